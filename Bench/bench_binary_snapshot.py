@@ -0,0 +1,77 @@
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.Convertors.convert_factory import convert_factory
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Сравнение выгрузки и восстановления данных в формате JSON
+    и в двоичном снимке (binary_snapshot): размер файла, время записи и загрузки.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_binary_snapshot
+"""
+
+TRANSACTIONS = 200000
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        repo.data[reposity.transaction_key()][item.unique_code] = item
+
+    directory = tempfile.gettempdir()
+    json_file = os.path.join(directory, "bench_snapshot.json")
+    binary_file = os.path.join(directory, "bench_snapshot.bin")
+
+    started = time.perf_counter()
+    service.dump(json_file)
+    json_dump = time.perf_counter() - started
+    started = time.perf_counter()
+    service.dump(binary_file, "binary")
+    binary_dump = time.perf_counter() - started
+
+    json_size = os.path.getsize(json_file)
+    binary_size = os.path.getsize(binary_file)
+
+    # Загрузка JSON через load_data требует файла данных приложения, поэтому замеряется напрямую
+    started = time.perf_counter()
+    with open(json_file, "r", encoding="utf-8") as f:
+        repo.load(convert_factory().convert_back(json.load(f)["data"]))
+    json_load = time.perf_counter() - started
+    started = time.perf_counter()
+    service.load_snapshot(binary_file)
+    # Справочники доступны сразу, транзакции декодируются в фоновом потоке
+    binary_ready = time.perf_counter() - started
+    service.wait_transactions()
+    binary_load = time.perf_counter() - started
+
+    os.remove(json_file)
+    os.remove(binary_file)
+    print(f"транзакций: {TRANSACTIONS}")
+    print(f"json:   {json_size / 1024 / 1024:.1f} МБ, выгрузка {json_dump:.2f} с, загрузка {json_load:.2f} с")
+    print(f"binary: {binary_size / 1024 / 1024:.1f} МБ, выгрузка {binary_dump:.2f} с, загрузка {binary_load:.2f} с "
+          f"(справочники доступны через {binary_ready:.3f} с)")
+
+
+if __name__ == "__main__":
+    run()
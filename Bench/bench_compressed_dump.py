@@ -0,0 +1,70 @@
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.Core.compressed_stream import compressed_stream
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Размер и время выгрузки JSON без сжатия и со сжатием каждым алгоритмом
+    (compressed_stream), а также время загрузки: распаковка частей и json.load.
+    Сжатие и распаковка выполняются в WORKERS потоках, для сравнения
+    распаковка замеряется и в одном потоке.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_compressed_dump
+"""
+
+TRANSACTIONS = 100000
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        repo.data[reposity.transaction_key()][item.unique_code] = item
+
+    filename = os.path.join(tempfile.gettempdir(), "bench_compressed_dump.json")
+    print(f"транзакций: {TRANSACTIONS}, потоков сжатия: {compressed_stream.WORKERS}")
+    plain = None
+    for compression in ["none"] + compressed_stream.codecs():
+        started = time.perf_counter()
+        service.dump(filename, "json", compression)
+        dumped = time.perf_counter() - started
+        size = os.path.getsize(filename)
+        plain = size if plain is None else plain
+
+        started = time.perf_counter()
+        with compressed_stream.open(filename) as f:
+            json.load(f)
+        loaded = time.perf_counter() - started
+
+        line = (f"{compression:>5}: {size / 1024 / 1024:6.1f} МБ ({plain / size:4.1f}x), "
+                f"выгрузка {dumped:.2f} с, загрузка {loaded:.2f} с")
+        if compression != "none":
+            started = time.perf_counter()
+            compressed_stream.read(filename, workers=1)
+            line += f", распаковка в 1 потоке {time.perf_counter() - started:.2f} с"
+        print(line)
+    os.remove(filename)
+
+
+if __name__ == "__main__":
+    run()
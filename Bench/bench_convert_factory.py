@@ -0,0 +1,41 @@
+import time
+from Src.Convertors.convert_factory import convert_factory
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Замер формирования данных для /api/recipes и /api/references
+    (convert_factory.convert по всем справочникам репозитория).
+    Первый проход собирает сериализаторы классов, последующие берут их из кэша.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_convert_factory
+"""
+
+ROUNDS = 1000
+
+
+def run():
+    service = start_service()
+    service.start()
+    data = service.repo.data
+    converter = convert_factory()
+
+    started = time.perf_counter()
+    converter.convert(data)
+    first = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        converter.convert_list(list(data[reposity.recipe_key()].values()))
+        for key, items in data.items():
+            if key != reposity.recipe_key():
+                converter.convert_list(list(items.values()))
+    elapsed = time.perf_counter() - started
+
+    print(f"первый проход: {first * 1000:.2f} мс")
+    print(f"повторный проход: {elapsed / ROUNDS * 1000:.3f} мс")
+
+
+if __name__ == "__main__":
+    run()
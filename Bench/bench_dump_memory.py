@@ -0,0 +1,71 @@
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from Src.Convertors.convert_factory import convert_factory
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Пиковая память выгрузки JSON: построение полного словаря
+    (convert_factory.convert + json.dump) против потоковой записи по одной модели
+    (start_service.dump через dump_job).
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_dump_memory
+"""
+
+TRANSACTIONS = 100000
+
+
+def measure(action) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        repo.data[reposity.transaction_key()][item.unique_code] = item
+
+    filename = os.path.join(tempfile.gettempdir(), "bench_dump_memory.json")
+
+    def full():
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"data": convert_factory().convert(repo.data)}, f, ensure_ascii=False, indent=2, default=str)
+
+    full_time, full_peak = measure(full)
+    stream_time, stream_peak = measure(lambda: service.dump(filename))
+    size = os.path.getsize(filename)
+    os.remove(filename)
+
+    print(f"транзакций: {TRANSACTIONS}, файл {size / 1024 / 1024:.1f} МБ")
+    print(f"полный словарь: {full_time:.2f} с, пик {full_peak / 1024 / 1024:.1f} МБ")
+    print(f"потоковая запись: {stream_time:.2f} с, пик {stream_peak / 1024 / 1024:.1f} МБ")
+
+
+if __name__ == "__main__":
+    run()
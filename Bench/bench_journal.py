@@ -0,0 +1,74 @@
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.journal import journal
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Стоимость сохранения одного изменения: полная перезапись файла данных
+    (dump) против записи в журнал изменений (journal) с пакетным fsync.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_journal
+"""
+
+TRANSACTIONS = 100000
+CHANGES = 2000
+
+
+def create_transaction(nomenclatures: list, storages: list) -> transaction_model:
+    nomenclature = random.choice(nomenclatures)
+    item = transaction_model()
+    item.name = "Транзакция"
+    item.storage = random.choice(storages)
+    item.nomenclature = nomenclature
+    item.measure = nomenclature.measure
+    item.quantity = float(random.randint(-50, 100))
+    item.date = datetime(2025, 1, 1) + timedelta(minutes=random.randint(0, 525600))
+    return item
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    transactions = repo.data[reposity.transaction_key()]
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    for _ in range(TRANSACTIONS):
+        item = create_transaction(nomenclatures, storages)
+        transactions[item.unique_code] = item
+
+    directory = tempfile.gettempdir()
+    dump_file = os.path.join(directory, "bench_journal.json")
+    started = time.perf_counter()
+    service.dump(dump_file)
+    full = time.perf_counter() - started
+    os.remove(dump_file)
+
+    journal_file = os.path.join(directory, "bench_journal.journal")
+    value = journal(journal_file, convert_factory().convert)
+    repo.attach_journal(value)
+    started = time.perf_counter()
+    for _ in range(CHANGES):
+        item = create_transaction(nomenclatures, storages)
+        transactions[item.unique_code] = item
+    value.sync()
+    journaled = (time.perf_counter() - started) / CHANGES
+    repo.detach_journal()
+    value.close()
+    os.remove(journal_file)
+
+    print(f"транзакций: {TRANSACTIONS}")
+    print(f"полная перезапись: {full * 1000:.1f} мс на изменение")
+    print(f"журнал: {journaled * 1000:.3f} мс на изменение (включая вставку в коллекцию)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,66 @@
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.Convertors.convert_factory import convert_factory
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Замер восстановления репозитория из выгрузки (load_data при перезапуске):
+    чтение JSON, convert_factory.convert_back и reposity.load.
+    Время на 1 ГБ выгрузки оценивается по измеренной скорости (МБ/с),
+    так как загрузка линейна по размеру файла.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_load_data
+"""
+
+TRANSACTIONS = 200000
+GIGABYTE = 1024 * 1024 * 1024
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        repo.data[reposity.transaction_key()][item.unique_code] = item
+
+    filename = os.path.join(tempfile.gettempdir(), "bench_load_data.json")
+    service.dump(filename)
+    size = os.path.getsize(filename)
+
+    started = time.perf_counter()
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    parsed = time.perf_counter() - started
+    models = convert_factory().convert_back(data["data"])
+    converted = time.perf_counter() - started
+    repo.load(models)
+    elapsed = time.perf_counter() - started
+    os.remove(filename)
+
+    speed = size / elapsed / 1024 / 1024
+    print(f"размер выгрузки: {size / 1024 / 1024:.1f} МБ, транзакций: {TRANSACTIONS}")
+    print(f"json.load: {parsed:.2f} с, convert_back: {converted - parsed:.2f} с, load: {elapsed - converted:.2f} с")
+    print(f"всего: {elapsed:.2f} с ({speed:.1f} МБ/с), оценка для 1 ГБ: {GIGABYTE / 1024 / 1024 / speed:.0f} с")
+
+
+if __name__ == "__main__":
+    run()
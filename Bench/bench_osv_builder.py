@@ -0,0 +1,79 @@
+import random
+import time
+from datetime import datetime, timedelta
+from Src.Core.osv_builder import osv_builder
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Замер времени построения оборотно-сальдовой ведомости (osv_builder.generate_rows).
+    Количество транзакций удваивается на каждом шаге. При линейной сложности
+    время в пересчете на одну транзакцию остается примерно постоянным.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_osv_builder
+"""
+
+NOMENCLATURE_COUNT = 2000
+STORAGE_COUNT = 4
+SIZES = [25_000, 50_000, 100_000, 200_000]
+START_DATE = datetime(2025, 1, 1)
+
+
+def create_references():
+    """ Создает справочники: номенклатуру и склады """
+    gramm = measure_model.create_gramm()
+    group = nomenclature_group_model.create("мука и крупы")
+    nomenclatures = {}
+    for i in range(NOMENCLATURE_COUNT):
+        item = nomenclature_model.create(f"Номенклатура {i}", group, gramm)
+        nomenclatures[item.name] = item
+
+    storages = []
+    for i in range(STORAGE_COUNT):
+        storage = storage_model()
+        storage.name = f"Склад {i}"
+        storages.append(storage)
+    return nomenclatures, storages
+
+
+def create_transactions(count: int, nomenclatures: dict, storages: list) -> dict:
+    """ Создает count случайных транзакций за год """
+    random.seed(count)
+    gramm = measure_model.create_gramm()
+    kilogramm = measure_model.create_kilogramm()
+    items = list(nomenclatures.values())
+    result = {}
+    for _ in range(count):
+        transaction = transaction_model()
+        transaction.date = START_DATE + timedelta(minutes=random.randint(0, 365 * 24 * 60))
+        transaction.nomenclature = random.choice(items)
+        transaction.storage = random.choice(storages)
+        transaction.quantity = float(random.randint(-50, 100))
+        transaction.measure = random.choice([gramm, kilogramm])
+        result[transaction.unique_code] = transaction
+    return result
+
+
+def run():
+    nomenclatures, storages = create_references()
+    osv = osv_model.create(datetime(2025, 6, 1), datetime(2025, 6, 30), storages[0])
+
+    print(f"{'транзакций':>12} {'время, с':>10} {'мкс/транзакцию':>16}")
+    for size in SIZES:
+        transactions = create_transactions(size, nomenclatures, storages)
+        builder = osv_builder(osv)
+
+        started = time.perf_counter()
+        builder.generate_rows(transactions, nomenclatures)
+        elapsed = time.perf_counter() - started
+
+        print(f"{size:>12} {elapsed:>10.3f} {elapsed / size * 1_000_000:>16.2f}")
+
+
+if __name__ == "__main__":
+    run()
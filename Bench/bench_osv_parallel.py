@@ -0,0 +1,71 @@
+import os
+import pickle
+import time
+from datetime import datetime
+from Bench.bench_osv_builder import create_references, create_transactions
+from Src.Core.osv_builder import osv_builder
+from Src.Core.transaction_collection import transaction_collection
+from Src.Models.osv_model import osv_model
+
+"""
+    Замер параллельного построения оборотно-сальдовой ведомости
+    (osv_builder.generate_rows_parallel) на разном количестве процессов.
+    Ускорение ограничено числом ядер машины и затратами на запуск процессов.
+
+    Кроме общего времени выводится доля подготовки в основном процессе:
+    срезы колонок индекса склада и их сериализация для передачи процессам.
+    Эта часть выполняется последовательно и ограничивает ускорение сверху.
+    Колонки индекса строятся один раз, время построения выводится отдельно,
+    запуск пула процессов в замер не входит.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_osv_parallel
+"""
+
+SIZE = 400_000
+WORKERS = [1, 2, 4, 8]
+
+
+def prepare(transactions, workers: int) -> float:
+    """ Время подготовки заданий в основном процессе: срезы колонок и их сериализация """
+    started = time.perf_counter()
+    rows = transactions.columns(osv_builder.transaction_row)
+    step = len(rows) / workers
+    bounds = [round(step * i) for i in range(workers)] + [len(rows)]
+    for begin, end in zip(bounds, bounds[1:]):
+        pickle.dumps(rows[begin:end], protocol=pickle.HIGHEST_PROTOCOL)
+    return time.perf_counter() - started
+
+
+def run():
+    nomenclatures, storages = create_references()
+    collection = transaction_collection(create_transactions(SIZE, nomenclatures, storages))
+    transactions = collection.storage_index(storages[0].unique_code)
+    osv = osv_model.create(datetime(2025, 6, 1), datetime(2025, 12, 31), storages[0])
+
+    print(f"ядер: {os.cpu_count()}, транзакций склада: {len(transactions)}")
+    started = time.perf_counter()
+    transactions.columns(osv_builder.transaction_row)
+    print(f"построение колонок индекса (один раз): {time.perf_counter() - started:.3f} с")
+
+    print(f"{'процессов':>10} {'время, с':>10} {'ускорение':>10} {'подготовка, с':>14} {'доля':>6}")
+    baseline = None
+    for workers in WORKERS:
+        builder = osv_builder(osv)
+        # Первый вызов запускает пул процессов, в замер он не входит
+        builder.generate_rows_parallel(transactions, nomenclatures, workers, min_shard=1)
+
+        started = time.perf_counter()
+        builder.generate_rows_parallel(transactions, nomenclatures, workers, min_shard=1)
+        elapsed = time.perf_counter() - started
+
+        baseline = baseline or elapsed
+        # При одном процессе используется последовательный расчет без подготовки заданий
+        prepared = prepare(transactions, workers) if workers > 1 else 0.0
+        print(f"{workers:>10} {elapsed:>10.3f} {baseline / elapsed:>10.2f} {prepared:>14.3f} {prepared / elapsed:>6.0%}")
+
+    osv_builder.shutdown_pool()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from Src.Core.production_posting import insufficient_balance_exception
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Списания «Приготовление блюда» с блокировкой (start_service.post_production)
+    из нескольких потоков, как у обработчиков Flask в час пик. Проверка остатков
+    по кэшу текущих остатков сравнивается с проверкой по ОСВ склада,
+    пересчитываемой на каждое списание. Репозиторий дополняется транзакциями
+    прошлых периодов, чтобы пересчет ОСВ стоил столько же, сколько в работе.
+
+    Запуск из корня репозитория (хранилище в памяти или в базе SQLite):
+        python -m Bench.bench_production_posting
+        python -m Bench.bench_production_posting sqlite
+"""
+
+THREADS = 8
+POSTINGS = 2000
+HISTORY = 200000
+
+
+def fill_history(service: start_service):
+    data = service.repo.data
+    storages = list(data[reposity.storage_key()].values())
+    nomenclatures = list(data[reposity.nomenclature_key()].values())
+    items = {}
+    for position in range(HISTORY):
+        nomenclature = nomenclatures[position % len(nomenclatures)]
+        code = f"history-{position}"
+        storage = storages[position // len(nomenclatures) % len(storages)]
+        items[code] = transaction_model.create_trusted(
+            code, "Поступление", storage, nomenclature, nomenclature.measure,
+            float(POSTINGS), datetime(2024, 1 + position % 12, 1 + position % 28))
+    service.repo.add_transactions(items)
+
+
+def measure(name: str, post, postings: int, threads: int):
+    counts = {"posted": 0, "blocked": 0}
+    lock = threading.Lock()
+
+    def work(count: int):
+        for _ in range(count):
+            try:
+                post()
+                result = "posted"
+            except insufficient_balance_exception:
+                result = "blocked"
+            with lock:
+                counts[result] += 1
+
+    workers = [threading.Thread(target=work, args=(postings // threads,)) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>12}: потоков {threads}, {elapsed:.2f} с, {postings / elapsed:,.0f} списаний/с, "
+          f"проведено {counts['posted']}, заблокировано {counts['blocked']}")
+
+
+def run(backend: str):
+    directory = tempfile.TemporaryDirectory()
+    service = start_service()
+    if backend == "sqlite":
+        service.open_store(os.path.join(directory.name, "bench.db"))
+    service.start()
+    fill_history(service)
+    data = service.repo.data
+    recipe = data[reposity.recipe_key()]["Вафли"]
+    storage = data[reposity.storage_key()]["Основной склад"]
+    # Остатков хватает на все списания: каждое проходит проверку и записывается
+    print(f"хранилище: {backend}, транзакций: {len(data[reposity.transaction_key()]):,}")
+
+    def osv_check():
+        # Остатки по ведомости на текущую дату, затем списание без повторной проверки
+        osv = service.create_osv(datetime(1900, 1, 1), datetime.now(), storage)
+        balances = {row.nomenclature.unique_code: row.end_balance for row in osv.rows}
+        for nomenclature, quantity in recipe.ingredients:
+            if balances.get(nomenclature.unique_code, 0.0) < quantity:
+                raise insufficient_balance_exception([(nomenclature, quantity, 0.0)])
+        service.post_production(recipe, storage, 1, "overdraft")
+
+    measure("кэш остатков", lambda: service.post_production(recipe, storage, 1), POSTINGS, THREADS)
+    # Построение ОСВ не согласовано с записью из других потоков, поэтому - в одном потоке
+    # и на меньшем числе списаний (каждое перебирает транзакции склада)
+    if backend == "memory":
+        measure("пересчет ОСВ", osv_check, POSTINGS // 20, 1)
+    service.close_store()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "memory")
@@ -0,0 +1,74 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.Convertors.convert_factory import convert_factory
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Время до первого запроса при запуске: загрузка единого файла данных
+    (json.load + convert_back + reposity.load) против каталога с файлом
+    на каждую коллекцию (start_service.load_sharded), где справочники
+    доступны сразу, а транзакции загружаются в фоновом потоке.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_sharded_startup
+"""
+
+TRANSACTIONS = 200000
+
+
+def run():
+    random.seed(1)
+    service = start_service()
+    service.start()
+    repo = service.repo
+    nomenclatures = list(repo.data[reposity.nomenclature_key()].values())
+    storages = list(repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        repo.data[reposity.transaction_key()][item.unique_code] = item
+
+    filename = os.path.join(tempfile.gettempdir(), "bench_sharded_startup.json")
+    directory = os.path.join(tempfile.gettempdir(), "bench_sharded_startup")
+    service.dump(filename)
+    service.dump(directory, "sharded")
+
+    started = time.perf_counter()
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    repo.load(convert_factory().convert_back(data["data"]))
+    monolithic = time.perf_counter() - started
+    del data
+
+    started = time.perf_counter()
+    service.load_sharded(directory)
+    first_request = time.perf_counter() - started
+    service.wait_transactions()
+    warmed = time.perf_counter() - started
+    loaded = len(repo.data[reposity.transaction_key()])
+
+    os.remove(filename)
+    shutil.rmtree(directory)
+
+    print(f"транзакций: {TRANSACTIONS} (загружено из каталога: {loaded})")
+    print(f"единый файл: {monolithic:.2f} с до первого запроса")
+    print(f"каталог коллекций: {first_request * 1000:.1f} мс до первого запроса, "
+          f"транзакции готовы через {warmed:.2f} с")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Сравнение хранилищ репозитория: словарь в памяти и база SQLite (sqlite_store).
+    Замеряются пакетное добавление транзакций, выборка за месяц по складу,
+    ОСВ склада и ОСВ всех складов за год, а также память, занятая данными
+    (tracemalloc): в базе SQLite транзакции в памяти процесса не хранятся.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_sqlite_backend
+"""
+
+TRANSACTIONS = 200000
+
+
+def create_transactions(service: start_service) -> dict:
+    random.seed(1)
+    nomenclatures = list(service.repo.data[reposity.nomenclature_key()].values())
+    storages = list(service.repo.data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    result = {}
+    for _ in range(TRANSACTIONS):
+        nomenclature = random.choice(nomenclatures)
+        item = transaction_model()
+        item.name = "Транзакция"
+        item.storage = random.choice(storages)
+        item.nomenclature = nomenclature
+        item.measure = nomenclature.measure
+        item.quantity = float(random.randint(-50, 100))
+        item.date = start + timedelta(minutes=random.randint(0, 525600))
+        result[item.unique_code] = item
+    return result
+
+
+def measure(service: start_service, name: str):
+    repo = service.repo
+    storages = list(repo.data[reposity.storage_key()].values())
+    storage = storages[0]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    items = create_transactions(service)
+
+    started = time.perf_counter()
+    repo.data[reposity.transaction_key()].update(items)
+    inserted = time.perf_counter() - started
+    # Остаются только модели, на которые ссылается хранилище
+    del items
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    found = repo.transactions_between(datetime(2025, 6, 1), datetime(2025, 6, 30), storage)
+    queried = time.perf_counter() - started
+
+    start_date, end_date = datetime(2025, 1, 1), datetime(2025, 12, 31)
+    started = time.perf_counter()
+    service.create_osv(start_date, end_date, storage)
+    osv = time.perf_counter() - started
+
+    started = time.perf_counter()
+    service.create_osv_batch(start_date, end_date)
+    batch = time.perf_counter() - started
+
+    print(f"{name:>6}: добавление {inserted:.2f} с, память {memory / 1024 / 1024:6.1f} МБ, "
+          f"выборка за месяц {queried * 1000:.1f} мс ({len(found)} шт), "
+          f"ОСВ склада {osv * 1000:.1f} мс, ОСВ {len(storages)} складов {batch * 1000:.1f} мс")
+
+
+def run():
+    service = start_service()
+    service.start()
+    print(f"транзакций: {TRANSACTIONS}")
+    measure(service, "memory")
+
+    filename = os.path.join(tempfile.gettempdir(), "bench_sqlite_backend.db")
+    for name in [filename, filename + "-wal", filename + "-shm"]:
+        if os.path.exists(name):
+            os.remove(name)
+    service = start_service()
+    service.open_store(filename)
+    service.start()
+    measure(service, "sqlite")
+    service.close_store()
+    print(f"размер базы: {os.path.getsize(filename) / 1024 / 1024:.1f} МБ")
+    os.remove(filename)
+
+
+if __name__ == "__main__":
+    run()
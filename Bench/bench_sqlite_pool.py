@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from Src.Core.sqlite_store import sqlite_store
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Задержка коротких запросов к базе SQLite (транзакция по коду) из нескольких
+    потоков, как у обработчиков Flask: соединение на каждый запрос
+    против пула соединений (sqlite_pool) с кэшем подготовленных запросов.
+    В конце выводятся показатели пула.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_sqlite_pool
+"""
+
+THREADS = 4
+REQUESTS = 5000
+
+
+def measure(name: str, lookup, keys: list):
+    def work(part):
+        for key in part:
+            lookup(key)
+
+    threads = [threading.Thread(target=work, args=(keys[position::THREADS],)) for position in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>26}: {elapsed:.2f} с, {elapsed / len(keys) * 1e6:.0f} мкс на запрос")
+
+
+def run():
+    filename = os.path.join(tempfile.gettempdir(), "bench_sqlite_pool.db")
+    for name in [filename, filename + "-wal", filename + "-shm"]:
+        if os.path.exists(name):
+            os.remove(name)
+    service = start_service()
+    service.open_store(filename)
+    service.start()
+    store = service.repo.store
+    codes = list(service.repo.data[reposity.transaction_key()])
+    keys = [codes[position % len(codes)] for position in range(REQUESTS)]
+
+    def connect_per_request(key):
+        connection = sqlite3.connect(filename)
+        try:
+            connection.execute(
+                f"SELECT {sqlite_store.COLUMNS} FROM transactions WHERE id = ?", (key,)).fetchone()
+        finally:
+            connection.close()
+
+    print(f"потоков: {THREADS}, запросов: {REQUESTS}")
+    measure("соединение на запрос", connect_per_request, keys)
+    measure("пул соединений", store.transaction, keys)
+    print(store.pool.metrics())
+    service.close_store()
+    os.remove(filename)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,76 @@
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Потоковый импорт файла транзакций (start_service.import_transactions)
+    в базу SQLite. Для каждого размера файла выводятся скорость и прирост
+    пикового потребления памяти процесса: при чтении частями он не зависит
+    от размера файла. Для сравнения файл загружается целиком
+    (start_service.ingest_transactions) - память растет вместе с файлом.
+
+    Запуск из корня репозитория (режим в аргументе, каждый - в отдельном процессе,
+    чтобы пиковая память не переходила между замерами):
+        python -m Bench.bench_transaction_importer stream 200000
+        python -m Bench.bench_transaction_importer stream 800000
+        python -m Bench.bench_transaction_importer whole 200000
+        python -m Bench.bench_transaction_importer whole 800000
+"""
+
+
+def peak_megabytes() -> float:
+    # ru_maxrss в Linux - в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_file(service: start_service, filename: str, rows: int):
+    random.seed(1)
+    data = service.repo.data
+    nomenclatures = [item.unique_code for item in data[reposity.nomenclature_key()].values()]
+    storages = [item.unique_code for item in data[reposity.storage_key()].values()]
+    start = datetime(2025, 1, 1)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("name,storage_id,nomenclature_id,quantity,date\n")
+        for position in range(rows):
+            date = start + timedelta(minutes=random.randint(0, 525600))
+            file.write(f"Поступление,{random.choice(storages)},{random.choice(nomenclatures)},"
+                       f"{random.randint(-50, 100)},{date:%Y-%m-%d %H:%M:%S}\n")
+            # Каждая тысячная строка - с ошибкой
+            if position % 1000 == 999:
+                file.write("Поступление,нет такого склада,,1,вчера\n")
+
+
+def run(mode: str, rows: int):
+    directory = tempfile.TemporaryDirectory()
+    database = os.path.join(directory.name, "bench.db")
+    filename = os.path.join(directory.name, "movements.csv")
+    service = start_service()
+    service.open_store(database)
+    service.start()
+    write_file(service, filename, rows)
+    before = peak_megabytes()
+
+    started = time.perf_counter()
+    if mode == "stream":
+        result = service.import_transactions(filename, reject_filename=os.path.join(directory.name, "rejected.jsonl"))
+    else:
+        with open(filename, encoding="utf-8") as file:
+            result = service.ingest_transactions(file.read(), "csv", skip_invalid=True)
+    elapsed = time.perf_counter() - started
+
+    size = os.path.getsize(filename) / 1024 / 1024
+    print(f"{mode:>6}: файл {size:.0f} МБ, строк {result['total']:,}, добавлено {result['inserted']:,}, "
+          f"отклонено {result['rejected']:,}, {elapsed:.1f} с, {result['total'] / elapsed:,.0f} строк/с, "
+          f"прирост пиковой памяти {peak_megabytes() - before:.0f} МБ")
+    service.close_store()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "stream", int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
@@ -0,0 +1,94 @@
+import gc
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Скорость пакетной загрузки транзакций (start_service.ingest_transactions)
+    из CSV и JSON lines в сравнении с созданием transaction_model по одной
+    через сеттеры с проверками и добавлением в репозиторий по одной.
+
+    Каждый способ замеряется на пустой коллекции транзакций: перед замером
+    транзакции предыдущего способа удаляются, а память освобождается
+    сборкой мусора вне замера.
+
+    Запуск из корня репозитория:
+        python -m Bench.bench_transaction_ingest
+"""
+
+ROWS = 200000
+
+
+def create_rows(service: start_service) -> list:
+    random.seed(1)
+    data = service.repo.data
+    nomenclatures = list(data[reposity.nomenclature_key()].values())
+    storages = list(data[reposity.storage_key()].values())
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "name": "Поступление",
+            "storage_id": random.choice(storages).unique_code,
+            "nomenclature_id": random.choice(nomenclatures).unique_code,
+            "quantity": random.randint(-50, 100),
+            "date": (start + timedelta(minutes=random.randint(0, 525600))).strftime("%Y-%m-%d %H:%M:%S")
+        }
+        for _ in range(ROWS)
+    ]
+
+
+def one_by_one(service: start_service, rows: list):
+    data = service.repo.data
+    codes = {
+        item.unique_code: item
+        for key in [reposity.storage_key(), reposity.nomenclature_key()] for item in data[key].values()
+    }
+    transactions = data[reposity.transaction_key()]
+    for row in rows:
+        item = transaction_model()
+        item.name = row["name"]
+        item.storage = codes[row["storage_id"]]
+        item.nomenclature = codes[row["nomenclature_id"]]
+        item.measure = item.nomenclature.measure
+        item.quantity = float(row["quantity"])
+        item.date = row["date"]
+        transactions[item.unique_code] = item
+
+
+def reset(service: start_service):
+    """ Очищает коллекцию транзакций и собирает мусор до начала замера """
+    service.repo.data[reposity.transaction_key()].clear()
+    gc.collect()
+
+
+def run():
+    service = start_service()
+    service.start()
+    rows = create_rows(service)
+    fields = ["name", "storage_id", "nomenclature_id", "quantity", "date"]
+    sources = {
+        "csv": "\n".join([",".join(fields)] + [",".join(str(row[name]) for name in fields) for row in rows]),
+        "jsonl": "\n".join(json.dumps(row) for row in rows)
+    }
+    print(f"строк: {ROWS}")
+
+    for ingest_format, source in sources.items():
+        reset(service)
+        started = time.perf_counter()
+        result = service.ingest_transactions(source, ingest_format)
+        elapsed = time.perf_counter() - started
+        print(f"{ingest_format:>10}: {elapsed:.2f} с, {ROWS / elapsed:,.0f} строк/с, добавлено {result['inserted']}")
+
+    reset(service)
+    started = time.perf_counter()
+    one_by_one(service, rows)
+    elapsed = time.perf_counter() - started
+    print(f"{'по одной':>10}: {elapsed:.2f} с, {ROWS / elapsed:,.0f} строк/с")
+
+
+if __name__ == "__main__":
+    run()
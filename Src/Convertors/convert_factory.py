@@ -1,41 +1,64 @@
+from collections.abc import Mapping
 from datetime import date, datetime, time
 from Src.Convertors.date_convertor import date_convertor
 from Src.Convertors.time_convertor import time_convertor
 from Src.Convertors.basic_convertor import basic_convertor
 from Src.Convertors.datetime_convertor import datetime_convertor
 from Src.Convertors.reference_convertor import reference_convertor
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Callable, Dict, List
 
 from Src.Core.abstract_model import abstract_model
-from Src.Core.common import common
+from Src.Core.validator import validator
+from Src.Dto.category_dto import category_dto
+from Src.Dto.measure_dto import measure_dto
+from Src.Dto.nomenclature_dto import nomenclature_dto
+from Src.Dto.recipe_dto import recipe_dto
+from Src.Dto.storage_dto import storage_dto
+from Src.Dto.transaction_dto import transaction_dto
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.recipe_model import recipe_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
 
 class convert_factory:
 
     """
     Фабрика для преобразования объектов любых типов в словари.
     Использует цепочку конвертеров: basic -> datetime -> reference.
+
+    Для каждого конкретного класса при первом преобразовании собирается
+    сериализатор (функция преобразования). Таблица сериализаторов общая
+    для всех экземпляров фабрики, поэтому фабрики, создаваемые на каждый
+    ответ, сразу берут готовый сериализатор. Модель с таблицей свойств DTO
+    (dto_fields) сериализуется прямо из своих свойств, без создания DTO.
     """
 
-    def __init__(self):
+    # Класс DTO -> [(имя свойства, геттер)], общий для всех экземпляров фабрики
+    __fields: Dict[type, list] = {}
+    # Класс DTO -> {имя свойства: сеттер}
+    __setters: Dict[type, dict] = {}
+    # Класс объекта -> сериализатор, общий для всех экземпляров фабрики
+    __serializers: Dict[type, Callable] = {}
 
-        """
-        Инициализирует цепочку конвертеров в порядке приоритета.
-        """
-
-        self.__converters = {
-            # Простые типы (str, int, float, bool, None)
-            str: basic_convertor(),
-            int: basic_convertor(),
-            float: basic_convertor(),
-            bool: basic_convertor(),
-            None: basic_convertor(),
-            # Дата/время (datetime, date, time)  
-            datetime: datetime_convertor(), 
-            date: date_convertor(),
-            time: time_convertor(),   
-            # Модели, DTO, объекты
-            abstract_model: reference_convertor()
-        }
+    # Цепочка конвертеров в порядке приоритета (конвертеры не хранят состояния)
+    __converters = {
+        # Простые типы (str, int, float, bool, None)
+        str: basic_convertor(),
+        int: basic_convertor(),
+        float: basic_convertor(),
+        bool: basic_convertor(),
+        None: basic_convertor(),
+        # Дата/время (datetime, date, time)
+        datetime: datetime_convertor(),
+        date: date_convertor(),
+        time: time_convertor(),
+        # Модели, DTO, объекты
+        abstract_model: reference_convertor()
+    }
 
     def convert(self, obj: Any) -> Dict[str, Any]:
 
@@ -47,36 +70,92 @@ class convert_factory:
             Dict[str, Any]: Словарь с данными объекта
         """
 
+        return convert_factory.__convert(obj)
+
+    @staticmethod
+    def __convert(obj: Any) -> Any:
+
+        """
+        Преобразует объект сериализатором его класса (собирается при первом обращении).
+        """
+
         # Обрабатываем None отдельно
         if obj is None:
             return None
-        
-        if isinstance(obj, list):
-            return self.convert_list(obj)
-                
-        if isinstance(obj, dict):
-            return self.convert_dict(obj)
-        
-        if type(obj) in self.__converters.keys():
-            converter = self.__converters[type(obj)]
-            return converter.convert(obj)
-            
-        if type(obj).__bases__[0] not in self.__converters.keys():
+
+        serializer = convert_factory.__serializers.get(type(obj))
+        if serializer is None:
+            serializer = convert_factory.__serializers[type(obj)] = convert_factory.__compile(type(obj))
+        return serializer(obj)
+
+    @staticmethod
+    def __compile(cls: type):
+
+        """
+        Собирает сериализатор для класса.
+        Аргументы:
+            cls: Класс преобразуемого объекта
+        Возвращает:
+            Функция obj -> преобразованное значение
+        """
+
+        convert = convert_factory.__convert
+        converters = convert_factory.__converters
+
+        if issubclass(cls, list):
+            return lambda objects: [convert(obj) for obj in objects]
+
+        # Словари и коллекции с тем же интерфейсом (например, транзакции в базе SQLite)
+        if issubclass(cls, Mapping):
+            return lambda obj_dict: {str(key): convert(value) for key, value in obj_dict.items()}
+
+        if cls in converters.keys():
+            return converters[cls].convert
+
+        if cls.__bases__[0] not in converters.keys():
 
             # Fallback: если ни один конвертер не подошел
-            return {
+            return lambda obj: {
                 'value': str(obj),
                 'type': 'unknown', 
                 'converter': 'factory_fallback',
                 'original_type': type(obj).__name__
             }
-        
-        converter = self.__converters[type(obj).__bases__[0]]
-        result = converter.convert(obj)
-        if isinstance(converter, reference_convertor):
-            fields = common.get_fields(result)
-            return {key: self.convert(getattr(result, key)) for key in fields}
-        return result
+
+        converter = converters[cls.__bases__[0]]
+        if not isinstance(converter, reference_convertor):
+            return converter.convert
+
+        # Значения свойств DTO читаются прямо из модели в порядке свойств DTO (как common.get_fields)
+        fields = cls.dto_fields()
+        if fields is not None:
+            fields = sorted(fields, key=itemgetter(0))
+            return lambda obj: {name: convert(getter(obj)) for name, getter in fields}
+
+        def serialize(obj):
+            result = converter.convert(obj)
+            return {name: convert(getter(result)) for name, getter in convert_factory.__getters(type(result))}
+        return serialize
+
+    @staticmethod
+    def __getters(cls: type) -> list:
+
+        """
+        Возвращает свойства класса DTO с их геттерами (в порядке common.get_fields).
+        Аргументы:
+            cls: Класс DTO
+        Возвращает:
+            list: [(имя свойства, геттер)]
+        """
+
+        getters = convert_factory.__fields.get(cls)
+        if getters is None:
+            getters = convert_factory.__fields[cls] = [
+                (name, getattr(cls, name).fget)
+                for name in dir(cls)
+                if not name.startswith("_") and isinstance(getattr(cls, name), property)
+            ]
+        return getters
 
     def convert_list(self, objects: List[Any]) -> List[Dict[str, Any]]:
 
@@ -88,7 +167,7 @@ class convert_factory:
             List[Dict[str, Any]]: Список преобразованных объектов
         """
 
-        return [self.convert(obj) for obj in objects]
+        return [convert_factory.__convert(obj) for obj in objects]
 
     def convert_dict(self, obj_dict: Dict[Any, Any]) -> Dict[str, Any]:
 
@@ -100,4 +179,104 @@ class convert_factory:
             Dict[str, Any]: Словарь с преобразованными объектами
         """
 
-        return {str(key): self.convert(value) for key, value in obj_dict.items()}
\ No newline at end of file
+        return {str(key): convert_factory.__convert(value) for key, value in obj_dict.items()}
+
+    @staticmethod
+    def load_order() -> list:
+
+        """
+        Порядок восстановления коллекций: каждая ссылается только на предыдущие.
+        Возвращает:
+            list: [(ключ коллекции, класс модели, класс DTO)]
+        """
+
+        return [
+            (reposity.measure_key(), measure_model, measure_dto),
+            (reposity.nomenclature_group_key(), nomenclature_group_model, category_dto),
+            (reposity.nomenclature_key(), nomenclature_model, nomenclature_dto),
+            (reposity.storage_key(), storage_model, storage_dto),
+            (reposity.recipe_key(), recipe_model, recipe_dto),
+            (reposity.transaction_key(), transaction_model, transaction_dto)
+        ]
+
+    def convert_back(self, data: Dict[str, Any], cache: Dict[str, Any] = None) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Восстанавливает модели из выгрузки (результата convert для данных репозитория).
+        
+        Коллекции восстанавливаются в порядке зависимостей (load_order).
+        Ссылки разрешаются через словарь unique_code -> модель, уникальные коды
+        моделей сохраняются, поэтому загрузка линейна по размеру выгрузки.
+        Аргументы:
+            data: Словарь {ключ коллекции: {ключ: словарь DTO}}
+            cache: Уже восстановленные модели {unique_code: модель}, на которые
+                могут ссылаться данные (например, справочники при отдельной загрузке транзакций)
+        Возвращает:
+            Dict[str, Dict[str, Any]]: Словарь {ключ коллекции: {ключ: модель}}
+        """
+
+        validator.validate(data, dict)
+        cache = {} if cache is None else dict(cache)
+        result = {}
+        for key, model_type, dto_type in convert_factory.load_order():
+            setters = convert_factory.__dto_setters(dto_type)
+            items = {}
+            source = data.get(key, {})
+            if model_type is measure_model:
+                source = convert_factory.__base_first(source)
+            for item_key, values in source.items():
+                dto = dto_type()
+                for name, value in values.items():
+                    setter = setters.get(name)
+                    if setter is not None:
+                        setter(dto, value)
+                item = model_type.from_dto(dto, cache)
+                cache[item.unique_code] = item
+                items[item_key] = item
+            result[key] = items
+        return result
+
+    @staticmethod
+    def __base_first(measures: Dict[str, Any]) -> Dict[str, Any]:
+
+        """
+        Упорядочивает единицы измерения так, чтобы базовая единица шла раньше зависимых.
+        Аргументы:
+            measures: Словарь {ключ: словарь DTO единицы}
+        Возвращает:
+            Dict[str, Any]: Тот же словарь в порядке зависимостей
+        """
+
+        by_id = {values.get("id"): item_key for item_key, values in measures.items()}
+        result = {}
+        for item_key in measures:
+            chain = []
+            current = item_key
+            # Поднимаемся по base_id до уже добавленной или корневой единицы
+            while current is not None and current not in result and current not in chain:
+                chain.append(current)
+                current = by_id.get(measures[current].get("base_id"))
+            for pending in reversed(chain):
+                result[pending] = measures[pending]
+        return result
+
+    @staticmethod
+    def __dto_setters(cls: type) -> dict:
+
+        """
+        Возвращает сеттеры свойств класса DTO (кэшируются по классу).
+        Аргументы:
+            cls: Класс DTO
+        Возвращает:
+            dict: {имя свойства: сеттер}
+        """
+
+        setters = convert_factory.__setters.get(cls)
+        if setters is None:
+            setters = convert_factory.__setters[cls] = {
+                name: getattr(cls, name).fset
+                for name in dir(cls)
+                if not name.startswith("_") and isinstance(getattr(cls, name), property)
+                and getattr(cls, name).fset is not None
+            }
+        return setters
@@ -26,6 +26,38 @@ class abstract_model(ABC):
         self.__unique_code = uuid.uuid4().hex
         self.__name = name
 
+    @classmethod
+    def _trusted(cls, unique_code: str, name: str):
+        """
+        Создает модель из уже проверенных значений без вызова __init__ и проверок сеттеров
+        (используется при пакетной загрузке, когда значения проверены столбцами целиком).
+        """
+
+        item = object.__new__(cls)
+        item.__unique_code = unique_code
+        item.__name = name
+        return item
+
+    def _fill_dto(self, dto):
+
+        """ Заполняет свойства DTO значениями dto_fields() модели и возвращает его """
+
+        for name, read in self.dto_fields():
+            setattr(dto, name, read(self))
+        return dto
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства DTO модели и функции чтения их значений из модели: [(имя, функция)].
+        Фабрика преобразований сериализует по ним модель без создания DTO,
+        а to_dto модели заполняет по ним же DTO (_fill_dto) - таблица одна на оба пути.
+        None - таблицы нет, модель преобразуется через to_dto.
+        """
+
+        return None
+
     # Уникальный код
     @property
     def unique_code(self) -> str:
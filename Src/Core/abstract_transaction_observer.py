@@ -0,0 +1,22 @@
+import abc
+
+# Абстрактный наблюдатель за изменениями коллекции транзакций
+
+class abstract_transaction_observer(abc.ABC):
+
+    # Транзакция добавлена в коллекцию (при замене по ключу - после удаления старой)
+    @abc.abstractmethod
+    def transaction_added(self, key, transaction):
+        pass
+
+    # Пакет новых транзакций добавлен в коллекцию: [(ключ, транзакция)].
+    # По умолчанию - transaction_added для каждой; наблюдатель, которому пакет
+    # не нужен, может не перебирать его
+    def transactions_added(self, pairs: list):
+        for key, transaction in pairs:
+            self.transaction_added(key, transaction)
+
+    # Транзакция удалена из коллекции (при замене по ключу - перед добавлением новой)
+    @abc.abstractmethod
+    def transaction_removed(self, key, transaction):
+        pass
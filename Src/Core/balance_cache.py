@@ -0,0 +1,123 @@
+import threading
+from datetime import datetime
+from Src.Core.abstract_transaction_observer import abstract_transaction_observer
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.osv_builder import osv_builder
+from Src.Core.sqlite_transaction_collection import sqlite_transaction_collection
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.validator import validator
+
+class balance_cache(abstract_transaction_observer):
+    """
+    Текущие остатки номенклатуры на складах с учетом всех транзакций.
+
+    Остатки {(код склада, код номенклатуры): количество} считаются один раз
+    при первом обращении (для базы SQLite - агрегированием в базе), после чего
+    кэш получает уведомления коллекции транзакций и поправляет единственный
+    остаток за O(1). Чтение остатка - поиск в словаре, без построения ОСВ.
+
+    Особенности:
+        - Остатки ведутся в единице строки ОСВ (корневая единица номенклатуры).
+        - После изменения таблицы пересчета единиц (measure_conversion)
+          остатки пересчитываются при следующем чтении.
+        - Подсчет выполняется под блокировкой записи коллекции (write_lock),
+          под которой писатели изменяют коллекцию и уведомляют наблюдателей:
+          изменение во время подсчета не теряется и не учитывается дважды.
+        - Ненужный кэш отписывается от коллекции (close).
+        - Вклад удаляемой транзакции вычисляется заново по ее модели, поэтому
+          транзакции заменяются новыми моделями, а не изменяются «на месте».
+    """
+
+    def __init__(self, transactions: transaction_collection, storages: dict):
+        """
+        Аргументы:
+            transactions (transaction_collection|sqlite_transaction_collection): Коллекция транзакций репозитория
+            storages (dict): Справочник складов
+        """
+        validator.validate(transactions, (transaction_collection, sqlite_transaction_collection))
+        validator.validate(storages, dict)
+        self.__transactions = transactions
+        self.__storages = storages
+        self.__balances = None
+        self.__version = None
+        self.__lock = threading.Lock()
+        transactions.subscribe(self)
+
+    def prepare(self):
+        """ Считает остатки заранее, чтобы первое чтение не ждало подсчета """
+        self.__current()
+
+    def close(self):
+        """ Отписывает кэш от изменений коллекции транзакций """
+        self.__transactions.unsubscribe(self)
+
+    def balance(self, storage_code: str, nomenclature_code: str) -> float:
+        """
+        Возвращает текущий остаток номенклатуры на складе.
+
+        Аргументы:
+            storage_code (str): Уникальный код склада
+            nomenclature_code (str): Уникальный код номенклатуры
+
+        Возвращает:
+            float: Остаток в единице строки ОСВ (0, если движений не было)
+        """
+        return self.__current().get((storage_code, nomenclature_code), 0.0)
+
+    def balances(self, storage_code: str) -> dict:
+        """
+        Возвращает текущие остатки склада {код номенклатуры: количество}.
+        """
+        return {
+            nomenclature_code: quantity
+            for (code, nomenclature_code), quantity in self.__current().items() if code == storage_code
+        }
+
+    def transaction_added(self, key, transaction):
+        if self.__balances is not None:
+            self.__apply(transaction, 1.0)
+
+    def transactions_added(self, pairs: list):
+        if self.__balances is not None:
+            for _, transaction in pairs:
+                self.__apply(transaction, 1.0)
+
+    def transaction_removed(self, key, transaction):
+        if self.__balances is not None:
+            self.__apply(transaction, -1.0)
+
+    def __apply(self, transaction, sign: float):
+        """ Добавляет (sign = 1) или вычитает (sign = -1) вклад транзакции в остаток """
+        code, quantity = osv_builder.row_quantity(transaction)
+        balance = (transaction.storage.unique_code, code)
+        self.__balances[balance] = self.__balances.get(balance, 0.0) + sign * quantity
+
+    def __current(self) -> dict:
+        """ Возвращает остатки, при необходимости посчитав их заново """
+        balances = self.__balances
+        if balances is not None and self.__version == measure_conversion.version():
+            return balances
+        with self.__lock:
+            if self.__balances is None or self.__version != measure_conversion.version():
+                # Писатели ждут окончания подсчета, поэтому уведомления применяются уже к новым остаткам
+                with self.__transactions.write_lock:
+                    version = measure_conversion.version()
+                    self.__balances = self.__build()
+                    self.__version = version
+            return self.__balances
+
+    def __build(self) -> dict:
+        """ Считает остатки по всем транзакциям """
+        result = {}
+        if isinstance(self.__transactions, sqlite_transaction_collection):
+            codes = [storage.unique_code for storage in self.__storages.values()]
+            totals = self.__transactions.totals(datetime.min, datetime.max, codes)
+            for storage_code, items in totals.items():
+                for nomenclature_code, (opening, income, outcome) in items.items():
+                    result[(storage_code, nomenclature_code)] = opening + income - outcome
+            return result
+        for transaction in self.__transactions.values():
+            code, quantity = osv_builder.row_quantity(transaction)
+            balance = (transaction.storage.unique_code, code)
+            result[balance] = result.get(balance, 0.0) + quantity
+        return result
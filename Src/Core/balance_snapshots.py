@@ -0,0 +1,185 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from Src.Core.date_index import date_index
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.validator import argument_exception, validator
+
+class balance_snapshots:
+    """
+    Материализованные остатки складов на границах периодов (снимки закрытия).
+
+    Снимок на границе B содержит остатки по каждой номенклатуре склада
+    с учетом всех транзакций с датой строго меньше B. Остаток на произвольную
+    дату считается как ближайший снимок плюс транзакции после него.
+
+    Снимки строятся лениво при первом запросе и сохраняются. При вставке или удалении
+    транзакции задним числом сбрасываются только снимки этого склада после ее даты.
+    При изменении таблицы пересчета единиц (measure_conversion) сбрасываются все снимки.
+
+    Снимки строят читатели без блокировки записи коллекции, поэтому у каждого склада
+    есть поколение, которое увеличивает invalidate. Построенные снимки сохраняются,
+    только если поколение склада не изменилось с начала чтения: иначе остатки
+    посчитаны по транзакциям до записи и были бы сохранены после ее сброса.
+    Коллекция должна вызывать invalidate после изменения индекса склада.
+
+    Свойства:
+        period (str): Периодичность снимков - "day", "month" или "year"
+    """
+
+    __periods = ["day", "month", "year"]
+
+    def __init__(self, period: str = "month"):
+        self.__period = ""
+        self.__storages = {}
+        # Поколения складов (invalidate) и всех снимков (clear)
+        self.__generations = {}
+        self.__epoch = 0
+        self.__lock = threading.Lock()
+        self.__version = measure_conversion.version()
+        self.period = period
+
+    @property
+    def period(self) -> str:
+        """Возвращает периодичность снимков"""
+        return self.__period
+
+    @period.setter
+    def period(self, value: str):
+        """
+        Устанавливает периодичность снимков. Сохраненные снимки сбрасываются.
+
+        Аргументы:
+            value (str): "day", "month" или "year"
+
+        Ошибки:
+            argument_exception: Если периодичность не поддерживается
+        """
+        validator.validate(value, str)
+        if value not in self.__periods:
+            raise argument_exception(f"Неподдерживаемая периодичность снимков: {value}")
+        with self.__lock:
+            if value != self.__period:
+                self.__reset()
+            self.__period = value
+
+    def boundary(self, date: datetime) -> datetime:
+        """
+        Возвращает ближайшую границу периода, не позже date.
+
+        Аргументы:
+            date (datetime): Дата
+
+        Возвращает:
+            datetime: Начало дня, месяца или года
+        """
+        if self.__period == "day":
+            return datetime(date.year, date.month, date.day)
+        if self.__period == "month":
+            return datetime(date.year, date.month, 1)
+        return datetime(date.year, 1, 1)
+
+    def next_boundary(self, boundary: datetime) -> datetime:
+        """ Возвращает следующую границу периода после boundary """
+        if self.__period == "day":
+            return datetime.fromordinal(boundary.toordinal() + 1)
+        if self.__period == "month":
+            if boundary.month == 12:
+                return datetime(boundary.year + 1, 1, 1)
+            return datetime(boundary.year, boundary.month + 1, 1)
+        return datetime(boundary.year + 1, 1, 1)
+
+    def opening(self, transactions: date_index, storage_code: str, date: datetime, convert) -> tuple:
+        """
+        Находит ближайший к date снимок склада, при необходимости построив его.
+
+        Аргументы:
+            transactions (date_index): Транзакции склада, отсортированные по дате
+            storage_code (str): Уникальный код склада
+            date (datetime): Дата, на которую нужен остаток
+            convert (callable): Функция transaction -> (код номенклатуры, количество)
+
+        Возвращает:
+            tuple: (остатки {код номенклатуры: количество} на границе,
+                    позиция в transactions первой транзакции после снимка)
+        """
+        target = self.boundary(date)
+        with self.__lock:
+            # Остатки снимков посчитаны в единицах строк ОСВ - после изменения единиц они устарели
+            if self.__version != measure_conversion.version():
+                self.__reset()
+                self.__version = measure_conversion.version()
+            generation = (self.__epoch, self.__generations.get(storage_code, 0))
+            boundaries, balances = self.__storages.get(storage_code, ([], {}))
+
+            # Последний сохраненный снимок не позже целевой границы
+            position = bisect_right(boundaries, target)
+            current = boundaries[position - 1] if position > 0 else None
+            totals = dict(balances[current]) if position > 0 else {}
+            stored = set(boundaries[position:])
+
+        if current is None:
+            if len(transactions) == 0 or transactions.dates[0] >= target:
+                # До целевой границы транзакций нет
+                return {}, transactions.lower(target)
+            current = self.boundary(transactions.dates[0])
+
+        # Достраиваем снимки по каждой границе до целевой
+        created = []
+        items = transactions.items
+        offset = transactions.lower(current)
+        while current < target:
+            current = self.next_boundary(current)
+            end = transactions.lower(current)
+            for transaction in items[offset:end]:
+                code, quantity = convert(transaction)
+                totals[code] = totals.get(code, 0.0) + quantity
+            offset = end
+            if current not in stored:
+                created.append((current, dict(totals)))
+
+        with self.__lock:
+            # Запись задним числом во время чтения сбросила снимки - построенные устарели
+            if len(created) > 0 and generation == (self.__epoch, self.__generations.get(storage_code, 0)):
+                boundaries, balances = self.__storages.setdefault(storage_code, ([], {}))
+                for boundary, values in created:
+                    if boundary not in balances:
+                        boundaries.insert(bisect_left(boundaries, boundary), boundary)
+                        balances[boundary] = values
+
+        return totals, offset
+
+    def invalidate(self, storage_code: str, date: datetime):
+        """
+        Сбрасывает снимки склада, на которые влияет транзакция с датой date.
+
+        Аргументы:
+            storage_code (str): Уникальный код склада
+            date (datetime): Дата добавленной или удаленной транзакции
+        """
+        with self.__lock:
+            self.__generations[storage_code] = self.__generations.get(storage_code, 0) + 1
+            if storage_code not in self.__storages:
+                return
+            boundaries, balances = self.__storages[storage_code]
+            position = bisect_right(boundaries, date)
+            for boundary in boundaries[position:]:
+                del balances[boundary]
+            del boundaries[position:]
+
+    def clear(self):
+        """ Сбрасывает все снимки """
+        with self.__lock:
+            self.__reset()
+
+    def count(self, storage_code: str) -> int:
+        """ Возвращает количество сохраненных снимков склада """
+        with self.__lock:
+            if storage_code not in self.__storages:
+                return 0
+            return len(self.__storages[storage_code][0])
+
+    def __reset(self):
+        """ Сбрасывает все снимки (под блокировкой) """
+        self.__storages.clear()
+        self.__epoch += 1
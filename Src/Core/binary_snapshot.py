@@ -0,0 +1,253 @@
+import json
+import mmap
+import struct
+from datetime import datetime, timedelta
+from Src.Core.compressed_stream import compressed_stream
+from Src.Core.validator import argument_exception, operation_exception, validator
+from Src.Models.transaction_model import transaction_model
+
+class binary_snapshot:
+    """
+    Двоичный снимок данных репозитория с чтением через mmap.
+
+    Формат файла:
+        - заголовок: сигнатура, размер записи, количество транзакций, длина раздела справочников;
+        - раздел справочников: компактный JSON {"data": справочники без транзакций,
+          "codes": коды связанных объектов транзакций, "names": наименования транзакций};
+        - записи транзакций фиксированной длины (RECORD), одна за другой.
+
+    Запись транзакции: код (до 32 байт UTF-8), номера склада, номенклатуры и единицы
+    в списке codes, номер наименования в списке names, количество (double)
+    и дата в микросекундах от 1970-01-01 (int64).
+
+    Особенности:
+        - Файл отображается в память, транзакции декодируются из отображения по запросу:
+          по номеру (transaction) или перебором (transactions), без проверок сеттеров
+          (transaction_model.create_trusted).
+        - Сжатый снимок (compressed_stream) отобразить в память нельзя: он распаковывается
+          в память целиком при открытии, поэтому для быстрого открытия снимок не сжимают.
+        - Справочники восстанавливаются через convert_factory.convert_back.
+    """
+
+    MAGIC = b"PTSNAP01"
+    HEADER = struct.Struct("<8sIQQ")
+    RECORD = struct.Struct("<32sIIIIdq")
+    # Номер отсутствующей ссылки
+    NONE = 0xFFFFFFFF
+    EPOCH = datetime(1970, 1, 1)
+
+    def __init__(self, filename: str):
+        """
+        Открывает снимок и отображает его в память.
+
+        Аргументы:
+            filename (str): Имя файла снимка
+
+        Ошибки:
+            operation_exception: Если файл не является двоичным снимком
+        """
+        validator.validate(filename, str)
+        self.__map = None
+        self.__file = None
+        try:
+            if compressed_stream.is_compressed(filename):
+                self.__map = compressed_stream.read(filename)
+            else:
+                self.__file = open(filename, "rb")
+                self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, record_size, count, meta_length = binary_snapshot.HEADER.unpack_from(self.__map, 0)
+        except (ValueError, struct.error, operation_exception):
+            # Пустой файл или файл короче заголовка
+            magic, record_size, count, meta_length = None, 0, 0, 0
+        if magic != binary_snapshot.MAGIC or record_size != binary_snapshot.RECORD.size:
+            self.close()
+            raise operation_exception(f"Файл {filename} не является двоичным снимком!")
+
+        self.__count = count
+        self.__meta_offset = binary_snapshot.HEADER.size
+        self.__records_offset = self.__meta_offset + meta_length
+        self.__meta = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        """ Количество транзакций в снимке """
+        return self.__count
+
+    def close(self):
+        """ Закрывает отображение и файл """
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+        self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+
+    def references(self) -> dict:
+        """
+        Возвращает справочники снимка в формате выгрузки (без транзакций).
+
+        Возвращает:
+            dict: {ключ коллекции: {ключ: словарь DTO}}
+        """
+        return self.__load_meta()["data"]
+
+    def transaction(self, position: int, cache: dict):
+        """
+        Декодирует одну транзакцию по номеру записи.
+
+        Аргументы:
+            position (int): Номер записи (0 <= position < len(snapshot))
+            cache (dict): Связанные модели по уникальному коду (склады, номенклатура, единицы)
+
+        Возвращает:
+            transaction_model: Транзакция
+        """
+        validator.validate(position, int)
+        if position < 0 or position >= self.__count:
+            raise argument_exception(f"Некорректный номер записи: {position}")
+        meta = self.__load_meta()
+        offset = self.__records_offset + position * binary_snapshot.RECORD.size
+        return binary_snapshot.__decode(binary_snapshot.RECORD.unpack_from(self.__map, offset), meta, cache)
+
+    def transactions(self, cache: dict):
+        """
+        Перебирает транзакции снимка, декодируя их по одной.
+
+        Аргументы:
+            cache (dict): Связанные модели по уникальному коду (склады, номенклатура, единицы)
+
+        Возвращает:
+            Generator[transaction_model]: Транзакции в порядке записи
+        """
+        meta = self.__load_meta()
+        unpack = binary_snapshot.RECORD.unpack_from
+        size = binary_snapshot.RECORD.size
+        end = self.__records_offset + self.__count * size
+        for offset in range(self.__records_offset, end, size):
+            yield binary_snapshot.__decode(unpack(self.__map, offset), meta, cache)
+
+    def records(self):
+        """
+        Перебирает транзакции снимка в формате выгрузки (словари DTO) без создания моделей.
+        Используется, когда к снимку нужно применить журнал изменений.
+
+        Возвращает:
+            Generator[dict]: Словари DTO транзакций в порядке записи
+        """
+        meta = self.__load_meta()
+        codes = meta["codes"]
+        names = meta["names"]
+        unpack = binary_snapshot.RECORD.unpack_from
+        size = binary_snapshot.RECORD.size
+        end = self.__records_offset + self.__count * size
+        for offset in range(self.__records_offset, end, size):
+            code, storage, nomenclature, measure, name, quantity, date = unpack(self.__map, offset)
+            yield {
+                "date": binary_snapshot.EPOCH + timedelta(microseconds=date),
+                "id": code.rstrip(b"\0").decode("utf-8"),
+                "measure_id": None if measure == binary_snapshot.NONE else codes[measure],
+                "name": names[name],
+                "nomenclature_id": None if nomenclature == binary_snapshot.NONE else codes[nomenclature],
+                "quantity": quantity,
+                "storage_id": None if storage == binary_snapshot.NONE else codes[storage]
+            }
+
+    @staticmethod
+    def is_snapshot(filename: str) -> bool:
+        """
+        Проверяет по сигнатуре, что файл является двоичным снимком.
+        """
+        validator.validate(filename, str)
+        try:
+            if compressed_stream.is_compressed(filename):
+                return compressed_stream.head(filename)[:len(binary_snapshot.MAGIC)] == binary_snapshot.MAGIC
+            with open(filename, "rb") as f:
+                return f.read(len(binary_snapshot.MAGIC)) == binary_snapshot.MAGIC
+        except (OSError, operation_exception):
+            return False
+
+    @staticmethod
+    def write(references: dict, transactions, filename: str):
+        """
+        Записывает двоичный снимок в файл.
+
+        Аргументы:
+            references (dict): Справочники в формате выгрузки (convert_factory.convert), без транзакций
+            transactions (Iterable[transaction_model]): Транзакции
+            filename (str): Имя файла
+
+        Ошибки:
+            operation_exception: Если код транзакции длиннее 32 байт
+        """
+        validator.validate(filename, str)
+        with open(filename, "wb") as f:
+            binary_snapshot.write_to(references, transactions, f)
+
+    @staticmethod
+    def write_to(references: dict, transactions, stream):
+        """
+        Записывает двоичный снимок в открытый двоичный поток.
+
+        Аргументы:
+            references (dict): Справочники в формате выгрузки (convert_factory.convert), без транзакций
+            transactions (Iterable[transaction_model]): Транзакции
+            stream: Поток, открытый на запись в двоичном режиме
+
+        Ошибки:
+            operation_exception: Если код транзакции длиннее 32 байт
+        """
+        validator.validate(references, dict)
+        codes = {}
+        names = {}
+        records = bytearray()
+        count = 0
+        for transaction in transactions:
+            records += binary_snapshot.__encode(transaction, codes, names)
+            count += 1
+
+        meta = json.dumps(
+            {"data": references, "codes": list(codes), "names": list(names)},
+            ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        stream.write(binary_snapshot.HEADER.pack(binary_snapshot.MAGIC, binary_snapshot.RECORD.size, count, len(meta)))
+        stream.write(meta)
+        stream.write(records)
+
+    @staticmethod
+    def __encode(transaction, codes: dict, names: dict) -> bytes:
+        """ Упаковывает транзакцию в запись, пополняя таблицы кодов и наименований """
+        code = transaction.unique_code.encode("utf-8")
+        if len(code) > 32:
+            raise operation_exception(f"Код транзакции {transaction.unique_code} длиннее 32 байт!")
+        references = []
+        for item in (transaction.storage, transaction.nomenclature, transaction.measure):
+            if item is None:
+                references.append(binary_snapshot.NONE)
+            else:
+                references.append(codes.setdefault(item.unique_code, len(codes)))
+        name = names.setdefault(transaction.name, len(names))
+        date = (transaction.date - binary_snapshot.EPOCH) // timedelta(microseconds=1)
+        return binary_snapshot.RECORD.pack(code, *references, name, float(transaction.quantity), date)
+
+    @staticmethod
+    def __decode(record: tuple, meta: dict, cache: dict):
+        """ Восстанавливает транзакцию из записи (значения проверены при записи снимка) """
+        code, storage, nomenclature, measure, name, quantity, date = record
+        codes = meta["codes"]
+        none = binary_snapshot.NONE
+        return transaction_model.create_trusted(
+            code.rstrip(b"\0").decode("utf-8"), meta["names"][name],
+            None if storage == none else cache.get(codes[storage]),
+            None if nomenclature == none else cache.get(codes[nomenclature]),
+            None if measure == none else cache.get(codes[measure]),
+            quantity, binary_snapshot.EPOCH + timedelta(microseconds=date))
+
+    def __load_meta(self) -> dict:
+        """ Декодирует раздел справочников при первом обращении """
+        if self.__meta is None:
+            raw = self.__map[self.__meta_offset:self.__records_offset]
+            self.__meta = json.loads(raw.decode("utf-8"))
+        return self.__meta
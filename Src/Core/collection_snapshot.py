@@ -0,0 +1,71 @@
+from itertools import islice
+
+class collection_snapshot:
+    """
+    Снимок коллекции в памяти (versioned_collection) с копированием при записи.
+
+    Создание снимка ничего не копирует: пока коллекция не меняется, перебор
+    читает ее словарь напрямую. Перед первым изменением коллекция передает
+    открытым снимкам копию своего содержимого (freeze), и перебор продолжается
+    по копии с той же позиции. Копию, таким образом, делает писатель и только
+    если запись пришлась на время перебора.
+
+    Особенности:
+        - Перебор читает словарь коллекции пакетами по BATCH пар под блокировкой
+          коллекции, которую держат и ее изменения: поток перебора может
+          отличаться от потока, создавшего снимок.
+        - Модели в снимке общие с коллекцией: изменение модели «на месте»
+          может попасть в перебор.
+        - После перебора снимок закрывается (close), чтобы писатели больше
+          не копировали для него коллекцию.
+    """
+
+    # Количество пар, читаемых из словаря коллекции под одной блокировкой
+    BATCH = 1000
+
+    def __init__(self, source: dict, lock, release):
+        """
+        Аргументы:
+            source (dict): Словарь коллекции на момент снимка
+            lock: Блокировка коллекции, под которой выполняются ее изменения
+            release (callable): Функция release(снимок), отключающая снимок от коллекции
+        """
+        self.__source = source
+        self.__lock = lock
+        self.__release = release
+        self.__frozen = None
+        self.__length = len(source)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def freeze(self, items: dict):
+        """ Запоминает копию коллекции перед ее изменением (вызывается под блокировкой коллекции) """
+        self.__frozen = items
+
+    def items(self):
+        """ Перебирает пары (ключ, модель) снимка в порядке добавления """
+        position = 0
+        source = iter(dict.items(self.__source))
+        while True:
+            with self.__lock:
+                frozen = self.__frozen
+                if frozen is None:
+                    batch = list(islice(source, collection_snapshot.BATCH))
+            if frozen is not None:
+                # Копия больше не меняется: остаток читается без блокировки
+                yield from islice(frozen.items(), position, None)
+                return
+            yield from batch
+            position += len(batch)
+            if len(batch) < collection_snapshot.BATCH:
+                return
+
+    def values(self):
+        """ Перебирает модели снимка в порядке добавления """
+        for _, item in self.items():
+            yield item
+
+    def close(self):
+        """ Отключает снимок от коллекции """
+        self.__release(self)
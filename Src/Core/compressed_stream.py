@@ -0,0 +1,241 @@
+import bz2
+import io
+import lzma
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from Src.Core.validator import argument_exception, operation_exception, validator
+
+class compressed_stream:
+    """
+    Сжатый файл из независимо сжатых частей.
+
+    Формат файла:
+        - заголовок: сигнатура и номер алгоритма сжатия (HEADER);
+        - части одна за другой: длина сжатых данных, длина исходных данных (FRAME)
+          и сжатые данные. Каждая часть - самостоятельный поток gzip, bz2 или xz.
+
+    Части сжимаются и распаковываются в пуле потоков: zlib, bz2 и lzma освобождают
+    GIL на время работы, поэтому потоки выполняются параллельно. Количество частей
+    в памяти при записи ограничено удвоенным количеством потоков.
+
+    Особенности:
+        - Сжатый файл распознается по сигнатуре (is_compressed), поэтому
+          загрузка не зависит от текущей настройки сжатия.
+        - open возвращает поток на чтение как для сжатого, так и для обычного файла.
+    """
+
+    MAGIC = b"PTZCHNK1"
+    HEADER = struct.Struct("<8sB")
+    FRAME = struct.Struct("<II")
+    # Размер исходных данных одной части
+    CHUNK = 4 * 1024 * 1024
+    # Количество потоков сжатия и распаковки
+    WORKERS = min(8, os.cpu_count() or 1)
+
+    # Алгоритм: (номер в заголовке, сжатие, распаковка)
+    __codecs = {
+        "gzip": (1, lambda data: zlib.compress(data, 6, 31), lambda data: zlib.decompress(data, 31)),
+        "bz2": (2, lambda data: bz2.compress(data, 9), bz2.decompress),
+        "lzma": (3, lambda data: lzma.compress(data, preset=6), lzma.decompress)
+    }
+
+    @staticmethod
+    def codecs() -> list:
+        """ Поддерживаемые алгоритмы сжатия """
+        return list(compressed_stream.__codecs.keys())
+
+    @staticmethod
+    def writer(stream, codec: str, chunk_size: int = None, workers: int = None) -> 'compressed_writer':
+        """
+        Создает поток записи сжатых частей поверх открытого двоичного потока.
+
+        Аргументы:
+            stream: Поток, открытый на запись в двоичном режиме (не закрывается writer)
+            codec (str): Алгоритм сжатия ("gzip", "bz2" или "lzma")
+            chunk_size (int): Размер исходных данных одной части (по умолчанию CHUNK)
+            workers (int): Количество потоков сжатия (по умолчанию WORKERS)
+
+        Возвращает:
+            compressed_writer: Поток записи, close() дописывает оставшиеся части
+        """
+        validator.validate(codec, str)
+        if codec not in compressed_stream.__codecs:
+            raise argument_exception(f"Неподдерживаемый алгоритм сжатия: {codec}")
+        number, compress, _ = compressed_stream.__codecs[codec]
+        return compressed_writer(
+            stream, number, compress,
+            compressed_stream.CHUNK if chunk_size is None else chunk_size,
+            compressed_stream.WORKERS if workers is None else workers)
+
+    @staticmethod
+    def is_compressed(filename: str) -> bool:
+        """
+        Проверяет по сигнатуре, что файл записан compressed_stream.
+        """
+        validator.validate(filename, str)
+        try:
+            with open(filename, "rb") as f:
+                return f.read(len(compressed_stream.MAGIC)) == compressed_stream.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def read(filename: str, workers: int = None) -> bytes:
+        """
+        Распаковывает сжатый файл, части распаковываются параллельно.
+
+        Аргументы:
+            filename (str): Имя файла
+            workers (int): Количество потоков распаковки (по умолчанию WORKERS)
+
+        Возвращает:
+            bytes: Исходные данные
+
+        Ошибки:
+            operation_exception: Если файл не является сжатым, обрезан или поврежден
+        """
+        with open(filename, "rb") as f:
+            decompress = compressed_stream.__decompressor(f, filename)
+            frames = list(compressed_stream.__frames(f, filename))
+        workers = compressed_stream.WORKERS if workers is None else workers
+        try:
+            if workers <= 1 or len(frames) <= 1:
+                return b"".join(decompress(frame) for frame in frames)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return b"".join(executor.map(decompress, frames))
+        except (zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+            raise operation_exception(f"Файл {filename} поврежден: {e}")
+
+    @staticmethod
+    def head(filename: str) -> bytes:
+        """
+        Распаковывает только первую часть файла (например, для проверки сигнатуры содержимого).
+        """
+        with open(filename, "rb") as f:
+            decompress = compressed_stream.__decompressor(f, filename)
+            for frame in compressed_stream.__frames(f, filename):
+                try:
+                    return decompress(frame)
+                except (zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+                    raise operation_exception(f"Файл {filename} поврежден: {e}")
+        return b""
+
+    @staticmethod
+    def open(filename: str):
+        """
+        Открывает файл на чтение в двоичном режиме.
+        Сжатый файл распаковывается целиком в память.
+
+        Аргументы:
+            filename (str): Имя файла
+
+        Возвращает:
+            Поток на чтение с исходными данными файла
+        """
+        validator.validate(filename, str)
+        if compressed_stream.is_compressed(filename):
+            return io.BytesIO(compressed_stream.read(filename))
+        return open(filename, "rb")
+
+    @staticmethod
+    def __decompressor(f, filename: str):
+        """ Читает заголовок и возвращает функцию распаковки частей """
+        header = f.read(compressed_stream.HEADER.size)
+        if len(header) < compressed_stream.HEADER.size:
+            raise operation_exception(f"Файл {filename} не является сжатым файлом данных!")
+        magic, number = compressed_stream.HEADER.unpack(header)
+        codec = next((item for item in compressed_stream.__codecs.values() if item[0] == number), None)
+        if magic != compressed_stream.MAGIC or codec is None:
+            raise operation_exception(f"Файл {filename} не является сжатым файлом данных!")
+        return codec[2]
+
+    @staticmethod
+    def __frames(f, filename: str):
+        """ Перебирает сжатые части файла """
+        while True:
+            header = f.read(compressed_stream.FRAME.size)
+            if len(header) == 0:
+                return
+            if len(header) < compressed_stream.FRAME.size:
+                raise operation_exception(f"Файл {filename} обрезан!")
+            size, _ = compressed_stream.FRAME.unpack(header)
+            data = f.read(size)
+            if len(data) < size:
+                raise operation_exception(f"Файл {filename} обрезан!")
+            yield data
+
+
+class compressed_writer(io.BufferedIOBase):
+    """
+    Поток записи сжатого файла (compressed_stream).
+    Данные накапливаются до размера части, полные части сжимаются в пуле потоков
+    и записываются в исходном порядке. Создается через compressed_stream.writer.
+    """
+
+    def __init__(self, stream, number: int, compress, chunk_size: int, workers: int):
+        super().__init__()
+        validator.validate(chunk_size, int)
+        validator.validate(workers, int)
+        if chunk_size < 1 or workers < 1:
+            raise argument_exception("Размер части и количество потоков должны быть положительными!")
+        self.__stream = stream
+        self.__compress = compress
+        self.__chunk_size = chunk_size
+        self.__workers = workers
+        self.__buffer = bytearray()
+        self.__pending = deque()
+        self.__executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        stream.write(compressed_stream.HEADER.pack(compressed_stream.MAGIC, number))
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        """ Добавляет данные, полные части отправляются на сжатие """
+        self.__buffer += data
+        size = self.__chunk_size
+        if len(self.__buffer) >= size:
+            view = memoryview(self.__buffer)
+            count = len(self.__buffer) // size
+            chunks = [bytes(view[position * size:(position + 1) * size]) for position in range(count)]
+            view.release()
+            del self.__buffer[:count * size]
+            for chunk in chunks:
+                self.__submit(chunk)
+        return len(data)
+
+    def close(self):
+        """ Сжимает оставшиеся данные и дописывает все части. Исходный поток не закрывается """
+        if self.closed:
+            return
+        try:
+            if len(self.__buffer) > 0:
+                self.__submit(bytes(self.__buffer))
+                self.__buffer = bytearray()
+            while len(self.__pending) > 0:
+                self.__write_next()
+        finally:
+            if self.__executor is not None:
+                self.__executor.shutdown(cancel_futures=True)
+            super().close()
+
+    def __submit(self, chunk: bytes):
+        """ Отправляет часть на сжатие, ограничивая количество частей в памяти """
+        if self.__executor is None:
+            self.__write_frame(self.__compress(chunk), len(chunk))
+            return
+        self.__pending.append((self.__executor.submit(self.__compress, chunk), len(chunk)))
+        while len(self.__pending) > 2 * self.__workers:
+            self.__write_next()
+
+    def __write_next(self):
+        """ Дожидается сжатия самой ранней части и записывает ее """
+        future, size = self.__pending.popleft()
+        self.__write_frame(future.result(), size)
+
+    def __write_frame(self, data: bytes, size: int):
+        self.__stream.write(compressed_stream.FRAME.pack(len(data), size))
+        self.__stream.write(data)
@@ -0,0 +1,137 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from operator import itemgetter
+
+class date_index:
+    """
+    Упорядоченный по дате список элементов.
+
+    Хранит два параллельных массива: отсортированные даты и элементы.
+    Вставка сохраняет порядок (элементы с одинаковой датой идут в порядке добавления),
+    а границы периода находятся бинарным поиском за O(log n).
+
+    По запросу (columns) ведется третий параллельный массив - значения, извлеченные
+    из элементов (например, кортежи для передачи в дочерние процессы). После первого
+    построения он поддерживается вставкой и удалением вместе с элементами.
+    """
+
+    # Пакет меньше индекса в столько раз вставляется по одному, а не слиянием
+    MERGE_RATIO = 32
+
+    def __init__(self):
+        self.__dates: list = []
+        self.__items: list = []
+        self.__rows: list = None
+        self.__extract = None
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    @property
+    def dates(self) -> list:
+        """Возвращает отсортированный список дат"""
+        return self.__dates
+
+    @property
+    def items(self) -> list:
+        """Возвращает элементы в порядке возрастания даты"""
+        return self.__items
+
+    def columns(self, extract) -> list:
+        """
+        Возвращает значения extract(элемент) в порядке возрастания даты.
+        Список строится при первом вызове и дальше поддерживается вместе с индексом.
+
+        Аргументы:
+            extract (callable): Функция элемент -> значение
+
+        Возвращает:
+            list: Значения, параллельные items
+        """
+        if self.__rows is None or self.__extract is not extract:
+            self.__extract = extract
+            self.__rows = [extract(item) for item in self.__items]
+        return self.__rows
+
+    def insert(self, date: datetime, item):
+        """
+        Добавляет элемент с сохранением сортировки по дате.
+
+        Аргументы:
+            date (datetime): Дата элемента
+            item: Элемент (например, transaction_model)
+        """
+        position = bisect_right(self.__dates, date)
+        self.__dates.insert(position, date)
+        self.__items.insert(position, item)
+        if self.__rows is not None:
+            self.__rows.insert(position, self.__extract(item))
+
+    def extend(self, pairs: list):
+        """
+        Добавляет пакет элементов с одной сортировкой вместо вставки по одному.
+        Порядок элементов с одинаковой датой такой же, как при последовательной вставке.
+
+        Аргументы:
+            pairs (list): Список пар (дата, элемент) в порядке добавления
+        """
+        if len(pairs) == 0:
+            return
+        pairs = sorted(pairs, key=itemgetter(0))
+        # Пакет не раньше последнего элемента (например, текущие операции) дописывается в конец
+        if len(self.__dates) == 0 or pairs[0][0] >= self.__dates[-1]:
+            self.__dates.extend(map(itemgetter(0), pairs))
+            self.__items.extend(map(itemgetter(1), pairs))
+            if self.__rows is not None:
+                self.__rows.extend([self.__extract(item) for _, item in pairs])
+            return
+        # Небольшой пакет вставляется по одному: поиск позиции за O(log n) дешевле слияния всего индекса
+        if len(pairs) * date_index.MERGE_RATIO < len(self.__dates):
+            for date, item in pairs:
+                self.insert(date, item)
+            return
+        # Сортировка устойчива: существующие элементы остаются раньше новых с той же датой,
+        # а слияние двух упорядоченных серий выполняется за линейное время
+        merged = list(zip(self.__dates, self.__items))
+        merged.extend(pairs)
+        merged.sort(key=itemgetter(0))
+        self.__dates[:] = map(itemgetter(0), merged)
+        self.__items[:] = map(itemgetter(1), merged)
+        # После слияния значения строятся заново при следующем запросе
+        self.__rows = None
+
+    def remove(self, date: datetime, item) -> bool:
+        """
+        Удаляет элемент, добавленный с указанной датой.
+
+        Аргументы:
+            date (datetime): Дата, с которой элемент был добавлен
+            item: Удаляемый элемент
+
+        Возвращает:
+            bool: True если элемент найден и удален
+        """
+        for position in range(self.lower(date), self.upper(date)):
+            if self.__items[position] is item:
+                del self.__dates[position]
+                del self.__items[position]
+                if self.__rows is not None:
+                    del self.__rows[position]
+                return True
+        return False
+
+    def lower(self, date: datetime) -> int:
+        """Позиция первого элемента с датой >= date"""
+        return bisect_left(self.__dates, date)
+
+    def upper(self, date: datetime) -> int:
+        """Позиция первого элемента с датой > date"""
+        return bisect_right(self.__dates, date)
+
+    def before(self, date: datetime) -> list:
+        """Возвращает элементы с датой строго меньше date"""
+        return self.__items[:self.lower(date)]
+
+    def between(self, start_date: datetime, end_date: datetime) -> list:
+        """Возвращает элементы с датой в диапазоне [start_date, end_date]"""
+        return self.__items[self.lower(start_date):self.upper(end_date)]
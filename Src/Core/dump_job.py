@@ -0,0 +1,340 @@
+import io
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.binary_snapshot import binary_snapshot
+from Src.Core.compressed_stream import compressed_stream
+from Src.Core.sharded_store import sharded_store
+from Src.Core.validator import argument_exception, validator
+from Src.reposity import reposity
+
+class dump_job:
+    """
+    Задание выгрузки данных репозитория в файл.
+
+    При создании задание берет снимки коллекций (snapshot): коллекция в памяти
+    копируется только перед изменением во время выгрузки, транзакции в базе SQLite
+    читаются в транзакции чтения. Поток, создавший задание, ничего не копирует,
+    а последующие вставки и удаления в репозитории в выгрузку не попадают.
+    Запись выполняется во временный
+    файл рядом с целевым, который затем атомарно переименовывается (os.replace):
+    читатели видят либо прежний файл, либо новый целиком.
+
+    Особенности:
+        - run() выполняет выгрузку в текущем потоке, start() - в фоновом.
+        - Формат "sharded" записывает каталог с файлом на каждую коллекцию
+          (sharded_store): файлы коллекций получают новые имена, манифест заменяется последним.
+        - При сжатии (compression) файл записывается частями, которые сжимаются
+          параллельно (compressed_stream); манифест каталога не сжимается.
+        - Ход выполнения (progress) - доля преобразованных моделей от 0 до 1.
+        - Модели в снимке общие с репозиторием: изменение модели «на месте»
+          во время выгрузки может попасть в файл.
+
+    Свойства:
+        id (str): Идентификатор задания
+        status (str): "pending", "running", "done" или "failed"
+    """
+
+    # Кодировщик выгрузки JSON, общий для всех заданий (не хранит состояния между вызовами)
+    __encoder = json.JSONEncoder(ensure_ascii=False, indent=2, default=str)
+
+    # Количество моделей, кодируемых за один вызов при записи JSON
+    BATCH = 1000
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    @staticmethod
+    def formats() -> list:
+        """ Поддерживаемые форматы выгрузки """
+        return ["json", "binary", "sharded"]
+
+    @staticmethod
+    def compressions() -> list:
+        """ Поддерживаемые алгоритмы сжатия выгрузки ("none" - без сжатия) """
+        return ["none"] + compressed_stream.codecs()
+
+    def __init__(self, data: dict, filename: str, dump_format: str = "json", compression: str = "none"):
+        """
+        Аргументы:
+            data (dict): Данные репозитория {ключ коллекции: {ключ: модель}}
+            filename (str): Имя файла выгрузки
+            dump_format (str): "json", "binary" или "sharded" (filename - каталог данных)
+            compression (str): "none" (по умолчанию), "gzip", "bz2" или "lzma"
+        """
+        validator.validate(data, dict)
+        validator.validate(filename, str)
+        validator.validate(dump_format, str)
+        validator.validate(compression, str)
+        if dump_format not in dump_job.formats():
+            raise argument_exception(f"Неподдерживаемый формат выгрузки: {dump_format}")
+        if compression not in dump_job.compressions():
+            raise argument_exception(f"Неподдерживаемый алгоритм сжатия: {compression}")
+        # Каталог с чужими файлами не перезаписывается
+        if dump_format == "sharded" and not sharded_store(filename).writable():
+            raise argument_exception(f"Каталог {filename} не пуст и не содержит выгрузку данных")
+
+        self.__id = uuid.uuid4().hex
+        self.__data = {}
+        try:
+            for key, items in data.items():
+                self.__data[key] = dump_job.__snapshot(items)
+        except BaseException:
+            self.__close()
+            raise
+        self.__filename = filename
+        self.__format = dump_format
+        self.__compression = compression
+        self.__total = sum(len(items) for items in self.__data.values())
+        self.__processed = 0
+        self.__status = dump_job.PENDING
+        self.__error = None
+        self.__started = None
+        self.__finished = None
+        self.__thread = None
+
+    @property
+    def id(self) -> str:
+        """Возвращает идентификатор задания"""
+        return self.__id
+
+    @property
+    def status(self) -> str:
+        """Возвращает состояние задания"""
+        return self.__status
+
+    @property
+    def progress(self) -> float:
+        """Возвращает долю преобразованных моделей (от 0 до 1)"""
+        if self.__status == dump_job.DONE:
+            return 1.0
+        return self.__processed / self.__total if self.__total > 0 else 0.0
+
+    @property
+    def filename(self) -> str:
+        """Возвращает имя файла выгрузки"""
+        return self.__filename
+
+    @property
+    def error(self) -> str:
+        """Возвращает текст ошибки или None"""
+        return self.__error
+
+    def run(self):
+        """
+        Выполняет выгрузку в текущем потоке.
+
+        Ошибки:
+            Exception: Ошибка записи (задание при этом переходит в состояние "failed")
+        """
+        self.__status = dump_job.RUNNING
+        self.__started = datetime.now()
+        try:
+            if self.__format == "sharded":
+                self.__write_sharded()
+            elif self.__format == "binary":
+                self.__write_file(self.__filename, self.__write_binary)
+            else:
+                self.__write_file(self.__filename, self.__write_json)
+        except Exception as e:
+            self.__error = str(e)
+            self.__status = dump_job.FAILED
+            raise
+        finally:
+            self.__finished = datetime.now()
+            # Снимки больше не нужны
+            self.__close()
+        self.__status = dump_job.DONE
+
+    def start(self) -> 'dump_job':
+        """
+        Запускает выгрузку в фоновом потоке.
+
+        Возвращает:
+            dump_job: Это же задание
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run_background, daemon=True)
+            self.__thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Ожидает завершения фонового задания.
+
+        Возвращает:
+            bool: True, если задание завершено
+        """
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        return self.__status in [dump_job.DONE, dump_job.FAILED]
+
+    def state(self) -> dict:
+        """
+        Возвращает состояние задания для ответа API.
+
+        Возвращает:
+            dict: Идентификатор, состояние, ход выполнения, файл, ошибка и время
+        """
+        return {
+            "job_id": self.__id,
+            "status": self.__status,
+            "progress": round(self.progress, 4),
+            "filename": self.__filename,
+            "format": self.__format,
+            "compression": self.__compression,
+            "error": self.__error,
+            "started": self.__started.isoformat() if self.__started else None,
+            "finished": self.__finished.isoformat() if self.__finished else None
+        }
+
+    def __run_background(self):
+        """ Выполняет выгрузку в фоновом потоке, ошибка сохраняется в задании """
+        try:
+            self.run()
+        except Exception:
+            pass
+
+    @staticmethod
+    def __snapshot(items):
+        """ Снимок коллекции (snapshot) или копия словаря без поддержки снимков """
+        if hasattr(items, "snapshot"):
+            return items.snapshot()
+        return dict(items)
+
+    def __close(self):
+        """ Закрывает снимки коллекций """
+        data, self.__data = self.__data, {}
+        for items in data.values():
+            if hasattr(items, "close"):
+                items.close()
+
+    def __convert(self, converter: convert_factory, items: dict) -> dict:
+        """ Преобразует модели коллекции с учетом хода выполнения """
+        result = {}
+        for key, item in items.items():
+            result[str(key)] = converter.convert(item)
+            self.__processed += 1
+        return result
+
+    def __write_file(self, filename: str, write):
+        """
+        Записывает файл через временный рядом с ним и атомарно заменяет прежний.
+        При ошибке временный файл удаляется.
+        """
+        temp = f"{filename}.{self.__id}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                if self.__compression == "none":
+                    write(f)
+                else:
+                    with compressed_stream.writer(f, self.__compression) as stream:
+                        write(stream)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, filename)
+        except Exception:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+    def __write_text(self, f, chunks):
+        """ Записывает части текста в двоичный файл в кодировке UTF-8 """
+        writer = io.TextIOWrapper(f, encoding="utf-8")
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.flush()
+        # Файл закрывает вызывающий код
+        writer.detach()
+
+    def __write_json(self, f):
+        """
+        Записывает выгрузку в формате JSON по одной модели за раз.
+        Результат совпадает с json.dump(convert_factory.convert(данные), indent=2),
+        но в памяти одновременно находится только одна преобразованная модель.
+        """
+        self.__write_text(f, self.__encode_json(convert_factory()))
+
+    def __encode_json(self, converter: convert_factory):
+        """ Последовательно формирует части текста выгрузки JSON (пакетами по batch моделей) """
+        if len(self.__data) == 0:
+            yield '{\n  "data": {}\n}'
+            return
+
+        yield '{\n  "data": {'
+        for position, (key, items) in enumerate(self.__data.items()):
+            yield "\n    " if position == 0 else ",\n    "
+            yield dump_job.__encoder.encode(key) + ": "
+            yield from self.__encode_items(converter, items, "\n    ")
+        yield "\n  }\n}"
+
+    def __encode_items(self, converter: convert_factory, items: dict, shift: str):
+        """
+        Формирует текст словаря коллекции {ключ: DTO} пакетами по BATCH моделей.
+        shift - перевод строки с отступом, на который сдвигается словарь.
+        """
+        if len(items) == 0:
+            yield "{}"
+            return
+        yield "{"
+        batch = {}
+        first = True
+        for item_key, item in items.items():
+            batch[str(item_key)] = converter.convert(item)
+            if len(batch) == dump_job.BATCH:
+                yield dump_job.__encode_batch(batch, first, shift)
+                self.__processed += len(batch)
+                batch = {}
+                first = False
+        if len(batch) > 0:
+            yield dump_job.__encode_batch(batch, first, shift)
+            self.__processed += len(batch)
+        yield shift + "}"
+
+    @staticmethod
+    def __encode_batch(batch: dict, first: bool, shift: str) -> str:
+        """
+        Кодирует пакет моделей коллекции как часть ее словаря с отступами выгрузки.
+        Переводы строк внутри строковых значений экранируются, поэтому сдвиг отступа безопасен.
+        """
+        # Без внешних фигурных скобок: "\n  ключ: {...},\n  ключ: {...}"
+        text = dump_job.__encoder.encode(batch)[1:-2]
+        if shift != "\n":
+            text = text.replace("\n", shift)
+        return text if first else "," + text
+
+    def __write_sharded(self):
+        """
+        Записывает каталог данных (sharded_store): файл на каждую коллекцию,
+        затем манифест, ссылающийся на эти файлы.
+        """
+        os.makedirs(self.__filename, exist_ok=True)
+        converter = convert_factory()
+        collections = {}
+        for key, items in self.__data.items():
+            name = f"{key}.{self.__id[:12]}.json"
+            self.__write_file(
+                os.path.join(self.__filename, name),
+                lambda f, items=items: self.__write_text(f, self.__encode_items(converter, items, "\n")))
+            collections[key] = {"file": name, "count": len(items), "compression": self.__compression}
+        sharded_store(self.__filename).commit(collections)
+
+    def __write_binary(self, f):
+        """ Записывает двоичный снимок (binary_snapshot) """
+        converter = convert_factory()
+        references = {
+            key: self.__convert(converter, items)
+            for key, items in self.__data.items() if key != reposity.transaction_key()
+        }
+        binary_snapshot.write_to(references, self.__transactions(), f)
+
+    def __transactions(self):
+        """ Перебирает транзакции снимка с учетом хода выполнения """
+        for item in self.__data.get(reposity.transaction_key(), {}).values():
+            yield item
+            self.__processed += 1
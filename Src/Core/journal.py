@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+from Src.Core.validator import argument_exception, validator
+
+class journal:
+    """
+    Журнал упреждающей записи (write-ahead log) изменений репозитория.
+
+    Каждое изменение коллекции дописывается в конец файла отдельной строкой JSON:
+        {"op": "put", "key": ключ коллекции, "id": ключ модели, "value": словарь DTO}
+        {"op": "delete", "key": ключ коллекции, "id": ключ модели}
+        {"op": "clear", "key": ключ коллекции}
+    Поэтому стоимость сохранения изменения пропорциональна самому изменению,
+    а не объему всех данных.
+
+    Особенности:
+        - Каждая запись сразу передается ОС (flush), fsync выполняется
+          пакетами по sync_every записей, при sync() и при закрытии.
+        - При чтении недописанная последняя строка (сбой во время записи) отбрасывается,
+          а при открытии файл обрезается по последней целой записи, чтобы новые
+          записи не склеились с обрывком строки.
+        - Перед снимком запоминается позиция журнала (position), после записи
+          снимка удаляются только записи до нее (truncate): изменения, записанные
+          во время снимка, остаются в журнале. Так журнал «сворачивается» в снимок.
+        - Каждые compact_every записей вызывается on_compact, который должен
+          запустить запись снимка (не дожидаясь ее в потоке, изменившем коллекцию).
+        - Запись, позиция и сворачивание выполняются под блокировкой журнала:
+          изменения приходят из разных потоков.
+    """
+
+    def __init__(self, filename: str, convert, sync_every: int = 64, compact_every: int = 0, on_compact=None):
+        """
+        Аргументы:
+            filename (str): Имя файла журнала
+            convert (callable): Преобразование модели в словарь DTO (convert_factory.convert)
+            sync_every (int): Количество записей между вызовами fsync
+            compact_every (int): Количество записей, после которого вызывается on_compact (0 - не вызывать)
+            on_compact (callable): Функция без аргументов, запускающая запись полного снимка
+        """
+        validator.validate(filename, str)
+        validator.validate(sync_every, int)
+        validator.validate(compact_every, int)
+        if not callable(convert):
+            raise argument_exception("Преобразование модели должно быть вызываемым объектом!")
+        if sync_every < 1:
+            raise argument_exception("Количество записей между fsync должно быть не меньше 1!")
+        if compact_every < 0:
+            raise argument_exception("Порог сворачивания журнала не может быть отрицательным!")
+
+        self.__filename = filename
+        self.__convert = convert
+        self.__sync_every = sync_every
+        self.__compact_every = compact_every
+        self.__on_compact = on_compact
+        self.__count, self.__size = journal.__repair(filename)
+        self.__file = open(filename, "ab")
+        self.__pending = 0
+        self.__compact_at = self.__count + compact_every
+        self.__lock = threading.Lock()
+
+    @property
+    def filename(self) -> str:
+        """Возвращает имя файла журнала"""
+        return self.__filename
+
+    @property
+    def count(self) -> int:
+        """Возвращает количество записей в журнале"""
+        return self.__count
+
+    def record(self, key: str, item_key, value):
+        """
+        Дописывает изменение коллекции в журнал.
+        Сигнатура совпадает со слушателем versioned_collection (с ключом коллекции впереди).
+
+        Аргументы:
+            key (str): Ключ коллекции репозитория
+            item_key: Ключ модели в коллекции (None - очистка коллекции)
+            value: Записанная модель (None - удаление)
+        """
+        if item_key is None:
+            entry = {"op": "clear", "key": key}
+        elif value is None:
+            entry = {"op": "delete", "key": key, "id": item_key}
+        else:
+            entry = {"op": "put", "key": key, "id": item_key, "value": self.__convert(value)}
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+        with self.__lock:
+            self.__file.write(line)
+            self.__file.flush()
+            self.__count += 1
+            self.__size += len(line)
+            self.__pending += 1
+            if self.__pending >= self.__sync_every:
+                self.__sync()
+            compact = self.__compact_every > 0 and self.__count >= self.__compact_at
+            if compact:
+                # Следующий вызов - не раньше чем через compact_every записей
+                self.__compact_at = self.__count + self.__compact_every
+
+        if compact and self.__on_compact is not None:
+            self.__on_compact()
+
+    def position(self) -> tuple:
+        """
+        Возвращает позицию конца журнала для последующего truncate.
+        Позиция запоминается до снимка данных: записи до нее уже есть в снимке.
+
+        Возвращает:
+            tuple: (размер файла в байтах, количество записей)
+        """
+        with self.__lock:
+            return self.__size, self.__count
+
+    def sync(self):
+        """ Сбрасывает записанные изменения на диск (fsync) """
+        with self.__lock:
+            self.__sync()
+
+    def truncate(self, position: tuple = None):
+        """
+        Удаляет записи, вошедшие в полный снимок.
+
+        Аргументы:
+            position (tuple): Позиция (position()), запомненная перед снимком.
+                              None - удалить все записи
+        """
+        with self.__lock:
+            size, count = (self.__size, self.__count) if position is None else position
+            self.__file.flush()
+            if size >= self.__size:
+                self.__file.truncate(0)
+                os.fsync(self.__file.fileno())
+            elif size > 0:
+                # Записи после позиции переписываются в новый файл, который заменяет журнал
+                with open(self.__filename, "rb") as source:
+                    source.seek(size)
+                    tail = source.read()
+                temporary = self.__filename + ".tmp"
+                with open(temporary, "wb") as target:
+                    target.write(tail)
+                    target.flush()
+                    os.fsync(target.fileno())
+                self.__file.close()
+                os.replace(temporary, self.__filename)
+                self.__file = open(self.__filename, "ab")
+            else:
+                return
+            self.__size = max(self.__size - size, 0)
+            self.__count = max(self.__count - count, 0)
+            self.__pending = 0
+            self.__compact_at = self.__count + self.__compact_every
+
+    def close(self):
+        """ Сбрасывает изменения на диск и закрывает файл """
+        with self.__lock:
+            if not self.__file.closed:
+                self.__sync()
+                self.__file.close()
+
+    def __sync(self):
+        """ fsync под блокировкой журнала """
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__pending = 0
+
+    @staticmethod
+    def read(filename: str):
+        """
+        Читает записи журнала по порядку.
+        Чтение останавливается на первой недописанной или поврежденной строке.
+
+        Аргументы:
+            filename (str): Имя файла журнала
+
+        Возвращает:
+            Generator[dict]: Записи журнала
+        """
+        validator.validate(filename, str)
+        if not os.path.exists(filename):
+            return
+        with open(filename, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+
+    @staticmethod
+    def __repair(filename: str) -> int:
+        """
+        Обрезает файл журнала после последней целой записи (недописанная строка
+        или поврежденная запись и все после нее при чтении все равно отбрасываются).
+
+        Возвращает:
+            tuple: (количество целых записей, их размер в байтах)
+        """
+        if not os.path.exists(filename):
+            return 0, 0
+        count = 0
+        valid = 0
+        with open(filename, "rb+") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                count += 1
+                valid += len(line)
+            if f.seek(0, os.SEEK_END) != valid:
+                f.truncate(valid)
+                f.flush()
+                os.fsync(f.fileno())
+        return count, valid
+
+    @staticmethod
+    def apply(entries, data: dict) -> int:
+        """
+        Применяет записи журнала к данным в формате выгрузки.
+
+        Аргументы:
+            entries (Iterable[dict]): Записи журнала
+            data (dict): {ключ коллекции: {ключ модели: словарь DTO}}, изменяется на месте
+
+        Возвращает:
+            int: Количество примененных записей
+        """
+        validator.validate(data, dict)
+        count = 0
+        for entry in entries:
+            items = data.setdefault(entry["key"], {})
+            if entry["op"] == "put":
+                items[entry["id"]] = entry["value"]
+            elif entry["op"] == "delete":
+                items.pop(entry["id"], None)
+            elif entry["op"] == "clear":
+                items.clear()
+            count += 1
+        return count
@@ -0,0 +1,122 @@
+from Src.Core.validator import operation_exception
+
+class measure_conversion:
+    """
+    Кэшированная таблица пересчета единиц измерения.
+
+    Для каждой единицы (по unique_code) хранит корневую базовую единицу цепочки
+    base_measure и накопленный коэффициент пересчета в нее, например
+    килограмм -> (грамм, 1000). Цепочка разворачивается один раз,
+    после чего пересчет - это один поиск в словаре и одно умножение.
+
+    Особенности:
+        - Таблица заполняется лениво, в нее попадают все единицы разобранной цепочки.
+        - При изменении единицы из таблицы (base_measure, conversion_factor)
+          таблица сбрасывается и увеличивается версия. По версии зависимые
+          кэши (снимки остатков, колоночное хранилище) понимают, что устарели.
+    """
+
+    # unique_code единицы -> (корневая единица, коэффициент пересчета в нее)
+    __table: dict = {}
+    __version: int = 0
+
+    @staticmethod
+    def resolve(measure) -> tuple:
+        """
+        Возвращает корневую базовую единицу и накопленный коэффициент пересчета.
+
+        Аргументы:
+            measure (measure_model): Единица измерения
+
+        Возвращает:
+            tuple: (measure_model, float)
+
+        Ошибки:
+            operation_exception: Если цепочка базовых единиц зациклена
+        """
+        entry = measure_conversion.__table.get(measure.unique_code)
+        if entry is None:
+            entry = measure_conversion.__build(measure)
+        return entry
+
+    @staticmethod
+    def convert(quantity: float, measure, target) -> float:
+        """
+        Пересчитывает количество из одной единицы в другую.
+
+        Аргументы:
+            quantity (float): Количество в единице measure
+            measure (measure_model): Исходная единица
+            target (measure_model): Целевая единица
+
+        Возвращает:
+            float: Количество в единице target. Если у единиц разные корневые
+                   единицы, количество возвращается без пересчета.
+        """
+        root, factor = measure_conversion.resolve(measure)
+        target_root, target_factor = measure_conversion.resolve(target)
+        if root.unique_code != target_root.unique_code:
+            return quantity
+        if target_factor == 1.0:
+            return quantity * factor
+        return quantity * factor / target_factor
+
+    @staticmethod
+    def invalidate(unique_code: str):
+        """
+        Сбрасывает таблицу, если изменилась единица, участвующая в пересчете.
+
+        Аргументы:
+            unique_code (str): Уникальный код измененной единицы
+        """
+        if unique_code in measure_conversion.__table:
+            measure_conversion.__table.clear()
+            measure_conversion.__version += 1
+
+    @staticmethod
+    def version() -> int:
+        """ Возвращает версию таблицы, увеличивается при каждом сбросе """
+        return measure_conversion.__version
+
+    @staticmethod
+    def follow(version: int):
+        """
+        Сбрасывает таблицу, если она построена для другой версии.
+        Используется в дочерних процессах: изменения единиц в основном процессе
+        до них не доходят, поэтому версия передается вместе с заданием.
+
+        Аргументы:
+            version (int): Версия таблицы основного процесса
+        """
+        if version != measure_conversion.__version:
+            measure_conversion.__table.clear()
+            measure_conversion.__version = version
+
+    @staticmethod
+    def __build(measure) -> tuple:
+        """ Разворачивает цепочку base_measure и записывает все ее единицы в таблицу """
+        chain = []
+        visited = set()
+        current = measure
+        while True:
+            entry = measure_conversion.__table.get(current.unique_code)
+            if entry is not None:
+                break
+            if current.unique_code in visited:
+                raise operation_exception(f"Цепочка базовых единиц зациклена на единице {current.name}!")
+            visited.add(current.unique_code)
+            chain.append(current)
+            if current.base_measure is None:
+                entry = (current, 1.0)
+                measure_conversion.__table[current.unique_code] = entry
+                chain.pop()
+                break
+            current = current.base_measure
+
+        # Проходим цепочку от корня к исходной единице, накапливая коэффициент
+        root, factor = entry
+        for item in reversed(chain):
+            factor *= item.conversion_factor
+            entry = (root, factor)
+            measure_conversion.__table[item.unique_code] = entry
+        return entry
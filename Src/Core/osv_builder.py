@@ -1,8 +1,15 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List
 from Src.Core.abstract_model import abstract_model
-from Src.Models.nomenclature_model import nomenclature_model
-from Src.Core.validator import operation_exception, validator
+from Src.Core.balance_snapshots import balance_snapshots
+from Src.Core.date_index import date_index
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.transaction_columns import transaction_columns
+from Src.Models.measure_model import measure_model
+from Src.Core.validator import argument_exception, operation_exception, validator
 from Src.Models.osv_model import osv_model
 from Src.Models.osv_unit_model import osv_unit_model
 from Src.Models.storage_model import storage_model
@@ -14,12 +21,18 @@ class osv_builder(abstract_model):
     __end_date: datetime
     __storage: storage_model
     __rows: List[osv_unit_model]
+    __index: dict
+    # Пул процессов параллельного расчета, общий для всех ведомостей
+    __pool: ProcessPoolExecutor = None
+    __pool_workers: int = 0
+    __pool_lock = threading.Lock()
 
     def __init__(self, osv: osv_model):
         self.__start_date = osv.start_date
         self.__end_date = osv.end_date
         self.__storage = osv.storage
         self.__rows: List[osv_unit_model] = []
+        self.__index = {}
 
     @property
     def start_date(self) -> datetime:
@@ -99,6 +112,29 @@ class osv_builder(abstract_model):
             validator.validate(row, osv_unit_model)
         self.__rows = rows
 
+        # Индекс по уникальному коду номенклатуры строится заново вместе со строками
+        self.__index = {}
+        for row in rows:
+            self.__index.setdefault(row.nomenclature.unique_code, row)
+
+    @staticmethod
+    def convert_quantity(transaction: transaction_model, measure: measure_model) -> float:
+        """
+        Пересчитывает количество транзакции в единицу измерения строки ведомости.
+        
+        Аргументы:
+            transaction (transaction_model): Транзакция
+            measure (measure_model): Единица измерения строки ОСВ
+            
+        Возвращает:
+            float: Количество с учетом коэффициента пересчета
+        """
+        # Строки ведомости ведутся в корневой единице: один поиск в таблице и одно умножение
+        root, factor = measure_conversion.resolve(transaction.measure)
+        if root.unique_code == measure.unique_code:
+            return transaction.quantity * factor
+        return measure_conversion.convert(transaction.quantity, transaction.measure, measure)
+
     def find_row(self, nomenclature):
         """
         Находит строку ведомости по номенклатуре.
@@ -112,83 +148,377 @@ class osv_builder(abstract_model):
         Ошибки:
             operation_exception: Если строка с указанной номенклатурой не найдена
         """
-        # Итерируем по всем строкам ведомости
-        for item in self.__rows:
-            if item.nomenclature == nomenclature:
-                return item
-        # Если не найдено - генерируем исключение
-        raise operation_exception("Элемент ОСВ не найден!")
+        item = self.__index.get(nomenclature.unique_code)
+        if item is None:
+            raise operation_exception("Элемент ОСВ не найден!")
+        return item
+
+    def row_by_code(self, unique_code: str) -> osv_unit_model:
+        """
+        Находит строку ведомости по уникальному коду номенклатуры.
+
+        Аргументы:
+            unique_code (str): Уникальный код номенклатуры
+
+        Возвращает:
+            osv_unit_model: Строка ведомости или None, если ее нет
+        """
+        return self.__index.get(unique_code)
 
-    def generate_rows(self, transactions: list[transaction_model], nomenclatures: list[nomenclature_model]):
+    def generate_rows(self, transactions, nomenclatures):
         """
         Генерирует строки ведомости на основе транзакций и справочника номенклатур.
         
+        Все показатели (начальный остаток, приход, расход, конечный остаток)
+        считаются за один проход по транзакциям. Строка ведомости находится
+        по хеш-индексу unique_code -> строка, поэтому стоимость построения
+        линейна по числу транзакций.
+        
         Аргументы:
-            transactions (list[transaction_model]): Список всех транзакций
-            nomenclatures (list[nomenclature_model]): Справочник номенклатур
+            transactions (dict|list[transaction_model]): Транзакции
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
         """
-        # Инициализация строк ОСВ: создаем по одной строке для каждой номенклатуры с начальными значениями
-        self.__rows = [
-            osv_unit_model.create_default(nomenclature, nomenclature.measure.base_measure or nomenclature.measure)
-            for nomenclature in dict(nomenclatures).values()
-        ]
+        osv_builder.generate_batch([self], transactions, nomenclatures)
 
-        # Обработка транзакций до начала периода для определения начальных остатков
-        for transaction in transactions:
-            # Проверка, относится ли транзакция к правильному складу и к периоду до start_date
-            is_correct_storage = transaction.storage.unique_code == self.__storage.unique_code
-            is_before_start_date = transaction.date < self.__start_date
+    @staticmethod
+    def generate_batch(builders: list, transactions, nomenclatures):
+        """
+        Генерирует строки ведомостей нескольких складов за один проход по транзакциям.
+        
+        Транзакции группируются по складу через словарь unique_code склада -> ведомость,
+        поэтому стоимость не зависит от количества складов.
+        
+        Аргументы:
+            builders (list[osv_builder]): Ведомости, по одной на склад
+            transactions (dict|list[transaction_model]): Транзакции
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
             
-            if not (is_correct_storage and is_before_start_date):
+        Ошибки:
+            operation_exception: Если для одного склада передано несколько ведомостей
+        """
+        validator.validate(builders, list)
+        # unique_code склада -> (ведомость, накопители [начальный остаток, приход, расход])
+        groups = {}
+        for builder in builders:
+            validator.validate(builder, osv_builder)
+            storage_code = builder.storage.unique_code
+            if storage_code in groups:
+                raise operation_exception(f"Ведомость склада {builder.storage.name} передана повторно!")
+            builder.__prepare_rows(nomenclatures)
+            groups[storage_code] = (builder, {code: [0.0, 0.0, 0.0] for code in builder.__index})
+
+        for transaction in osv_builder.__values(transactions):
+            # Транзакции других складов и после окончания периода не влияют на отчет
+            group = groups.get(transaction.storage.unique_code)
+            if group is None:
                 continue
-                
-            try:
-                # Находим строку по номенклатуре транзакции
-                item = self.find_row(transaction.nomenclature)
-                quantity = transaction.quantity
-                
-                # Корректируем количество по коэффициенту преобразования измерений
-                if transaction.measure.base_measure and transaction.measure.base_measure == item.measure:
-                    quantity *= transaction.measure.conversion_factor
-                
-                # Обновляем начальный остаток
-                item.start_balance += quantity
-                
-                # Обновляем конечный остаток (для учета всех транзакций)
-                item.end_balance += quantity
-            
-            except operation_exception:
-                # Если номенклатура отсутствует в текущем списке, пропускаем транзакцию
+            builder, totals = group
+            date = transaction.date
+            if date > builder.__end_date:
+                continue
+
+            code = transaction.nomenclature.unique_code
+            item = builder.__index.get(code)
+            if item is None:
+                # Номенклатура отсутствует в справочнике - пропускаем транзакцию
+                continue
+
+            quantity = osv_builder.convert_quantity(transaction, item.measure)
+            total = totals[code]
+            if date < builder.__start_date:
+                total[0] += quantity
+            elif transaction.quantity > 0:
+                total[1] += quantity
+            else:
+                # Для расхода берем абсолютное значение
+                total[2] += abs(quantity)
+
+        for builder, totals in groups.values():
+            builder.__apply_totals(totals)
+
+    def generate_rows_sorted(self, transactions: date_index, nomenclatures, snapshots: balance_snapshots = None):
+        """
+        Генерирует строки ведомости по транзакциям одного склада, упорядоченным по дате.
+
+        Границы периода находятся бинарным поиском, поэтому транзакции
+        после окончания периода и транзакции других складов не просматриваются.
+        Если переданы снимки остатков, начальный остаток берется из ближайшего
+        снимка, и просматриваются только транзакции после него.
+
+        Аргументы:
+            transactions (date_index): Транзакции склада ведомости, отсортированные по дате
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
+            snapshots (balance_snapshots): Снимки остатков (необязательно)
+        """
+        validator.validate(transactions, date_index)
+        self.__prepare_rows(nomenclatures)
+
+        totals = {code: [0.0, 0.0, 0.0] for code in self.__index}
+        start_position = transactions.lower(self.__start_date)
+        end_position = transactions.upper(self.__end_date)
+        items = transactions.items
+
+        opening_position = 0
+        if snapshots is not None:
+            balances, opening_position = snapshots.opening(
+                transactions, self.__storage.unique_code, self.__start_date, osv_builder.row_quantity)
+            for code, quantity in balances.items():
+                if code in totals:
+                    totals[code][0] = quantity
+
+        self.__add_opening(totals, items[opening_position:start_position])
+        self.__add_turnover(totals, items[start_position:end_position])
+        self.__apply_totals(totals)
+
+    def generate_rows_parallel(self, transactions: date_index, nomenclatures, workers: int,
+                               snapshots: balance_snapshots = None, min_shard: int = 50000):
+        """
+        Генерирует строки ведомости по транзакциям склада в нескольких процессах.
+
+        Диапазон транзакций от ближайшего снимка до конца периода делится на
+        непрерывные части. Каждый процесс общего пула получает срез колонок индекса
+        склада (номенклатура, единица, количество), сам пересчитывает количества
+        в единицу строки и считает частичные суммы [начальный остаток, приход, расход],
+        затем суммы складываются. Колонки индекса строятся один раз и поддерживаются
+        вместе с ним, поэтому основной процесс только режет срезы.
+        При небольшом числе транзакций используется последовательный расчет.
+
+        Аргументы:
+            transactions (date_index): Транзакции склада ведомости, отсортированные по дате
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
+            workers (int): Количество процессов
+            snapshots (balance_snapshots): Снимки остатков (необязательно)
+            min_shard (int): Минимальное количество транзакций на один процесс
+
+        Ошибки:
+            argument_exception: Если количество процессов меньше 1
+        """
+        validator.validate(transactions, date_index)
+        validator.validate(workers, int)
+        validator.validate(min_shard, int)
+        if workers < 1 or min_shard < 1:
+            raise argument_exception("Количество процессов и размер части должны быть не меньше 1!")
+
+        start_position = transactions.lower(self.__start_date)
+        end_position = transactions.upper(self.__end_date)
+        opening_position = 0
+        balances = {}
+        if snapshots is not None:
+            balances, opening_position = snapshots.opening(
+                transactions, self.__storage.unique_code, self.__start_date, osv_builder.row_quantity)
+
+        workers = min(workers, (end_position - opening_position) // min_shard)
+        if workers <= 1:
+            self.generate_rows_sorted(transactions, nomenclatures, snapshots)
+            return
+
+        self.__prepare_rows(nomenclatures)
+        totals = {code: [0.0, 0.0, 0.0] for code in self.__index}
+        for code, quantity in balances.items():
+            if code in totals:
+                totals[code][0] = quantity
+
+        # Границы частей: [bounds[i], bounds[i + 1])
+        step = (end_position - opening_position) / workers
+        bounds = [opening_position + round(step * i) for i in range(workers)] + [end_position]
+
+        # Процессам передаются срезы колонок, а не модели транзакций: пул запущен
+        # через forkserver или spawn и ничего не наследует. Единицы строк передаются
+        # кодами, версия таблицы пересчета - чтобы процесс сбросил устаревшую таблицу
+        rows = transactions.columns(osv_builder.transaction_row)
+        row_measures = {code: item.measure.unique_code for code, item in self.__index.items()}
+        version = measure_conversion.version()
+        executor = osv_builder.__executor(workers)
+        futures = []
+        for begin, end in zip(bounds, bounds[1:]):
+            middle = min(max(start_position, begin), end)
+            futures.append(executor.submit(
+                osv_builder.partial_totals, rows[begin:end], row_measures, middle - begin, version))
+
+        for future in futures:
+            for code, values in future.result().items():
+                total = totals[code]
+                total[0] += values[0]
+                total[1] += values[1]
+                total[2] += values[2]
+
+        self.__apply_totals(totals)
+
+    @staticmethod
+    def __executor(workers: int) -> ProcessPoolExecutor:
+        """
+        Возвращает общий пул процессов не меньше чем на workers процессов.
+        Пул создается один раз через forkserver (или spawn, если forkserver недоступен):
+        fork в многопоточном сервере копирует блокировки, занятые другими потоками.
+        """
+        with osv_builder.__pool_lock:
+            if osv_builder.__pool is None or osv_builder.__pool_workers < workers:
+                if osv_builder.__pool is not None:
+                    osv_builder.__pool.shutdown(wait=False)
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                osv_builder.__pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                osv_builder.__pool_workers = workers
+            return osv_builder.__pool
+
+    @staticmethod
+    def shutdown_pool():
+        """ Останавливает пул процессов параллельного расчета """
+        with osv_builder.__pool_lock:
+            if osv_builder.__pool is not None:
+                osv_builder.__pool.shutdown()
+            osv_builder.__pool = None
+            osv_builder.__pool_workers = 0
+
+    @staticmethod
+    def transaction_row(transaction: transaction_model) -> tuple:
+        """ Возвращает строку колонок индекса склада: (код номенклатуры, единица, количество) """
+        return transaction.nomenclature.unique_code, transaction.measure, transaction.quantity
+
+    @staticmethod
+    def partial_totals(rows: list, row_measures: dict, opening: int, version: int) -> dict:
+        """
+        Считает частичные суммы ОСВ по срезу колонок индекса склада. Выполняется в дочернем процессе.
+
+        Аргументы:
+            rows (list[tuple]): Строки (код номенклатуры, единица, количество) в порядке даты
+            row_measures (dict): Код номенклатуры -> код единицы строки ведомости
+            opening (int): Количество первых строк среза, относящихся к начальному остатку
+            version (int): Версия таблицы пересчета единиц основного процесса
+
+        Возвращает:
+            dict: код номенклатуры -> [начальный остаток, приход, расход]
+        """
+        measure_conversion.follow(version)
+        totals = {}
+        factors = {}
+        for position, (code, measure, quantity) in enumerate(rows):
+            row_measure = row_measures.get(code)
+            if row_measure is None:
+                # Номенклатура отсутствует в справочнике - пропускаем транзакцию
                 continue
+            key = (code, measure.unique_code)
+            factor = factors.get(key)
+            if factor is None:
+                # Строки ведутся в корневой единице; при другом корне количество не пересчитывается
+                root, factor = measure_conversion.resolve(measure)
+                if root.unique_code != row_measure:
+                    factor = 1.0
+                factors[key] = factor
+            total = totals.get(code)
+            if total is None:
+                total = totals[code] = [0.0, 0.0, 0.0]
+            if position < opening:
+                total[0] += quantity * factor
+            elif quantity > 0:
+                total[1] += quantity * factor
+            else:
+                total[2] += abs(quantity * factor)
+        return totals
 
-        # Обработка транзакций в диапазоне даты (учет операций за период)
+    def generate_rows_columnar(self, columns: transaction_columns, nomenclatures):
+        """
+        Генерирует строки ведомости векторным расчетом по колоночному хранилищу.
+
+        Аргументы:
+            columns (transaction_columns): Колоночное хранилище транзакций
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
+        """
+        validator.validate(columns, transaction_columns)
+        self.generate_rows_totals(
+            columns.totals(self.__storage.unique_code, self.__start_date, self.__end_date), nomenclatures)
+
+    def generate_rows_totals(self, values: dict, nomenclatures):
+        """
+        Генерирует строки ведомости по готовым показателям номенклатур,
+        посчитанным хранилищем транзакций (колоночным или базой данных).
+
+        Аргументы:
+            values (dict): unique_code -> [начальный остаток, приход, расход] в единице строки
+            nomenclatures (dict|list[nomenclature_model]): Справочник номенклатур
+        """
+        validator.validate(values, dict)
+        self.__prepare_rows(nomenclatures)
+
+        totals = {code: [0.0, 0.0, 0.0] for code in self.__index}
+        for code, value in values.items():
+            if code in totals:
+                totals[code] = value
+        self.__apply_totals(totals)
+
+    def __add_opening(self, totals: dict, transactions):
+        """ Добавляет транзакции до начала периода в начальный остаток """
+        index = self.__index
         for transaction in transactions:
-            # Проверка, что транзакция относится к правильному складу и попадает в диапазон дат
-            is_correct_storage = transaction.storage.unique_code == self.__storage.unique_code
-            is_in_date_range = self.__start_date <= transaction.date <= self.__end_date
-            
-            if not (is_correct_storage and is_in_date_range):
+            code = transaction.nomenclature.unique_code
+            item = index.get(code)
+            if item is None:
                 continue
-                
-            try:
-                # Находим строку по номенклатуре транзакции
-                item = self.find_row(transaction.nomenclature)
-                quantity = transaction.quantity
-                
-                # Корректируем количество, если измерение отличается от базового
-                if transaction.measure.base_measure and transaction.measure.base_measure == item.measure:
-                    quantity *= transaction.measure.conversion_factor
-                
-                # Обновляем показатели по приходу/расходу
-                if transaction.quantity > 0:
-                    item.income += quantity
-                else:
-                    # Для расхода берем абсолютное значение
-                    item.outcome += abs(quantity)
-                
-                # Обновляем конечный остаток
-                item.end_balance += quantity
+            totals[code][0] += osv_builder.convert_quantity(transaction, item.measure)
+
+    def __add_turnover(self, totals: dict, transactions):
+        """ Добавляет транзакции периода в приход и расход """
+        index = self.__index
+        for transaction in transactions:
+            code = transaction.nomenclature.unique_code
+            item = index.get(code)
+            if item is None:
+                continue
+            quantity = osv_builder.convert_quantity(transaction, item.measure)
+            if transaction.quantity > 0:
+                totals[code][1] += quantity
+            else:
+                totals[code][2] += abs(quantity)
+
+    @staticmethod
+    def row_measure(nomenclature) -> measure_model:
+        """
+        Возвращает единицу измерения строки ведомости для номенклатуры.
+        
+        Аргументы:
+            nomenclature (nomenclature_model): Номенклатура
             
-            except operation_exception:
-                # Пропускаем транзакции без соответствующей номенклатуры
-                continue
\ No newline at end of file
+        Возвращает:
+            measure_model: Корневая базовая единица цепочки единиц номенклатуры
+        """
+        return measure_conversion.resolve(nomenclature.measure)[0]
+
+    @staticmethod
+    def row_quantity(transaction: transaction_model) -> tuple:
+        """
+        Возвращает код номенклатуры и количество транзакции в единице строки ведомости.
+        Используется снимками остатков и колоночным хранилищем.
+        """
+        measure = osv_builder.row_measure(transaction.nomenclature)
+        return transaction.nomenclature.unique_code, osv_builder.convert_quantity(transaction, measure)
+
+    def __prepare_rows(self, nomenclatures):
+        """
+        Создает по одной строке с нулевыми значениями для каждой номенклатуры
+        и строит индекс unique_code -> строка.
+        """
+        self.rows = [
+            osv_unit_model.create_default(nomenclature, osv_builder.row_measure(nomenclature))
+            for nomenclature in osv_builder.__values(nomenclatures)
+        ]
+
+    def __apply_totals(self, totals: dict):
+        """
+        Переносит накопленные суммы в строки ведомости.
+        
+        Аргументы:
+            totals (dict): unique_code -> [начальный остаток, приход, расход]
+        """
+        for code, (start_balance, income, outcome) in totals.items():
+            item = self.__index[code]
+            item.start_balance = float(start_balance)
+            item.income = float(income)
+            item.outcome = float(outcome)
+            item.end_balance = float(start_balance + income - outcome)
+
+    @staticmethod
+    def __values(source):
+        """ Возвращает элементы коллекции: значения словаря или сам список """
+        if isinstance(source, dict):
+            return source.values()
+        return source
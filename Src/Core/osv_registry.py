@@ -0,0 +1,176 @@
+from datetime import datetime
+from Src.Core.abstract_transaction_observer import abstract_transaction_observer
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.osv_builder import osv_builder
+from Src.Core.sqlite_transaction_collection import sqlite_transaction_collection
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.validator import validator
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+
+class osv_registry(abstract_transaction_observer):
+    """
+    Реестр «живых» оборотно-сальдовых ведомостей.
+
+    Подписанная ведомость (склад, период) строится один раз, после чего
+    реестр получает уведомления коллекции транзакций и поправляет
+    единственную затронутую строку за O(1) на ведомость склада.
+    Чтение возвращает уже готовый результат.
+
+    Особенности:
+        - Для транзакций складов с подписками запоминается внесенный вклад
+          (номенклатура, количество, дата), поэтому изменение транзакции
+          «на месте» с повторной записью по тому же ключу учитывается верно.
+        - После изменения таблицы пересчета единиц (measure_conversion)
+          ведомости перестраиваются при следующем чтении.
+        - Номенклатура, добавленная в справочник после подписки, появится
+          в ведомости только после переподписки.
+        - Построение, перестроение и отмена подписки выполняются под блокировкой
+          записи коллекции (write_lock), под которой коллекция уведомляет наблюдателей,
+          поэтому транзакция не может быть учтена дважды или пропущена.
+    """
+
+    def __init__(self, transactions: transaction_collection, nomenclatures: dict):
+        """
+        Аргументы:
+            transactions (transaction_collection|sqlite_transaction_collection): Коллекция транзакций репозитория
+            nomenclatures (dict): Справочник номенклатур
+        """
+        validator.validate(transactions, (transaction_collection, sqlite_transaction_collection))
+        validator.validate(nomenclatures, dict)
+        self.__transactions = transactions
+        self.__nomenclatures = nomenclatures
+        # unique_code склада -> {(начало, конец): ведомость}
+        self.__reports = {}
+        # ключ транзакции -> (склад, номенклатура, количество, дата, признак прихода)
+        self.__records = {}
+        self.__version = measure_conversion.version()
+        transactions.subscribe(self)
+
+    def subscribe(self, start_date: datetime, end_date: datetime, storage: storage_model) -> osv_builder:
+        """
+        Подписывает ведомость склада за период и возвращает ее.
+        Повторная подписка на тот же склад и период возвращает ту же ведомость.
+
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage (storage_model): Склад
+
+        Возвращает:
+            osv_builder: Поддерживаемая ведомость
+        """
+        validator.validate(storage, storage_model)
+        with self.__transactions.write_lock:
+            self.__refresh()
+            reports = self.__reports.get(storage.unique_code)
+            if reports is None:
+                reports = self.__reports[storage.unique_code] = {}
+                self.__record_storage(storage.unique_code)
+
+            builder = reports.get((start_date, end_date))
+            if builder is None:
+                builder = reports[(start_date, end_date)] = self.__build(start_date, end_date, storage)
+            return builder
+
+    def get(self, start_date: datetime, end_date: datetime, storage: storage_model) -> osv_builder:
+        """
+        Возвращает подписанную ведомость или None, если подписки нет.
+        """
+        validator.validate(storage, storage_model)
+        with self.__transactions.write_lock:
+            self.__refresh()
+            return self.__reports.get(storage.unique_code, {}).get((start_date, end_date))
+
+    def unsubscribe(self, start_date: datetime, end_date: datetime, storage: storage_model):
+        """
+        Отменяет подписку на ведомость склада за период.
+        """
+        validator.validate(storage, storage_model)
+        with self.__transactions.write_lock:
+            reports = self.__reports.get(storage.unique_code)
+            if reports is None:
+                return
+            reports.pop((start_date, end_date), None)
+            if len(reports) == 0:
+                del self.__reports[storage.unique_code]
+                self.__records = {
+                    key: record for key, record in self.__records.items() if record[0] != storage.unique_code
+                }
+
+    def count(self) -> int:
+        """ Возвращает количество подписанных ведомостей """
+        return sum(len(reports) for reports in self.__reports.values())
+
+    def transaction_added(self, key, transaction):
+        storage_code = transaction.storage.unique_code
+        if storage_code not in self.__reports:
+            return
+        code, quantity = osv_builder.row_quantity(transaction)
+        record = (storage_code, code, quantity, transaction.date, transaction.quantity > 0)
+        self.__records[key] = record
+        self.__apply(record, 1.0)
+
+    def transactions_added(self, pairs: list):
+        # Пока нет подписок, пакет не перебирается
+        if len(self.__reports) > 0:
+            super().transactions_added(pairs)
+
+    def transaction_removed(self, key, transaction):
+        record = self.__records.pop(key, None)
+        if record is not None:
+            self.__apply(record, -1.0)
+
+    def __apply(self, record: tuple, sign: float):
+        """ Добавляет (sign = 1) или вычитает (sign = -1) вклад транзакции во все ведомости склада """
+        storage_code, code, quantity, date, is_income = record
+        for (start_date, end_date), builder in self.__reports[storage_code].items():
+            if date > end_date:
+                continue
+            row = builder.row_by_code(code)
+            if row is None:
+                continue
+            if date < start_date:
+                row.start_balance = row.start_balance + sign * quantity
+            elif is_income:
+                row.income = row.income + sign * quantity
+            else:
+                # Расход хранится по модулю
+                row.outcome = row.outcome + sign * abs(quantity)
+            row.end_balance = row.end_balance + sign * quantity
+
+    def __record_storage(self, storage_code: str):
+        """
+        Запоминает вклад уже существующих транзакций склада.
+        Ключом служит ключ транзакции в коллекции - тот же, что получают
+        transaction_added и transaction_removed, - поэтому коллекция перебирается
+        парами (ключ, транзакция), а не по индексу склада.
+        """
+        for key, transaction in self.__transactions.items():
+            if transaction.storage.unique_code != storage_code:
+                continue
+            code, quantity = osv_builder.row_quantity(transaction)
+            self.__records[key] = (storage_code, code, quantity, transaction.date, transaction.quantity > 0)
+
+    def __build(self, start_date: datetime, end_date: datetime, storage: storage_model) -> osv_builder:
+        """ Строит ведомость с нуля по отсортированным транзакциям склада """
+        builder = osv_builder(osv_model.create(start_date, end_date, storage))
+        self.__generate(builder)
+        return builder
+
+    def __generate(self, builder: osv_builder):
+        """ Заполняет строки ведомости по отсортированным транзакциям склада """
+        builder.generate_rows_sorted(
+            self.__transactions.storage_index(builder.storage.unique_code),
+            self.__nomenclatures, self.__transactions.snapshots)
+
+    def __refresh(self):
+        """ Перестраивает ведомости на месте после изменения таблицы пересчета единиц """
+        if self.__version == measure_conversion.version():
+            return
+        self.__version = measure_conversion.version()
+        self.__records = {}
+        for storage_code, reports in self.__reports.items():
+            self.__record_storage(storage_code)
+            for builder in reports.values():
+                self.__generate(builder)
@@ -0,0 +1,161 @@
+import threading
+import uuid
+from datetime import datetime
+from Src.Core.osv_builder import osv_builder
+from Src.Core.validator import argument_exception, operation_exception, validator
+from Src.Models.recipe_model import recipe_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+
+# Исключение при недостатке остатков для списания с блокировкой
+class insufficient_balance_exception(operation_exception):
+    """
+    Списание заблокировано: остатков номенклатуры на складе не хватает.
+
+    Свойства:
+        shortages (list): [(nomenclature_model, требуется, остаток)] в единице строки ОСВ
+    """
+
+    def __init__(self, shortages: list):
+        self.shortages = shortages
+        names = ", ".join(
+            f"{nomenclature.name} (требуется {required:g}, остаток {available:g})"
+            for nomenclature, required, available in shortages)
+        super().__init__(f"Недостаточно остатков для списания: {names}")
+
+class production_posting:
+    """
+    Операция «Приготовление блюда»: списание ингредиентов рецепта со склада.
+
+    По рецепту и количеству порций создаются транзакции расхода ингредиентов
+    (количество ингредиента на порцию в единице номенклатуры, умноженное на порции).
+    Варианты списания (технические требования 2.2 - 2.4):
+        "blocking" - с блокировкой: списание отклоняется, если остатка не хватает;
+        "overdraft" - под сальдо: списание без проверки, остаток может стать отрицательным.
+
+    Остатки проверяются по кэшу текущих остатков репозитория (balance_cache)
+    поиском в словаре, без построения ОСВ. На время проверки и записи
+    захватываются блокировки пар (склад, номенклатура) ингредиентов в порядке
+    сортировки кодов (без взаимных блокировок), поэтому два одновременных
+    списания одной номенклатуры со склада не могут оба пройти проверку,
+    а списания разных номенклатур или складов проверяются параллельно.
+    Запись в коллекцию транзакций выполняется под ее блокировкой записи.
+
+    Особенности:
+        - Проверка согласована только между списаниями этой операции: прочие
+          изменения транзакций (загрузка, импорт) выполняются без блокировок пар.
+        - Остатки учитывают все транзакции, в том числе с датой позже даты списания.
+    """
+
+    BLOCKING = "blocking"
+    OVERDRAFT = "overdraft"
+
+    # Погрешность сравнения остатков (количества хранятся в float)
+    EPSILON = 1e-9
+
+    @staticmethod
+    def modes() -> list:
+        """ Поддерживаемые варианты списания """
+        return [production_posting.BLOCKING, production_posting.OVERDRAFT]
+
+    def __init__(self, repo: reposity):
+        """
+        Аргументы:
+            repo (reposity): Репозиторий
+        """
+        validator.validate(repo, reposity)
+        self.__repo = repo
+        # (код склада, код номенклатуры) -> блокировка
+        self.__locks = {}
+        self.__guard = threading.Lock()
+        self.__prepared = None
+
+    def post(self, recipe: recipe_model, storage: storage_model, portions: float,
+             mode: str = BLOCKING, date: datetime = None) -> list:
+        """
+        Списывает ингредиенты рецепта со склада.
+
+        Аргументы:
+            recipe (recipe_model): Рецепт
+            storage (storage_model): Склад
+            portions (int|float): Количество порций (больше нуля)
+            mode (str): "blocking" (по умолчанию) или "overdraft"
+            date (datetime): Дата списания (по умолчанию - текущая)
+
+        Возвращает:
+            list[transaction_model]: Транзакции расхода, добавленные в репозиторий
+
+        Ошибки:
+            argument_exception: Некорректные аргументы или рецепт без ингредиентов
+            insufficient_balance_exception: Не хватает остатков (вариант "blocking")
+        """
+        validator.validate(recipe, recipe_model)
+        validator.validate(storage, storage_model)
+        validator.validate(portions, (int, float))
+        validator.validate(mode, str)
+        if isinstance(portions, bool) or not portions > 0:
+            raise argument_exception("Количество порций должно быть больше нуля")
+        if mode not in production_posting.modes():
+            raise argument_exception(f"Неподдерживаемый вариант списания: {mode}")
+        if date is None:
+            date = datetime.now()
+        validator.validate(date, datetime)
+
+        items = self.__outflow(recipe, storage, portions, date)
+        cache = self.__repo.balance_cache()
+        if cache is not self.__prepared:
+            # Остатки считаются до захвата блокировок пар, чтобы списания не ждали подсчета под ними
+            cache.prepare()
+            self.__prepared = cache
+
+        locks = [self.__lock(storage.unique_code, code) for code in sorted(items)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            if mode == production_posting.BLOCKING:
+                self.__check(items, storage, cache)
+            self.__repo.add_transactions({item.unique_code: item for item in items.values()})
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        return list(items.values())
+
+    # Служебные методы
+
+    def __outflow(self, recipe: recipe_model, storage: storage_model, portions: float, date: datetime) -> dict:
+        """ Создает транзакции расхода {код номенклатуры: транзакция}, повторы ингредиента суммируются """
+        required = {}
+        for nomenclature, quantity in recipe.ingredients:
+            code = nomenclature.unique_code
+            previous = required.get(code)
+            required[code] = (nomenclature, quantity * portions + (0.0 if previous is None else previous[1]))
+        if len(required) == 0:
+            raise argument_exception(f"В рецепте нет ингредиентов: {recipe.name}")
+
+        name = f"Приготовление: {recipe.name}"[:50].strip()
+        return {
+            code: transaction_model.create_trusted(
+                uuid.uuid4().hex, name, storage, nomenclature, nomenclature.measure, -float(quantity), date)
+            for code, (nomenclature, quantity) in required.items()
+        }
+
+    def __check(self, items: dict, storage: storage_model, cache):
+        """ Проверяет остатки по всем ингредиентам и отклоняет списание при недостатке любого """
+        shortages = []
+        for item in items.values():
+            code, quantity = osv_builder.row_quantity(item)
+            available = cache.balance(storage.unique_code, code)
+            if available + quantity < -production_posting.EPSILON:
+                shortages.append((item.nomenclature, -quantity, available))
+        if len(shortages) > 0:
+            raise insufficient_balance_exception(shortages)
+
+    def __lock(self, storage_code: str, nomenclature_code: str) -> threading.Lock:
+        """ Возвращает блокировку пары (склад, номенклатура), создав ее при первом обращении """
+        key = (storage_code, nomenclature_code)
+        lock = self.__locks.get(key)
+        if lock is None:
+            with self.__guard:
+                lock = self.__locks.setdefault(key, threading.Lock())
+        return lock
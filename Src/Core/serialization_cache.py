@@ -0,0 +1,147 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from Src.Core.validator import argument_exception, validator
+
+class serialization_cache:
+    """
+    LRU-кэш преобразованных (сериализованных) моделей.
+
+    Ключ записи - (ключ коллекции, unique_code модели, версия коллекции).
+    После изменения коллекции ее версия меняется, старые записи больше
+    не запрашиваются и вытесняются по LRU.
+
+    Дополнительно хранит готовые байты ответов целых коллекций с хешем
+    содержимого (ETag), пересобираемые только при смене версии коллекции.
+
+    Особенности:
+        - Возвращаемые словари общие для всех запросов, изменять их нельзя.
+        - Ведется статистика попаданий и промахов.
+        - Кэш общий для потоков обработчиков: порядок LRU, вытеснение и статистика
+          меняются под блокировкой, преобразование модели выполняется вне ее.
+
+    Свойства:
+        capacity (int): Максимальное количество записей
+    """
+
+    def __init__(self, capacity: int = 4096):
+        validator.validate(capacity, int)
+        if capacity < 1:
+            raise argument_exception("Емкость кэша должна быть не меньше 1!")
+        self.__capacity = capacity
+        self.__lock = threading.Lock()
+        self.__items = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        # Ключ ответа -> (версия, байты, ETag)
+        self.__encoded = {}
+
+    @property
+    def capacity(self) -> int:
+        """Возвращает максимальное количество записей"""
+        return self.__capacity
+
+    def convert(self, collection_key: str, version, item, converter):
+        """
+        Возвращает преобразованную модель из кэша или преобразует и запоминает ее.
+
+        Аргументы:
+            collection_key (str): Ключ коллекции репозитория
+            version: Версия коллекции (любое хешируемое значение)
+            item (abstract_model): Модель
+            converter (convert_factory): Фабрика конвертеров для промаха
+
+        Возвращает:
+            dict: Преобразованная модель
+        """
+        key = (collection_key, item.unique_code, version)
+        with self.__lock:
+            result = self.__items.get(key)
+            if result is not None:
+                self.__hits += 1
+                self.__items.move_to_end(key)
+                return result
+            self.__misses += 1
+
+        result = converter.convert(item)
+        with self.__lock:
+            self.__items[key] = result
+            self.__items.move_to_end(key)
+            while len(self.__items) > self.__capacity:
+                self.__items.popitem(last=False)
+                self.__evictions += 1
+        return result
+
+    def convert_collection(self, collection_key: str, version, items, converter) -> list:
+        """
+        Преобразует все модели коллекции через кэш.
+
+        Аргументы:
+            collection_key (str): Ключ коллекции репозитория
+            version: Версия коллекции
+            items (dict|list): Модели коллекции
+            converter (convert_factory): Фабрика конвертеров для промахов
+
+        Возвращает:
+            list[dict]: Преобразованные модели в порядке коллекции
+        """
+        if isinstance(items, dict):
+            items = items.values()
+        return [self.convert(collection_key, version, item, converter) for item in items]
+
+    def encoded(self, response_key: str, version, build) -> tuple:
+        """
+        Возвращает готовые байты ответа и их ETag, пересобирая их при смене версии.
+
+        Аргументы:
+            response_key (str): Ключ ответа (например, имя коллекции)
+            version: Версия данных ответа
+            build (callable): Функция без аргументов, возвращающая байты ответа
+
+        Возвращает:
+            tuple: (bytes, ETag)
+        """
+        entry = self.__encoded.get(response_key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        body = build()
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        with self.__lock:
+            self.__encoded[response_key] = (version, body, etag)
+        return body, etag
+
+    def etag(self, response_key: str, version) -> str:
+        """
+        Возвращает ETag готового ответа или None, если ответ для этой версии не собран.
+        """
+        entry = self.__encoded.get(response_key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[2]
+
+    def clear(self):
+        """ Удаляет все записи, статистика сохраняется """
+        with self.__lock:
+            self.__items.clear()
+            self.__encoded.clear()
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша.
+
+        Возвращает:
+            dict: Размер, емкость, попадания, промахи, вытеснения и доля попаданий
+        """
+        with self.__lock:
+            total = self.__hits + self.__misses
+            return {
+                "size": len(self.__items),
+                "capacity": self.__capacity,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+                "encoded_responses": len(self.__encoded),
+                "hit_rate": self.__hits / total if total > 0 else 0.0
+            }
@@ -0,0 +1,142 @@
+import json
+import os
+import re
+from datetime import datetime
+from Src.Core.compressed_stream import compressed_stream
+from Src.Core.validator import operation_exception, validator
+
+class sharded_store:
+    """
+    Каталог данных репозитория, разделенный по коллекциям.
+
+    Структура каталога:
+        - manifest.json: {"version": 1, "created": дата записи,
+          "collections": {ключ коллекции: {"file": имя файла, "count": количество,
+          "compression": алгоритм сжатия}}};
+        - по одному JSON-файлу {ключ: словарь DTO} на каждую коллекцию.
+
+    Манифест записывается последним и атомарно заменяет прежний (os.replace),
+    поэтому он всегда ссылается на полностью записанные файлы коллекций.
+    Имена файлов коллекций содержат идентификатор записи (<ключ>.<идентификатор>.json):
+    файлы прежней записи удаляются только после замены манифеста, и только те,
+    на которые ссылался прежний манифест. Прочие файлы каталога не затрагиваются,
+    а запись в непустой каталог без манифеста запрещена (writable).
+
+    Особенности:
+        - Коллекции читаются по отдельности (read), поэтому справочники
+          можно загрузить без разбора файла транзакций.
+        - Сжатые файлы коллекций (compressed_stream) распознаются по сигнатуре.
+    """
+
+    MANIFEST = "manifest.json"
+    VERSION = 1
+
+    # Имя файла коллекции: <ключ коллекции>.<идентификатор записи>.json
+    __SHARD = re.compile(r"\w+\.[0-9a-f]+\.json")
+
+    def __init__(self, directory: str):
+        """
+        Аргументы:
+            directory (str): Каталог данных
+        """
+        validator.validate(directory, str)
+        self.__directory = directory
+        self.__manifest = None
+
+    @property
+    def directory(self) -> str:
+        """ Возвращает каталог данных """
+        return self.__directory
+
+    def exists(self) -> bool:
+        """ Проверяет наличие манифеста в каталоге """
+        return os.path.exists(os.path.join(self.__directory, sharded_store.MANIFEST))
+
+    def writable(self) -> bool:
+        """
+        Проверяет, можно ли записать каталог данных: каталога нет, он пуст
+        или уже содержит манифест (прежнюю выгрузку).
+        """
+        if not os.path.exists(self.__directory):
+            return True
+        if not os.path.isdir(self.__directory):
+            return False
+        return self.exists() or len(os.listdir(self.__directory)) == 0
+
+    def manifest(self) -> dict:
+        """
+        Читает манифест каталога (один раз).
+
+        Ошибки:
+            operation_exception: Если манифест отсутствует или имеет неизвестную версию
+        """
+        if self.__manifest is None:
+            filename = os.path.join(self.__directory, sharded_store.MANIFEST)
+            if not os.path.exists(filename):
+                raise operation_exception(f"В каталоге {self.__directory} нет манифеста данных!")
+            with open(filename, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != sharded_store.VERSION:
+                raise operation_exception(f"Неподдерживаемая версия манифеста: {manifest.get('version')}")
+            self.__manifest = manifest
+        return self.__manifest
+
+    def keys(self) -> list:
+        """ Возвращает ключи коллекций, записанных в каталоге """
+        return list(self.manifest()["collections"].keys())
+
+    def count(self, key: str) -> int:
+        """ Возвращает количество элементов коллекции по манифесту (0, если коллекции нет) """
+        validator.validate(key, str)
+        return self.manifest()["collections"].get(key, {}).get("count", 0)
+
+    def read(self, key: str) -> dict:
+        """
+        Читает коллекцию в формате выгрузки.
+
+        Аргументы:
+            key (str): Ключ коллекции
+
+        Возвращает:
+            dict: Словарь {ключ: словарь DTO} или пустой словарь, если коллекции нет
+        """
+        validator.validate(key, str)
+        entry = self.manifest()["collections"].get(key)
+        if entry is None:
+            return {}
+        with compressed_stream.open(os.path.join(self.__directory, entry["file"])) as f:
+            return json.load(f)
+
+    def commit(self, collections: dict):
+        """
+        Записывает манифест, ссылающийся на уже записанные файлы коллекций,
+        и удаляет файлы коллекций прежнего манифеста, на которые новый больше не ссылается.
+
+        Аргументы:
+            collections (dict): {ключ коллекции: {"file": имя файла, "count": количество, ...}}
+        """
+        validator.validate(collections, dict)
+        previous = self.manifest()["collections"] if self.exists() else {}
+        manifest = {
+            "version": sharded_store.VERSION,
+            "created": datetime.now().isoformat(),
+            "collections": collections
+        }
+        filename = os.path.join(self.__directory, sharded_store.MANIFEST)
+        temp = f"{filename}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, filename)
+        self.__manifest = manifest
+
+        files = set(entry["file"] for entry in collections.values())
+        for entry in previous.values():
+            name = entry.get("file", "")
+            # Только файлы коллекций в каталоге данных (без путей и чужих имен)
+            if name in files or sharded_store.__SHARD.fullmatch(name) is None:
+                continue
+            path = os.path.join(self.__directory, name)
+            if os.path.exists(path):
+                os.remove(path)
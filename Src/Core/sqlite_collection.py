@@ -0,0 +1,65 @@
+from Src.Core.sqlite_store import sqlite_store
+from Src.Core.versioned_collection import versioned_collection
+
+class sqlite_collection(versioned_collection):
+    """
+    Коллекция справочника, сохраняемая в базу SQLite (sqlite_store).
+
+    Модели хранятся в памяти как в versioned_collection (ссылки между моделями
+    и сравнение по ссылке сохраняются), а каждая запись и удаление сразу
+    записываются в таблицу entities в формате выгрузки.
+
+    Особенности:
+        - Изменение модели «на месте» в базу не попадает: после изменения
+          модель нужно повторно записать по тому же ключу.
+        - Пакет (update, add_many) записывается в базу одной фиксацией.
+    """
+
+    def __init__(self, store: sqlite_store, key: str, convert, items: dict = None):
+        """
+        Аргументы:
+            store (sqlite_store): База данных
+            key (str): Ключ коллекции репозитория
+            convert (callable): Функция модель -> словарь DTO (convert_factory.convert)
+            items (dict): Модели, уже сохраненные в базе (загружаются без записи)
+        """
+        self.__store = store
+        self.__key = key
+        self.__convert = convert
+        super().__init__()
+        if items is not None:
+            dict.update(self, items)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.__store.put_entity(self.__key, str(key), self.__convert(value))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.__store.delete_entity(self.__key, str(key))
+
+    def pop(self, key, *default):
+        exists = key in self
+        value = super().pop(key, *default)
+        if exists:
+            self.__store.delete_entity(self.__key, str(key))
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.__store.delete_entity(self.__key, str(item[0]))
+        return item
+
+    def update(self, *args, **kwargs):
+        # Записи пакета входят в одну транзакцию базы
+        with self.__store.pool.transaction():
+            super().update(*args, **kwargs)
+
+    def add_many(self, items: dict):
+        values = {str(key): self.__convert(value) for key, value in items.items()}
+        super().add_many(items)
+        self.__store.put_entities(self.__key, values)
+
+    def clear(self):
+        super().clear()
+        self.__store.clear_entities(self.__key)
@@ -0,0 +1,329 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from Src.Core.validator import argument_exception, operation_exception, validator
+
+class sqlite_pool:
+    """
+    Потокобезопасный пул соединений с базой SQLite.
+
+    Поток получает соединение на время обращения (connection) и держит его
+    до выхода из самого внешнего блока: вложенные обращения того же потока
+    используют то же соединение. Одновременно открыто не больше size соединений,
+    остальные потоки ждут освобождения (не дольше timeout секунд).
+
+    Каждое соединение открывается в режиме WAL: читатели работают параллельно
+    с записью и друг с другом. Запись (transaction) выполняется под общей
+    блокировкой записи и фиксируется одной транзакцией, поэтому писатели
+    не получают SQLITE_BUSY.
+
+    Подготовленные запросы кэширует сам модуль sqlite3 (cached_statements, LRU
+    по тексту SQL в каждом соединении): запросы репозитория - постоянные строки,
+    списки кодов передаются одним параметром JSON, поэтому повторное выполнение
+    не разбирает SQL заново. Содержимое этого кэша sqlite3 не раскрывает, поэтому
+    пул считает повторы текстов запросов в соединении по такому же LRU емкостью
+    STATEMENTS (sql_texts в metrics()) - это оценка попаданий в кэш, а не их счетчик.
+
+    Особенности:
+        - База ":memory:" существует только в своем соединении, поэтому для нее
+          пул всегда содержит одно соединение.
+        - metrics() возвращает показатели загрузки пула для API.
+        - snapshot() занимает соединение с открытой транзакцией чтения: согласованный
+          снимок базы, который можно читать из другого потока (use).
+    """
+
+    # Размер пула по умолчанию
+    SIZE = 8
+    # Емкость кэша подготовленных запросов sqlite3 в одном соединении
+    STATEMENTS = 256
+
+    def __init__(self, filename: str, size: int = SIZE, timeout: float = 30.0):
+        """
+        Аргументы:
+            filename (str): Имя файла базы данных (":memory:" - база в памяти)
+            size (int): Максимальное количество соединений
+            timeout (float): Максимальное время ожидания свободного соединения в секундах
+        """
+        validator.validate(filename, str)
+        validator.validate(size, int)
+        if size < 1:
+            raise argument_exception("Размер пула соединений должен быть не меньше 1!")
+        self.__filename = filename
+        self.__size = 1 if filename == ":memory:" else size
+        self.__timeout = timeout
+        self.__slots = threading.BoundedSemaphore(self.__size)
+        self.__lock = threading.Lock()
+        self.__write_lock = threading.RLock()
+        self.__local = threading.local()
+        self.__idle = []
+        self.__closed = False
+        # Показатели пула
+        self.__opened = 0
+        self.__in_use = 0
+        self.__peak = 0
+        self.__checkouts = 0
+        self.__waits = 0
+        self.__wait_time = 0.0
+        self.__max_wait = 0.0
+        self.__timeouts = 0
+        self.__repeated = 0
+        self.__new = 0
+
+    @property
+    def filename(self) -> str:
+        """ Возвращает имя файла базы данных """
+        return self.__filename
+
+    @property
+    def size(self) -> int:
+        """ Возвращает максимальное количество соединений """
+        return self.__size
+
+    @contextmanager
+    def connection(self):
+        """
+        Выдает соединение потока на время блока with.
+
+        Ошибки:
+            operation_exception: Если пул закрыт или свободное соединение не появилось за timeout
+        """
+        local = self.__local
+        if getattr(local, "depth", 0) > 0:
+            local.depth += 1
+            try:
+                yield local.connection
+            finally:
+                local.depth -= 1
+            return
+
+        local.connection = self.__acquire()
+        local.depth = 1
+        try:
+            yield local.connection
+        finally:
+            local.depth = 0
+            connection, local.connection = local.connection, None
+            self.__release(connection)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Выдает соединение потока для записи: изменения блока with фиксируются
+        одной транзакцией, при ошибке откатываются. Писатели выполняются по очереди.
+        """
+        with self.__write_lock, self.connection() as connection:
+            if connection.depth > 0:
+                # Вложенная запись входит в транзакцию внешнего блока
+                yield connection
+                return
+            connection.depth += 1
+            try:
+                yield connection
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+            finally:
+                connection.depth -= 1
+
+    def snapshot(self):
+        """
+        Занимает соединение и открывает в нем транзакцию чтения. До закрытия
+        снимка (close) чтения через него видят базу на момент вызова, записи
+        других соединений не видны. Соединение занимает место в пуле.
+
+        Возвращает:
+            Снимок: use() - блок with, в котором обращения текущего потока
+            к пулу выполняются через соединение снимка; close() - завершает чтение
+
+        Ошибки:
+            operation_exception: Если пул закрыт или свободное соединение не появилось за timeout
+        """
+        connection = self.__acquire()
+        try:
+            connection.execute("BEGIN")
+            # Транзакция чтения фиксирует снимок базы при первом чтении
+            connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        except BaseException:
+            connection.rollback()
+            self.__release(connection)
+            raise
+        return sqlite_pool.__snapshot(connection, self.__bind, self.__finish)
+
+    def close(self):
+        """ Закрывает свободные соединения, занятые закрываются при освобождении """
+        with self.__lock:
+            self.__closed = True
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+    def metrics(self) -> dict:
+        """
+        Возвращает показатели загрузки пула.
+
+        Возвращает:
+            dict: Размер пула, открытые, занятые и свободные соединения, пик занятых,
+                  количество выдач, ожиданий и отказов по времени, время ожидания (с)
+                  и повторы текстов запросов в соединениях
+        """
+        with self.__lock:
+            texts = self.__repeated + self.__new
+            return {
+                "size": self.__size,
+                "open": self.__opened,
+                "in_use": self.__in_use,
+                "idle": len(self.__idle),
+                "peak_in_use": self.__peak,
+                "saturation": self.__in_use / self.__size,
+                "checkouts": self.__checkouts,
+                "waits": self.__waits,
+                "timeouts": self.__timeouts,
+                "wait_time": self.__wait_time,
+                "max_wait": self.__max_wait,
+                "sql_texts": {
+                    "repeated": self.__repeated,
+                    "new": self.__new,
+                    "repeat_rate": self.__repeated / texts if texts > 0 else 0.0
+                }
+            }
+
+    def statement_used(self, repeated: bool):
+        """ Учитывает выполнение запроса: текст уже выполнялся в соединении (среди последних STATEMENTS) или новый """
+        with self.__lock:
+            if repeated:
+                self.__repeated += 1
+            else:
+                self.__new += 1
+
+    # Служебные методы
+
+    def __acquire(self):
+        """ Занимает свободное соединение или открывает новое """
+        if self.__closed:
+            raise operation_exception("Пул соединений закрыт!")
+        started = time.perf_counter()
+        if not self.__slots.acquire(blocking=False):
+            with self.__lock:
+                self.__waits += 1
+            if not self.__slots.acquire(timeout=self.__timeout):
+                with self.__lock:
+                    self.__timeouts += 1
+                raise operation_exception(
+                    f"Нет свободного соединения с базой за {self.__timeout} с (размер пула {self.__size})")
+        waited = time.perf_counter() - started
+
+        with self.__lock:
+            self.__checkouts += 1
+            self.__in_use += 1
+            self.__peak = max(self.__peak, self.__in_use)
+            self.__wait_time += waited
+            self.__max_wait = max(self.__max_wait, waited)
+            connection = self.__idle.pop() if len(self.__idle) > 0 else None
+        if connection is None:
+            try:
+                connection = sqlite_pool.__connection(self, self.__filename)
+            except BaseException:
+                self.__release(None)
+                raise
+            with self.__lock:
+                self.__opened += 1
+        return connection
+
+    @contextmanager
+    def __bind(self, connection):
+        """ Выполняет обращения текущего потока к пулу внутри блока через указанное соединение """
+        local = self.__local
+        if getattr(local, "depth", 0) > 0:
+            raise operation_exception("Поток уже использует соединение пула!")
+        local.connection = connection
+        local.depth = 1
+        try:
+            yield connection
+        finally:
+            local.depth = 0
+            local.connection = None
+
+    def __finish(self, connection):
+        """ Завершает транзакцию чтения снимка и возвращает соединение в пул """
+        try:
+            connection.rollback()
+        finally:
+            self.__release(connection)
+
+    def __release(self, connection):
+        """ Возвращает соединение в пул """
+        with self.__lock:
+            self.__in_use -= 1
+            closed = self.__closed
+            if connection is not None and not closed:
+                self.__idle.append(connection)
+        if connection is not None and closed:
+            connection.close()
+        self.__slots.release()
+
+    class __snapshot:
+        """ Соединение пула с открытой транзакцией чтения """
+
+        def __init__(self, connection, bind, finish):
+            self.__connection = connection
+            self.__bind = bind
+            self.__finish = finish
+            self.__lock = threading.Lock()
+
+        def use(self):
+            """ Блок with, в котором обращения текущего потока к пулу читают снимок """
+            if self.__connection is None:
+                raise operation_exception("Снимок базы закрыт!")
+            return self.__bind(self.__connection)
+
+        def close(self):
+            """ Завершает транзакцию чтения (повторный вызов ничего не делает) """
+            with self.__lock:
+                connection, self.__connection = self.__connection, None
+            if connection is not None:
+                self.__finish(connection)
+
+    class __connection:
+        """ Соединение пула: считает повторы текстов запросов """
+
+        def __init__(self, pool, filename: str):
+            self.__pool = pool
+            self.__connection = sqlite3.connect(
+                filename, check_same_thread=False, timeout=30.0,
+                cached_statements=sqlite_pool.STATEMENTS)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            # Последние тексты запросов соединения в порядке использования (как LRU sqlite3)
+            self.__statements = OrderedDict()
+            # Глубина вложенных записей
+            self.depth = 0
+
+        def execute(self, sql: str, parameters=()):
+            self.__count(sql)
+            return self.__connection.execute(sql, parameters)
+
+        def executemany(self, sql: str, rows):
+            self.__count(sql)
+            return self.__connection.executemany(sql, rows)
+
+        def commit(self):
+            self.__connection.commit()
+
+        def rollback(self):
+            self.__connection.rollback()
+
+        def close(self):
+            self.__connection.close()
+
+        def __count(self, sql: str):
+            repeated = sql in self.__statements
+            if repeated:
+                self.__statements.move_to_end(sql)
+            else:
+                self.__statements[sql] = None
+                if len(self.__statements) > sqlite_pool.STATEMENTS:
+                    self.__statements.popitem(last=False)
+            self.__pool.statement_used(repeated)
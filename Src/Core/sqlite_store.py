@@ -0,0 +1,272 @@
+import json
+from datetime import datetime, timedelta
+from Src.Core.sqlite_pool import sqlite_pool
+from Src.Core.validator import validator
+
+class sqlite_store:
+    """
+    База данных SQLite с данными репозитория.
+
+    Таблицы:
+        - entities (collection, key, value): модели справочников и рецептов
+          в формате выгрузки (JSON словаря DTO) по ключу коллекции и ключу модели;
+        - transactions (id, storage_id, nomenclature_id, measure_id, name, quantity, date):
+          транзакции с уникальными кодами связанных моделей, дата - микросекунды от 1970-01-01.
+          Составные индексы (storage_id, date) и (nomenclature_id, date) обслуживают
+          выборки за период по складу и по номенклатуре, индекс по date - общие выборки.
+          Индекс по складу дополнительно содержит номенклатуру, единицу и количество,
+          поэтому суммы ОСВ считаются по одному индексу без чтения строк таблицы.
+
+    Особенности:
+        - Журнал SQLite в режиме WAL с synchronous=NORMAL: фиксация не ждет fsync,
+          при сбое теряются только последние изменения, база остается целостной.
+        - Соединения выдает пул (sqlite_pool): чтения разных потоков выполняются
+          параллельно, записи - по очереди, каждая одной фиксацией.
+        - Тексты запросов постоянны, поэтому повторные запросы берутся из кэша
+          подготовленных запросов соединения.
+        - Строки транзакций возвращаются кортежами (id, storage_id, nomenclature_id,
+          measure_id, name, quantity, date), модели из них собирает вызывающий код.
+    """
+
+    EPOCH = datetime(1970, 1, 1)
+    # Колонки строки транзакции в порядке кортежей
+    COLUMNS = "id, storage_id, nomenclature_id, measure_id, name, quantity, date"
+
+    __schema = [
+        "CREATE TABLE IF NOT EXISTS entities ("
+        " collection TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+        " PRIMARY KEY (collection, key))",
+        "CREATE TABLE IF NOT EXISTS transactions ("
+        " id TEXT PRIMARY KEY, storage_id TEXT, nomenclature_id TEXT, measure_id TEXT,"
+        " name TEXT, quantity REAL NOT NULL, date INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS transactions_storage_date"
+        " ON transactions (storage_id, date, nomenclature_id, measure_id, quantity)",
+        "CREATE INDEX IF NOT EXISTS transactions_nomenclature_date ON transactions (nomenclature_id, date)",
+        "CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date)"
+    ]
+
+    def __init__(self, filename: str, pool_size: int = sqlite_pool.SIZE):
+        """
+        Открывает (при необходимости создает) базу данных.
+
+        Аргументы:
+            filename (str): Имя файла базы данных (":memory:" - база в памяти)
+            pool_size (int): Максимальное количество соединений
+        """
+        validator.validate(filename, str)
+        self.__filename = filename
+        self.__pool = sqlite_pool(filename, pool_size)
+        with self.__pool.transaction() as connection:
+            for statement in sqlite_store.__schema:
+                connection.execute(statement)
+
+    @property
+    def filename(self) -> str:
+        """ Возвращает имя файла базы данных """
+        return self.__filename
+
+    @property
+    def pool(self) -> sqlite_pool:
+        """ Возвращает пул соединений базы """
+        return self.__pool
+
+    def close(self):
+        """ Закрывает соединения """
+        self.__pool.close()
+
+    @staticmethod
+    def encode_date(date: datetime) -> int:
+        """ Дата в микросекундах от 1970-01-01 """
+        return (date - sqlite_store.EPOCH) // timedelta(microseconds=1)
+
+    @staticmethod
+    def decode_date(value: int) -> datetime:
+        """ Дата по количеству микросекунд от 1970-01-01 """
+        return sqlite_store.EPOCH + timedelta(microseconds=value)
+
+    # Справочники и рецепты
+
+    def entities(self, collection: str) -> dict:
+        """
+        Возвращает модели коллекции в формате выгрузки.
+
+        Аргументы:
+            collection (str): Ключ коллекции
+
+        Возвращает:
+            dict: {ключ модели: словарь DTO} в порядке добавления
+        """
+        validator.validate(collection, str)
+        with self.__pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT key, value FROM entities WHERE collection = ? ORDER BY rowid", (collection,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def put_entity(self, collection: str, key: str, value: dict):
+        """ Записывает модель коллекции (словарь DTO) """
+        text = json.dumps(value, ensure_ascii=False, default=str)
+        with self.__pool.transaction() as connection:
+            connection.execute(
+                "INSERT INTO entities (collection, key, value) VALUES (?, ?, ?)"
+                " ON CONFLICT (collection, key) DO UPDATE SET value = excluded.value",
+                (collection, key, text))
+
+    def put_entities(self, collection: str, values: dict):
+        """
+        Записывает пакет моделей коллекции одной фиксацией.
+
+        Аргументы:
+            collection (str): Ключ коллекции
+            values (dict): {ключ модели: словарь DTO}
+        """
+        rows = [
+            (collection, key, json.dumps(value, ensure_ascii=False, default=str)) for key, value in values.items()
+        ]
+        with self.__pool.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO entities (collection, key, value) VALUES (?, ?, ?)"
+                " ON CONFLICT (collection, key) DO UPDATE SET value = excluded.value",
+                rows)
+
+    def delete_entity(self, collection: str, key: str):
+        """ Удаляет модель коллекции """
+        with self.__pool.transaction() as connection:
+            connection.execute("DELETE FROM entities WHERE collection = ? AND key = ?", (collection, key))
+
+    def clear_entities(self, collection: str):
+        """ Удаляет все модели коллекции """
+        with self.__pool.transaction() as connection:
+            connection.execute("DELETE FROM entities WHERE collection = ?", (collection,))
+
+    # Транзакции
+
+    def put_transactions(self, rows: list):
+        """
+        Записывает транзакции одной фиксацией. Запись с существующим кодом
+        заменяется на месте (порядок добавления сохраняется).
+
+        Аргументы:
+            rows (list[tuple]): Строки транзакций в порядке COLUMNS
+        """
+        with self.__pool.transaction() as connection:
+            connection.executemany(
+                f"INSERT INTO transactions ({sqlite_store.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET storage_id = excluded.storage_id,"
+                " nomenclature_id = excluded.nomenclature_id, measure_id = excluded.measure_id,"
+                " name = excluded.name, quantity = excluded.quantity, date = excluded.date",
+                rows)
+
+    def delete_transaction(self, key: str):
+        """ Удаляет транзакцию по коду """
+        with self.__pool.transaction() as connection:
+            connection.execute("DELETE FROM transactions WHERE id = ?", (key,))
+
+    def clear_transactions(self):
+        """ Удаляет все транзакции """
+        with self.__pool.transaction() as connection:
+            connection.execute("DELETE FROM transactions")
+
+    def transaction(self, key: str) -> tuple:
+        """ Возвращает строку транзакции по коду или None """
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                f"SELECT {sqlite_store.COLUMNS} FROM transactions WHERE id = ?", (key,)).fetchone()
+
+    def transactions(self, keys: list) -> list:
+        """
+        Возвращает строки существующих транзакций по списку кодов.
+        Коды передаются одним параметром - массивом JSON (json_each), поэтому текст
+        запроса не зависит от их количества и берется из кэша подготовленных запросов.
+
+        Аргументы:
+            keys (list[str]): Коды транзакций
+
+        Возвращает:
+            list[tuple]: Строки найденных транзакций в порядке COLUMNS
+        """
+        if len(keys) == 0:
+            return []
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                f"SELECT {sqlite_store.COLUMNS} FROM transactions"
+                " WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(keys),)).fetchall()
+
+    def transaction_count(self) -> int:
+        """ Возвращает количество транзакций """
+        with self.__pool.connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def transaction_page(self, after: int, limit: int) -> list:
+        """
+        Возвращает страницу транзакций в порядке добавления.
+
+        Аргументы:
+            after (int): rowid последней строки предыдущей страницы (0 - с начала)
+            limit (int): Размер страницы
+
+        Возвращает:
+            list[tuple]: Строки (rowid, затем колонки COLUMNS)
+        """
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                f"SELECT rowid, {sqlite_store.COLUMNS} FROM transactions WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (after, limit)).fetchall()
+
+    def transactions_between(self, start_date: datetime, end_date: datetime, storage_code: str = None,
+                             nomenclature_code: str = None, offset: int = 0, limit: int = None) -> list:
+        """
+        Возвращает строки транзакций за период [start_date, end_date] в порядке возрастания даты
+        (при равных датах - в порядке добавления).
+
+        Возвращает:
+            list[tuple]: Строки в порядке COLUMNS
+        """
+        conditions = ["date BETWEEN ? AND ?"]
+        params = [sqlite_store.encode_date(start_date), sqlite_store.encode_date(end_date)]
+        if storage_code is not None:
+            conditions.append("storage_id = ?")
+            params.append(storage_code)
+        if nomenclature_code is not None:
+            conditions.append("nomenclature_id = ?")
+            params.append(nomenclature_code)
+        params += [-1 if limit is None else limit, offset]
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                f"SELECT {sqlite_store.COLUMNS} FROM transactions WHERE {' AND '.join(conditions)}"
+                " ORDER BY date, rowid LIMIT ? OFFSET ?", params).fetchall()
+
+    def storage_transactions(self, storage_code: str) -> list:
+        """ Возвращает строки транзакций склада в порядке возрастания даты """
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                f"SELECT {sqlite_store.COLUMNS} FROM transactions WHERE storage_id = ? ORDER BY date, rowid",
+                (storage_code,)).fetchall()
+
+    def totals(self, start_date: datetime, end_date: datetime, storage_codes: list) -> list:
+        """
+        Агрегирует показатели ОСВ складов за период на стороне SQLite (SUM ... GROUP BY).
+        Суммы считаются в единицах транзакций, поэтому группируются и по единице измерения.
+        Коды складов передаются массивом JSON, текст запроса постоянный.
+
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage_codes (list[str]): Уникальные коды складов
+
+        Возвращает:
+            list[tuple]: (склад, номенклатура, единица, начальный остаток, приход, расход)
+        """
+        validator.validate(storage_codes, list)
+        if len(storage_codes) == 0:
+            return []
+        start = sqlite_store.encode_date(start_date)
+        end = sqlite_store.encode_date(end_date)
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                "SELECT storage_id, nomenclature_id, measure_id,"
+                " TOTAL(CASE WHEN date < ? THEN quantity END),"
+                " TOTAL(CASE WHEN date >= ? AND quantity > 0 THEN quantity END),"
+                " TOTAL(CASE WHEN date >= ? AND quantity <= 0 THEN -quantity END)"
+                " FROM transactions WHERE storage_id IN (SELECT value FROM json_each(?)) AND date <= ?"
+                " GROUP BY storage_id, nomenclature_id, measure_id",
+                (start, start, start, json.dumps(storage_codes), end)).fetchall()
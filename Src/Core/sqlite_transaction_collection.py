@@ -0,0 +1,364 @@
+import threading
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from datetime import datetime
+from Src.Core.abstract_transaction_observer import abstract_transaction_observer
+from Src.Core.balance_snapshots import balance_snapshots
+from Src.Core.date_index import date_index
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.sqlite_store import sqlite_store
+from Src.Core.validator import argument_exception, validator
+from Src.Models.transaction_model import transaction_model
+
+class sqlite_transaction_collection(MutableMapping):
+    """
+    Коллекция транзакций репозитория, хранящая транзакции в базе SQLite (sqlite_store).
+
+    Поддерживает тот же интерфейс, что и transaction_collection: словарь
+    {ключ: transaction_model} с версией и слушателем, выборки за период
+    (transactions_between), транзакции склада по дате (storage_index),
+    снимки остатков и наблюдателей. В памяти транзакции не хранятся:
+    модель собирается из строки таблицы при каждом обращении, связанные
+    склад, номенклатура и единица находятся по уникальному коду (resolve).
+
+    Показатели ОСВ считаются в базе (totals): суммы группируются по складу,
+    номенклатуре и единице измерения и затем пересчитываются в единицу строки
+    ведомости. Пересчет единиц линеен, поэтому пересчет суммы равен сумме пересчетов.
+
+    Особенности:
+        - Каждое обращение возвращает новый объект модели: изменение модели
+          «на месте» нужно сохранить повторной записью по тому же ключу.
+        - Перебор (keys, values, items) читает таблицу страницами по PAGE строк.
+        - snapshot() - снимок для перебора в другом потоке в транзакции чтения базы.
+        - Изменения вместе с уведомлениями наблюдателей выполняются под блокировкой
+          записи (write_lock), как в transaction_collection.
+    """
+
+    # Размер страницы при переборе транзакций
+    PAGE = 1000
+
+    def __init__(self, store: sqlite_store, resolve):
+        """
+        Аргументы:
+            store (sqlite_store): База данных
+            resolve (callable): Функция unique_code -> модель склада, номенклатуры или единицы (или None)
+        """
+        validator.validate(store, sqlite_store)
+        if not callable(resolve):
+            raise argument_exception("Функция поиска моделей должна быть вызываемым объектом!")
+        self.__store = store
+        self.__resolve = resolve
+        self.__version = 0
+        self.__listener = None
+        self.__snapshots = balance_snapshots()
+        self.__observers = []
+        self.__count = store.transaction_count()
+        self.__write = threading.RLock()
+
+    @property
+    def store(self) -> sqlite_store:
+        """ Возвращает базу данных коллекции """
+        return self.__store
+
+    @property
+    def listener(self):
+        """Возвращает слушателя изменений коллекции или None"""
+        return self.__listener
+
+    @listener.setter
+    def listener(self, value):
+        """Устанавливает слушателя изменений коллекции (None - отключить)"""
+        if value is not None and not callable(value):
+            raise argument_exception("Слушатель коллекции должен быть вызываемым объектом!")
+        self.__listener = value
+
+    @property
+    def version(self) -> int:
+        """Возвращает текущую версию коллекции"""
+        return self.__version
+
+    def touch(self):
+        """ Увеличивает версию коллекции """
+        self.__version += 1
+
+    @property
+    def write_lock(self) -> threading.RLock:
+        """Возвращает блокировку записи: изменения коллекции и уведомления наблюдателей выполняются под ней"""
+        return self.__write
+
+    @property
+    def snapshots(self) -> balance_snapshots:
+        """Возвращает снимки остатков складов"""
+        return self.__snapshots
+
+    @property
+    def columns(self):
+        """ Колоночное хранилище не ведется: агрегаты считаются в базе """
+        return None
+
+    def enable_columns(self) -> bool:
+        """ Колоночное хранилище не поддерживается (агрегаты считаются в базе) """
+        return False
+
+    def disable_columns(self):
+        """ Колоночное хранилище не ведется """
+        pass
+
+    def subscribe(self, observer: abstract_transaction_observer):
+        """ Подписывает наблюдателя на изменения коллекции """
+        validator.validate(observer, abstract_transaction_observer)
+        if observer not in self.__observers:
+            self.__observers.append(observer)
+
+    def unsubscribe(self, observer: abstract_transaction_observer):
+        """ Отписывает наблюдателя от изменений коллекции """
+        if observer in self.__observers:
+            self.__observers.remove(observer)
+
+    # Словарь
+
+    def __getitem__(self, key):
+        row = self.__store.transaction(key) if isinstance(key, str) else None
+        if row is None:
+            raise KeyError(key)
+        return self.__model(row)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.__store.transaction(key) is not None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __iter__(self):
+        for row in self.__rows():
+            yield row[0]
+
+    def values(self):
+        return sqlite_transaction_collection.__view(
+            self, lambda: (self.__model(row) for row in self.__rows()))
+
+    def items(self):
+        return sqlite_transaction_collection.__view(
+            self, lambda: ((row[0], self.__model(row)) for row in self.__rows()))
+
+    def __setitem__(self, key, transaction):
+        self.update({key: transaction})
+
+    def __delitem__(self, key):
+        with self.__write:
+            row = self.__store.transaction(key) if isinstance(key, str) else None
+            if row is None:
+                raise KeyError(key)
+            transaction = self.__model(row)
+            self.__store.delete_transaction(key)
+            self.__count -= 1
+            self.__version += 1
+            self.__snapshots.invalidate(row[1], transaction.date)
+            for observer in self.__observers:
+                observer.transaction_removed(key, transaction)
+            if self.__listener is not None:
+                self.__listener(key, None)
+
+    def clear(self):
+        with self.__write:
+            if len(self.__observers) > 0:
+                for key, transaction in self.items():
+                    for observer in self.__observers:
+                        observer.transaction_removed(key, transaction)
+            self.__store.clear_transactions()
+            self.__count = 0
+            self.__version += 1
+            self.__snapshots.clear()
+            if self.__listener is not None:
+                self.__listener(None, None)
+
+    def update(self, *args, **kwargs):
+        with self.__write:
+            # Все транзакции пакета записываются одной фиксацией
+            items = dict(*args, **kwargs)
+            if len(items) == 0:
+                return
+            # Заменяемые транзакции находятся одним запросом по всем кодам пакета
+            previous = {}
+            if self.__count > 0:
+                previous = {row[0]: self.__model(row) for row in self.__store.transactions(list(items))}
+            self.__store.put_transactions([
+                sqlite_transaction_collection.__row(key, transaction) for key, transaction in items.items()
+            ])
+            self.__count += len(items) - len(previous)
+            self.__version += len(items)
+
+            for key, transaction in items.items():
+                old = previous.get(key)
+                if old is not None:
+                    self.__snapshots.invalidate(old.storage.unique_code, old.date)
+                    for observer in self.__observers:
+                        observer.transaction_removed(key, old)
+                self.__snapshots.invalidate(transaction.storage.unique_code, transaction.date)
+                for observer in self.__observers:
+                    observer.transaction_added(key, transaction)
+                if self.__listener is not None:
+                    self.__listener(key, transaction)
+
+    def snapshot(self):
+        """
+        Возвращает снимок транзакций: транзакцию чтения базы (sqlite_pool.snapshot),
+        в которой таблица перебирается страницами, в том числе из другого потока.
+        Снимок занимает соединение пула, после перебора его нужно закрыть (close).
+        """
+        handle = self.__store.pool.snapshot()
+        try:
+            with handle.use():
+                count = self.__store.transaction_count()
+        except BaseException:
+            handle.close()
+            raise
+        return sqlite_transaction_collection.__snapshot(
+            count, handle, lambda: ((row[0], self.__model(row)) for row in self.__rows(handle)))
+
+    # Выборки
+
+    def storage_index(self, storage_code: str) -> date_index:
+        """
+        Возвращает транзакции склада, отсортированные по дате.
+
+        Аргументы:
+            storage_code (str): Уникальный код склада
+
+        Возвращает:
+            date_index: Индекс транзакций склада, прочитанный из базы
+        """
+        result = date_index()
+        result.extend([
+            (transaction.date, transaction)
+            for transaction in map(self.__model, self.__store.storage_transactions(storage_code))
+        ])
+        return result
+
+    def transactions_between(self, start_date: datetime, end_date: datetime, storage_code: str = None,
+                             nomenclature_code: str = None, offset: int = 0, limit: int = None) -> list:
+        """
+        Возвращает транзакции за период [start_date, end_date] в порядке возрастания даты.
+        Выборка выполняется по индексу (storage_id, date), (nomenclature_id, date) или (date).
+
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage_code (str): Уникальный код склада (необязательно)
+            nomenclature_code (str): Уникальный код номенклатуры (необязательно)
+            offset (int): Количество пропускаемых транзакций
+            limit (int): Максимальное количество транзакций (None - без ограничения)
+
+        Возвращает:
+            list[transaction_model]: Транзакции периода
+        """
+        validator.validate(start_date, datetime)
+        validator.validate(end_date, datetime)
+        validator.validate(offset, int)
+        if limit is not None:
+            validator.validate(limit, int)
+        rows = self.__store.transactions_between(
+            start_date, end_date, storage_code, nomenclature_code, offset, limit)
+        return [self.__model(row) for row in rows]
+
+    def totals(self, start_date: datetime, end_date: datetime, storage_codes: list) -> dict:
+        """
+        Считает показатели ОСВ складов за период агрегированием в базе.
+
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage_codes (list[str]): Уникальные коды складов
+
+        Возвращает:
+            dict: код склада -> {код номенклатуры: [начальный остаток, приход, расход]}
+                  в единице строки ведомости
+        """
+        validator.validate(start_date, datetime)
+        validator.validate(end_date, datetime)
+        result = {code: {} for code in storage_codes}
+        for storage_code, nomenclature_code, measure_code, opening, income, outcome \
+                in self.__store.totals(start_date, end_date, storage_codes):
+            nomenclature = self.__resolve(nomenclature_code)
+            if nomenclature is None:
+                continue
+            measure = self.__resolve(measure_code)
+            target = measure_conversion.resolve(nomenclature.measure)[0]
+            total = result[storage_code].setdefault(nomenclature_code, [0.0, 0.0, 0.0])
+            for position, value in enumerate((opening, income, outcome)):
+                total[position] += value if measure is None else measure_conversion.convert(value, measure, target)
+        return result
+
+    # Служебные методы
+
+    def __rows(self, handle = None):
+        """ Перебирает строки таблицы страницами в порядке добавления (handle - снимок базы) """
+        after = 0
+        while True:
+            with nullcontext() if handle is None else handle.use():
+                page = self.__store.transaction_page(after, sqlite_transaction_collection.PAGE)
+            for row in page:
+                yield row[1:]
+            if len(page) < sqlite_transaction_collection.PAGE:
+                return
+            after = page[-1][0]
+
+    def __model(self, row: tuple) -> transaction_model:
+        """ Собирает модель транзакции из строки таблицы """
+        # Значения строки проверены при записи - модель собирается без проверок сеттеров
+        key, storage, nomenclature, measure, name, quantity, date = row
+        resolve = self.__resolve
+        return transaction_model.create_trusted(
+            key, name or "",
+            None if storage is None else resolve(storage),
+            None if nomenclature is None else resolve(nomenclature),
+            None if measure is None else resolve(measure),
+            quantity, sqlite_store.decode_date(date))
+
+    @staticmethod
+    def __row(key, transaction) -> tuple:
+        """ Строка таблицы для модели транзакции """
+        validator.validate(key, str)
+        validator.validate(transaction, transaction_model)
+        return (
+            key,
+            None if transaction.storage is None else transaction.storage.unique_code,
+            None if transaction.nomenclature is None else transaction.nomenclature.unique_code,
+            None if transaction.measure is None else transaction.measure.unique_code,
+            transaction.name,
+            float(transaction.quantity),
+            sqlite_store.encode_date(transaction.date)
+        )
+
+    class __view:
+        """ Значения или пары коллекции, читаемые страницами без поиска по каждому ключу """
+
+        def __init__(self, collection, iterate):
+            self.__collection = collection
+            self.__iterate = iterate
+
+        def __len__(self) -> int:
+            return len(self.__collection)
+
+        def __iter__(self):
+            return self.__iterate()
+
+    class __snapshot:
+        """ Пары коллекции, читаемые страницами в транзакции чтения базы """
+
+        def __init__(self, count: int, handle, iterate):
+            self.__count = count
+            self.__handle = handle
+            self.__iterate = iterate
+
+        def __len__(self) -> int:
+            return self.__count
+
+        def items(self):
+            return self.__iterate()
+
+        def values(self):
+            return (item for _, item in self.__iterate())
+
+        def close(self):
+            self.__handle.close()
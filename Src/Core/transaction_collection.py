@@ -0,0 +1,332 @@
+import threading
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from Src.Core.abstract_transaction_observer import abstract_transaction_observer
+from Src.Core.balance_snapshots import balance_snapshots
+from Src.Core.date_index import date_index
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.osv_builder import osv_builder
+from Src.Core.transaction_columns import transaction_columns
+from Src.Core.validator import argument_exception, validator
+from Src.Core.versioned_collection import versioned_collection
+
+class transaction_collection(versioned_collection):
+    """
+    Коллекция транзакций репозитория.
+
+    Ведет себя как словарь с версией (versioned_collection) {ключ: transaction_model}
+    и дополнительно поддерживает вторичные индексы транзакций, отсортированных по дате:
+    общий, по складу (unique_code) и по номенклатуре (unique_code).
+    Индексы обновляются инкрементально при каждой вставке и удалении.
+    Рядом с индексом хранятся снимки остатков складов (balance_snapshots),
+    которые сбрасываются при изменении транзакций задним числом.
+    По запросу дополнительно ведется колоночное хранилище (transaction_columns).
+    О каждой вставке и удалении уведомляются подписанные наблюдатели
+    (abstract_transaction_observer).
+
+    Особенности:
+        - Для удаления из индексов запоминаются склад, номенклатура и дата на момент вставки,
+          поэтому после изменения транзакции ее нужно повторно записать по тому же ключу.
+        - Колоночное хранилище хранит пересчитанные количества и перестраивается
+          при изменении таблицы пересчета единиц (measure_conversion).
+        - Даты транзакций - без часового пояса: транзакция с другой датой отклоняется
+          до изменения коллекции, а пакет сначала добавляется в индексы, затем в словарь.
+        - Изменения вместе с уведомлениями наблюдателей выполняются под блокировкой
+          записи (write_lock): под ней же наблюдатель может перебрать коллекцию целиком.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.__write = threading.RLock()
+        super().__init__()
+        self.__dates = date_index()
+        self.__storages = {}
+        self.__nomenclatures = {}
+        self.__positions = {}
+        self.__snapshots = balance_snapshots()
+        self.__columns = None
+        self.__columns_version = 0
+        self.__observers = []
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, transaction):
+        transaction_collection.__check(transaction)
+        with self.__write:
+            if key in self:
+                self.__unindex(key)
+            super().__setitem__(key, transaction)
+            self.__index(key, transaction)
+
+    def __delitem__(self, key):
+        with self.__write:
+            self.__unindex(key)
+            super().__delitem__(key)
+
+    def pop(self, key, *default):
+        with self.__write:
+            if key in self:
+                self.__unindex(key)
+            return super().pop(key, *default)
+
+    def popitem(self):
+        with self.__write:
+            if len(self) == 0:
+                raise KeyError("popitem(): коллекция пуста")
+            key = next(reversed(self))
+            return key, self.pop(key)
+
+    def clear(self):
+        with self.__write:
+            for key in list(self.keys()):
+                self.__notify_removed(key, super().__getitem__(key))
+            super().clear()
+            self.__dates = date_index()
+            self.__storages.clear()
+            self.__nomenclatures.clear()
+            self.__positions.clear()
+            self.__snapshots.clear()
+            if self.__columns is not None:
+                self.__columns.clear()
+
+    def update(self, *args, **kwargs):
+        # Новые ключи добавляются в словарь и индексы пакетом, замена существующих - по одному
+        items = dict(*args, **kwargs)
+        transaction_collection.__check_many(items.values())
+        with self.__write:
+            if self.keys().isdisjoint(items):
+                added = items
+            else:
+                added = {}
+                for key, transaction in items.items():
+                    if key in self:
+                        self[key] = transaction
+                    else:
+                        added[key] = transaction
+            if len(added) == 0:
+                return
+            pairs = list(added.items())
+            self.__index_many(pairs)
+            self.add_many(added)
+            for observer in self.__observers:
+                observer.transactions_added(pairs)
+
+    @property
+    def write_lock(self) -> threading.RLock:
+        """Возвращает блокировку записи: изменения коллекции и уведомления наблюдателей выполняются под ней"""
+        return self.__write
+
+    @property
+    def snapshots(self) -> balance_snapshots:
+        """Возвращает снимки остатков складов"""
+        return self.__snapshots
+
+    @property
+    def columns(self) -> transaction_columns:
+        """Возвращает колоночное хранилище или None, если оно не включено"""
+        if self.__columns is not None and self.__columns_version != measure_conversion.version():
+            self.disable_columns()
+            self.enable_columns()
+        return self.__columns
+
+    def enable_columns(self) -> bool:
+        """
+        Включает колоночное хранилище и заполняет его текущими транзакциями.
+
+        Возвращает:
+            bool: False, если numpy не установлен
+        """
+        if not transaction_columns.available():
+            return False
+        if self.__columns is None:
+            self.__columns_version = measure_conversion.version()
+            self.__columns = transaction_columns(osv_builder.row_quantity, max(len(self), 1024))
+            for key, transaction in self.items():
+                self.__columns.append(key, transaction)
+        return True
+
+    def disable_columns(self):
+        """ Отключает колоночное хранилище """
+        self.__columns = None
+
+    def subscribe(self, observer: abstract_transaction_observer):
+        """
+        Подписывает наблюдателя на изменения коллекции.
+
+        Аргументы:
+            observer (abstract_transaction_observer): Наблюдатель
+        """
+        validator.validate(observer, abstract_transaction_observer)
+        if observer not in self.__observers:
+            self.__observers.append(observer)
+
+    def unsubscribe(self, observer: abstract_transaction_observer):
+        """ Отписывает наблюдателя от изменений коллекции """
+        if observer in self.__observers:
+            self.__observers.remove(observer)
+
+    def storage_index(self, storage_code: str) -> date_index:
+        """
+        Возвращает транзакции склада, отсортированные по дате.
+
+        Аргументы:
+            storage_code (str): Уникальный код склада
+
+        Возвращает:
+            date_index: Индекс транзакций склада (пустой, если транзакций нет)
+        """
+        return self.__storages.get(storage_code) or date_index()
+
+    def transactions_between(self, start_date: datetime, end_date: datetime, storage_code: str = None,
+                             nomenclature_code: str = None, offset: int = 0, limit: int = None) -> list:
+        """
+        Возвращает транзакции за период [start_date, end_date] в порядке возрастания даты.
+
+        Границы периода находятся бинарным поиском по подходящему индексу,
+        поэтому стоимость - O(log n) плюс размер выборки.
+        Если заданы и склад, и номенклатура, просматривается меньший
+        из двух диапазонов с фильтрацией по второму условию.
+
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage_code (str): Уникальный код склада (необязательно)
+            nomenclature_code (str): Уникальный код номенклатуры (необязательно)
+            offset (int): Количество пропускаемых транзакций
+            limit (int): Максимальное количество транзакций (None - без ограничения)
+
+        Возвращает:
+            list[transaction_model]: Транзакции периода
+        """
+        validator.validate(start_date, datetime)
+        validator.validate(end_date, datetime)
+        validator.validate(offset, int)
+        if limit is not None:
+            validator.validate(limit, int)
+        stop = None if limit is None else offset + limit
+
+        index = self.__dates
+        check = None
+        if storage_code is not None:
+            index = self.__storages.get(storage_code) or date_index()
+        if nomenclature_code is not None:
+            by_nomenclature = self.__nomenclatures.get(nomenclature_code) or date_index()
+            if storage_code is None:
+                index = by_nomenclature
+            elif transaction_collection.__range_size(by_nomenclature, start_date, end_date) \
+                    < transaction_collection.__range_size(index, start_date, end_date):
+                index = by_nomenclature
+                check = lambda transaction: transaction.storage.unique_code == storage_code
+            else:
+                check = lambda transaction: transaction.nomenclature.unique_code == nomenclature_code
+
+        lower = index.lower(start_date)
+        upper = index.upper(end_date)
+        items = index.items
+        if check is None:
+            return items[min(lower + offset, upper):upper if stop is None else min(lower + stop, upper)]
+        selected = (items[position] for position in range(lower, upper) if check(items[position]))
+        return list(islice(selected, offset, stop))
+
+    @staticmethod
+    def __range_size(index: date_index, start_date: datetime, end_date: datetime) -> int:
+        """ Количество элементов индекса за период """
+        return max(index.upper(end_date) - index.lower(start_date), 0)
+
+    @staticmethod
+    def __check(transaction):
+        """ Проверяет дату транзакции: индексы сравнивают только даты без часового пояса """
+        validator.validate(transaction.date, datetime)
+        if transaction.date.tzinfo is not None:
+            raise argument_exception(f"Дата транзакции должна быть без часового пояса: {transaction.date}")
+
+    @staticmethod
+    def __check_many(transactions):
+        """ Проверяет даты пакета: полная проверка только для дат, не прошедших быструю """
+        for transaction in transactions:
+            date = transaction.date
+            if date.__class__ is not datetime or date.tzinfo is not None:
+                transaction_collection.__check(transaction)
+
+    def __index(self, key, transaction):
+        """ Добавляет транзакцию во вторичные индексы """
+        storage_code = transaction.storage.unique_code
+        nomenclature_code = transaction.nomenclature.unique_code
+        index = self.__storages.get(storage_code)
+        if index is None:
+            index = self.__storages[storage_code] = date_index()
+        index.insert(transaction.date, transaction)
+        index = self.__nomenclatures.get(nomenclature_code)
+        if index is None:
+            index = self.__nomenclatures[nomenclature_code] = date_index()
+        index.insert(transaction.date, transaction)
+        self.__dates.insert(transaction.date, transaction)
+        self.__positions[key] = (storage_code, nomenclature_code, transaction.date)
+        self.__snapshots.invalidate(storage_code, transaction.date)
+        if self.__columns is not None:
+            self.__columns.append(key, transaction)
+        for observer in self.__observers:
+            observer.transaction_added(key, transaction)
+
+    def __index_many(self, pairs: list):
+        """
+        Добавляет пакет транзакций во вторичные индексы
+        (наблюдатели уведомляются после добавления пакета в словарь).
+
+        Пакет сортируется по дате один раз (устойчиво, порядок добавления сохраняется),
+        поэтому группы складов и номенклатур собираются уже упорядоченными,
+        и сортировка в date_index.extend проходит по ним за линейное время.
+        """
+        if len(pairs) == 0:
+            return
+        rows = sorted([(transaction.date, key, transaction) for key, transaction in pairs], key=itemgetter(0))
+        storages = {}
+        nomenclatures = {}
+        dates = []
+        positions = self.__positions
+        for date, key, transaction in rows:
+            storage_code = transaction.storage.unique_code
+            nomenclature_code = transaction.nomenclature.unique_code
+            pair = (date, transaction)
+            group = storages.get(storage_code)
+            if group is None:
+                group = storages[storage_code] = []
+            group.append(pair)
+            group = nomenclatures.get(nomenclature_code)
+            if group is None:
+                group = nomenclatures[nomenclature_code] = []
+            group.append(pair)
+            dates.append(pair)
+            positions[key] = (storage_code, nomenclature_code, date)
+        if self.__columns is not None:
+            for key, transaction in pairs:
+                self.__columns.append(key, transaction)
+
+        for indexes, groups in ((self.__storages, storages), (self.__nomenclatures, nomenclatures)):
+            for code, group in groups.items():
+                index = indexes.get(code)
+                if index is None:
+                    index = indexes[code] = date_index()
+                index.extend(group)
+        self.__dates.extend(dates)
+
+        # Снимки склада сбрасываются один раз - с самой ранней даты пакета, после изменения индекса;
+        # группы упорядочены, поэтому самая ранняя дата - первая
+        for storage_code, group in storages.items():
+            self.__snapshots.invalidate(storage_code, group[0][0])
+
+    def __unindex(self, key):
+        """ Удаляет транзакцию из вторичных индексов """
+        transaction = super().__getitem__(key)
+        storage_code, nomenclature_code, date = self.__positions.pop(key)
+        self.__storages[storage_code].remove(date, transaction)
+        self.__nomenclatures[nomenclature_code].remove(date, transaction)
+        self.__dates.remove(date, transaction)
+        self.__snapshots.invalidate(storage_code, date)
+        if self.__columns is not None:
+            self.__columns.remove(key)
+        self.__notify_removed(key, transaction)
+
+    def __notify_removed(self, key, transaction):
+        """ Уведомляет наблюдателей об удалении транзакции """
+        for observer in self.__observers:
+            observer.transaction_removed(key, transaction)
@@ -0,0 +1,187 @@
+from datetime import datetime, timedelta
+from Src.Core.validator import operation_exception
+
+# NumPy - необязательная зависимость, без нее колоночное хранилище недоступно
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class transaction_columns:
+    """
+    Колоночное хранилище транзакций для аналитики.
+
+    Хранит транзакции в параллельных массивах NumPy:
+        - dates (int64): дата в микросекундах от 1970-01-01
+        - quantities (float64): количество, уже пересчитанное в единицу строки ОСВ
+        - storages, nomenclatures, measures (int32): целочисленные коды сущностей
+
+    Оборотно-сальдовая ведомость считается векторно: маски по складу и датам
+    и суммирование по номенклатуре через np.bincount.
+
+    Особенности:
+        - Массивы растут с удвоением емкости, вставка амортизированно O(1).
+        - Удаленная транзакция помечается кодом склада -1 и в расчетах не участвует.
+          Когда помеченных строк становится больше доли COMPACT_RATIO от занятых,
+          массивы уплотняются: живые строки сдвигаются к началу с сохранением порядка.
+    """
+
+    # Доля помеченных удаленными строк, после которой массивы уплотняются
+    COMPACT_RATIO = 0.25
+
+    __epoch = datetime(1970, 1, 1)
+    __microsecond = timedelta(microseconds=1)
+
+    def __init__(self, convert, capacity: int = 1024):
+        """
+        Аргументы:
+            convert (callable): Функция transaction -> (код номенклатуры, количество в единице строки ОСВ)
+            capacity (int): Начальная емкость массивов
+        """
+        if not transaction_columns.available():
+            raise operation_exception("Для колоночного хранилища требуется пакет numpy!")
+        self.__convert = convert
+        self.__size = 0
+        self.__dates = np.empty(capacity, dtype=np.int64)
+        self.__quantities = np.empty(capacity, dtype=np.float64)
+        self.__storages = np.empty(capacity, dtype=np.int32)
+        self.__nomenclatures = np.empty(capacity, dtype=np.int32)
+        self.__measures = np.empty(capacity, dtype=np.int32)
+        # Словари кодирования unique_code -> целочисленный код
+        self.__storage_codes = {}
+        self.__nomenclature_codes = {}
+        self.__measure_codes = {}
+        # Ключ транзакции в коллекции -> номер строки
+        self.__rows = {}
+        # Количество строк, помеченных удаленными
+        self.__removed = 0
+
+    @staticmethod
+    def available() -> bool:
+        """ Проверяет, установлен ли numpy """
+        return np is not None
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    @property
+    def removed(self) -> int:
+        """ Количество строк, помеченных удаленными и еще не уплотненных """
+        return self.__removed
+
+    def epoch(self, date: datetime) -> int:
+        """ Переводит дату в микросекунды от 1970-01-01 """
+        return (date - transaction_columns.__epoch) // transaction_columns.__microsecond
+
+    def append(self, key, transaction):
+        """
+        Добавляет транзакцию в хранилище.
+
+        Аргументы:
+            key: Ключ транзакции в коллекции
+            transaction (transaction_model): Транзакция
+        """
+        if key in self.__rows:
+            self.remove(key)
+        if self.__size == len(self.__dates):
+            self.__grow()
+
+        code, quantity = self.__convert(transaction)
+        row = self.__size
+        self.__dates[row] = self.epoch(transaction.date)
+        self.__quantities[row] = quantity
+        self.__storages[row] = transaction_columns.__encode(self.__storage_codes, transaction.storage.unique_code)
+        self.__nomenclatures[row] = transaction_columns.__encode(self.__nomenclature_codes, code)
+        self.__measures[row] = transaction_columns.__encode(self.__measure_codes, transaction.measure.unique_code)
+        self.__rows[key] = row
+        self.__size += 1
+
+    def remove(self, key):
+        """
+        Исключает транзакцию из расчетов.
+
+        Аргументы:
+            key: Ключ транзакции в коллекции
+        """
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        self.__storages[row] = -1
+        self.__removed += 1
+        if self.__removed > self.__size * transaction_columns.COMPACT_RATIO:
+            self.__compact()
+
+    def clear(self):
+        """ Удаляет все транзакции """
+        self.__size = 0
+        self.__removed = 0
+        self.__rows.clear()
+
+    def totals(self, storage_code: str, start_date: datetime, end_date: datetime) -> dict:
+        """
+        Считает показатели ОСВ склада за период.
+
+        Аргументы:
+            storage_code (str): Уникальный код склада
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+
+        Возвращает:
+            dict: код номенклатуры -> [начальный остаток, приход, расход]
+        """
+        storage = self.__storage_codes.get(storage_code)
+        if storage is None:
+            return {}
+
+        size = self.__size
+        count = len(self.__nomenclature_codes)
+        dates = self.__dates[:size]
+        quantities = self.__quantities[:size]
+        nomenclatures = self.__nomenclatures[:size]
+
+        is_storage = self.__storages[:size] == storage
+        before = is_storage & (dates < self.epoch(start_date))
+        period = is_storage & (dates >= self.epoch(start_date)) & (dates <= self.epoch(end_date))
+        income = period & (quantities > 0)
+        outcome = period & ~(quantities > 0)
+
+        opening_sum = np.bincount(nomenclatures[before], weights=quantities[before], minlength=count)
+        income_sum = np.bincount(nomenclatures[income], weights=quantities[income], minlength=count)
+        outcome_sum = np.bincount(nomenclatures[outcome], weights=np.abs(quantities[outcome]), minlength=count)
+
+        return {
+            code: [float(opening_sum[index]), float(income_sum[index]), float(outcome_sum[index])]
+            for code, index in self.__nomenclature_codes.items()
+        }
+
+    def __compact(self):
+        """ Убирает помеченные удаленными строки и перенумеровывает оставшиеся """
+        size = self.__size
+        alive = np.flatnonzero(self.__storages[:size] >= 0)
+        count = len(alive)
+        for values in (self.__dates, self.__quantities, self.__storages, self.__nomenclatures, self.__measures):
+            values[:count] = values[alive]
+        # Старый номер строки -> новый
+        numbers = np.zeros(size, dtype=np.int64)
+        numbers[alive] = np.arange(count)
+        numbers = numbers.tolist()
+        self.__rows = {key: numbers[row] for key, row in self.__rows.items()}
+        self.__size = count
+        self.__removed = 0
+
+    def __grow(self):
+        """ Удваивает емкость массивов """
+        capacity = max(len(self.__dates) * 2, 1)
+        self.__dates = np.resize(self.__dates, capacity)
+        self.__quantities = np.resize(self.__quantities, capacity)
+        self.__storages = np.resize(self.__storages, capacity)
+        self.__nomenclatures = np.resize(self.__nomenclatures, capacity)
+        self.__measures = np.resize(self.__measures, capacity)
+
+    @staticmethod
+    def __encode(codes: dict, unique_code: str) -> int:
+        """ Возвращает целочисленный код сущности, назначая новый при необходимости """
+        value = codes.get(unique_code)
+        if value is None:
+            value = codes[unique_code] = len(codes)
+        return value
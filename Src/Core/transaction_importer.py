@@ -0,0 +1,325 @@
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
+from Src.Core.transaction_ingest import transaction_ingest
+from Src.Core.validator import argument_exception, validator
+from Src.reposity import reposity
+
+class transaction_importer:
+    """
+    Потоковый импорт транзакций из файла CSV или JSON lines.
+
+    Файл обрабатывается конвейером из трех потоков, связанных очередями
+    ограниченной длины (queue_size частей):
+        чтение - строки файла собираются в части по batch_size строк;
+        разбор - часть раскладывается в столбцы, коды склада, номенклатуры
+                 и единицы ищутся в словарях, значения проверяются (transaction_ingest);
+        вставка - в потоке вызова: проверенные транзакции части добавляются
+                  в репозиторий одной операцией, отклоненные строки пишутся в файл отказов.
+    Если вставка не успевает, чтение останавливается на заполненной очереди,
+    поэтому в памяти одновременно не больше (2 * queue_size + 3) частей файла.
+
+    Особенности:
+        - Строка с ошибкой не прерывает импорт: она записывается в файл отказов
+          (JSON lines {"line", "error", "row"}), в итог попадают первые 100 ошибок.
+          Для строки CSV, которую не удалось разобрать (csv.Error), row = null.
+        - Для репозитория в памяти сборка мусора приостанавливается на время
+          разбора и вставки каждой части (transaction_ingest.paused_gc).
+        - Номера строк считаются от начала файла (заголовок CSV - строка 1).
+        - Повтор кода транзакции в разных частях файла заменяет транзакцию,
+          как и код, уже имеющийся в репозитории.
+        - Память постоянна только для хранилища SQLite (repository_backend = "sqlite"):
+          в памяти репозитория все транзакции остаются загруженными.
+        - Сжатые файлы не поддерживаются: файл читается построчно как UTF-8 (с BOM или без).
+    """
+
+    # Количество строк в части файла по умолчанию
+    BATCH = 10000
+
+    # Длина очередей между этапами конвейера (в частях)
+    QUEUE = 4
+
+    # Количество ошибок в итоге импорта
+    ERRORS = 100
+
+    # Признак окончания данных в очереди
+    __END = object()
+
+    # Расширения файлов по форматам
+    __EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+    @staticmethod
+    def detect_format(filename: str) -> str:
+        """
+        Определяет формат файла по расширению.
+
+        Ошибки:
+            argument_exception: Если расширение не соответствует поддерживаемому формату
+        """
+        validator.validate(filename, str)
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in transaction_importer.__EXTENSIONS:
+            raise argument_exception(f"Не удалось определить формат импорта по имени файла: {filename}")
+        return transaction_importer.__EXTENSIONS[extension]
+
+    def __init__(self, repo: reposity, batch_size: int = BATCH, queue_size: int = QUEUE):
+        """
+        Аргументы:
+            repo (reposity): Репозиторий, в который добавляются транзакции
+            batch_size (int): Количество строк в части файла
+            queue_size (int): Длина очередей между этапами конвейера
+        """
+        validator.validate(repo, reposity)
+        validator.validate(batch_size, int)
+        validator.validate(queue_size, int)
+        if batch_size < 1 or queue_size < 1:
+            raise argument_exception("Размер части и длина очереди должны быть положительными")
+        self.__repo = repo
+        self.__batch_size = batch_size
+        self.__queue_size = queue_size
+
+    def run(self, filename: str, import_format: str = "csv", reject_filename: str = None,
+            progress=None, progress_every: float = 1.0) -> dict:
+        """
+        Импортирует файл в репозиторий.
+
+        Аргументы:
+            filename (str): Имя файла
+            import_format (str): "csv" или "jsonl"
+            reject_filename (str): Файл отказов (по умолчанию не записывается)
+            progress (callable): Вызывается с ходом импорта (dict) не чаще раза
+                                 в progress_every секунд и по окончании
+            progress_every (float): Интервал отчетов о ходе импорта в секундах
+
+        Возвращает:
+            dict: Итог импорта: строк, добавлено, отклонено, ошибки (не больше 100),
+                  время в секундах и строк в секунду
+
+        Ошибки:
+            argument_exception: Файл не найден, неподдерживаемый формат или нет обязательного столбца CSV
+        """
+        validator.validate(filename, str)
+        validator.validate(import_format, str)
+        validator.validate(progress_every, (int, float))
+        if import_format not in transaction_ingest.formats():
+            raise argument_exception(f"Неподдерживаемый формат импорта: {import_format}")
+        if reject_filename is not None:
+            validator.validate(reject_filename, str)
+        if progress is not None and not callable(progress):
+            raise argument_exception("Ход импорта передается функции")
+        if not os.path.isfile(filename):
+            raise argument_exception(f"Файл не найден: {filename}")
+
+        data = self.__repo.data
+        references = (
+            {item.unique_code: item for item in data[reposity.storage_key()].values()},
+            {item.unique_code: item for item in data[reposity.nomenclature_key()].values()},
+            {item.unique_code: item for item in data[reposity.measure_key()].values()}
+        )
+        state = {
+            "rows": 0, "inserted": 0, "rejected": 0,
+            "bytes": 0, "size": os.path.getsize(filename),
+            "elapsed": 0.0, "rows_per_second": 0.0
+        }
+        errors = []
+        failures = []
+        stop = threading.Event()
+        lines = queue.Queue(self.__queue_size)
+        batches = queue.Queue(self.__queue_size)
+
+        handle = open(filename, "rb")
+        text = io.TextIOWrapper(handle, encoding="utf-8-sig", newline="")
+        rejects = None
+        threads = []
+        started = time.perf_counter()
+        try:
+            if import_format == "csv":
+                rows = csv.reader(text)
+                try:
+                    header = next(rows, [])
+                except csv.Error as e:
+                    raise argument_exception(f"Ошибка разбора заголовка CSV: {e}")
+                # Заголовок проверяется до запуска конвейера
+                transaction_ingest.csv_columns(header, [], [])
+                read = lambda: self.__read_csv(rows, header, handle, lines, stop)
+            else:
+                header = None
+                read = lambda: self.__read_jsonl(text, handle, lines, stop)
+            if reject_filename is not None:
+                rejects = open(reject_filename, "w", encoding="utf-8")
+
+            threads = [
+                threading.Thread(target=self.__stage, args=(read, lines, failures, stop), daemon=True),
+                threading.Thread(
+                    target=self.__stage,
+                    args=(lambda: self.__parse(import_format, header, references, lines, batches, stop),
+                          batches, failures, stop),
+                    daemon=True)
+            ]
+            for thread in threads:
+                thread.start()
+
+            reported = started
+            while True:
+                batch = self.__take(batches, stop)
+                if batch is transaction_importer.__END:
+                    break
+                items, rejected, count, position = batch
+                if len(items) > 0:
+                    with transaction_ingest.paused_gc(self.__repo.store is None):
+                        self.__repo.add_transactions(items)
+                if len(rejected) > 0:
+                    if rejects is not None:
+                        rejects.writelines(
+                            json.dumps({"line": line, "error": message, "row": row}, ensure_ascii=False) + "\n"
+                            for line, message, row in rejected)
+                    errors.extend(rejected[:transaction_importer.ERRORS - len(errors)])
+                state["rows"] += count
+                state["inserted"] += len(items)
+                state["rejected"] += len(rejected)
+                state["bytes"] = position
+
+                now = time.perf_counter()
+                if progress is not None and now - reported >= progress_every:
+                    reported = now
+                    progress(self.__report(state, now - started))
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            text.close()
+            if rejects is not None:
+                rejects.close()
+
+        if len(failures) > 0:
+            raise failures[0]
+        state["bytes"] = state["size"]
+        result = self.__report(state, time.perf_counter() - started)
+        if progress is not None:
+            progress(dict(result))
+        return {
+            "total": result["rows"],
+            "inserted": result["inserted"],
+            "rejected": result["rejected"],
+            "errors": [{"line": line, "error": message} for line, message, _ in errors],
+            "elapsed": result["elapsed"],
+            "rows_per_second": result["rows_per_second"]
+        }
+
+    # Этапы конвейера
+
+    def __read_csv(self, rows, header: list, handle, target: queue.Queue, stop: threading.Event):
+        """
+        Собирает строки CSV в части: (строки, номера строк, прочитано байт,
+        строки с ошибкой разбора [(номер строки, ошибка)])
+        """
+        size = self.__batch_size
+        batch = []
+        numbers = []
+        errors = []
+        for number, row, error in transaction_ingest.csv_rows(rows):
+            if error is not None:
+                errors.append((number, error))
+                continue
+            batch.append(row)
+            numbers.append(number)
+            if len(batch) == size:
+                if not self.__put(target, (batch, numbers, handle.tell(), errors), stop):
+                    return
+                batch = []
+                numbers = []
+                errors = []
+        if len(batch) > 0 or len(errors) > 0:
+            self.__put(target, (batch, numbers, handle.tell(), errors), stop)
+
+    def __read_jsonl(self, text, handle, target: queue.Queue, stop: threading.Event):
+        """ Собирает непустые строки JSON lines в части: (строки, номера строк, прочитано байт, []) """
+        size = self.__batch_size
+        batch = []
+        numbers = []
+        for number, line in enumerate(text, 1):
+            if line.isspace() or line == "":
+                continue
+            batch.append(line)
+            numbers.append(number)
+            if len(batch) == size:
+                if not self.__put(target, (batch, numbers, handle.tell(), []), stop):
+                    return
+                batch = []
+                numbers = []
+        if len(batch) > 0:
+            self.__put(target, (batch, numbers, handle.tell(), []), stop)
+
+    def __parse(self, import_format: str, header: list, references: tuple,
+                source: queue.Queue, target: queue.Queue, stop: threading.Event):
+        """
+        Разбирает части в транзакции: (транзакции, отклоненные [(номер строки, ошибка, строка)],
+        строк в части, прочитано байт)
+        """
+        storages, nomenclatures, measures = references
+        while True:
+            batch = self.__take(source, stop)
+            if batch is transaction_importer.__END:
+                return
+            rows, numbers, position, unparsed = batch
+            if import_format == "csv":
+                columns, accepted, rejected = transaction_ingest.csv_columns(header, rows, numbers)
+            else:
+                columns, accepted, rejected = transaction_ingest.jsonl_columns(rows, numbers)
+            with transaction_ingest.paused_gc(self.__repo.store is None):
+                items, errors = transaction_ingest.build(columns, accepted, storages, nomenclatures, measures)
+            rejected = rejected + errors + unparsed
+            if len(rejected) > 0:
+                # Исходные строки нужны только для отказов (строка с ошибкой разбора CSV не сохраняется)
+                raw = dict(zip(numbers, rows))
+                rejected = [
+                    (line, message, raw[line].rstrip("\r\n") if import_format == "jsonl" else raw.get(line))
+                    for line, message in sorted(rejected)
+                ]
+            if not self.__put(target, (items, rejected, len(rows) + len(unparsed), position), stop):
+                return
+
+    # Служебные методы
+
+    @staticmethod
+    def __stage(work, target: queue.Queue, failures: list, stop: threading.Event):
+        """ Выполняет этап конвейера; по окончании передает признак конца, при ошибке останавливает конвейер """
+        try:
+            work()
+        except BaseException as e:
+            failures.append(e)
+            stop.set()
+            return
+        transaction_importer.__put(target, transaction_importer.__END, stop)
+
+    @staticmethod
+    def __put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """ Помещает элемент в очередь, ожидая места; False - если конвейер остановлен """
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    @staticmethod
+    def __take(source: queue.Queue, stop: threading.Event):
+        """ Берет элемент из очереди, ожидая его; при остановке конвейера - признак конца """
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return transaction_importer.__END
+
+    @staticmethod
+    def __report(state: dict, elapsed: float) -> dict:
+        """ Ход импорта с временем и скоростью """
+        state["elapsed"] = round(elapsed, 3)
+        state["rows_per_second"] = round(state["rows"] / elapsed, 1) if elapsed > 0 else 0.0
+        return dict(state)
@@ -0,0 +1,400 @@
+import csv
+import gc
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import repeat
+from Src.Core.validator import argument_exception, validator
+from Src.Models.transaction_model import transaction_model
+
+class transaction_ingest:
+    """
+    Пакетная загрузка транзакций из CSV или JSON lines.
+
+    Строки читаются в столбцы {поле: [значения]}, после чего каждый столбец
+    проверяется и преобразуется целиком: количество - float, дата -
+    datetime.fromisoformat, коды склада, номенклатуры и единицы - поиском
+    в словарях {unique_code: модель}. Модели создаются без проверок сеттеров
+    (transaction_model.create_trusted). Если столбец не преобразуется целиком,
+    он проверяется по одному значению, и строки с ошибками отклоняются.
+
+    Поля строки (как в transaction_dto):
+        id - уникальный код (необязательно, по умолчанию создается новый),
+        name - наименование (непустое, не больше 50 символов без пробелов по краям),
+        storage_id, nomenclature_id - коды склада и номенклатуры,
+        measure_id - код единицы (необязательно, по умолчанию единица номенклатуры),
+        quantity - количество (положительное - приход, отрицательное - расход),
+        date - дата "ГГГГ-ММ-ДД ЧЧ:ММ:СС" (или в формате ISO 8601 без часового пояса).
+
+    Особенности:
+        - CSV читается с заголовком, номера строк ошибок считаются от заголовка (строка 1).
+        - Повтор кода транзакции в одном пакете отклоняется.
+        - Строка CSV, которую не удалось разобрать (csv.Error), отклоняется как строка с ошибкой.
+        - На время пакета в памяти сборка мусора приостанавливается (paused_gc).
+    """
+
+    FIELDS = ["id", "name", "storage_id", "nomenclature_id", "measure_id", "quantity", "date"]
+    REQUIRED = ["name", "storage_id", "nomenclature_id", "quantity", "date"]
+
+    # Пакеты, выполняемые с приостановленной сборкой мусора, и ее состояние до первого из них
+    __gc_lock = threading.Lock()
+    __gc_depth = 0
+    __gc_enabled = False
+
+    @staticmethod
+    def formats() -> list:
+        """ Поддерживаемые форматы загрузки """
+        return ["csv", "jsonl"]
+
+    @staticmethod
+    def read(source, ingest_format: str = "csv") -> tuple:
+        """
+        Читает строки источника в столбцы.
+
+        Аргументы:
+            source (str|iterable[str]): Текст или строки текста
+            ingest_format (str): "csv" или "jsonl"
+
+        Возвращает:
+            tuple: (столбцы {поле: list}, номера строк, отклоненные [(номер строки, ошибка)])
+
+        Ошибки:
+            argument_exception: Неподдерживаемый формат или нет обязательного столбца CSV
+        """
+        validator.validate(ingest_format, str)
+        if ingest_format not in transaction_ingest.formats():
+            raise argument_exception(f"Неподдерживаемый формат загрузки: {ingest_format}")
+        lines = source.splitlines() if isinstance(source, str) else source
+        if ingest_format == "csv":
+            return transaction_ingest.__read_csv(lines)
+        return transaction_ingest.__read_jsonl(lines)
+
+    @staticmethod
+    def build(columns: dict, numbers: list, storages: dict, nomenclatures: dict, measures: dict) -> tuple:
+        """
+        Проверяет столбцы и создает модели транзакций.
+
+        Аргументы:
+            columns (dict): Столбцы {поле: list} (результат read)
+            numbers (list[int]): Номера строк источника
+            storages (dict): Склады {unique_code: storage_model}
+            nomenclatures (dict): Номенклатура {unique_code: nomenclature_model}
+            measures (dict): Единицы измерения {unique_code: measure_model}
+
+        Возвращает:
+            tuple: (транзакции {unique_code: transaction_model}, отклоненные [(номер строки, ошибка)])
+        """
+        validator.validate(columns, dict)
+        validator.validate(numbers, list)
+        count = len(numbers)
+        errors = {}
+        empty = [None] * count
+
+        quantities = transaction_ingest.__column(
+            columns.get("quantity", empty), transaction_ingest.__quantities, transaction_ingest.__quantity,
+            "Некорректное количество", errors)
+        dates = transaction_ingest.__column(
+            columns.get("date", empty), transaction_ingest.__dates, transaction_ingest.__date,
+            "Некорректная дата (ожидается ГГГГ-ММ-ДД ЧЧ:ММ:СС без часового пояса)", errors)
+        names = transaction_ingest.__column(
+            columns.get("name", empty), transaction_ingest.__names, transaction_ingest.__name,
+            "Некорректное наименование (непустое, не больше 50 символов)", errors)
+        stores = transaction_ingest.__lookup(columns.get("storage_id", empty), storages, "Склад не найден", errors)
+        items = transaction_ingest.__lookup(
+            columns.get("nomenclature_id", empty), nomenclatures, "Номенклатура не найдена", errors)
+        # Без кода единицы транзакция ведется в единице номенклатуры
+        codes = [
+            nomenclature.measure.unique_code if (code is None or code == "") and nomenclature is not None else code
+            for code, nomenclature in zip(columns.get("measure_id", empty), items)
+        ]
+        units = transaction_ingest.__lookup(codes, measures, "Единица измерения не найдена", errors)
+
+        # Коды для строк без id: случайные 128 бит в шестнадцатеричном виде, как uuid4().hex,
+        # получаются одним обращением к os.urandom на весь пакет
+        generated = os.urandom(16 * count).hex()
+        result = {}
+        for position, (code, name, storage, nomenclature, measure, quantity, date) in enumerate(
+                zip(columns.get("id", empty), names, stores, items, units, quantities, dates)):
+            if position in errors:
+                continue
+            if code is None or code == "":
+                code = generated[position * 32:position * 32 + 32]
+            else:
+                code = str(code).strip()
+            if code in result:
+                errors[position] = f"Повтор кода транзакции в пакете: {code}"
+                continue
+            result[code] = transaction_model.create_trusted(
+                code, name, storage, nomenclature, measure, quantity, date)
+
+        rejected = [(numbers[position], message) for position, message in sorted(errors.items())]
+        return result, rejected
+
+    @staticmethod
+    def csv_columns(header: list, rows: list, numbers: list) -> tuple:
+        """
+        Собирает столбцы из строк CSV (например, из очередной части большого файла).
+
+        Аргументы:
+            header (list[str]): Заголовок CSV
+            rows (list[list[str]]): Строки значений
+            numbers (list[int]): Номера строк в файле
+
+        Возвращает:
+            tuple: (столбцы {поле: list}, номера принятых строк, отклоненные [(номер строки, ошибка)])
+
+        Ошибки:
+            argument_exception: Если в заголовке нет обязательного столбца
+        """
+        header = [name.strip() for name in header]
+        missing = [name for name in transaction_ingest.REQUIRED if name not in header]
+        if len(missing) > 0:
+            raise argument_exception(f"В заголовке CSV нет столбцов: {', '.join(missing)}")
+        positions = [
+            (name, header.index(name)) for name in transaction_ingest.FIELDS if name in header
+        ]
+        width = len(header)
+        accepted = []
+        accepted_numbers = []
+        rejected = []
+        for number, row in zip(numbers, rows):
+            if len(row) != width:
+                rejected.append((number, f"Ожидается {width} значений, получено {len(row)}"))
+                continue
+            accepted.append(row)
+            accepted_numbers.append(number)
+        columns = {name: [row[position] for row in accepted] for name, position in positions}
+        return columns, accepted_numbers, rejected
+
+    @staticmethod
+    def jsonl_columns(texts: list, numbers: list) -> tuple:
+        """
+        Собирает столбцы из непустых строк JSON lines.
+        Все строки разбираются одним вызовом json.loads как массив,
+        при ошибке - по одной, чтобы отклонить только некорректные.
+
+        Аргументы:
+            texts (list[str]): Строки JSON
+            numbers (list[int]): Номера строк в файле
+
+        Возвращает:
+            tuple: (столбцы {поле: list}, номера принятых строк, отклоненные [(номер строки, ошибка)])
+        """
+        try:
+            rows = json.loads("[" + ",".join(texts) + "]")
+        except ValueError:
+            rows = None
+        if rows is None or len(rows) != len(texts):
+            rows = []
+            for text in texts:
+                try:
+                    rows.append(json.loads(text))
+                except ValueError as e:
+                    rows.append(e)
+
+        # Все строки - объекты: столбцы собираются без проверки по одной
+        if set(map(type, rows)) == {dict}:
+            columns = {name: list(map(dict.get, rows, repeat(name))) for name in transaction_ingest.FIELDS}
+            return columns, list(numbers), []
+
+        accepted = []
+        accepted_numbers = []
+        rejected = []
+        for number, row in zip(numbers, rows):
+            if isinstance(row, ValueError):
+                rejected.append((number, f"Некорректная строка JSON: {row}"))
+            elif not isinstance(row, dict):
+                rejected.append((number, "Строка JSON должна быть объектом"))
+            else:
+                accepted.append(row)
+                accepted_numbers.append(number)
+        columns = {name: [row.get(name) for row in accepted] for name in transaction_ingest.FIELDS}
+        return columns, accepted_numbers, rejected
+
+    @staticmethod
+    def csv_rows(reader):
+        """
+        Перебирает непустые строки CSV после заголовка.
+
+        Аргументы:
+            reader: csv.reader
+
+        Возвращает:
+            Generator[tuple]: (номер строки, значения, None) или (номер строки, None, ошибка)
+                              для строки, которую не удалось разобрать (csv.Error)
+        """
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, None, f"Ошибка разбора CSV: {e}"
+                continue
+            if len(row) > 0:
+                yield reader.line_num, row, None
+
+    @staticmethod
+    @contextmanager
+    def paused_gc(pause: bool = True):
+        """
+        Приостанавливает сборку мусора на время обработки пакета.
+        Созданные модели остаются в репозитории в памяти, и сборка мусора
+        во время пакета только обходит их повторно; для базы SQLite (pause = False)
+        модели не накапливаются, и сборка мусора не останавливается.
+
+        Сборка мусора общая для процесса, поэтому пакеты разных потоков учитываются
+        вместе: она возобновляется после последнего пакета, если была включена до первого.
+        """
+        if not pause:
+            yield
+            return
+        with transaction_ingest.__gc_lock:
+            if transaction_ingest.__gc_depth == 0:
+                transaction_ingest.__gc_enabled = gc.isenabled()
+                gc.disable()
+            transaction_ingest.__gc_depth += 1
+        try:
+            yield
+        finally:
+            with transaction_ingest.__gc_lock:
+                transaction_ingest.__gc_depth -= 1
+                if transaction_ingest.__gc_depth == 0 and transaction_ingest.__gc_enabled:
+                    gc.enable()
+
+    # Служебные методы
+
+    @staticmethod
+    def __read_csv(lines) -> tuple:
+        """ Читает CSV с заголовком в столбцы """
+        # Список строк читается целиком; если каждая запись заняла ровно одну строку,
+        # номера строк известны без line_num, иначе - чтение по одной записи
+        if isinstance(lines, list):
+            try:
+                rows = list(csv.reader(lines))
+            except csv.Error:
+                rows = None
+            if rows is not None and len(rows) == len(lines):
+                header = rows[0] if len(rows) > 0 else []
+                numbers = [number for number, row in enumerate(rows[1:], 2) if len(row) > 0]
+                if len(numbers) < len(rows) - 1:
+                    rows = [row for row in rows[1:] if len(row) > 0]
+                else:
+                    rows = rows[1:]
+                return transaction_ingest.csv_columns(header, rows, numbers)
+
+        reader = csv.reader(lines)
+        header = next(reader, [])
+        rows = []
+        numbers = []
+        errors = []
+        for number, row, error in transaction_ingest.csv_rows(reader):
+            if error is not None:
+                errors.append((number, error))
+                continue
+            rows.append(row)
+            numbers.append(number)
+        columns, accepted, rejected = transaction_ingest.csv_columns(header, rows, numbers)
+        return columns, accepted, rejected + errors
+
+    @staticmethod
+    def __read_jsonl(lines) -> tuple:
+        """ Читает JSON lines (объект на строку) в столбцы """
+        # Текст без пустых строк: номера строк - по порядку
+        if isinstance(lines, list) and set(map(type, lines)) <= {str} and all(map(str.strip, lines)):
+            return transaction_ingest.jsonl_columns(lines, list(range(1, len(lines) + 1)))
+        numbers = []
+        texts = []
+        for number, line in enumerate(lines, 1):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            if line.strip() != "":
+                numbers.append(number)
+                texts.append(line)
+        return transaction_ingest.jsonl_columns(texts, numbers)
+
+    @staticmethod
+    def __column(values: list, convert_all, convert, message: str, errors: dict) -> list:
+        """
+        Преобразует столбец целиком (convert_all), при ошибке - по одному значению (convert).
+        Позиции с ошибками записываются в errors, их значения - None.
+        """
+        try:
+            return convert_all(values)
+        except (TypeError, ValueError):
+            pass
+        result = []
+        for position, value in enumerate(values):
+            try:
+                result.append(convert(value))
+            except (TypeError, ValueError):
+                errors.setdefault(position, f"{message}: {value}")
+                result.append(None)
+        return result
+
+    @staticmethod
+    def __lookup(codes: list, models: dict, message: str, errors: dict) -> list:
+        """ Находит модели столбца кодов поиском в словаре, ненайденные коды записываются в errors """
+        try:
+            result = list(map(models.get, codes))
+        except TypeError:
+            # Нехешируемое значение (например, список в JSON)
+            result = [models.get(code) if isinstance(code, str) else None for code in codes]
+        if any(model is None for model in result):
+            for position, (code, model) in enumerate(zip(codes, result)):
+                if model is None:
+                    errors.setdefault(position, f"{message}: {code}")
+        return result
+
+    @staticmethod
+    def __quantities(values: list) -> list:
+        result = list(map(float, values))
+        if not all(map(math.isfinite, result)) or bool in set(map(type, values)):
+            raise ValueError("quantity")
+        return result
+
+    @staticmethod
+    def __dates(values: list) -> list:
+        # fromisoformat отклоняет не строки (TypeError) сама
+        result = list(map(datetime.fromisoformat, values))
+        if any(date.tzinfo is not None for date in result):
+            raise ValueError("date")
+        return result
+
+    @staticmethod
+    def __names(values: list) -> list:
+        # str.strip отклоняет не строки (TypeError) сама
+        result = list(map(str.strip, values))
+        if not all(result) or max(map(len, result), default=0) > 50:
+            raise ValueError("name")
+        return result
+
+    @staticmethod
+    def __quantity(value) -> float:
+        result = float(value)
+        if not math.isfinite(result) or isinstance(value, bool):
+            raise ValueError(value)
+        return result
+
+    @staticmethod
+    def __date(value) -> datetime:
+        if not isinstance(value, str):
+            raise TypeError(value)
+        result = datetime.fromisoformat(value)
+        # Индексы коллекции сравнивают только даты без часового пояса
+        if result.tzinfo is not None:
+            raise ValueError(value)
+        return result
+
+    @staticmethod
+    def __name(value) -> str:
+        # Те же правила, что у сеттера abstract_model.name: непустое, не больше 50 символов
+        if not isinstance(value, str):
+            raise TypeError(value)
+        result = value.strip()
+        if len(result) == 0 or len(result) > 50:
+            raise ValueError(value)
+        return result
@@ -42,6 +42,11 @@ class validator:
         if not isinstance(value, type_):
             raise argument_exception(f"Некорректный тип!\nОжидается {type_}. Текущий тип {type(value)}")
 
+        # Строковое представление коллекции не бывает пустым, а его построение
+        # линейно по размеру (например, для кэша моделей при загрузке)
+        if len_ is None and isinstance(value, (dict, list, tuple, set)):
+            return True
+
         # Проверка аргумента
         if len(str(value).strip()) == 0:
             raise argument_exception("Пустой аргумент")
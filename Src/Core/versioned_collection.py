@@ -0,0 +1,146 @@
+import threading
+from Src.Core.collection_snapshot import collection_snapshot
+from Src.Core.validator import argument_exception
+
+class versioned_collection(dict):
+    """
+    Коллекция репозитория со счетчиком версий.
+
+    Ведет себя как обычный словарь {ключ: модель}. Каждая вставка, замена
+    и удаление увеличивают версию, по которой кэши сериализации понимают,
+    что данные коллекции изменились.
+
+    Особенности:
+        - Изменение модели «на месте» версию не меняет: после изменения
+          модель нужно повторно записать по тому же ключу.
+        - Об изменениях сообщается слушателю (listener), например журналу
+          репозитория: listener(ключ, модель) при записи, listener(ключ, None)
+          при удалении и listener(None, None) при очистке.
+        - snapshot() возвращает снимок для перебора в другом потоке:
+          перед изменением коллекция копирует содержимое для открытых снимков.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.__version = 0
+        self.__listener = None
+        # Блокировка изменений словаря и открытые снимки (collection_snapshot)
+        self.__lock = threading.Lock()
+        self.__views = []
+        self.update(*args, **kwargs)
+
+    @property
+    def listener(self):
+        """Возвращает слушателя изменений коллекции или None"""
+        return self.__listener
+
+    @listener.setter
+    def listener(self, value):
+        """Устанавливает слушателя изменений коллекции (None - отключить)"""
+        if value is not None and not callable(value):
+            raise argument_exception("Слушатель коллекции должен быть вызываемым объектом!")
+        self.__listener = value
+
+    @property
+    def version(self) -> int:
+        """Возвращает текущую версию коллекции"""
+        return self.__version
+
+    def touch(self):
+        """ Увеличивает версию коллекции (например, после изменения модели на месте) """
+        self.__version += 1
+
+    def snapshot(self) -> collection_snapshot:
+        """
+        Возвращает снимок коллекции с копированием при записи.
+        Снимок можно перебирать в другом потоке, после перебора его нужно закрыть.
+        """
+        with self.__lock:
+            view = collection_snapshot(self, self.__lock, self.__release)
+            self.__views.append(view)
+        return view
+
+    def __setitem__(self, key, value):
+        with self.__lock:
+            self.__freeze()
+            super().__setitem__(key, value)
+        self.__version += 1
+        if self.__listener is not None:
+            self.__listener(key, value)
+
+    def __delitem__(self, key):
+        with self.__lock:
+            self.__freeze()
+            super().__delitem__(key)
+        self.__version += 1
+        if self.__listener is not None:
+            self.__listener(key, None)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        with self.__lock:
+            self.__freeze()
+            value = super().pop(key)
+        self.__version += 1
+        if self.__listener is not None:
+            self.__listener(key, None)
+        return value
+
+    def popitem(self):
+        with self.__lock:
+            self.__freeze()
+            item = super().popitem()
+        self.__version += 1
+        if self.__listener is not None:
+            self.__listener(item[0], None)
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__freeze()
+            super().clear()
+        self.__version += 1
+        if self.__listener is not None:
+            self.__listener(None, None)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def add_many(self, items: dict):
+        """
+        Добавляет пакет моделей одной операцией словаря: версия увеличивается
+        на размер пакета, слушатель получает каждую модель.
+
+        Аргументы:
+            items (dict): Модели {ключ: модель}
+        """
+        with self.__lock:
+            self.__freeze()
+            dict.update(self, items)
+        self.__version += len(items)
+        if self.__listener is not None:
+            for key, value in items.items():
+                self.__listener(key, value)
+
+    def __freeze(self):
+        """ Передает открытым снимкам копию словаря перед его изменением (под блокировкой) """
+        if len(self.__views) == 0:
+            return
+        items = dict(dict.items(self))
+        for view in self.__views:
+            view.freeze(items)
+        # Снимки с копией больше не зависят от коллекции
+        self.__views = []
+
+    def __release(self, view: collection_snapshot):
+        """ Отключает закрытый снимок """
+        with self.__lock:
+            if view in self.__views:
+                self.__views.remove(view)
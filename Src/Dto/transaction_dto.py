@@ -89,13 +89,17 @@ class transaction_dto(abstract_dto):
         Поддерживает установку как из строки, так и из объекта datetime.
         
         Аргументы:
-            value (str|datetime): Дата и время в формате строки "ГГГГ-ММ-ДД ЧЧ:ММ:СС" или объект datetime
+            value (str|datetime|dict): Дата и время в формате строки "ГГГГ-ММ-ДД ЧЧ:ММ:СС", объект datetime
+                или словарь выгрузки datetime_convertor (с ключом iso_format)
             
         Ошибки:
             Validation error: Если переданный параметр не является строкой или datetime
             ValueError: Если строка не соответствует формату "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
         """
-        validator.validate(value, str | datetime)
+        validator.validate(value, str | datetime | dict)
+        if isinstance(value, dict):
+            # Словарь выгрузки datetime_convertor
+            self.__date = datetime.fromisoformat(value["iso_format"])
         if isinstance(value, str):
             # Преобразуем строку в объект datetime по заданному формату
             self.__date = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
@@ -1,5 +1,5 @@
 from Src.Core.abstract_response import abstract_response
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 class response_csv(abstract_response):
 
@@ -32,24 +32,52 @@ class response_csv(abstract_response):
         for item in converted_data:
             all_headers.update(item.keys())
         
-        # Убираем служебные поля
-        all_headers = [h for h in all_headers if h not in ['converter', 'type']]
-        headers = sorted(all_headers)
+        headers = self.__headers(all_headers)
         
         # Создаем заголовок CSV
         text = self.delimiter.join(headers) + "\n"
         
         # Добавляем строки с данными
-        rows = []
-        for item in converted_data:
-            values = []
-            for header in headers:
-                value = item.get(header, "")
-                values.append(self.__format_csv_value(value))
-            rows.append(self.delimiter.join(values))
+        rows = [self.__format_row(item, headers) for item in converted_data]
         
         text += "\n".join(rows)
         return text
+
+    def create_stream(self, data: Iterable) -> Iterator[str]:
+
+        """
+        Генерирует CSV по частям: сначала заголовок, затем строки по мере преобразования.
+        Объекты преобразуются по одному, поэтому память не зависит от размера отчета,
+        а первая часть отдается сразу.
+        
+        Заголовки берутся из первого объекта, поэтому для однородных данных
+        (например, строк ОСВ) склеенный результат совпадает с create.
+        """
+
+        # Одиночный объект оборачиваем в список
+        if isinstance(data, dict) or not hasattr(data, "__iter__"):
+            data = [data]
+
+        headers = None
+        for item in data:
+            converted = self._converter.convert(item)
+            if headers is None:
+                headers = self.__headers(converted.keys())
+                yield self.delimiter.join(headers) + "\n" + self.__format_row(converted, headers)
+            else:
+                yield "\n" + self.__format_row(converted, headers)
+
+    def __headers(self, keys) -> list:
+        """
+        Возвращает отсортированные заголовки без служебных полей.
+        """
+        return sorted(h for h in keys if h not in ['converter', 'type'])
+
+    def __format_row(self, item: dict, headers: list) -> str:
+        """
+        Форматирует одну строку CSV в порядке заголовков.
+        """
+        return self.delimiter.join(self.__format_csv_value(item.get(header, "")) for header in headers)
     
     def __format_csv_value(self, value: Any) -> str:
         """
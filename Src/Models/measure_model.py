@@ -1,5 +1,6 @@
 from Src.Core.validator import validator
 from Src.Core.abstract_model import abstract_model
+from Src.Core.measure_conversion import measure_conversion
 from Src.Core.validator import argument_exception
 from Src.Dto.measure_dto import measure_dto
 
@@ -44,6 +45,7 @@ class measure_model(abstract_model):
         if base_measure is not None:
             validator.validate(base_measure, measure_model) 
         self.__base_measure = base_measure
+        measure_conversion.invalidate(self.unique_code)
 
     @property
     def conversion_factor(self) -> float:
@@ -57,6 +59,7 @@ class measure_model(abstract_model):
         if conversion_factor <= 0:
             raise argument_exception("Некорректный аргумент!")
         self.__conversion_factor = conversion_factor
+        measure_conversion.invalidate(self.unique_code)
 
     """ Универсальный метод - фабричный. Упрощает переиспользование и использование распространенных единиц измерения """
     @staticmethod
@@ -110,7 +113,8 @@ class measure_model(abstract_model):
         validator.validate(dto, measure_dto)
         validator.validate(cache, dict)
         base  = cache[ dto.base_id ] if dto.base_id in cache else None
-        item = measure_model.create(dto.name, dto.value, base)
+        item = measure_model(dto.name, float(dto.value), base)
+        item.unique_code = dto.id
         return item
     
     def to_dto(self) -> measure_dto:
@@ -118,10 +122,19 @@ class measure_model(abstract_model):
         """
         Преобразует measure_model в measure_dto
         """
-        
-        dto = measure_dto()
-        dto.id = self.unique_code
-        dto.name = self.name
-        dto.base_id = self.base_measure.unique_code if self.base_measure else None
-        dto.value = self.conversion_factor
-        return dto
\ No newline at end of file
+
+        return self._fill_dto(measure_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства measure_dto и их значения по модели (сериализация без создания DTO)
+        """
+
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name),
+            ("base_id", lambda item: item.base_measure.unique_code if item.base_measure else None),
+            ("value", lambda item: item.conversion_factor)
+        ]
\ No newline at end of file
@@ -83,7 +83,16 @@ class nomenclature_group_model(abstract_model):
         Преобразует nomenclature_group_model в category_dto для передачи данных
         """
 
-        dto = category_dto()
-        dto.id = self.unique_code
-        dto.name = self.name
-        return dto
\ No newline at end of file
+        return self._fill_dto(category_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства category_dto и их значения по модели (сериализация без создания DTO)
+        """
+
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name)
+        ]
\ No newline at end of file
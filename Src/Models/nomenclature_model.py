@@ -109,13 +109,12 @@ class nomenclature_model(abstract_model):
         measure = cache.get(dto.range_id)  # range_id соответствует measure
         category = cache.get(dto.category_id)  # category_id соответствует nomenclature_group
         
-        item = nomenclature_model.create(
-            name=dto.name,
-            group=category,
-            measure=measure,
-            fullname=dto.name  # В текущей реализации используется name как fullname
-        )
+        validator.validate(measure, measure_model)
+        validator.validate(category, nomenclature_group_model)
         
+        # В текущей реализации используется name как fullname
+        item = nomenclature_model(dto.name, dto.name, category, measure)
+        item.unique_code = dto.id
         return item
     
     def to_dto(self) -> nomenclature_dto:
@@ -126,9 +125,20 @@ class nomenclature_model(abstract_model):
             nomenclature_dto: DTO объект с данными модели
         """
 
-        dto = nomenclature_dto()
-        dto.id = self.unique_code  # ID из базового класса
-        dto.name = self.name  # Наименование из базового класса
-        dto.range_id = self.measure.unique_code if self.measure else None  # ID единицы измерения
-        dto.category_id = self.nomenclature_group.unique_code if self.nomenclature_group else None  # ID группы
-        return dto
\ No newline at end of file
+        return self._fill_dto(nomenclature_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства nomenclature_dto и их значения по модели (сериализация без создания DTO).
+        Возвращает:
+            list: [(имя свойства DTO, функция модель -> значение)]
+        """
+
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name),
+            ("range_id", lambda item: item.measure.unique_code if item.measure else None),
+            ("category_id", lambda item: item.nomenclature_group.unique_code if item.nomenclature_group else None)
+        ]
\ No newline at end of file
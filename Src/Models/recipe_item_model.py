@@ -97,11 +97,20 @@ class receipt_item_model(abstract_model):
         """
         Преобразует receipt_item_model в composition_dto для передачи данных.
         """
-        
-        dto = composition_dto()
-        dto.id = self.unique_code  # Уникальный идентификатор
-        dto.name = self.name if hasattr(self, 'name') else f"Item_{self.unique_code}"  # Имя или значение по умолчанию
-        dto.nomenclature_id = self.nomenclature.unique_code if self.nomenclature else None  # ID номенклатуры
-        dto.range_id = self.range.unique_code if self.range else None  # ID единицы измерения
-        dto.value = self.value  # Количество
-        return dto
\ No newline at end of file
+
+        return self._fill_dto(composition_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства composition_dto и их значения по модели (сериализация без создания DTO)
+        """
+
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name if hasattr(item, 'name') else f"Item_{item.unique_code}"),
+            ("nomenclature_id", lambda item: item.nomenclature.unique_code if item.nomenclature else None),
+            ("range_id", lambda item: item.range.unique_code if item.range else None),
+            ("value", lambda item: item.value)
+        ]
\ No newline at end of file
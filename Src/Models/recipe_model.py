@@ -168,13 +168,11 @@ class recipe_model(abstract_model):
                 nomenclature = cache[nomenclature_id]
                 ingredients.append((nomenclature, quantity))
         
-        # Создаем модель рецепта
-        recipe = recipe_model.create(
-            name=dto.name,
-            steps=dto.steps,
-            ingredients=ingredients
-        )
-        
+        # Создаем модель рецепта с сохранением уникального кода
+        recipe = recipe_model(dto.name)
+        recipe.ingredients = ingredients
+        recipe.steps = dto.steps
+        recipe.unique_code = dto.id
         return recipe
     
     def to_dto(self) -> recipe_dto:
@@ -183,7 +181,28 @@ class recipe_model(abstract_model):
         Преобразует recipe_model в recipe_dto
         """
 
-        # Преобразуем ингредиенты в формат для DTO
+        return self._fill_dto(recipe_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+
+        """
+        Свойства recipe_dto и их значения по модели (сериализация без создания DTO)
+        """
+
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name),
+            ("ingredients", lambda item: item.__ingredients_dto()),
+            ("steps", lambda item: item.steps)
+        ]
+
+    def __ingredients_dto(self) -> list:
+
+        """
+        Преобразует ингредиенты в формат для DTO
+        """
+
         ingredients_dto = []
         for ingredient in self.ingredients:
             if len(ingredient) >= 2:
@@ -195,11 +214,4 @@ class recipe_model(abstract_model):
                     'quantity': quantity,
                     'measure_unit': nomenclature.measure.name if nomenclature.measure else ''
                 })
-        
-        # Создаем DTO
-        dto = recipe_dto()
-        dto.id = self.unique_code
-        dto.name = self.name
-        dto.ingredients = ingredients_dto
-        dto.steps = self.steps
-        return dto
\ No newline at end of file
+        return ingredients_dto
\ No newline at end of file
@@ -1,5 +1,5 @@
 from Src.Models.company_model import company_model
-from Src.Core.validator import validator
+from Src.Core.validator import validator, argument_exception
 
 class settings_model:
 
@@ -14,11 +14,25 @@ class settings_model:
         company (company_model): Настройки организации.  Содержит информацию, относящуюся к компании,
                                         использующей приложение, такую как название, адрес и т.д.
         response_format (str): Формат ответа API, используемый приложением.
+        snapshot_period (str): Периодичность снимков остатков для ОСВ ("day", "month", "year").
+        columnar_store (bool): Вести колоночное хранилище транзакций (NumPy) для расчета ОСВ.
+        osv_workers (int): Количество процессов для параллельного расчета ОСВ.
+        dump_format (str): Формат файла данных ("json", "binary" или "sharded" - каталог с файлом на коллекцию).
+        dump_compression (str): Сжатие файла данных ("none", "gzip", "bz2" или "lzma").
+        journal (bool): Вести журнал изменений (write-ahead log) между записями снимка.
+        repository_backend (str): Хранилище данных репозитория ("memory" или "sqlite").
 
     """
 
     __company: company_model = None
     __response_format: str = ""
+    __snapshot_period: str = "month"
+    __columnar_store: bool = False
+    __osv_workers: int = 1
+    __dump_format: str = "json"
+    __dump_compression: str = "none"
+    __journal: bool = False
+    __repository_backend: str = "memory"
 
     @property
     def company(self) -> company_model:
@@ -66,3 +80,160 @@ class settings_model:
         """
         validator.validate(value, str)
         self.__response_format = value
+
+    @property
+    def snapshot_period(self) -> str:
+        """
+        Возвращает периодичность снимков остатков складов.
+
+        Возвращает:
+            str: "day", "month" или "year". По умолчанию "month".
+        """
+        return self.__snapshot_period
+
+    @snapshot_period.setter
+    def snapshot_period(self, value: str):
+        """
+        Устанавливает периодичность снимков остатков складов.
+
+        Аргументы:
+            value (str): "day", "month" или "year".
+        """
+        validator.validate(value, str)
+        if value not in ["day", "month", "year"]:
+            raise argument_exception(f"Неподдерживаемая периодичность снимков: {value}")
+        self.__snapshot_period = value
+
+    @property
+    def columnar_store(self) -> bool:
+        """
+        Возвращает признак использования колоночного хранилища транзакций.
+
+        Возвращает:
+            bool: True, если ОСВ считается по колоночному хранилищу. По умолчанию False.
+        """
+        return self.__columnar_store
+
+    @columnar_store.setter
+    def columnar_store(self, value: bool):
+        """
+        Включает или отключает колоночное хранилище транзакций.
+
+        Аргументы:
+            value (bool): Признак использования колоночного хранилища.
+        """
+        validator.validate(value, bool)
+        self.__columnar_store = value
+
+    @property
+    def osv_workers(self) -> int:
+        """
+        Возвращает количество процессов для параллельного расчета ОСВ.
+
+        Возвращает:
+            int: Количество процессов. По умолчанию 1 (последовательный расчет).
+        """
+        return self.__osv_workers
+
+    @osv_workers.setter
+    def osv_workers(self, value: int):
+        """
+        Устанавливает количество процессов для параллельного расчета ОСВ.
+
+        Аргументы:
+            value (int): Количество процессов, не меньше 1.
+        """
+        validator.validate(value, int)
+        if value < 1:
+            raise argument_exception("Количество процессов должно быть не меньше 1!")
+        self.__osv_workers = value
+
+    @property
+    def dump_format(self) -> str:
+        """
+        Возвращает формат файла данных.
+
+        Возвращает:
+            str: "json", "binary" или "sharded". По умолчанию "json".
+        """
+        return self.__dump_format
+
+    @dump_format.setter
+    def dump_format(self, value: str):
+        """
+        Устанавливает формат файла данных.
+
+        Аргументы:
+            value (str): "json", "binary" или "sharded".
+        """
+        validator.validate(value, str)
+        if value not in ["json", "binary", "sharded"]:
+            raise argument_exception(f"Неподдерживаемый формат файла данных: {value}")
+        self.__dump_format = value
+
+    @property
+    def dump_compression(self) -> str:
+        """
+        Возвращает алгоритм сжатия файла данных.
+
+        Возвращает:
+            str: "none", "gzip", "bz2" или "lzma". По умолчанию "none".
+        """
+        return self.__dump_compression
+
+    @dump_compression.setter
+    def dump_compression(self, value: str):
+        """
+        Устанавливает алгоритм сжатия файла данных.
+
+        Аргументы:
+            value (str): "none", "gzip", "bz2" или "lzma".
+        """
+        validator.validate(value, str)
+        if value not in ["none", "gzip", "bz2", "lzma"]:
+            raise argument_exception(f"Неподдерживаемый алгоритм сжатия: {value}")
+        self.__dump_compression = value
+
+    @property
+    def journal(self) -> bool:
+        """
+        Возвращает признак ведения журнала изменений.
+
+        Возвращает:
+            bool: True, если изменения записываются в журнал. По умолчанию False.
+        """
+        return self.__journal
+
+    @journal.setter
+    def journal(self, value: bool):
+        """
+        Включает или отключает журнал изменений.
+
+        Аргументы:
+            value (bool): Признак ведения журнала.
+        """
+        validator.validate(value, bool)
+        self.__journal = value
+
+    @property
+    def repository_backend(self) -> str:
+        """
+        Возвращает хранилище данных репозитория.
+
+        Возвращает:
+            str: "memory" (данные в памяти и файле данных) или "sqlite" (база SQLite). По умолчанию "memory".
+        """
+        return self.__repository_backend
+
+    @repository_backend.setter
+    def repository_backend(self, value: str):
+        """
+        Устанавливает хранилище данных репозитория.
+
+        Аргументы:
+            value (str): "memory" или "sqlite".
+        """
+        validator.validate(value, str)
+        if value not in ["memory", "sqlite"]:
+            raise argument_exception(f"Неподдерживаемое хранилище данных: {value}")
+        self.__repository_backend = value
@@ -33,6 +33,26 @@ class storage_model(abstract_model):
         # Удаляем лишние пробелы в начале и конце строки
         self.__address = value.strip()
 
+    @staticmethod
+    def from_dto(dto: storage_dto, cache: dict) -> 'storage_model':
+        """
+        Создает модель склада из DTO объекта.
+        
+        Аргументы:
+            dto (storage_dto): DTO объект с данными склада
+            cache (dict): Кэш связанных объектов (не используется)
+            
+        Возвращает:
+            storage_model: Созданная модель склада
+        """
+        validator.validate(dto, storage_dto)
+        item = storage_model()
+        item.name = dto.name
+        if dto.address:
+            item.address = dto.address
+        item.unique_code = dto.id
+        return item
+
     def to_dto(self) -> storage_dto:
         """
         Преобразует модель домена storage_model в транспортный объект storage_dto.
@@ -40,9 +60,18 @@ class storage_model(abstract_model):
         Возвращает:
             storage_dto: Транспортный объект для передачи данных между слоями приложения
         """
-        dto = storage_dto()
-        dto.id = self.unique_code    # Уникальный идентификатор склада
-        dto.name = self.name         # Наименование склада
-        dto.address = self.address   # Адрес склада
+        return self._fill_dto(storage_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+        """
+        Свойства storage_dto и их значения по модели (сериализация без создания DTO).
         
-        return dto
\ No newline at end of file
+        Возвращает:
+            list: [(имя свойства DTO, функция модель -> значение)]
+        """
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name),
+            ("address", lambda item: item.address)
+        ]
\ No newline at end of file
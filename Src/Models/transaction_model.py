@@ -124,6 +124,62 @@ class transaction_model(abstract_model):
             # Используем переданный объект datetime напрямую
             self.__date = value
 
+    @staticmethod
+    def from_dto(dto: transaction_dto, cache: dict) -> 'transaction_model':
+        """
+        Создает модель транзакции из DTO объекта.
+        
+        Аргументы:
+            dto (transaction_dto): DTO объект с данными транзакции
+            cache (dict): Кэш связанных объектов по уникальному коду (склад, номенклатура, единица)
+            
+        Возвращает:
+            transaction_model: Созданная модель транзакции
+            
+        Ошибки:
+            Validation error: Если связанный объект не найден в кэше
+        """
+        validator.validate(dto, transaction_dto)
+        validator.validate(cache, dict)
+        
+        item = transaction_model()
+        item.name = dto.name
+        item.storage = cache.get(dto.storage_id)
+        item.nomenclature = cache.get(dto.nomenclature_id)
+        item.measure = cache.get(dto.measure_id)
+        item.quantity = float(dto.quantity)
+        item.date = dto.date
+        item.unique_code = dto.id
+        return item
+
+    @staticmethod
+    def create_trusted(unique_code: str, name: str, storage: storage_model, nomenclature: nomenclature_model,
+                       measure: measure_model, quantity: float, date: datetime) -> 'transaction_model':
+        """
+        Создает транзакцию из уже проверенных значений без проверок в сеттерах.
+        Используется пакетной загрузкой, которая проверяет столбцы значений целиком,
+        и чтением транзакций из базы данных.
+        
+        Аргументы:
+            unique_code (str): Уникальный код транзакции
+            name (str): Наименование (не больше 50 символов, без пробелов по краям)
+            storage (storage_model): Склад
+            nomenclature (nomenclature_model): Номенклатура
+            measure (measure_model): Единица измерения
+            quantity (float): Количество
+            date (datetime): Дата и время операции
+            
+        Возвращает:
+            transaction_model: Созданная модель транзакции
+        """
+        item = transaction_model._trusted(unique_code, name)
+        item.__storage = storage
+        item.__nomenclature = nomenclature
+        item.__measure = measure
+        item.__quantity = quantity
+        item.__date = date
+        return item
+
     def to_dto(self) -> transaction_dto:
         """
         Преобразует модель домена transaction_model в транспортный объект transaction_dto.
@@ -135,12 +191,22 @@ class transaction_model(abstract_model):
             Метод извлекает уникальные идентификаторы связанных объектов (measure, storage, nomenclature)
             для сериализации в DTO формат.
         """
-        dto = transaction_dto()
-        dto.id = self.unique_code  # Уникальный идентификатор транзакции
-        dto.measure_id = self.measure.unique_code if self.measure else None  # ID единицы измерения
-        dto.storage_id = self.storage.unique_code if self.storage else None  # ID склада
-        dto.nomenclature_id = self.nomenclature.unique_code if self.nomenclature else None  # ID номенклатуры
-        dto.quantity = self.quantity  # Количество товара
-        dto.date = self.date  # Дата и время операции
+        return self._fill_dto(transaction_dto())
+
+    @staticmethod
+    def dto_fields() -> list:
+        """
+        Свойства transaction_dto и их значения по модели (сериализация без создания DTO).
         
-        return dto
\ No newline at end of file
+        Возвращает:
+            list: [(имя свойства DTO, функция модель -> значение)]
+        """
+        return [
+            ("id", lambda item: item.unique_code),
+            ("name", lambda item: item.name),
+            ("measure_id", lambda item: item.measure.unique_code if item.measure else None),
+            ("storage_id", lambda item: item.storage.unique_code if item.storage else None),
+            ("nomenclature_id", lambda item: item.nomenclature.unique_code if item.nomenclature else None),
+            ("quantity", lambda item: item.quantity),
+            ("date", lambda item: item.date)
+        ]
\ No newline at end of file
@@ -5,9 +5,34 @@
 с организацией по типам сущностей через систему ключей.
 """
 
+from Src.Core.balance_cache import balance_cache
+from Src.Core.journal import journal
+from Src.Core.osv_registry import osv_registry
+from Src.Core.serialization_cache import serialization_cache
+from Src.Core.sqlite_collection import sqlite_collection
+from Src.Core.sqlite_store import sqlite_store
+from Src.Core.sqlite_transaction_collection import sqlite_transaction_collection
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.validator import argument_exception, validator
+from Src.Core.versioned_collection import versioned_collection
+
 class reposity:
     # Приватный словарь для хранения всех данных приложения
     __data = {}
+    # Реестр поддерживаемых ОСВ, создается при первом обращении
+    __registry = None
+    # Текущие остатки складов, создаются при первом обращении
+    __balances = None
+    # Кэш преобразованных моделей
+    __cache = serialization_cache()
+    # Журнал изменений, если подключен
+    __journal = None
+    # База SQLite и преобразование моделей в словари DTO, если подключена
+    __store = None
+    __convert = None
+    # Индекс уникальный код -> модель справочника и версии, по которым он построен
+    __codes = {}
+    __codes_version = None
 
     @property
     def data(self):
@@ -105,12 +130,283 @@ class reposity:
         """
         Инициализирует структуру данных репозитория.
         
-        Создает пустые словари для каждого типа сущностей
-        на основе всех доступных ключей.
+        Создает пустые коллекции с версией для каждого типа сущностей
+        на основе всех доступных ключей. Транзакции хранятся в коллекции
+        с индексом по складу и дате. Если подключена база SQLite,
+        ее таблицы очищаются, а коллекции сохраняются в нее.
         """
         # Получаем все ключи репозитория
         keys = reposity.keys()
         
-        # Инициализируем пустые словари для каждого ключа
-        for key in keys:
-            self.__data[key] = {}
\ No newline at end of file
+        store = reposity.__store
+        if store is None:
+            # Инициализируем пустые коллекции для каждого ключа
+            for key in keys:
+                self.__data[key] = versioned_collection()
+            self.__data[reposity.transaction_key()] = transaction_collection()
+        else:
+            for key in keys:
+                store.clear_entities(key)
+            store.clear_transactions()
+            self.__attach_collections(store, {})
+        reposity.__registry = None
+        reposity.__reset_balances()
+        # Версии новых коллекций начинаются заново - прежние записи кэша недействительны
+        reposity.__cache.clear()
+        # Подключенный журнал продолжает писать изменения новых коллекций
+        if reposity.__journal is not None:
+            for key in keys:
+                reposity.__journal.record(key, None, None)
+            self.__listen(reposity.__journal)
+
+    def load(self, data: dict):
+        """
+        Заменяет данные репозитория восстановленными моделями.
+        
+        Аргументы:
+            data (dict): Словарь {ключ коллекции: {ключ: модель}} (например, результат convert_factory.convert_back)
+        """
+        self.initalize()
+        for key, items in data.items():
+            if key in self.__data:
+                self.__data[key].update(items)
+
+    @property
+    def store(self) -> sqlite_store:
+        """ Возвращает подключенную базу SQLite или None (данные в памяти) """
+        return reposity.__store
+
+    def attach_store(self, store: sqlite_store, convert, data: dict = None):
+        """
+        Переключает репозиторий на хранение в базе SQLite.
+        Справочники и рецепты остаются в памяти и записываются в базу при каждом
+        изменении (sqlite_collection), транзакции хранятся только в базе
+        (sqlite_transaction_collection).
+        
+        Аргументы:
+            store (sqlite_store): База данных
+            convert (callable): Функция модель -> словарь DTO (convert_factory.convert)
+            data (dict): Модели справочников, уже сохраненные в базе {ключ коллекции: {ключ: модель}}
+        """
+        validator.validate(store, sqlite_store)
+        if not callable(convert):
+            raise argument_exception("Функция преобразования моделей должна быть вызываемым объектом!")
+        reposity.__store = store
+        reposity.__convert = convert
+        self.__attach_collections(store, {} if data is None else data)
+
+    def detach_store(self) -> sqlite_store:
+        """
+        Возвращает репозиторий к хранению в памяти (с пустыми коллекциями).
+        База при этом не очищается и не закрывается.
+        
+        Возвращает:
+            sqlite_store: Отключенная база или None
+        """
+        result = reposity.__store
+        reposity.__store = None
+        reposity.__convert = None
+        self.initalize()
+        return result
+
+    def find(self, unique_code: str):
+        """
+        Находит единицу измерения, номенклатуру или склад по уникальному коду.
+        Индекс кодов перестраивается, если эти коллекции изменились.
+        
+        Аргументы:
+            unique_code (str): Уникальный код модели
+            
+        Возвращает:
+            Модель или None, если код не найден
+        """
+        keys = [reposity.measure_key(), reposity.nomenclature_key(), reposity.storage_key()]
+        version = tuple((id(self.__data[key]), self.__data[key].version) for key in keys)
+        if reposity.__codes_version != version:
+            reposity.__codes = {
+                item.unique_code: item for key in keys for item in self.__data[key].values()
+            }
+            reposity.__codes_version = version
+        return reposity.__codes.get(unique_code)
+
+    def __attach_collections(self, store: sqlite_store, data: dict):
+        """ Создает коллекции, сохраняемые в базу, и заполняет справочники моделями data """
+        for key in reposity.keys():
+            if key != reposity.transaction_key():
+                self.__data[key] = sqlite_collection(store, key, reposity.__convert, data.get(key))
+        self.__data[reposity.transaction_key()] = sqlite_transaction_collection(store, self.find)
+        reposity.__registry = None
+        reposity.__reset_balances()
+        reposity.__cache.clear()
+        if reposity.__journal is not None:
+            self.__listen(reposity.__journal)
+
+    def replace(self, key: str, collection: versioned_collection):
+        """
+        Заменяет коллекцию целиком, например заполненную в фоновом потоке.
+        Замена ссылки атомарна: читатели видят либо прежнюю коллекцию, либо новую.
+        Изменения прежней коллекции после ее копирования в новую теряются.
+
+        Аргументы:
+            key (str): Ключ коллекции
+            collection (versioned_collection): Новая коллекция
+        """
+        self.__data[key] = collection
+        if key == reposity.transaction_key():
+            reposity.__registry = None
+        if key in [reposity.transaction_key(), reposity.storage_key()]:
+            reposity.__reset_balances()
+        # Версия новой коллекции начинается заново - прежние записи кэша недействительны
+        reposity.__cache.clear()
+        if reposity.__journal is not None:
+            self.__listen(reposity.__journal)
+
+    def storage_transactions(self, storage_code: str):
+        """
+        Возвращает транзакции склада, отсортированные по дате.
+        
+        Аргументы:
+            storage_code (str): Уникальный код склада
+            
+        Возвращает:
+            date_index: Индекс транзакций склада
+        """
+        return self.__data[reposity.transaction_key()].storage_index(storage_code)
+
+    def transactions_between(self, start_date, end_date, storage=None, nomenclature=None,
+                             offset: int = 0, limit: int = None) -> list:
+        """
+        Возвращает транзакции за период, отсортированные по дате.
+        
+        Аргументы:
+            start_date (datetime): Дата начала периода
+            end_date (datetime): Дата окончания периода
+            storage (storage_model): Склад для отбора (необязательно)
+            nomenclature (nomenclature_model): Номенклатура для отбора (необязательно)
+            offset (int): Количество пропускаемых транзакций
+            limit (int): Максимальное количество транзакций (None - без ограничения)
+            
+        Возвращает:
+            list[transaction_model]: Транзакции периода
+        """
+        return self.__data[reposity.transaction_key()].transactions_between(
+            start_date, end_date,
+            storage.unique_code if storage is not None else None,
+            nomenclature.unique_code if nomenclature is not None else None,
+            offset, limit)
+
+    def add_transactions(self, items: dict):
+        """
+        Добавляет пакет транзакций одной операцией коллекции: индексы складов,
+        снимки остатков и подписчики обновляются один раз на пакет
+        (в базе SQLite пакет записывается одной фиксацией).
+        
+        Аргументы:
+            items (dict): Транзакции {unique_code: transaction_model}
+        """
+        validator.validate(items, dict)
+        self.__data[reposity.transaction_key()].update(items)
+
+    def snapshots(self):
+        """
+        Предоставляет доступ к снимкам остатков складов.
+        
+        Возвращает:
+            balance_snapshots: Снимки остатков, хранящиеся вместе с транзакциями
+        """
+        return self.__data[reposity.transaction_key()].snapshots
+
+    def columns(self):
+        """
+        Предоставляет доступ к колоночному хранилищу транзакций.
+        
+        Возвращает:
+            transaction_columns: Колоночное хранилище или None, если оно не включено
+        """
+        return self.__data[reposity.transaction_key()].columns
+
+    def osv_registry(self) -> osv_registry:
+        """
+        Предоставляет доступ к реестру поддерживаемых ОСВ.
+        Реестр подписан на изменения коллекции транзакций.
+        
+        Возвращает:
+            osv_registry: Реестр ведомостей
+        """
+        if reposity.__registry is None:
+            reposity.__registry = osv_registry(
+                self.__data[reposity.transaction_key()], self.__data[reposity.nomenclature_key()])
+        return reposity.__registry
+
+    def balance_cache(self) -> balance_cache:
+        """
+        Предоставляет доступ к текущим остаткам складов.
+        Кэш подписан на изменения коллекции транзакций.
+        
+        Возвращает:
+            balance_cache: Текущие остатки
+        """
+        if reposity.__balances is None:
+            reposity.__balances = balance_cache(
+                self.__data[reposity.transaction_key()], self.__data[reposity.storage_key()])
+        return reposity.__balances
+
+    @staticmethod
+    def __reset_balances():
+        """ Отписывает кэш остатков от прежней коллекции транзакций, новый создается при обращении """
+        if reposity.__balances is not None:
+            reposity.__balances.close()
+            reposity.__balances = None
+
+    def version(self, key: str) -> tuple:
+        """
+        Возвращает версию данных коллекции с учетом коллекций, от которых
+        зависит ее сериализация (рецепт включает наименования номенклатуры и единиц).
+        
+        Аргументы:
+            key (str): Ключ коллекции
+            
+        Возвращает:
+            tuple: Версии коллекции и ее зависимостей
+        """
+        keys = [key]
+        if key == reposity.recipe_key():
+            keys += [reposity.nomenclature_key(), reposity.measure_key()]
+        return tuple(self.__data[item].version for item in keys)
+
+    def attach_journal(self, value: journal):
+        """
+        Подключает журнал: каждое последующее изменение коллекций записывается в него.
+        
+        Аргументы:
+            value (journal): Журнал изменений
+        """
+        reposity.__journal = value
+        self.__listen(value)
+
+    def detach_journal(self) -> journal:
+        """
+        Отключает журнал от коллекций.
+        
+        Возвращает:
+            journal: Отключенный журнал или None
+        """
+        result = reposity.__journal
+        reposity.__journal = None
+        self.__listen(None)
+        return result
+
+    def __listen(self, value: journal):
+        """ Устанавливает слушателя изменений каждой коллекции """
+        for key, collection in self.__data.items():
+            collection.listener = None if value is None else \
+                (lambda item_key, item, key=key: value.record(key, item_key, item))
+
+    def serialization_cache(self) -> serialization_cache:
+        """
+        Предоставляет доступ к кэшу преобразованных моделей.
+        
+        Возвращает:
+            serialization_cache: LRU-кэш сериализации
+        """
+        return reposity.__cache
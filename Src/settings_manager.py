@@ -27,6 +27,7 @@ class settings_manager:
     __settings: settings_model = None  # Объект settings_model, хранящий конфигурацию.
     __global_attributes: list = ["company", "response_format", "first_start"]  # Список глобальных атрибутов settings_model.
     __settings_dict: list = ["company"] # Список атрибутов settings_model, которые нужно конвертировать из словаря
+    __optional_attributes: list = ["snapshot_period", "columnar_store", "osv_workers", "dump_format", "dump_compression", "journal", "repository_backend"]  # Необязательные атрибуты settings_model, при отсутствии остаются по умолчанию.
 
     def __init__(self, config_filename: str):
         """
@@ -162,6 +163,10 @@ class settings_manager:
                             return False # Ошибка конвертации настроек компании
                     else:
                         setattr(self.__settings, key, data[key])
+
+                for key in self.__optional_attributes:
+                    if key in data.keys():
+                        setattr(self.__settings, key, data[key])
             return True
         except Exception as e:
             print(f"Ошибка при загрузке настроек: {e}") # Logging ошибки
@@ -185,7 +190,7 @@ class settings_manager:
             }
             
             # Сохраняем остальные глобальные атрибуты
-            for attr in self.__global_attributes:
+            for attr in self.__global_attributes + self.__optional_attributes:
                 if attr != "company" and hasattr(self.__settings, attr):
                     settings_dict[attr] = getattr(self.__settings, attr)
             
@@ -209,4 +214,11 @@ class settings_manager:
         self.__settings.company.correspondent_account = 0
         self.__settings.company.bik = 0
         self.__settings.response_format = "json"
-        self.__settings.first_start = True
\ No newline at end of file
+        self.__settings.first_start = True
+        self.__settings.snapshot_period = "month"
+        self.__settings.columnar_store = False
+        self.__settings.osv_workers = 1
+        self.__settings.dump_format = "json"
+        self.__settings.dump_compression = "none"
+        self.__settings.journal = False
+        self.__settings.repository_backend = "memory"
\ No newline at end of file
@@ -1,10 +1,21 @@
 from datetime import datetime
 import json
 import os
+import threading
 
 from Src.Convertors.convert_factory import convert_factory
+from Src.Core.binary_snapshot import binary_snapshot
+from Src.Core.compressed_stream import compressed_stream
+from Src.Core.dump_job import dump_job
+from Src.Core.journal import journal
+from Src.Core.production_posting import production_posting
+from Src.Core.sharded_store import sharded_store
+from Src.Core.sqlite_store import sqlite_store
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.transaction_importer import transaction_importer
+from Src.Core.transaction_ingest import transaction_ingest
 from Src.Core.validator import validator
-from Src.Core.validator import argument_exception
+from Src.Core.validator import argument_exception, operation_exception
 from Src.Models.nomenclature_group_model import nomenclature_group_model
 from Src.Models.nomenclature_model import nomenclature_model
 from Src.Models.osv_model import osv_model
@@ -37,11 +48,48 @@ class start_service:
 
     Атрибуты:
         __repo (reposity): Центральный репозиторий для хранения всех данных приложения
-        __data_file (str): Имя файла для сохранения/загрузки данных
+        __data_file (str): Имя файла для сохранения/загрузки данных в формате JSON
+        __binary_data_file (str): Имя файла для сохранения/загрузки двоичного снимка
+        __sharded_data_dir (str): Каталог данных с файлом на каждую коллекцию (sharded_store)
+        __sqlite_file (str): Имя файла базы SQLite (хранилище данных "sqlite")
+        __journal_file (str): Имя файла журнала изменений
+        __osv_workers (int): Количество процессов для расчета ОСВ
+        __dump_format (str): Формат файла данных ("json", "binary" или "sharded")
+        __dump_compression (str): Сжатие файла данных ("none", "gzip", "bz2" или "lzma")
+        __journal (journal): Подключенный журнал изменений или None
+        __jobs (dict): Задания фоновой выгрузки (dump_job) по идентификатору
+        __warming (dict): Состояние фоновой загрузки транзакций из каталога данных
+        __production (production_posting): Операция списания ингредиентов рецептов
     """
 
     __repo: reposity = reposity()
     __data_file: str = "app_data.json"
+    __binary_data_file: str = "app_data.bin"
+    __sharded_data_dir: str = "app_data"
+    __sqlite_file: str = "app_data.db"
+    __journal_file: str = "app_data.journal"
+    # Записей журнала между fsync и до сворачивания журнала в снимок
+    __journal_sync_every: int = 64
+    __journal_compact_every: int = 10000
+    __journal: journal = None
+    # Сворачивание журнала в файл данных в фоновом потоке и блокировка записи файла данных
+    __compaction: threading.Thread = None
+    __compaction_lock = threading.Lock()
+    __save_lock = threading.Lock()
+    # Задания фоновой выгрузки по идентификатору
+    __jobs: dict = {}
+    __jobs_limit: int = 100
+    __osv_workers: int = 1
+    __dump_format: str = "json"
+    __dump_compression: str = "none"
+    # Настройки коллекции транзакций, применяются заново после загрузки данных
+    __snapshot_period: str = "month"
+    __columnar_store: bool = False
+    # Фоновая загрузка транзакций ("ready", "warming" или "failed")
+    __warming: dict = {"status": "ready", "total": 0, "error": None, "started": None, "finished": None}
+    __warming_thread: threading.Thread = None
+    # Операция «Приготовление блюда», общая для всех запросов (блокировки остатков)
+    __production: production_posting = production_posting(__repo)
 
     def __init__(self):
         """
@@ -83,41 +131,344 @@ class start_service:
 
     def load_data(self) -> bool:
         """
-        Загружает данные из файла, если он существует.
+        Загружает данные из файла, если он существует, и применяет к ним
+        записи журнала изменений, сделанные после записи файла.
         
         Возвращает:
             bool: True если данные успешно загружены, иначе False
         """
         try:
-            if os.path.exists(self.__data_file):
-                with open(self.__data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                converter = convert_factory()
-                loaded_data = converter.convert_back(data["data"])
-                
-                # Восстанавливаем данные в репозиторий
-                self.__repo.data = loaded_data
-                print("Данные успешно загружены из файла")
+            entries = list(journal.read(self.__journal_file))
+            if self.__dump_format == "sharded" and sharded_store(self.__sharded_data_dir).exists():
+                self.load_sharded(self.__sharded_data_dir, entries)
+                print("Справочники загружены, транзакции загружаются в фоновом режиме")
                 return True
-            return False
+            if self.__dump_format == "binary" and os.path.exists(self.__binary_data_file):
+                if len(entries) == 0:
+                    self.load_snapshot(self.__binary_data_file)
+                    print("Справочники загружены из двоичного снимка, транзакции загружаются в фоновом режиме")
+                    return True
+                # Журнал применяется к данным в формате выгрузки, поэтому транзакции читаются как словари
+                with binary_snapshot(self.__binary_data_file) as snapshot:
+                    data = dict(snapshot.references())
+                    data[reposity.transaction_key()] = {item["id"]: item for item in snapshot.records()}
+            elif os.path.exists(self.__data_file):
+                # Сжатый файл распознается по сигнатуре и распаковывается параллельно
+                with compressed_stream.open(self.__data_file) as f:
+                    data = json.load(f)["data"]
+            else:
+                return False
+
+            # Применяем изменения, сделанные после записи файла
+            replayed = journal.apply(entries, data)
+            converter = convert_factory()
+            loaded_data = converter.convert_back(data)
+            
+            # Восстанавливаем данные в репозиторий
+            self.__repo.load(loaded_data)
+            self.__configure_transactions(self.__repo.data[reposity.transaction_key()])
+            print(f"Данные успешно загружены из файла (записей журнала: {replayed})")
+            return True
         except Exception as e:
             print(f"Ошибка загрузки данных: {e}")
             return False
 
+    def load_snapshot(self, filename: str, background: bool = True):
+        """
+        Восстанавливает данные репозитория из двоичного снимка.
+        Справочники восстанавливаются через convert_factory.convert_back сразу,
+        транзакции декодируются из отображенного в память файла при загрузке
+        в фоновом потоке (как в load_sharded), после чего файл закрывается.
+        До этого момента warming_state() возвращает состояние "warming".
+        
+        Аргументы:
+            filename (str): Имя файла снимка
+            background (bool): Декодировать транзакции в фоновом потоке (по умолчанию True)
+            
+        Ошибки:
+            operation_exception: Если файл не является двоичным снимком
+        """
+        # Предыдущая фоновая загрузка должна завершиться до замены данных
+        self.wait_transactions()
+        snapshot = binary_snapshot(filename)
+        try:
+            loaded_data = convert_factory().convert_back(snapshot.references())
+        except BaseException:
+            snapshot.close()
+            raise
+        key = reposity.transaction_key()
+        self.__repo.load(loaded_data)
+        self.__configure_transactions(self.__repo.data[key])
+        cache = {
+            item.unique_code: item
+            for items in loaded_data.values() for item in items.values()
+        }
+        self.__start_warming(
+            len(snapshot), lambda: {item.unique_code: item for item in snapshot.transactions(cache)},
+            snapshot.close, background)
+
+    def load_sharded(self, directory: str, entries: list = None, background: bool = True):
+        """
+        Загружает каталог данных с файлом на каждую коллекцию (sharded_store).
+        Справочники и рецепты, нужные каждому запросу, загружаются сразу.
+        Транзакции читаются, восстанавливаются и индексируются в отдельной
+        коллекции, которая затем атомарно заменяет пустую (reposity.replace).
+        До этого момента warming_state() возвращает состояние "warming".
+        
+        Аргументы:
+            directory (str): Каталог данных
+            entries (list): Записи журнала, сделанные после записи каталога
+            background (bool): Загружать транзакции в фоновом потоке (по умолчанию True)
+            
+        Ошибки:
+            operation_exception: Если в каталоге нет манифеста
+        """
+        validator.validate(directory, str)
+        store = sharded_store(directory)
+        key = reposity.transaction_key()
+        entries = [] if entries is None else entries
+        # Предыдущая фоновая загрузка должна завершиться до замены данных
+        self.wait_transactions()
+
+        data = {item: store.read(item) for item in store.keys() if item != key}
+        journal.apply([entry for entry in entries if entry["key"] != key], data)
+        loaded_data = convert_factory().convert_back(data)
+        self.__repo.load(loaded_data)
+        self.__configure_transactions(self.__repo.data[key])
+        cache = {
+            item.unique_code: item
+            for items in loaded_data.values() for item in items.values()
+        }
+
+        transactions = [entry for entry in entries if entry["key"] == key]
+        self.__start_warming(
+            store.count(key), lambda: start_service.__read_transactions(store, transactions, cache),
+            None, background)
+
+    @staticmethod
+    def __read_transactions(store: sharded_store, entries: list, cache: dict) -> dict:
+        """ Читает транзакции каталога данных и применяет к ним записи журнала """
+        key = reposity.transaction_key()
+        data = {key: store.read(key)}
+        journal.apply(entries, data)
+        return convert_factory().convert_back(data, cache)[key]
+
+    def __start_warming(self, total: int, read, close, background: bool):
+        """
+        Запускает загрузку транзакций (read() -> {код: модель}) в фоновом
+        или текущем потоке. close() (если задана) вызывается после загрузки.
+        """
+        self.__warming = {
+            "status": "warming", "total": total, "error": None,
+            "started": datetime.now(), "finished": None
+        }
+        if background:
+            self.__warming_thread = threading.Thread(
+                target=self.__warm_transactions, args=(read, close), daemon=True)
+            self.__warming_thread.start()
+        else:
+            self.__warm_transactions(read, close)
+
+    def __warm_transactions(self, read, close):
+        """ Загружает и индексирует транзакции, затем подменяет ими коллекцию репозитория """
+        key = reposity.transaction_key()
+        try:
+            items = read()
+            if self.__repo.store is not None:
+                # Транзакции записываются в базу одной фиксацией
+                self.__repo.data[key].update(items)
+            else:
+                collection = transaction_collection()
+                self.__configure_transactions(collection)
+                collection.update(items)
+                self.__repo.replace(key, collection)
+            self.__warming["status"] = "ready"
+        except Exception as e:
+            self.__warming["error"] = str(e)
+            self.__warming["status"] = "failed"
+            print(f"Ошибка загрузки транзакций: {e}")
+        finally:
+            if close is not None:
+                close()
+            self.__warming["finished"] = datetime.now()
+
+        # Записи журнала, отложенные до загрузки транзакций, сворачиваются в файл данных
+        if self.__warming["status"] == "ready" and self.__journal is not None and self.__journal.count > 0:
+            self.save_data()
+
+    def transactions_ready(self) -> bool:
+        """ Проверяет, что транзакции загружены и проиндексированы """
+        return self.__warming["status"] == "ready"
+
+    def wait_transactions(self, timeout: float = None) -> bool:
+        """
+        Ожидает завершения фоновой загрузки транзакций.
+        
+        Аргументы:
+            timeout (float): Максимальное время ожидания в секундах (по умолчанию без ограничения)
+            
+        Возвращает:
+            bool: True, если транзакции загружены
+        """
+        thread = self.__warming_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return self.transactions_ready()
+
+    def warming_state(self) -> dict:
+        """
+        Возвращает состояние загрузки транзакций для ответа API.
+        
+        Возвращает:
+            dict: Состояние ("ready", "warming" или "failed"), количество транзакций
+                  по манифесту, ошибка и время начала и окончания загрузки
+        """
+        state = dict(self.__warming)
+        for name in ["started", "finished"]:
+            state[name] = state[name].isoformat() if state[name] else None
+        return state
+
+    def __configure_transactions(self, collection: transaction_collection):
+        """ Применяет к коллекции транзакций настройки снимков остатков и колоночного хранилища """
+        collection.snapshots.period = self.__snapshot_period
+        # Колоночное хранилище транзакций (требуется numpy, в базе SQLite агрегаты считает сама база)
+        if self.__columnar_store and not collection.enable_columns():
+            print("Колоночное хранилище недоступно (пакет numpy не установлен или данные в базе SQLite)")
+
+    def open_store(self, filename: str = None) -> bool:
+        """
+        Переключает репозиторий на хранение в базе SQLite.
+        Модели справочников и рецептов, сохраненные в базе, восстанавливаются
+        через convert_factory.convert_back, транзакции остаются в базе.
+        
+        Аргументы:
+            filename (str): Имя файла базы (по умолчанию app_data.db)
+            
+        Возвращает:
+            bool: True, если в базе уже есть данные
+        """
+        if filename is None:
+            filename = self.__sqlite_file
+        validator.validate(filename, str)
+        self.close_store()
+        store = sqlite_store(filename)
+        key = reposity.transaction_key()
+        data = {item: store.entities(item) for item in reposity.keys() if item != key}
+        converter = convert_factory()
+        self.__repo.attach_store(store, converter.convert, converter.convert_back(data))
+        self.__configure_transactions(self.__repo.data[key])
+        return any(len(items) > 0 for items in data.values()) or store.transaction_count() > 0
+
+    def store_metrics(self) -> dict:
+        """
+        Возвращает показатели пула соединений базы SQLite для API.
+
+        Возвращает:
+            dict: Показатели sqlite_pool.metrics() и имя файла базы
+                  или {"backend": "memory"}, если база не подключена
+        """
+        store = self.__repo.store
+        if store is None:
+            return {"backend": "memory"}
+        result = {"backend": "sqlite", "filename": store.filename}
+        result.update(store.pool.metrics())
+        return result
+
+    def close_store(self):
+        """ Возвращает репозиторий к хранению в памяти и закрывает базу SQLite """
+        if self.__repo.store is None:
+            return
+        self.__repo.detach_store().close()
+        self.__configure_transactions(self.__repo.data[reposity.transaction_key()])
+
+    def open_journal(self):
+        """
+        Подключает журнал изменений репозитория.
+        Записи, оставшиеся в журнале после загрузки, сворачиваются в файл данных
+        (при фоновой загрузке транзакций - после ее завершения).
+        """
+        if self.__journal is not None:
+            return
+        self.__journal = journal(
+            self.__journal_file, convert_factory().convert,
+            self.__journal_sync_every, self.__journal_compact_every, self.__compact_journal)
+        if self.__journal.count > 0 and self.transactions_ready():
+            self.save_data()
+        self.__repo.attach_journal(self.__journal)
+
+    def close_journal(self):
+        """ Отключает журнал изменений и закрывает его файл """
+        if self.__journal is None:
+            return
+        self.__repo.detach_journal()
+        # Фоновое сворачивание удаляет записи из файла журнала
+        self.wait_compaction()
+        self.__journal.close()
+        self.__journal = None
+
     def save_data(self) -> bool:
         """
         Сохраняет текущие данные в файл.
+        Позиция журнала изменений запоминается вместе со снимком коллекций,
+        после записи файла из журнала удаляются только записи до нее:
+        изменения, сделанные во время записи файла, остаются в журнале.
         
         Возвращает:
             bool: True если данные успешно сохранены, иначе False
         """
-        try:
-            self.dump(self.__data_file)
+        # Данные в базе SQLite сохраняются при каждом изменении
+        if self.__repo.store is not None:
             return True
-        except Exception as e:
-            print(f"Ошибка сохранения данных: {e}")
+        # Без загруженных транзакций файл данных потерял бы их
+        if not self.wait_transactions():
+            print("Транзакции не загружены. Данные не сохранены")
             return False
+        if self.__dump_format == "sharded":
+            filename = self.__sharded_data_dir
+        elif self.__dump_format == "binary":
+            filename = self.__binary_data_file
+        else:
+            filename = self.__data_file
+        # Файл данных записывается одним потоком за раз
+        with self.__save_lock:
+            try:
+                journal_file = self.__journal
+                # Записи журнала до позиции относятся к изменениям, уже попавшим в снимок:
+                # позиция и снимок берутся без изменений транзакций между ними
+                with self.__repo.data[reposity.transaction_key()].write_lock:
+                    position = journal_file.position() if journal_file is not None else None
+                    job = dump_job(self.__repo.data, filename, self.__dump_format, self.__dump_compression)
+                job.run()
+                if journal_file is not None:
+                    journal_file.truncate(position)
+                return True
+            except Exception as e:
+                print(f"Ошибка сохранения данных: {e}")
+                return False
+
+    def __compact_journal(self):
+        """
+        Сворачивает журнал в файл данных в фоновом потоке (вызывается журналом
+        из потока, изменившего коллекцию). Одновременно выполняется одно сворачивание.
+        """
+        with self.__compaction_lock:
+            if self.__compaction is not None and self.__compaction.is_alive():
+                return
+            start_service.__compaction = threading.Thread(target=self.save_data, daemon=True)
+            start_service.__compaction.start()
+
+    def wait_compaction(self, timeout: float = None) -> bool:
+        """
+        Ожидает завершения фонового сворачивания журнала.
+
+        Возвращает:
+            bool: True, если сворачивание не выполняется
+        """
+        compaction = self.__compaction
+        if compaction is not None:
+            compaction.join(timeout)
+            return not compaction.is_alive()
+        return True
 
     def initialize_application(self, settings_mgr: settings_manager) -> bool:
         """
@@ -134,6 +485,27 @@ class start_service:
             - Если first_start = False: загружает данные из файла
             - Если файл данных не найден: создает новые данные
         """
+        # Периодичность снимков остатков для ОСВ и колоночное хранилище
+        self.__snapshot_period = settings_mgr.settings().snapshot_period
+        self.__columnar_store = settings_mgr.settings().columnar_store
+        self.__osv_workers = settings_mgr.settings().osv_workers
+        self.__dump_format = settings_mgr.settings().dump_format
+        self.__dump_compression = settings_mgr.settings().dump_compression
+        self.__configure_transactions(self.__repo.data[reposity.transaction_key()])
+
+        # Данные в базе SQLite: файл данных и журнал не нужны
+        if settings_mgr.settings().repository_backend == "sqlite":
+            if self.open_store():
+                print("Данные загружены из базы SQLite")
+            else:
+                print("База SQLite пуста. Создание новых данных...")
+                self.start()
+            if settings_mgr.is_first_start():
+                settings_mgr.set_first_start_completed()
+            return True
+
+        # Хранение в памяти: ранее подключенная база SQLite отключается
+        self.close_store()
         if settings_mgr.is_first_start():
             print("Первый запуск приложения. Инициализация данных...")
             # Создаем начальные данные
@@ -143,7 +515,6 @@ class start_service:
                 # Устанавливаем флаг первого запуска в False
                 settings_mgr.set_first_start_completed()
                 print("Инициализация данных завершена")
-                return True
             else:
                 print("Ошибка сохранения данных при первом запуске")
                 return False
@@ -153,6 +524,10 @@ class start_service:
                 print("Файл данных не найден. Создание новых данных...")
                 self.start()
                 self.save_data()
+
+        # Журнал изменений между записями файла данных
+        if settings_mgr.settings().journal:
+            self.open_journal()
         
         return True
 
@@ -440,31 +815,165 @@ class start_service:
         self.__repo.data[reposity.transaction_key()][t4.unique_code] = t4
         self.__repo.data[reposity.transaction_key()][t5.unique_code] = t5
 
-    def dump(self, filename: str = "data_dump.json"):
+    @property
+    def dump_format(self) -> str:
+        """ Формат файла данных из настроек ("json", "binary" или "sharded") """
+        return self.__dump_format
+
+    @property
+    def dump_compression(self) -> str:
+        """ Сжатие файла данных из настроек ("none", "gzip", "bz2" или "lzma") """
+        return self.__dump_compression
+
+    def dump(self, filename: str = "data_dump.json", dump_format: str = "json", compression: str = "none"):
         """
-        Выгружает в файл JSON-формата все доступные данные из репозитория.
+        Выгружает в файл все доступные данные из репозитория.
+        Файл записывается во временный и атомарно заменяет прежний (dump_job).
         
         Аргументы:
             filename (str): Имя файла для сохранения данных (по умолчанию "data_dump.json")
+            dump_format (str): "json" (по умолчанию), "binary" - двоичный снимок (binary_snapshot)
+                или "sharded" - каталог с файлом на каждую коллекцию (filename - каталог)
+            compression (str): "none" (по умолчанию), "gzip", "bz2" или "lzma" - файл
+                записывается частями, сжатыми параллельно (compressed_stream)
             
         Ошибки:
             Exception: В случае ошибки при записи файла
+            operation_exception: Если фоновая загрузка транзакций завершилась ошибкой
         """
-        # Собираем все данные из репозитория
-        data_to_dump = {}
-        
-        # Сохраняем данные в файл
+        self.__require_transactions()
+        job = dump_job(self.__repo.data, filename, dump_format, compression)
         try:
-            # Открываем файл для записи с кодировкой UTF-8
-            with open(filename, 'w', encoding='utf-8') as f:
-                converter = convert_factory()
-                data_to_dump["data"] = converter.convert(self.__repo.data)
-
-                json.dump(data_to_dump, f, ensure_ascii=False, indent=2, default=str)
+            job.run()
         except Exception as e:
             # Обработка возможных ошибок при записи файла
             raise argument_exception("Ошибка при выгрузке данных!")
 
+    def dump_async(self, filename: str = "data_dump.json", dump_format: str = "json",
+                   compression: str = "none") -> dump_job:
+        """
+        Запускает выгрузку в фоновом потоке.
+        Снимок коллекций запоминается сразу, запрос не ждет записи файла.
+        
+        Аргументы:
+            filename (str): Имя файла для сохранения данных
+            dump_format (str): "json" (по умолчанию), "binary" или "sharded"
+            compression (str): "none" (по умолчанию), "gzip", "bz2" или "lzma"
+            
+        Возвращает:
+            dump_job: Запущенное задание, состояние доступно через find_dump_job
+        """
+        self.__require_transactions()
+        job = dump_job(self.__repo.data, filename, dump_format, compression)
+        self.__jobs[job.id] = job
+        # Храним ограниченное количество заданий, удаляя самые старые завершенные
+        for key in list(self.__jobs.keys()):
+            if len(self.__jobs) <= self.__jobs_limit:
+                break
+            if self.__jobs[key].status in [dump_job.DONE, dump_job.FAILED]:
+                del self.__jobs[key]
+        return job.start()
+
+    def __require_transactions(self):
+        """ Ожидает фоновую загрузку транзакций: выгрузка без них потеряла бы данные """
+        if not self.wait_transactions():
+            raise operation_exception(f"Транзакции не загружены: {self.__warming['error']}")
+
+    def ingest_transactions(self, source, ingest_format: str = "csv", skip_invalid: bool = False) -> dict:
+        """
+        Загружает пакет транзакций из CSV или JSON lines (transaction_ingest).
+        Коды склада, номенклатуры и единицы ищутся в словарях по unique_code,
+        столбцы значений проверяются целиком, а транзакции добавляются
+        в репозиторий одной операцией.
+        
+        Аргументы:
+            source (str|iterable[str]): Текст или строки текста
+            ingest_format (str): "csv" или "jsonl"
+            skip_invalid (bool): Добавить корректные строки, отклонив строки с ошибками.
+                                 По умолчанию при любой ошибке пакет не добавляется.
+            
+        Возвращает:
+            dict: Итог загрузки: строк, добавлено, отклонено и ошибки (номер строки, текст; не больше 100)
+        """
+        validator.validate(skip_invalid, bool)
+        self.__require_transactions()
+        columns, numbers, rejected = transaction_ingest.read(source, ingest_format)
+        data = self.__repo.data
+        # Сборка мусора приостанавливается на время создания и вставки моделей в памяти
+        with transaction_ingest.paused_gc(self.__repo.store is None):
+            items, errors = transaction_ingest.build(
+                columns, numbers,
+                {item.unique_code: item for item in data[reposity.storage_key()].values()},
+                {item.unique_code: item for item in data[reposity.nomenclature_key()].values()},
+                {item.unique_code: item for item in data[reposity.measure_key()].values()})
+            total = len(numbers) + len(rejected)
+            rejected = sorted(rejected + errors)
+
+            if len(rejected) > 0 and not skip_invalid:
+                items = {}
+            if len(items) > 0:
+                self.__repo.add_transactions(items)
+        return {
+            "total": total,
+            "inserted": len(items),
+            "rejected": len(rejected),
+            "errors": [{"line": line, "error": message} for line, message in rejected[:100]]
+        }
+
+    def import_transactions(self, filename: str, import_format: str = None, reject_filename: str = None,
+                            batch_size: int = transaction_importer.BATCH,
+                            queue_size: int = transaction_importer.QUEUE, progress=None) -> dict:
+        """
+        Потоковый импорт транзакций из файла CSV или JSON lines (transaction_importer).
+        Файл читается частями по batch_size строк, строки с ошибками не прерывают
+        импорт, а записываются в файл отказов.
+        
+        Аргументы:
+            filename (str): Имя файла
+            import_format (str): "csv" или "jsonl" (по умолчанию - по расширению файла)
+            reject_filename (str): Файл отказов (JSON lines), по умолчанию не записывается
+            batch_size (int): Количество строк в части файла
+            queue_size (int): Длина очередей между этапами конвейера
+            progress (callable): Вызывается с ходом импорта (dict) не чаще раза в секунду и по окончании
+            
+        Возвращает:
+            dict: Итог импорта: строк, добавлено, отклонено, ошибки (не больше 100), время и скорость
+        """
+        if import_format is None:
+            import_format = transaction_importer.detect_format(filename)
+        importer = transaction_importer(self.__repo, batch_size, queue_size)
+        self.__require_transactions()
+        return importer.run(filename, import_format, reject_filename, progress)
+
+    def post_production(self, recipe: recipe_model, storage: storage_model, portions: float,
+                        mode: str = production_posting.BLOCKING, date: datetime = None) -> list:
+        """
+        Списывает ингредиенты рецепта со склада (операция «Приготовление блюда»).
+        
+        Аргументы:
+            recipe (recipe_model): Рецепт
+            storage (storage_model): Склад
+            portions (int|float): Количество порций
+            mode (str): "blocking" - с блокировкой при недостатке остатков,
+                        "overdraft" - под сальдо
+            date (datetime): Дата списания (по умолчанию - текущая)
+            
+        Возвращает:
+            list[transaction_model]: Транзакции расхода ингредиентов
+            
+        Ошибки:
+            insufficient_balance_exception: Не хватает остатков (вариант "blocking")
+        """
+        self.__require_transactions()
+        return self.__production.post(recipe, storage, portions, mode, date)
+
+    def find_dump_job(self, job_id: str) -> dump_job:
+        """
+        Возвращает задание выгрузки по идентификатору или None.
+        """
+        validator.validate(job_id, str)
+        return self.__jobs.get(job_id)
+
     def create_osv(self, start_date: datetime, end_date: datetime, storage: storage_model):
         """
         Создает оборотно-сальдовую ведомость для указанного склада за период.
@@ -480,8 +989,7 @@ class start_service:
         Ошибки:
             Validation error: Если переданный объект склада не является моделью storage_model
         """
-        # Получаем транзакции и номенклатуру из репозитория
-        transactions = self.__repo.data[reposity.transaction_key()]
+        # Получаем номенклатуру из репозитория
         nomenclatures = self.__repo.data[reposity.nomenclature_key()]
         
         # Получаем объект склада по переданному экземпляру
@@ -495,11 +1003,98 @@ class start_service:
         osv = osv_model.create(start_date, end_date, storage_obj)
         osv_build = osv_builder(osv)
         
-        # Генерируем строки ведомости на основе транзакций и номенклатуры
-        osv_build.generate_rows(transactions, nomenclatures)
+        # Если включено колоночное хранилище - считаем ведомость векторно
+        columns = self.__repo.columns()
+        if columns is not None:
+            osv_build.generate_rows_columnar(columns, nomenclatures)
+            return osv_build
+
+        # Данные в базе SQLite - суммы считаются запросом с группировкой
+        if self.__repo.store is not None:
+            totals = self.__repo.data[reposity.transaction_key()].totals(
+                start_date, end_date, [storage_obj.unique_code])
+            osv_build.generate_rows_totals(totals[storage_obj.unique_code], nomenclatures)
+            return osv_build
+
+        # Генерируем строки ведомости по отсортированным транзакциям склада,
+        # начальный остаток берется из ближайшего снимка остатков
+        transactions = self.__repo.storage_transactions(storage_obj.unique_code)
+        if self.__osv_workers > 1:
+            osv_build.generate_rows_parallel(transactions, nomenclatures, self.__osv_workers, self.__repo.snapshots())
+        else:
+            osv_build.generate_rows_sorted(transactions, nomenclatures, self.__repo.snapshots())
         
         return osv_build
-    
+
+    def live_osv(self, start_date: datetime, end_date: datetime, storage: storage_model) -> osv_builder:
+        """
+        Возвращает поддерживаемую оборотно-сальдовую ведомость склада за период.
+
+        При первом запросе ведомость строится и подписывается на изменения транзакций,
+        далее ее строки обновляются при каждой вставке, изменении и удалении транзакции,
+        а повторный запрос возвращает готовый результат.
+
+        Аргументы:
+            start_date (datetime): Начальная дата периода
+            end_date (datetime): Конечная дата периода
+            storage (storage_model): Склад
+
+        Возвращает:
+            osv_builder: Поддерживаемая ведомость
+        """
+        validator.validate(start_date, datetime)
+        validator.validate(end_date, datetime)
+        storage_obj = self.__repo.data[reposity.storage_key()][storage.name]
+        validator.validate(storage_obj, storage_model)
+        return self.__repo.osv_registry().subscribe(start_date, end_date, storage_obj)
+
+    def create_osv_batch(self, start_date: datetime, end_date: datetime, storages: list = None) -> list:
+        """
+        Создает оборотно-сальдовые ведомости сразу для нескольких складов за период.
+
+        Для каждого склада просматривается только его индекс транзакций,
+        упорядоченный по дате, а начальный остаток берется из ближайшего
+        снимка остатков. Транзакции других складов не читаются.
+
+        Аргументы:
+            start_date (datetime): Начальная дата периода
+            end_date (datetime): Конечная дата периода
+            storages (list[storage_model]): Склады (по умолчанию - все склады репозитория)
+
+        Возвращает:
+            list[osv_builder]: Ведомости в порядке переданных складов
+        """
+        validator.validate(start_date, datetime)
+        validator.validate(end_date, datetime)
+        if storages is None:
+            storages = list(self.__repo.data[reposity.storage_key()].values())
+        validator.validate(storages, list)
+
+        builders = []
+        codes = set()
+        for storage in storages:
+            validator.validate(storage, storage_model)
+            if storage.unique_code in codes:
+                raise operation_exception(f"Ведомость склада {storage.name} передана повторно!")
+            codes.add(storage.unique_code)
+            builders.append(osv_builder(osv_model.create(start_date, end_date, storage)))
+        if len(builders) == 0:
+            return builders
+
+        transactions = self.__repo.data[reposity.transaction_key()]
+        nomenclatures = self.__repo.data[reposity.nomenclature_key()]
+        # Данные в базе SQLite - суммы всех складов считаются одним запросом
+        if self.__repo.store is not None:
+            totals = transactions.totals(start_date, end_date, [item.storage.unique_code for item in builders])
+            for builder in builders:
+                builder.generate_rows_totals(totals[builder.storage.unique_code], nomenclatures)
+            return builders
+        snapshots = self.__repo.snapshots()
+        for builder in builders:
+            builder.generate_rows_sorted(
+                self.__repo.storage_transactions(builder.storage.unique_code), nomenclatures, snapshots)
+        return builders
+
     def start(self):
         """
         Основной метод инициализации всех данных приложения.
@@ -0,0 +1,144 @@
+import unittest
+from datetime import datetime
+from Src.Core.balance_snapshots import balance_snapshots
+from Src.Core.osv_builder import osv_builder
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.validator import argument_exception
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Unit-тесты для класса balance_snapshots.
+    Проверяются:
+    - границы периодов снимков
+    - совпадение начального остатка со снимками и без них
+    - сброс снимков после вставки транзакции задним числом
+    - снимки, построенные во время записи задним числом, не сохраняются
+    - сброс снимков после изменения коэффициента пересчета единицы
+"""
+
+class TestBalanceSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.gramm = measure_model.create_gramm()
+        self.kilogramm = measure_model.create_kilogramm()
+        group = nomenclature_group_model.create("мука и крупы")
+        self.flour = nomenclature_model.create("Мука", group, self.gramm)
+        self.nomenclatures = {"Мука": self.flour}
+        self.storage = storage_model()
+        self.storage.name = "Основной склад"
+
+        self.collection = transaction_collection()
+        self.add("2025-01-15 10:00:00", 2.0, self.kilogramm)
+        self.add("2025-03-10 10:00:00", -500.0, self.gramm)
+        self.add("2025-05-20 10:00:00", 300.0, self.gramm)
+        self.add("2025-07-01 00:00:00", 100.0, self.gramm)
+
+    def add(self, date: str, quantity: float, measure):
+        transaction = transaction_model()
+        transaction.date = date
+        transaction.nomenclature = self.flour
+        transaction.storage = self.storage
+        transaction.quantity = quantity
+        transaction.measure = measure
+        self.collection[transaction.unique_code] = transaction
+
+    def build(self, start: datetime, end: datetime, snapshots = None) -> osv_builder:
+        osv = osv_model.create(start, end, self.storage)
+        builder = osv_builder(osv)
+        index = self.collection.storage_index(self.storage.unique_code)
+        builder.generate_rows_sorted(index, self.nomenclatures, snapshots)
+        return builder
+
+    def test_boundaries(self):
+        # Подготовка
+        snapshots = balance_snapshots("month")
+        date = datetime(2025, 12, 15, 10, 30)
+
+        # Действие
+        boundary = snapshots.boundary(date)
+
+        # Проверка
+        self.assertEqual(boundary, datetime(2025, 12, 1))
+        self.assertEqual(snapshots.next_boundary(boundary), datetime(2026, 1, 1))
+
+    def test_invalid_period(self):
+        # Подготовка
+
+        # Действие и проверка
+        with self.assertRaises(argument_exception):
+            balance_snapshots("week")
+
+    def test_opening_matches_full_history(self):
+        # Подготовка
+        snapshots = self.collection.snapshots
+        start, end = datetime(2025, 6, 10), datetime(2025, 7, 31)
+
+        # Действие
+        expected = self.build(start, end).find_row(self.flour)
+        actual = self.build(start, end, snapshots).find_row(self.flour)
+
+        # Проверка
+        self.assertEqual(actual.start_balance, 1800.0)
+        self.assertEqual(actual.start_balance, expected.start_balance)
+        self.assertEqual(actual.end_balance, expected.end_balance)
+        self.assertGreater(snapshots.count(self.storage.unique_code), 0)
+
+    def test_back_dated_insert_invalidates(self):
+        # Подготовка
+        snapshots = self.collection.snapshots
+        self.build(datetime(2025, 6, 10), datetime(2025, 7, 31), snapshots)
+
+        # Действие
+        self.add("2025-04-05 10:00:00", 50.0, self.gramm)
+        count = snapshots.count(self.storage.unique_code)
+        row = self.build(datetime(2025, 6, 10), datetime(2025, 7, 31), snapshots).find_row(self.flour)
+
+        # Проверка
+        # Остаются снимки на 1 февраля, 1 марта и 1 апреля
+        self.assertEqual(count, 3)
+        self.assertEqual(row.start_balance, 1850.0)
+
+    def test_measure_change_invalidates(self):
+        # Подготовка
+        bag = measure_model("мешок", 10.0, self.gramm)
+        self.add("2025-02-01 10:00:00", 1.0, bag)
+        snapshots = self.collection.snapshots
+        self.build(datetime(2025, 6, 10), datetime(2025, 7, 31), snapshots)
+
+        # Действие
+        bag.conversion_factor = 20.0
+        row = self.build(datetime(2025, 6, 10), datetime(2025, 7, 31), snapshots).find_row(self.flour)
+
+        # Проверка
+        self.assertEqual(row.start_balance, 1820.0)
+
+    def test_insert_during_build_not_stored(self):
+        # Подготовка
+        snapshots = self.collection.snapshots
+        index = self.collection.storage_index(self.storage.unique_code)
+        inserted = []
+
+        def convert(transaction):
+            # Запись задним числом из другого потока, пока читатель строит снимки
+            if len(inserted) == 0:
+                inserted.append(True)
+                self.add("2025-02-05 10:00:00", 50.0, self.gramm)
+            return osv_builder.row_quantity(transaction)
+
+        # Действие
+        snapshots.opening(index, self.storage.unique_code, datetime(2025, 6, 10), convert)
+        count = snapshots.count(self.storage.unique_code)
+        row = self.build(datetime(2025, 6, 10), datetime(2025, 7, 31), snapshots).find_row(self.flour)
+
+        # Проверка
+        self.assertEqual(count, 0)
+        self.assertEqual(row.start_balance, 1850.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.binary_snapshot import binary_snapshot
+from Src.Core.validator import operation_exception
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для класса binary_snapshot.
+    Проверяются:
+    - выгрузка и восстановление данных репозитория через двоичный снимок
+      (результат совпадает с восстановлением из JSON), транзакции - в фоновом потоке
+    - декодирование отдельной транзакции по номеру записи
+    - отказ при открытии файла другого формата
+"""
+
+class TestBinarySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "snapshot.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        # Подготовка
+        factory = convert_factory()
+        # Ожидаемый результат - восстановление из выгрузки JSON
+        expected = factory.convert(factory.convert_back(factory.convert(self.service.data())))
+        self.service.dump(self.filename, "binary")
+
+        # Действие
+        self.service.load_snapshot(self.filename)
+        ready = self.service.wait_transactions(30)
+
+        # Проверка
+        self.assertTrue(ready)
+        self.assertTrue(binary_snapshot.is_snapshot(self.filename))
+        self.assertEqual(factory.convert(self.service.data()), expected)
+
+    def test_transaction_by_position(self):
+        # Подготовка
+        data = self.service.data()
+        transactions = list(data[reposity.transaction_key()].values())
+        cache = {}
+        for key in [reposity.storage_key(), reposity.nomenclature_key(), reposity.measure_key()]:
+            cache.update({item.unique_code: item for item in data[key].values()})
+        self.service.dump(self.filename, "binary")
+
+        # Действие
+        with binary_snapshot(self.filename) as snapshot:
+            count = len(snapshot)
+            item = snapshot.transaction(2, cache)
+
+        # Проверка
+        self.assertEqual(count, len(transactions))
+        self.assertEqual(item.unique_code, transactions[2].unique_code)
+        self.assertEqual(item.date, transactions[2].date)
+        self.assertEqual(item.quantity, transactions[2].quantity)
+        self.assertIs(item.nomenclature, transactions[2].nomenclature)
+        self.assertIs(item.storage, transactions[2].storage)
+
+    def test_not_snapshot(self):
+        # Подготовка
+        self.service.dump(self.filename)
+
+        # Действие и проверка
+        self.assertFalse(binary_snapshot.is_snapshot(self.filename))
+        with self.assertRaises(operation_exception):
+            binary_snapshot(self.filename)
+
+if __name__ == '__main__':
+    unittest.main()
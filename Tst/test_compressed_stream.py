@@ -0,0 +1,91 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.binary_snapshot import binary_snapshot
+from Src.Core.compressed_stream import compressed_stream
+from Src.Core.sharded_store import sharded_store
+from Src.Core.validator import operation_exception
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для класса compressed_stream.
+    Проверяются:
+    - сжатие и распаковка частями для каждого алгоритма
+    - выгрузка JSON, двоичного снимка и каталога коллекций со сжатием
+    - ошибка при чтении обрезанного файла
+"""
+
+class TestCompressedStream(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "data.z")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        # Подготовка
+        data = "".join(f"{number:08x}-транзакция;" for number in range(5000)).encode("utf-8")
+
+        for codec in compressed_stream.codecs():
+            # Действие
+            with open(self.filename, "wb") as f:
+                with compressed_stream.writer(f, codec, chunk_size=7000, workers=3) as stream:
+                    # Запись порциями, не кратными размеру части
+                    for position in range(0, len(data), 3001):
+                        stream.write(data[position:position + 3001])
+
+            # Проверка
+            self.assertTrue(compressed_stream.is_compressed(self.filename))
+            self.assertEqual(compressed_stream.read(self.filename), data)
+            self.assertEqual(compressed_stream.read(self.filename, workers=1), data)
+            self.assertEqual(compressed_stream.head(self.filename), data[:7000])
+            self.assertLess(os.path.getsize(self.filename), len(data))
+
+    def test_dump(self):
+        # Подготовка
+        data = self.service.repo.data
+        expected = json.loads(json.dumps({"data": convert_factory().convert(data)}, default=str))
+        binary = os.path.join(self.directory.name, "data.bin")
+        sharded = os.path.join(self.directory.name, "data")
+
+        # Действие
+        self.service.dump(self.filename, "json", "gzip")
+        self.service.dump(binary, "binary", "lzma")
+        self.service.dump(sharded, "sharded", "bz2")
+
+        # Проверка
+        with compressed_stream.open(self.filename) as f:
+            self.assertEqual(json.load(f), expected)
+        self.assertTrue(binary_snapshot.is_snapshot(binary))
+        with binary_snapshot(binary) as snapshot:
+            self.assertEqual(len(snapshot), len(data[reposity.transaction_key()]))
+        store = sharded_store(sharded)
+        self.assertEqual(store.read(reposity.recipe_key()), expected["data"][reposity.recipe_key()])
+        self.assertEqual(store.manifest()["collections"][reposity.recipe_key()]["compression"], "bz2")
+
+    def test_truncated(self):
+        # Подготовка
+        stream = io.BytesIO()
+        with compressed_stream.writer(stream, "gzip", chunk_size=16, workers=1) as writer:
+            writer.write(b"0123456789" * 10)
+
+        # Действие
+        with open(self.filename, "wb") as f:
+            f.write(stream.getvalue()[:-5])
+
+        # Проверка
+        with self.assertRaises(operation_exception):
+            compressed_stream.read(self.filename)
+        self.assertFalse(binary_snapshot.is_snapshot(self.filename))
+
+if __name__ == '__main__':
+    unittest.main()
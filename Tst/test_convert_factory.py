@@ -3,6 +3,10 @@ from Src.Convertors.convert_factory import convert_factory
 from datetime import datetime, date, time
 from Src.Core.abstract_model import abstract_model
 from Src.Core.abstract_dto import abstract_dto
+from Src.Core.common import common
+from Src.Models.measure_model import measure_model
+from Src.reposity import reposity
+from Src.start_service import start_service
 
 """
     Unit-тесты для модуля convert_factory:
@@ -12,6 +16,9 @@ from Src.Core.abstract_dto import abstract_dto
     - Обработка списков и словарей
     - Получение информации о конвертерах
     - Обработка граничных случаев (None, неизвестные типы)
+    - Повторное преобразование модели через кэшированный сериализатор
+    - Преобразование моделей по таблице свойств DTO с тем же результатом, что и через DTO
+    - Восстановление моделей из выгрузки (convert_back) с сохранением ссылок
 """
 
 class TestConvertFactory(unittest.TestCase):
@@ -108,5 +115,68 @@ class TestConvertFactory(unittest.TestCase):
         self.assertEqual(result["string"], "hello")
         self.assertEqual(result["boolean"], True)
 
+    def test_convert_model_cached(self):
+        # Подготовка
+        kilogramm = measure_model.create_kilogramm()
+        fields = common.get_fields(kilogramm.to_dto())
+
+        # Действие
+        first = self.factory.convert(kilogramm)
+        second = convert_factory().convert(kilogramm)
+
+        # Проверка
+        self.assertEqual(list(first.keys()), fields)
+        self.assertEqual(first, second)
+        self.assertEqual(first["name"], "килограмм")
+        self.assertEqual(first["value"], 1000.0)
+
+    def test_convert_model_without_dto(self):
+        # Подготовка
+        service = start_service()
+        service.start()
+        models = [item for items in service.data().values() for item in items.values()]
+        transaction = next(iter(service.data()[reposity.transaction_key()].values()))
+        expected = []
+        for item in models:
+            dto = item.to_dto()
+            expected.append({name: self.factory.convert(getattr(dto, name)) for name in common.get_fields(dto)})
+
+        # Действие
+        result = [self.factory.convert(item) for item in models]
+        # Модель с таблицей свойств DTO преобразуется без вызова to_dto
+        transaction.to_dto = None
+        converted = self.factory.convert(transaction)
+
+        # Проверка
+        for actual, values in zip(result, expected):
+            self.assertEqual(actual, values)
+            self.assertEqual(list(actual.keys()), list(values.keys()))
+        self.assertEqual(converted["id"], transaction.unique_code)
+
+    def test_convert_back_round_trip(self):
+        # Подготовка
+        service = start_service()
+        service.start()
+        dumped = self.factory.convert(service.data())
+        # Базовая единица после зависимых
+        measures = dumped[reposity.measure_key()]
+        dumped[reposity.measure_key()] = dict(reversed(list(measures.items())))
+
+        # Действие
+        result = self.factory.convert_back(dumped)
+
+        # Проверка
+        for key, items in service.data().items():
+            self.assertEqual(set(result[key].keys()), set(items.keys()))
+            for item_key, item in items.items():
+                self.assertEqual(result[key][item_key].unique_code, item.unique_code)
+        transaction = next(iter(result[reposity.transaction_key()].values()))
+        nomenclature = result[reposity.nomenclature_key()][transaction.nomenclature.name]
+        self.assertIs(transaction.nomenclature, nomenclature)
+        kilogramm = result[reposity.measure_key()]["кг"]
+        self.assertIs(kilogramm.base_measure, result[reposity.measure_key()]["г"])
+        service.repo.load(result)
+        self.assertEqual(self.factory.convert(service.data()), self.factory.convert(result))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
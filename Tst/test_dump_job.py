@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.dump_job import dump_job
+from Src.Models.storage_model import storage_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для класса dump_job.
+    Проверяются:
+    - фоновая выгрузка по снимку, зафиксированному при создании задания
+    - снимок транзакций в базе SQLite не видит изменений после создания задания
+    - атомарная замена файла без временных файлов
+    - состояние задания при ошибке записи
+    - потоковая запись JSON совпадает с json.dump полного словаря
+"""
+
+class TestDumpJob(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "dump.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_background_snapshot(self):
+        # Подготовка
+        expected = convert_factory().convert(self.service.repo.data)
+        job = dump_job(self.service.repo.data, self.filename)
+        storage = storage_model()
+        storage.name = "Склад после снимка"
+        self.service.repo.data[reposity.storage_key()][storage.name] = storage
+
+        # Действие
+        job.start()
+        finished = job.wait(30)
+
+        # Проверка
+        self.assertTrue(finished)
+        self.assertEqual(job.status, dump_job.DONE)
+        self.assertEqual(job.state()["progress"], 1.0)
+        with open(self.filename, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["data"], json.loads(json.dumps(expected, default=str)))
+        self.assertEqual(os.listdir(self.directory.name), ["dump.json"])
+
+    def test_dump_async(self):
+        # Подготовка
+        filename = os.path.join(self.directory.name, "dump.bin")
+
+        # Действие
+        job = self.service.dump_async(filename, "binary")
+        job.wait(30)
+
+        # Проверка
+        self.assertIs(self.service.find_dump_job(job.id), job)
+        self.assertEqual(job.status, dump_job.DONE)
+        self.service.load_snapshot(filename, background=False)
+        self.assertTrue(self.service.transactions_ready())
+
+    def test_failed(self):
+        # Подготовка
+        job = dump_job(self.service.repo.data, os.path.join(self.directory.name, "missing", "dump.json"))
+
+        # Действие
+        job.start()
+        job.wait(30)
+
+        # Проверка
+        self.assertEqual(job.status, dump_job.FAILED)
+        self.assertIsNotNone(job.error)
+        self.assertIsNotNone(job.state()["finished"])
+
+    def test_stream_matches_full_dump(self):
+        # Подготовка
+        data = self.service.repo.data
+        expected = json.dumps({"data": convert_factory().convert(data)}, ensure_ascii=False, indent=2, default=str)
+        batch = dump_job.BATCH
+        # Несколько пакетов на коллекцию, включая неполный последний
+        dump_job.BATCH = 2
+
+        # Действие
+        try:
+            dump_job(data, self.filename).run()
+        finally:
+            dump_job.BATCH = batch
+
+        # Проверка
+        with open(self.filename, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_sqlite_snapshot(self):
+        # Подготовка
+        self.service.open_store(os.path.join(self.directory.name, "data.db"))
+        self.service.start()
+        transactions = self.service.repo.data[reposity.transaction_key()]
+        expected = list(transactions)
+        job = dump_job(self.service.repo.data, self.filename)
+
+        # Действие
+        try:
+            del transactions[expected[0]]
+            job.start()
+            job.wait(30)
+        finally:
+            self.service.close_store()
+
+        # Проверка
+        self.assertEqual(job.status, dump_job.DONE)
+        with open(self.filename, "r", encoding="utf-8") as f:
+            self.assertEqual(list(json.load(f)["data"][reposity.transaction_key()]), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.journal import journal
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для класса journal.
+    Проверяются:
+    - восстановление изменений репозитория по снимку и журналу
+    - отбрасывание недописанной последней записи и запись после повторного открытия
+    - сворачивание журнала по достижении порога записей
+    - удаление только записей до позиции, запомненной перед снимком
+"""
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.repo = self.service.repo
+        self.factory = convert_factory()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "data.journal")
+
+    def tearDown(self):
+        self.repo.detach_journal()
+        self.directory.cleanup()
+
+    def test_replay(self):
+        # Подготовка
+        snapshot = self.factory.convert(self.repo.data)
+        value = journal(self.filename, self.factory.convert, sync_every=2)
+        self.repo.attach_journal(value)
+        data = self.repo.data
+
+        # Действие
+        storage = storage_model()
+        storage.name = "Новый склад"
+        data[reposity.storage_key()][storage.name] = storage
+        transaction = transaction_model()
+        transaction.name = "Поступление"
+        transaction.storage = storage
+        transaction.nomenclature = data[reposity.nomenclature_key()]["Сахар"]
+        transaction.measure = transaction.nomenclature.measure
+        transaction.quantity = 10.0
+        transaction.date = datetime(2025, 11, 1)
+        data[reposity.transaction_key()][transaction.unique_code] = transaction
+        del data[reposity.transaction_key()][next(iter(data[reposity.transaction_key()]))]
+        data[reposity.recipe_key()].pop("Вафли")
+        value.close()
+
+        # Проверка
+        self.assertEqual(value.count, 4)
+        replayed = journal.apply(journal.read(self.filename), snapshot)
+        restored = self.factory.convert_back(snapshot)
+        self.assertEqual(replayed, 4)
+        # Ожидаемый результат - восстановление из выгрузки текущих данных
+        expected = self.factory.convert_back(self.factory.convert(self.repo.data))
+        self.assertEqual(self.factory.convert(restored), self.factory.convert(expected))
+        restored_transaction = restored[reposity.transaction_key()][transaction.unique_code]
+        self.assertIs(restored_transaction.storage, restored[reposity.storage_key()]["Новый склад"])
+
+    def test_torn_tail(self):
+        # Подготовка
+        value = journal(self.filename, self.factory.convert)
+        value.record(reposity.recipe_key(), "Вафли", None)
+        value.record(reposity.recipe_key(), "Омлет с молоком", None)
+        value.close()
+
+        # Действие
+        with open(self.filename, "a", encoding="utf-8") as f:
+            f.write('{"op": "clear", "key": "rec')
+
+        # Проверка
+        entries = list(journal.read(self.filename))
+        self.assertEqual([entry["id"] for entry in entries], ["Вафли", "Омлет с молоком"])
+        reopened = journal(self.filename, self.factory.convert)
+        self.assertEqual(reopened.count, 2)
+        reopened.record(reposity.recipe_key(), "Простые лепешки", None)
+        reopened.close()
+        # Запись после повторного открытия не склеивается с обрывком строки
+        entries = list(journal.read(self.filename))
+        self.assertEqual([entry["id"] for entry in entries], ["Вафли", "Омлет с молоком", "Простые лепешки"])
+
+    def test_compact(self):
+        # Подготовка
+        calls = []
+        value = journal(self.filename, self.factory.convert, compact_every=3,
+                        on_compact=lambda: (calls.append(value.count), value.truncate()))
+        self.repo.attach_journal(value)
+
+        # Действие
+        for key in ["Вафли", "Омлет с молоком", "Простые лепешки"]:
+            self.repo.data[reposity.recipe_key()].pop(key)
+
+        # Проверка
+        self.assertEqual(calls, [3])
+        self.assertEqual(value.count, 0)
+        self.assertEqual(os.path.getsize(self.filename), 0)
+        value.close()
+
+    def test_truncate_position(self):
+        # Подготовка
+        value = journal(self.filename, self.factory.convert)
+        value.record(reposity.recipe_key(), "Вафли", None)
+        value.record(reposity.recipe_key(), "Омлет с молоком", None)
+        position = value.position()
+        # Изменение, сделанное во время записи снимка
+        value.record(reposity.recipe_key(), "Простые лепешки", None)
+
+        # Действие
+        value.truncate(position)
+        value.record(reposity.recipe_key(), "Сырники", None)
+        value.close()
+
+        # Проверка
+        self.assertEqual(value.count, 2)
+        entries = list(journal.read(self.filename))
+        self.assertEqual([entry["id"] for entry in entries], ["Простые лепешки", "Сырники"])
+        reopened = journal(self.filename, self.factory.convert)
+        self.assertEqual(reopened.count, 2)
+        reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
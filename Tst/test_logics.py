@@ -17,6 +17,7 @@ import json
     - Фабрика создания обработчиков ответов (factory_entities)
     - Формирование ответов в различных форматах (CSV, JSON, Markdown, XML)
     - Обработка одиночных рецептов и списков рецептов
+    - Потоковое формирование CSV
     - Валидация входных параметров и обработка ошибок
     - Корректность преобразования данных рецептов в целевые форматы
 """
@@ -120,6 +121,18 @@ class TestLogics(unittest.TestCase):
         self.assertGreater(len(lines), 1, "CSV должен содержать заголовок и данные")
         self.assertIn("Омлет с молоком", result)
 
+    def test_create_stream_csv(self):
+        # Подготовка
+        data = list(self.repo.data[reposity.nomenclature_key()].values())
+
+        # Действие
+        chunks = list(self.responder.create_stream(iter(data)))
+
+        # Проверка
+        self.assertEqual(len(chunks), len(data))
+        self.assertEqual("".join(chunks), self.responder.create(data))
+        self.assertEqual(list(self.responder.create_stream([])), [])
+
     def test_create_valid_json(self):
         # Подготовка
 
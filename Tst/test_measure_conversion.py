@@ -0,0 +1,84 @@
+import unittest
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.validator import operation_exception
+from Src.Models.measure_model import measure_model
+
+"""
+    Unit-тесты для класса measure_conversion.
+    Проверяются:
+    - разворачивание многоуровневой цепочки базовых единиц
+    - сброс таблицы при изменении единицы
+    - сброс таблицы по версии основного процесса
+    - пересчет между единицами одной цепочки
+    - обработка зацикленной цепочки
+"""
+
+class TestMeasureConversion(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных: грамм <- килограмм <- мешок"""
+        self.gramm = measure_model("грамм", 1.0)
+        self.kilogramm = measure_model("килограмм", 1000.0, self.gramm)
+        self.bag = measure_model("мешок", 50.0, self.kilogramm)
+
+    def test_resolve_chain(self):
+        # Подготовка
+
+        # Действие
+        root, factor = measure_conversion.resolve(self.bag)
+
+        # Проверка
+        self.assertIs(root, self.gramm)
+        self.assertEqual(factor, 50000.0)
+        self.assertEqual(measure_conversion.resolve(self.kilogramm), (self.gramm, 1000.0))
+        self.assertEqual(measure_conversion.resolve(self.gramm), (self.gramm, 1.0))
+
+    def test_invalidate_on_change(self):
+        # Подготовка
+        measure_conversion.resolve(self.bag)
+        version = measure_conversion.version()
+
+        # Действие
+        self.kilogramm.conversion_factor = 100.0
+
+        # Проверка
+        self.assertEqual(measure_conversion.version(), version + 1)
+        self.assertEqual(measure_conversion.resolve(self.bag)[1], 5000.0)
+
+    def test_follow_version(self):
+        # Подготовка
+        measure_conversion.resolve(self.bag)
+        version = measure_conversion.version()
+        self.kilogramm._measure_model__conversion_factor = 100.0
+
+        # Действие
+        measure_conversion.follow(version)
+        unchanged = measure_conversion.resolve(self.bag)[1]
+        measure_conversion.follow(version + 1)
+
+        # Проверка
+        self.assertEqual(unchanged, 50000.0)
+        self.assertEqual(measure_conversion.version(), version + 1)
+        self.assertEqual(measure_conversion.resolve(self.bag)[1], 5000.0)
+
+    def test_convert(self):
+        # Подготовка
+        liter = measure_model("литр", 1.0)
+
+        # Действие и проверка
+        self.assertEqual(measure_conversion.convert(2.0, self.bag, self.kilogramm), 100.0)
+        self.assertEqual(measure_conversion.convert(500.0, self.gramm, self.kilogramm), 0.5)
+        self.assertEqual(measure_conversion.convert(3.0, liter, self.gramm), 3.0)
+
+    def test_cycle(self):
+        # Подготовка
+        first = measure_model("первая", 2.0)
+        second = measure_model("вторая", 2.0, first)
+        first.base_measure = second
+
+        # Действие и проверка
+        with self.assertRaises(operation_exception):
+            measure_conversion.resolve(first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+from datetime import datetime
+from Src.Core.osv_builder import osv_builder
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.balance_snapshots import balance_snapshots
+from Src.Core.validator import argument_exception, operation_exception
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Unit-тесты для класса osv_builder.
+    Проверяются:
+    - расчет начального остатка, прихода, расхода и конечного остатка
+    - пересчет количества из производной единицы измерения
+    - фильтрация транзакций по складу и периоду
+    - поиск строки ведомости по номенклатуре
+    - совпадение параллельного расчета с последовательным
+    - поддержка колонок индекса склада при изменении коллекции
+"""
+
+class TestOsvBuilder(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.gramm = measure_model.create_gramm()
+        self.kilogramm = measure_model.create_kilogramm()
+        group = nomenclature_group_model.create("мука и крупы")
+
+        self.flour = nomenclature_model.create("Мука", group, self.gramm)
+        self.sugar = nomenclature_model.create("Сахар", group, self.gramm)
+        self.nomenclatures = {"Мука": self.flour, "Сахар": self.sugar}
+
+        self.storage = storage_model()
+        self.storage.name = "Основной склад"
+        self.other_storage = storage_model()
+        self.other_storage.name = "Резервный склад"
+
+        self.transactions = {}
+        self.add_transaction("2025-09-30 10:00:00", self.flour, 1.0, self.kilogramm)
+        self.add_transaction("2025-10-05 10:00:00", self.flour, 500.0, self.gramm)
+        self.add_transaction("2025-10-10 10:00:00", self.flour, -300.0, self.gramm)
+        self.add_transaction("2025-10-12 10:00:00", self.sugar, 200.0, self.gramm)
+        self.add_transaction("2025-11-02 10:00:00", self.sugar, 999.0, self.gramm)
+        self.add_transaction("2025-10-07 10:00:00", self.flour, 777.0, self.gramm, self.other_storage)
+
+    def add_transaction(self, date: str, nomenclature, quantity: float, measure, storage = None):
+        transaction = transaction_model()
+        transaction.date = date
+        transaction.nomenclature = nomenclature
+        transaction.storage = storage or self.storage
+        transaction.quantity = quantity
+        transaction.measure = measure
+        self.transactions[transaction.unique_code] = transaction
+
+    def build(self, transactions) -> osv_builder:
+        osv = osv_model.create(datetime(2025, 10, 1), datetime(2025, 10, 31), self.storage)
+        builder = osv_builder(osv)
+        builder.generate_rows(transactions, self.nomenclatures)
+        return builder
+
+    def test_generate_rows_balances(self):
+        # Подготовка
+
+        # Действие
+        builder = self.build(self.transactions)
+        flour = builder.find_row(self.flour)
+        sugar = builder.find_row(self.sugar)
+
+        # Проверка
+        self.assertEqual(len(builder.rows), 2)
+        self.assertEqual(flour.start_balance, 1000.0)
+        self.assertEqual(flour.income, 500.0)
+        self.assertEqual(flour.outcome, 300.0)
+        self.assertEqual(flour.end_balance, 1200.0)
+        self.assertEqual(sugar.start_balance, 0.0)
+        self.assertEqual(sugar.income, 200.0)
+        self.assertEqual(sugar.outcome, 0.0)
+        self.assertEqual(sugar.end_balance, 200.0)
+
+    def test_generate_rows_from_list(self):
+        # Подготовка
+        expected = self.build(self.transactions)
+
+        # Действие
+        builder = self.build(list(self.transactions.values()))
+
+        # Проверка
+        for row in builder.rows:
+            other = expected.find_row(row.nomenclature)
+            self.assertEqual(row.start_balance, other.start_balance)
+            self.assertEqual(row.end_balance, other.end_balance)
+
+    def test_generate_rows_sorted(self):
+        # Подготовка
+        expected = self.build(self.transactions)
+        collection = transaction_collection(self.transactions)
+        osv = osv_model.create(datetime(2025, 10, 1), datetime(2025, 10, 31), self.storage)
+        builder = osv_builder(osv)
+
+        # Действие
+        builder.generate_rows_sorted(collection.storage_index(self.storage.unique_code), self.nomenclatures)
+
+        # Проверка
+        for row in builder.rows:
+            other = expected.find_row(row.nomenclature)
+            self.assertEqual(row.start_balance, other.start_balance)
+            self.assertEqual(row.income, other.income)
+            self.assertEqual(row.outcome, other.outcome)
+            self.assertEqual(row.end_balance, other.end_balance)
+
+    def test_generate_rows_parallel(self):
+        # Подготовка
+        expected = self.build(self.transactions)
+        collection = transaction_collection(self.transactions)
+        transactions = collection.storage_index(self.storage.unique_code)
+        osv = osv_model.create(datetime(2025, 10, 1), datetime(2025, 10, 31), self.storage)
+        self.addCleanup(osv_builder.shutdown_pool)
+
+        for snapshots in [None, balance_snapshots("day")]:
+            builder = osv_builder(osv)
+
+            # Действие
+            builder.generate_rows_parallel(transactions, self.nomenclatures, 2, snapshots, min_shard=1)
+
+            # Проверка
+            for row in builder.rows:
+                other = expected.find_row(row.nomenclature)
+                self.assertEqual(row.start_balance, other.start_balance)
+                self.assertEqual(row.income, other.income)
+                self.assertEqual(row.outcome, other.outcome)
+                self.assertEqual(row.end_balance, other.end_balance)
+
+    def test_parallel_columns_follow_collection(self):
+        # Подготовка
+        collection = transaction_collection(self.transactions)
+        transactions = collection.storage_index(self.storage.unique_code)
+        transactions.columns(osv_builder.transaction_row)
+        osv = osv_model.create(datetime(2025, 10, 1), datetime(2025, 10, 31), self.storage)
+        self.addCleanup(osv_builder.shutdown_pool)
+
+        # Действие
+        self.add_transaction("2025-10-03 10:00:00", self.sugar, 2.0, self.kilogramm)
+        added = list(self.transactions)[-1]
+        collection[added] = self.transactions[added]
+        del collection[next(iter(self.transactions))]
+        builder = osv_builder(osv)
+        builder.generate_rows_parallel(transactions, self.nomenclatures, 2, min_shard=1)
+
+        # Проверка
+        self.assertEqual(transactions.columns(osv_builder.transaction_row),
+                         [osv_builder.transaction_row(item) for item in transactions.items])
+        expected = self.build(collection)
+        for row in builder.rows:
+            other = expected.find_row(row.nomenclature)
+            self.assertEqual(row.start_balance, other.start_balance)
+            self.assertEqual(row.income, other.income)
+            self.assertEqual(row.outcome, other.outcome)
+
+    def test_generate_rows_parallel_invalid_workers(self):
+        # Подготовка
+        collection = transaction_collection(self.transactions)
+        osv = osv_model.create(datetime(2025, 10, 1), datetime(2025, 10, 31), self.storage)
+        builder = osv_builder(osv)
+
+        # Действие и проверка
+        with self.assertRaises(argument_exception):
+            builder.generate_rows_parallel(collection.storage_index(self.storage.unique_code), self.nomenclatures, 0)
+
+    def test_find_row_not_found(self):
+        # Подготовка
+        builder = self.build(self.transactions)
+        unknown = nomenclature_model.create("Соль", self.flour.nomenclature_group, self.gramm)
+
+        # Действие и проверка
+        with self.assertRaises(operation_exception):
+            builder.find_row(unknown)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from Src.Core.osv_builder import osv_builder
+from Src.Core.osv_registry import osv_registry
+from Src.Core.transaction_collection import transaction_collection
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Unit-тесты для класса osv_registry.
+    Проверяются:
+    - совпадение поддерживаемой ведомости с построенной заново
+      после вставки, изменения и удаления транзакций
+    - учет транзакций, ключ которых в коллекции отличается от unique_code
+    - повторная подписка возвращает ту же ведомость
+    - отмена подписки
+"""
+
+class TestOsvRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        random.seed(7)
+        self.gramm = measure_model.create_gramm()
+        self.kilogramm = measure_model.create_kilogramm()
+        group = nomenclature_group_model.create("мука и крупы")
+        self.nomenclatures = {}
+        for i in range(5):
+            item = nomenclature_model.create(f"Номенклатура {i}", group, self.gramm)
+            self.nomenclatures[item.name] = item
+
+        self.storage = storage_model()
+        self.storage.name = "Основной склад"
+        self.other_storage = storage_model()
+        self.other_storage.name = "Резервный склад"
+
+        self.collection = transaction_collection()
+        for _ in range(100):
+            self.add()
+        self.registry = osv_registry(self.collection, self.nomenclatures)
+        self.start_date = datetime(2025, 4, 1)
+        self.end_date = datetime(2025, 6, 30, 23, 59, 59)
+
+    def add(self) -> transaction_model:
+        transaction = transaction_model()
+        self.randomize(transaction)
+        self.collection[transaction.unique_code] = transaction
+        return transaction
+
+    def randomize(self, transaction: transaction_model):
+        transaction.date = datetime(2025, 1, 1) + timedelta(hours=random.randint(0, 24 * 300))
+        transaction.nomenclature = random.choice(list(self.nomenclatures.values()))
+        transaction.storage = random.choice([self.storage, self.other_storage])
+        transaction.quantity = float(random.randint(-20, 50))
+        transaction.measure = random.choice([self.gramm, self.kilogramm])
+
+    def compare(self, actual: osv_builder):
+        expected = osv_builder(osv_model.create(self.start_date, self.end_date, self.storage))
+        expected.generate_rows(self.collection, self.nomenclatures)
+        for row in expected.rows:
+            other = actual.find_row(row.nomenclature)
+            self.assertAlmostEqual(row.start_balance, other.start_balance)
+            self.assertAlmostEqual(row.income, other.income)
+            self.assertAlmostEqual(row.outcome, other.outcome)
+            self.assertAlmostEqual(row.end_balance, other.end_balance)
+
+    def test_live_updates(self):
+        # Подготовка
+        live = self.registry.subscribe(self.start_date, self.end_date, self.storage)
+        keys = list(self.collection.keys())
+
+        # Действие
+        for _ in range(50):
+            self.add()
+        for key in keys[:20]:
+            del self.collection[key]
+        for key in keys[20:40]:
+            # Изменение «на месте» с повторной записью по тому же ключу
+            transaction = self.collection[key]
+            self.randomize(transaction)
+            self.collection[key] = transaction
+
+        # Проверка
+        self.compare(live)
+        self.assertIs(self.registry.get(self.start_date, self.end_date, self.storage), live)
+
+    def test_keys_differ_from_unique_code(self):
+        # Подготовка
+        self.collection = transaction_collection()
+        for i in range(100):
+            transaction = transaction_model()
+            self.randomize(transaction)
+            self.collection[f"ключ {i}"] = transaction
+        self.registry = osv_registry(self.collection, self.nomenclatures)
+        live = self.registry.subscribe(self.start_date, self.end_date, self.storage)
+
+        # Действие
+        for i in range(20):
+            del self.collection[f"ключ {i}"]
+        for i in range(20, 40):
+            transaction = self.collection[f"ключ {i}"]
+            self.randomize(transaction)
+            self.collection[f"ключ {i}"] = transaction
+
+        # Проверка
+        self.compare(live)
+
+    def test_subscribe_same_report(self):
+        # Подготовка
+        first = self.registry.subscribe(self.start_date, self.end_date, self.storage)
+
+        # Действие
+        second = self.registry.subscribe(self.start_date, self.end_date, self.storage)
+
+        # Проверка
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.count(), 1)
+
+    def test_unsubscribe(self):
+        # Подготовка
+        self.registry.subscribe(self.start_date, self.end_date, self.storage)
+
+        # Действие
+        self.registry.unsubscribe(self.start_date, self.end_date, self.storage)
+        self.add()
+
+        # Проверка
+        self.assertEqual(self.registry.count(), 0)
+        self.assertIsNone(self.registry.get(self.start_date, self.end_date, self.storage))
+
+if __name__ == '__main__':
+    unittest.main()
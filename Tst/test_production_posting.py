@@ -0,0 +1,178 @@
+import threading
+import unittest
+from datetime import datetime
+from Src.Core.measure_conversion import measure_conversion
+from Src.Core.production_posting import insufficient_balance_exception, production_posting
+from Src.Core.validator import argument_exception
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для операции «Приготовление блюда» (production_posting) и кэша остатков.
+    Проверяются:
+    - совпадение текущих остатков кэша с ОСВ и их поправка при добавлении и удалении транзакций
+    - списание с блокировкой: расход ингредиентов и отказ при недостатке остатков
+    - списание под сальдо с отрицательным остатком
+    - одновременные списания не проходят проверку сверх остатка
+    - пересчет остатков во время записи из другого потока и отписка прежнего кэша
+"""
+
+class TestProductionPosting(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.repo = self.service.repo
+        data = self.repo.data
+        self.transactions = data[reposity.transaction_key()]
+        self.recipe = data[reposity.recipe_key()]["Омлет с молоком"]
+        # Отдельный склад с остатком каждого ингредиента на 10 порций
+        self.storage = storage_model()
+        self.storage.name = "Склад кухни"
+        data[reposity.storage_key()][self.storage.name] = self.storage
+        self.repo.add_transactions({
+            f"stock-{position}": transaction_model.create_trusted(
+                f"stock-{position}", "Поступление", self.storage, nomenclature, nomenclature.measure,
+                float(quantity * 10), datetime(2025, 1, 1))
+            for position, (nomenclature, quantity) in enumerate(self.recipe.ingredients)
+        })
+
+    def balances(self) -> dict:
+        cache = self.repo.balance_cache()
+        return {
+            nomenclature.unique_code: cache.balance(self.storage.unique_code, nomenclature.unique_code)
+            for nomenclature, _ in self.recipe.ingredients
+        }
+
+    def test_balance_cache(self):
+        # Подготовка
+        storage = next(iter(self.repo.data[reposity.storage_key()].values()))
+        osv = self.service.create_osv(datetime(1900, 1, 1), datetime(2100, 1, 1), storage)
+        cache = self.repo.balance_cache()
+        before = self.balances()
+
+        # Действие
+        del self.transactions["stock-0"]
+        removed = self.balances()
+
+        # Проверка
+        for row in osv.rows:
+            self.assertAlmostEqual(
+                cache.balance(storage.unique_code, row.nomenclature.unique_code), row.end_balance)
+        code = self.recipe.ingredients[0][0].unique_code
+        self.assertEqual(removed[code], 0.0)
+        self.assertEqual(cache.balances(self.storage.unique_code)[self.recipe.ingredients[1][0].unique_code],
+                         before[self.recipe.ingredients[1][0].unique_code])
+
+    def test_post_blocking(self):
+        # Подготовка
+        before = self.balances()
+        count = len(self.transactions)
+
+        # Действие
+        items = self.service.post_production(self.recipe, self.storage, 4)
+        after = self.balances()
+        with self.assertRaises(insufficient_balance_exception) as context:
+            self.service.post_production(self.recipe, self.storage, 7)
+
+        # Проверка
+        self.assertEqual(len(items), len(self.recipe.ingredients))
+        self.assertEqual(len(self.transactions), count + len(items))
+        for item in items:
+            self.assertLess(item.quantity, 0)
+            self.assertIs(item.storage, self.storage)
+            self.assertIs(self.transactions[item.unique_code], item)
+            self.assertAlmostEqual(after[item.nomenclature.unique_code], before[item.nomenclature.unique_code] * 0.6)
+        self.assertEqual(len(context.exception.shortages), len(self.recipe.ingredients))
+        self.assertEqual(len(self.transactions), count + len(items))
+        with self.assertRaises(argument_exception):
+            self.service.post_production(self.recipe, self.storage, 0)
+        with self.assertRaises(argument_exception):
+            self.service.post_production(self.recipe, self.storage, 1, "сразу")
+
+    def test_post_overdraft(self):
+        # Действие
+        self.service.post_production(self.recipe, self.storage, 15, production_posting.OVERDRAFT)
+
+        # Проверка
+        self.assertTrue(all(balance < 0 for balance in self.balances().values()))
+        with self.assertRaises(insufficient_balance_exception):
+            self.service.post_production(self.recipe, self.storage, 1)
+
+    def test_concurrent_posting(self):
+        # Подготовка
+        posted = []
+        blocked = []
+        start = threading.Barrier(8)
+
+        def post():
+            start.wait()
+            for _ in range(5):
+                try:
+                    posted.append(self.service.post_production(self.recipe, self.storage, 1))
+                except insufficient_balance_exception:
+                    blocked.append(1)
+
+        threads = [threading.Thread(target=post) for _ in range(8)]
+
+        # Действие
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Проверка
+        self.assertEqual(len(posted), 10)
+        self.assertEqual(len(blocked), 30)
+        for balance in self.balances().values():
+            self.assertAlmostEqual(balance, 0.0)
+
+
+    def test_rebuild_while_writing(self):
+        # Подготовка
+        cache = self.repo.balance_cache()
+        nomenclature = self.recipe.ingredients[0][0]
+        expected = self.balances()[nomenclature.unique_code]
+        measure = measure_conversion.resolve(nomenclature.measure)[0]
+
+        def write():
+            for position in range(2000):
+                code = f"write-{position}"
+                self.transactions[code] = transaction_model.create_trusted(
+                    code, "Поступление", self.storage, nomenclature, measure, 1.0, datetime(2025, 2, 1))
+
+        writer = threading.Thread(target=write)
+
+        # Действие
+        writer.start()
+        while writer.is_alive():
+            # Сброс таблицы пересчета единиц вызывает пересчет остатков при чтении
+            measure_conversion.resolve(measure)
+            measure_conversion.invalidate(measure.unique_code)
+            cache.balance(self.storage.unique_code, nomenclature.unique_code)
+        writer.join()
+
+        # Проверка
+        self.assertAlmostEqual(self.balances()[nomenclature.unique_code], expected + 2000)
+
+    def test_reset_unsubscribes(self):
+        # Подготовка
+        old = self.repo.balance_cache()
+        code = self.recipe.ingredients[0][0].unique_code
+        before = old.balance(self.storage.unique_code, code)
+        stock = self.transactions["stock-0"]
+
+        # Действие
+        self.repo.replace(reposity.storage_key(), self.repo.data[reposity.storage_key()])
+        del self.transactions["stock-0"]
+
+        # Проверка
+        self.assertIsNot(self.repo.balance_cache(), old)
+        self.assertEqual(old.balance(self.storage.unique_code, code), before)
+        self.assertEqual(self.balances()[code], before - stock.quantity)
+
+if __name__ == '__main__':
+    unittest.main()
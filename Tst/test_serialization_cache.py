@@ -0,0 +1,165 @@
+import threading
+import unittest
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.serialization_cache import serialization_cache
+from Src.Core.validator import argument_exception
+from Src.Core.collection_snapshot import collection_snapshot
+from Src.Core.versioned_collection import versioned_collection
+from Src.Models.measure_model import measure_model
+
+"""
+    Unit-тесты для классов serialization_cache и versioned_collection.
+    Проверяются:
+    - увеличение версии коллекции при вставке, замене и удалении
+    - снимок коллекции не меняется при изменении коллекции во время перебора
+    - попадания и промахи кэша с учетом версии коллекции
+    - вытеснение записей по LRU
+    - обращения из нескольких потоков
+    - готовые байты ответа и ETag пересобираются только при смене версии
+"""
+
+class TestSerializationCache(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.converter = convert_factory()
+        self.measures = versioned_collection()
+        self.measures["г"] = measure_model.create_gramm()
+        self.measures["кг"] = measure_model.create_kilogramm()
+
+    def test_collection_version(self):
+        # Подготовка
+        version = self.measures.version
+
+        # Действие
+        self.measures["л"] = measure_model.create_liter()
+        self.measures.pop("л")
+        self.measures.pop("нет", None)
+        del self.measures["кг"]
+
+        # Проверка
+        self.assertEqual(self.measures.version, version + 3)
+
+    def test_collection_snapshot(self):
+        # Подготовка
+        for position in range(10):
+            self.measures[f"ед-{position}"] = measure_model.create_gramm()
+        expected = list(self.measures.items())
+        snapshot = self.measures.snapshot()
+        batch = collection_snapshot.BATCH
+        collection_snapshot.BATCH = 3
+
+        # Действие
+        try:
+            items = snapshot.items()
+            result = [next(items) for _ in range(4)]
+            del self.measures["кг"]
+            self.measures["г"] = measure_model.create_liter()
+            self.measures["л"] = measure_model.create_liter()
+            result.extend(items)
+        finally:
+            collection_snapshot.BATCH = batch
+        snapshot.close()
+
+        # Проверка
+        self.assertEqual(len(snapshot), len(expected))
+        self.assertEqual([key for key, _ in result], [key for key, _ in expected])
+        self.assertTrue(all(item is other for (_, item), (_, other) in zip(result, expected)))
+        self.assertEqual(len(self.measures), len(expected))
+
+    def test_hits_and_misses(self):
+        # Подготовка
+        cache = serialization_cache()
+
+        # Действие
+        first = cache.convert_collection("measures", self.measures.version, self.measures, self.converter)
+        second = cache.convert_collection("measures", self.measures.version, self.measures, self.converter)
+        self.measures["л"] = measure_model.create_liter()
+        third = cache.convert_collection("measures", self.measures.version, self.measures, self.converter)
+
+        # Проверка
+        self.assertEqual(first, self.converter.convert(list(self.measures.values())[:2]))
+        self.assertIs(first[0], second[0])
+        self.assertEqual(len(third), 3)
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 5)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 7)
+
+    def test_lru_eviction(self):
+        # Подготовка
+        cache = serialization_cache(2)
+        gramm, kilogramm, liter = measure_model.create_gramm(), measure_model.create_kilogramm(), measure_model.create_liter()
+        cache.convert("measures", 0, gramm, self.converter)
+        cache.convert("measures", 0, kilogramm, self.converter)
+
+        # Действие
+        cache.convert("measures", 0, gramm, self.converter)
+        cache.convert("measures", 0, liter, self.converter)
+        cache.convert("measures", 0, gramm, self.converter)
+        cache.convert("measures", 0, kilogramm, self.converter)
+
+        # Проверка
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["evictions"], 2)
+
+    def test_concurrent_access(self):
+        # Подготовка
+        cache = serialization_cache(8)
+        items = [measure_model.create_gramm() for _ in range(32)]
+        errors = []
+
+        def work():
+            try:
+                for version in range(50):
+                    cache.convert_collection("measures", version % 3, items, self.converter)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+
+        # Действие
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Проверка
+        stats = cache.stats()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(stats["size"], 8)
+        self.assertEqual(stats["hits"] + stats["misses"], 8 * 50 * 32)
+
+    def test_encoded_response(self):
+        # Подготовка
+        cache = serialization_cache()
+        builds = []
+        def build():
+            builds.append(1)
+            return f"[{len(builds)}]".encode("utf-8")
+
+        # Действие
+        first, first_etag = cache.encoded("measures", 1, build)
+        second, second_etag = cache.encoded("measures", 1, build)
+        third, third_etag = cache.encoded("measures", 2, build)
+
+        # Проверка
+        self.assertEqual(len(builds), 2)
+        self.assertEqual(first, second)
+        self.assertEqual(first_etag, second_etag)
+        self.assertNotEqual(first_etag, third_etag)
+        self.assertEqual(cache.etag("measures", 2), third_etag)
+        self.assertIsNone(cache.etag("measures", 1))
+        self.assertIsNone(cache.etag("recipes", 2))
+
+    def test_invalid_capacity(self):
+        # Подготовка
+
+        # Действие и проверка
+        with self.assertRaises(argument_exception):
+            serialization_cache(0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.dump_job import dump_job
+from Src.Core.sharded_store import sharded_store
+from Src.Core.validator import argument_exception
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для класса sharded_store.
+    Проверяются:
+    - выгрузка каталога с файлом на каждую коллекцию и манифестом
+    - удаление файлов прежней выгрузки после замены манифеста (чужие файлы каталога остаются)
+    - отказ записи в непустой каталог без манифеста
+    - загрузка справочников сразу, а транзакций - отдельно с учетом журнала
+    - состояние загрузки при ошибке чтения транзакций
+"""
+
+class TestShardedStore(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        self.factory = convert_factory()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dump(self):
+        # Подготовка
+        data = self.service.repo.data
+        expected = json.loads(json.dumps(self.factory.convert(data), default=str))
+
+        # Действие
+        dump_job(data, self.path, "sharded").run()
+        first = set(os.listdir(self.path))
+        with open(os.path.join(self.path, "settings.json"), "w") as f:
+            f.write("{}")
+        dump_job(data, self.path, "sharded").run()
+
+        # Проверка
+        store = sharded_store(self.path)
+        self.assertTrue(store.exists())
+        self.assertEqual(store.keys(), list(data.keys()))
+        for key in store.keys():
+            self.assertEqual(store.count(key), len(data[key]))
+            self.assertEqual(store.read(key), expected[key])
+        # Файлы первой выгрузки удалены, кроме манифеста
+        self.assertEqual(first & set(os.listdir(self.path)), {sharded_store.MANIFEST})
+        self.assertEqual(len(os.listdir(self.path)), len(data) + 2)
+        self.assertIn("settings.json", os.listdir(self.path))
+
+    def test_dump_foreign_directory(self):
+        # Подготовка
+        os.makedirs(self.path)
+        foreign = os.path.join(self.path, "app_data.json")
+        with open(foreign, "w") as f:
+            f.write("{}")
+
+        # Проверка
+        with self.assertRaises(argument_exception):
+            dump_job(self.service.repo.data, self.path, "sharded")
+        self.assertTrue(os.path.exists(foreign))
+
+    def test_load_sharded(self):
+        # Подготовка
+        data = self.service.repo.data
+        key = reposity.transaction_key()
+        removed = next(iter(data[key]))
+        self.service.dump(self.path, "sharded")
+        expected = self.factory.convert(self.factory.convert_back(self.factory.convert(data)))
+        del expected[key][removed]
+        entries = [{"op": "delete", "key": key, "id": removed}]
+
+        # Действие
+        self.service.load_sharded(self.path, entries)
+        ready = self.service.wait_transactions(30)
+
+        # Проверка
+        self.assertTrue(ready)
+        self.assertEqual(self.service.warming_state()["status"], "ready")
+        self.assertEqual(self.service.warming_state()["total"], len(expected[key]) + 1)
+        self.assertEqual(self.factory.convert(self.service.repo.data), expected)
+        transaction = next(iter(self.service.repo.data[key].values()))
+        self.assertIs(transaction.storage,
+                      self.service.repo.data[reposity.storage_key()][transaction.storage.name])
+
+    def test_load_failed(self):
+        # Подготовка
+        self.service.dump(self.path, "sharded")
+        store = sharded_store(self.path)
+        filename = os.path.join(self.path, store.manifest()["collections"][reposity.transaction_key()]["file"])
+        with open(filename, "r", encoding="utf-8") as f:
+            content = f.read()
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content[:len(content) // 2])
+
+        # Действие
+        self.service.load_sharded(self.path, background=False)
+
+        # Проверка
+        try:
+            self.assertFalse(self.service.transactions_ready())
+            self.assertEqual(self.service.warming_state()["status"], "failed")
+            self.assertFalse(self.service.save_data())
+            self.assertGreater(len(self.service.repo.data[reposity.recipe_key()]), 0)
+        finally:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.service.load_sharded(self.path, background=False)
+        self.assertTrue(self.service.transactions_ready())
+
+if __name__ == '__main__':
+    unittest.main()
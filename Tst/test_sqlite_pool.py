@@ -0,0 +1,119 @@
+import os
+import tempfile
+import threading
+import unittest
+from Src.Core.sqlite_pool import sqlite_pool
+from Src.Core.validator import operation_exception
+
+"""
+    Unit-тесты для класса sqlite_pool.
+    Проверяются:
+    - одно соединение на поток во вложенных обращениях и повторное использование соединений
+    - ограничение количества соединений, ожидание и отказ по времени
+    - фиксация и откат записи
+    - статистика кэша подготовленных запросов
+"""
+
+class TestSqlitePool(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "data.db")
+        self.pool = sqlite_pool(self.filename, 2, timeout=0.2)
+        with self.pool.transaction() as connection:
+            connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+
+    def tearDown(self):
+        self.pool.close()
+        self.directory.cleanup()
+
+    def test_connection_per_thread(self):
+        # Подготовка
+        used = []
+
+        # Действие
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                used.append(inner)
+            used.append(outer)
+        with self.pool.connection() as again:
+            used.append(again)
+
+        # Проверка
+        self.assertIs(used[0], used[1])
+        self.assertIs(used[1], used[2])
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["open"], 1)
+        self.assertEqual(metrics["in_use"], 0)
+        self.assertEqual(metrics["idle"], 1)
+
+    def test_saturation(self):
+        # Подготовка
+        holding = threading.Barrier(3)
+        done = threading.Event()
+        errors = []
+
+        def hold():
+            with self.pool.connection():
+                holding.wait()
+                done.wait()
+
+        def wait():
+            try:
+                with self.pool.connection():
+                    pass
+            except operation_exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=hold) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        holding.wait()
+
+        # Действие
+        saturated = self.pool.metrics()
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        waiter.join()
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        # Проверка
+        self.assertEqual(saturated["in_use"], 2)
+        self.assertEqual(saturated["saturation"], 1.0)
+        self.assertEqual(len(errors), 1)
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["peak_in_use"], 2)
+        self.assertEqual(metrics["waits"], 1)
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertEqual(metrics["in_use"], 0)
+        self.assertLessEqual(metrics["open"], 2)
+
+    def test_transaction(self):
+        # Подготовка
+        sql = "INSERT INTO items (value) VALUES (?)"
+
+        # Действие
+        with self.pool.transaction() as connection:
+            connection.execute(sql, ("первый",))
+            with self.pool.transaction() as nested:
+                nested.execute(sql, ("второй",))
+        with self.assertRaises(ValueError):
+            with self.pool.transaction() as connection:
+                connection.execute(sql, ("третий",))
+                raise ValueError()
+
+        # Проверка
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT value FROM items ORDER BY id").fetchall()
+        self.assertEqual(rows, [("первый",), ("второй",)])
+        texts = self.pool.metrics()["sql_texts"]
+        # Создание таблицы, запрос вставки и выборка выполнены впервые, вставка повторена дважды
+        self.assertEqual(texts["new"], 3)
+        self.assertEqual(texts["repeated"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
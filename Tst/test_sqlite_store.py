@@ -0,0 +1,221 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from Src.Convertors.convert_factory import convert_factory
+from Src.Core.sqlite_collection import sqlite_collection
+from Src.Core.sqlite_store import sqlite_store
+from Src.Core.sqlite_transaction_collection import sqlite_transaction_collection
+from Src.Core.transaction_collection import transaction_collection
+from Src.Models.measure_model import measure_model
+from Src.Models.transaction_model import transaction_model
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для хранилища данных в базе SQLite (sqlite_store).
+    Проверяются:
+    - сохранение справочников и транзакций в базе и восстановление при повторном открытии
+    - выборки транзакций за период и по складу так же, как в памяти
+    - расчет ОСВ суммированием в базе с тем же результатом, что и в памяти
+    - изменение и удаление транзакций
+    - пакетная запись справочника (add_many, update) сохраняется в базе
+    - выборка транзакций по списку кодов одним постоянным запросом
+    - снимок транзакций в транзакции чтения, перебираемый из другого потока
+"""
+
+class TestSqliteStore(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "data.db")
+        self.factory = convert_factory()
+
+    def tearDown(self):
+        self.service.close_store()
+        self.directory.cleanup()
+
+    def create_memory(self) -> transaction_collection:
+        """ Коллекция транзакций в памяти с теми же транзакциями, что и в базе """
+        result = transaction_collection()
+        result.update(self.service.repo.data[reposity.transaction_key()].items())
+        return result
+
+    def test_round_trip(self):
+        # Подготовка
+        self.assertFalse(self.service.open_store(self.filename))
+        self.service.start()
+        data = self.factory.convert(self.service.repo.data)
+        expected = self.factory.convert(self.factory.convert_back(data))
+
+        # Действие
+        self.service.close_store()
+        loaded = self.service.open_store(self.filename)
+
+        # Проверка
+        data = self.service.repo.data
+        self.assertTrue(loaded)
+        self.assertIsInstance(data[reposity.transaction_key()], sqlite_transaction_collection)
+        self.assertEqual(self.factory.convert(data), expected)
+        for item in data[reposity.transaction_key()].values():
+            self.assertIs(item.storage, data[reposity.storage_key()][item.storage.name])
+
+    def test_transactions_between(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        collection = self.service.repo.data[reposity.transaction_key()]
+        memory = self.create_memory()
+        start_date = datetime(2025, 1, 1)
+        end_date = datetime(2025, 12, 31)
+        storage = next(iter(self.service.repo.data[reposity.storage_key()].values()))
+        nomenclature = next(iter(self.service.repo.data[reposity.nomenclature_key()].values()))
+
+        # Действие
+        result = [
+            collection.transactions_between(start_date, end_date),
+            collection.transactions_between(start_date, end_date, storage.unique_code),
+            collection.transactions_between(start_date, end_date, None, nomenclature.unique_code, 1, 2),
+            collection.storage_index(storage.unique_code).items
+        ]
+        expected = [
+            memory.transactions_between(start_date, end_date),
+            memory.transactions_between(start_date, end_date, storage.unique_code),
+            memory.transactions_between(start_date, end_date, None, nomenclature.unique_code, 1, 2),
+            memory.storage_index(storage.unique_code).items
+        ]
+
+        # Проверка
+        for items, expected_items in zip(result, expected):
+            self.assertEqual([item.unique_code for item in items], [item.unique_code for item in expected_items])
+
+    def test_create_osv(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        start_date = datetime(2025, 1, 1)
+        end_date = datetime(2025, 12, 31)
+        storages = list(self.service.repo.data[reposity.storage_key()].values())
+        data = self.factory.convert(self.service.repo.data)
+        self.service.close_store()
+        self.service.repo.load(self.factory.convert_back(data))
+        expected = {}
+        for storage in storages:
+            osv = self.service.create_osv(start_date, end_date, storage)
+            expected[storage.name] = {
+                row.nomenclature.name: (row.start_balance, row.income, row.outcome, row.end_balance)
+                for row in osv.rows
+            }
+
+        # Действие
+        self.service.open_store(self.filename)
+        result = [self.service.create_osv(start_date, end_date, storage) for storage in storages]
+        batch = self.service.create_osv_batch(start_date, end_date)
+
+        # Проверка
+        for osv in result + batch:
+            rows = expected[osv.storage.name]
+            self.assertEqual(len(osv.rows), len(rows))
+            for row in osv.rows:
+                for value, expected_value in zip(
+                        (row.start_balance, row.income, row.outcome, row.end_balance), rows[row.nomenclature.name]):
+                    self.assertAlmostEqual(value, expected_value)
+
+    def test_update_delete(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        collection = self.service.repo.data[reposity.transaction_key()]
+        count = len(collection)
+        keys = list(collection)
+        changed = collection[keys[0]]
+        changed.quantity = 12345.0
+
+        # Действие
+        collection[keys[0]] = changed
+        del collection[keys[1]]
+        self.service.close_store()
+        self.service.open_store(self.filename)
+
+        # Проверка
+        collection = self.service.repo.data[reposity.transaction_key()]
+        self.assertEqual(len(collection), count - 1)
+        self.assertEqual(collection[keys[0]].quantity, 12345.0)
+        self.assertNotIn(keys[1], collection)
+        self.assertEqual(list(collection)[0], keys[0])
+        with self.assertRaises(KeyError):
+            del collection[keys[1]]
+        self.assertEqual(sqlite_store(self.filename).transaction_count(), count - 1)
+
+    def test_reference_batch(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        measures = self.service.repo.data[reposity.measure_key()]
+        first = measure_model("пакетная 1", 1.0)
+        second = measure_model("пакетная 2", 1.0)
+        third = measure_model("пакетная 3", 1.0)
+
+        # Действие
+        measures.add_many({first.name: first})
+        measures.update({second.name: second, third.name: third})
+        self.service.close_store()
+        self.service.open_store(self.filename)
+
+        # Проверка
+        measures = self.service.repo.data[reposity.measure_key()]
+        self.assertIsInstance(measures, sqlite_collection)
+        for item in [first, second, third]:
+            self.assertEqual(measures[item.name].unique_code, item.unique_code)
+
+    def test_transactions_by_keys(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        store = self.service.repo.store
+        keys = list(self.service.repo.data[reposity.transaction_key()])
+        store.transactions(keys[:1])
+        before = store.pool.metrics()["sql_texts"]
+
+        # Действие
+        rows = store.transactions(keys + [f"нет-{position}" for position in range(1000)])
+
+        # Проверка
+        self.assertEqual(sorted(row[0] for row in rows), sorted(keys))
+        self.assertEqual(store.transactions([]), [])
+        # Текст запроса не зависит от количества кодов
+        after = store.pool.metrics()["sql_texts"]
+        self.assertEqual(after["new"], before["new"])
+        self.assertEqual(after["repeated"], before["repeated"] + 1)
+
+    def test_snapshot(self):
+        # Подготовка
+        self.service.open_store(self.filename)
+        self.service.start()
+        transactions = self.service.repo.data[reposity.transaction_key()]
+        expected = list(transactions)
+        snapshot = transactions.snapshot()
+        first = next(iter(transactions.values()))
+        added = transaction_model.create_trusted(
+            "после снимка", first.name, first.storage, first.nomenclature, first.measure, 1.0, first.date)
+        result = []
+
+        # Действие
+        del transactions[expected[0]]
+        transactions[added.unique_code] = added
+        thread = threading.Thread(target=lambda: result.extend(key for key, _ in snapshot.items()))
+        thread.start()
+        thread.join(30)
+        snapshot.close()
+
+        # Проверка
+        self.assertEqual(len(snapshot), len(expected))
+        self.assertEqual(result, expected)
+        self.assertNotIn(expected[0], list(transactions))
+        self.assertEqual(self.service.store_metrics()["in_use"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from datetime import datetime
 from Src.Core.osv_builder import osv_builder
-from Src.Core.validator import argument_exception
+from Src.Core.validator import argument_exception, operation_exception
 from Src.Models.nomenclature_group_model import nomenclature_group_model
 from Src.Models.nomenclature_model import nomenclature_model
 from Src.reposity import reposity
@@ -11,7 +11,10 @@ from Src.start_service import start_service
 from Src.Models.storage_model import storage_model
 from Src.Models.transaction_model import transaction_model
 from Src.Models.osv_model import osv_model
+import json
 import os
+import tempfile
+from Src.settings_manager import settings_manager
 
 """
     Unit-тесты для класса start_service.
@@ -27,6 +30,7 @@ import os
     - создание оборотно-сальдовой ведомости
     - выгрузка данных в файл
     - запуск полной инициализации данных
+    - инициализация приложения по настройкам из файла
 """
 
 class TestStartService(unittest.TestCase):
@@ -283,6 +287,58 @@ class TestStartService(unittest.TestCase):
         self.assertEqual(osv.storage.name, "Основной склад")
         self.assertIsInstance(osv.rows, list)
 
+    def test_check_create_osv_batch(self):
+        # Подготовка
+        start_date = datetime(2025, 10, 26)
+        end_date = datetime(2025, 10, 31)
+        storages = list(self.__start_service.repo.data[reposity.storage_key()].values())
+
+        # Действия
+        batch = self.__start_service.create_osv_batch(start_date, end_date)
+
+        # Проверка
+        self.assertEqual(len(batch), len(storages))
+        for osv in batch:
+            expected = self.__start_service.create_osv(start_date, end_date, osv.storage)
+            for row in osv.rows:
+                other = expected.find_row(row.nomenclature)
+                self.assertEqual(row.start_balance, other.start_balance)
+                self.assertEqual(row.income, other.income)
+                self.assertEqual(row.outcome, other.outcome)
+                self.assertEqual(row.end_balance, other.end_balance)
+
+    def test_create_osv_batch_snapshots(self):
+        # Подготовка
+        data = self.__start_service.repo.data
+        storages = list(data[reposity.storage_key()].values())
+        flour = data[reposity.nomenclature_key()]["Пшеничная мука"]
+        items = {}
+        for position in range(60):
+            code = f"batch-{position}"
+            items[code] = transaction_model.create_trusted(
+                code, "Поступление", storages[position % len(storages)], flour, flour.measure,
+                float(position - 20), datetime(2024, 1 + position % 12, 1 + position % 28))
+        self.__start_service.repo.add_transactions(items)
+        start_date = datetime(2024, 9, 1)
+        end_date = datetime(2024, 12, 31)
+
+        # Действия
+        self.__start_service.create_osv_batch(start_date, end_date)
+        batch = self.__start_service.create_osv_batch(start_date, end_date)
+
+        # Проверка
+        self.assertGreater(self.__start_service.repo.snapshots().count(storages[0].unique_code), 0)
+        for osv in batch:
+            expected = osv_builder(osv_model.create(start_date, end_date, osv.storage))
+            expected.generate_rows(data[reposity.transaction_key()], data[reposity.nomenclature_key()])
+            for row in expected.rows:
+                other = osv.find_row(row.nomenclature)
+                self.assertAlmostEqual(row.start_balance, other.start_balance)
+                self.assertAlmostEqual(row.income, other.income)
+                self.assertAlmostEqual(row.outcome, other.outcome)
+        with self.assertRaises(operation_exception):
+            self.__start_service.create_osv_batch(start_date, end_date, [storages[0], storages[0]])
+
     def test_check_dump_method(self):
         # Подготовка
         filename = "test_dump.json"
@@ -309,6 +365,44 @@ class TestStartService(unittest.TestCase):
         with self.assertRaises(argument_exception):
             self.__start_service.dump(invalid_filename)
 
+    def test_initialize_application_settings(self):
+        # Подготовка
+        with open("settings.json", encoding="utf-8") as file:
+            settings = json.load(file)
+        directory = tempfile.TemporaryDirectory()
+        current = os.getcwd()
+        os.chdir(directory.name)
+
+        def write(name: str, **values) -> settings_manager:
+            with open(name, "w", encoding="utf-8") as file:
+                json.dump(dict(settings, **values), file)
+            return settings_manager(name)
+
+        try:
+            # Действие
+            sqlite = write("sqlite.json", first_start=True, repository_backend="sqlite", dump_format="binary")
+            sqlite.load_settings()
+            self.assertTrue(self.__start_service.initialize_application(sqlite))
+
+            # Проверка
+            self.assertIsNotNone(self.__start_service.repo.store)
+            self.assertTrue(os.path.exists("app_data.db"))
+            self.assertEqual(self.__start_service.dump_format, "binary")
+            self.assertFalse(sqlite.is_first_start())
+
+            # Действие
+            memory = write("memory.json", first_start=True)
+            memory.load_settings()
+            self.assertTrue(self.__start_service.initialize_application(memory))
+
+            # Проверка
+            self.assertTrue(os.path.exists("app_data.json"))
+            self.assertEqual(self.__start_service.dump_format, "json")
+        finally:
+            self.__start_service.close_store()
+            os.chdir(current)
+            directory.cleanup()
+
     def test_check_repository_keys_completeness(self):
         # Подготовка
         data = self.__start_service.data()
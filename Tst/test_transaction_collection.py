@@ -0,0 +1,175 @@
+import unittest
+from datetime import datetime, timezone
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.validator import argument_exception
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Unit-тесты для класса transaction_collection.
+    Проверяются:
+    - поведение коллекции как словаря
+    - сортировка транзакций склада по дате
+    - обновление индекса при замене и удалении транзакций
+    - выборка периода бинарным поиском
+    - запрос транзакций за период с фильтрами и постраничной выдачей
+    - пакетное добавление (update) с тем же порядком, что и вставка по одной
+    - отказ от транзакций с датой в часовом поясе без изменения коллекции
+"""
+
+class TestTransactionCollection(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        gramm = measure_model.create_gramm()
+        group = nomenclature_group_model.create("мука и крупы")
+        self.nomenclature = nomenclature_model.create("Мука", group, gramm)
+        self.measure = gramm
+        self.storage = storage_model()
+        self.storage.name = "Основной склад"
+        self.other_storage = storage_model()
+        self.other_storage.name = "Резервный склад"
+        self.collection = transaction_collection()
+
+    def create_transaction(self, date: str, storage = None) -> transaction_model:
+        transaction = transaction_model()
+        transaction.date = date
+        transaction.nomenclature = self.nomenclature
+        transaction.storage = storage or self.storage
+        transaction.quantity = 1.0
+        transaction.measure = self.measure
+        return transaction
+
+    def add(self, date: str, storage = None) -> transaction_model:
+        transaction = self.create_transaction(date, storage)
+        self.collection[transaction.unique_code] = transaction
+        return transaction
+
+    def test_sorted_by_date(self):
+        # Подготовка
+        t3 = self.add("2025-10-03 10:00:00")
+        t1 = self.add("2025-10-01 10:00:00")
+        t2 = self.add("2025-10-02 10:00:00")
+        self.add("2025-10-01 12:00:00", self.other_storage)
+
+        # Действие
+        index = self.collection.storage_index(self.storage.unique_code)
+
+        # Проверка
+        self.assertIsInstance(self.collection, dict)
+        self.assertEqual(len(self.collection), 4)
+        self.assertEqual(index.items, [t1, t2, t3])
+
+    def test_between(self):
+        # Подготовка
+        self.add("2025-09-30 10:00:00")
+        t2 = self.add("2025-10-01 00:00:00")
+        t3 = self.add("2025-10-31 00:00:00")
+        self.add("2025-11-01 10:00:00")
+        index = self.collection.storage_index(self.storage.unique_code)
+
+        # Действие
+        result = index.between(datetime(2025, 10, 1), datetime(2025, 10, 31))
+
+        # Проверка
+        self.assertEqual(result, [t2, t3])
+        self.assertEqual(len(index.before(datetime(2025, 10, 1))), 1)
+
+    def test_remove_and_replace(self):
+        # Подготовка
+        t1 = self.add("2025-10-01 10:00:00")
+        t2 = self.add("2025-10-02 10:00:00")
+
+        # Действие
+        del self.collection[t1.unique_code]
+        t2.date = "2025-12-01 10:00:00"
+        t2.storage = self.other_storage
+        self.collection[t2.unique_code] = t2
+
+        # Проверка
+        self.assertEqual(len(self.collection.storage_index(self.storage.unique_code)), 0)
+        self.assertEqual(self.collection.storage_index(self.other_storage.unique_code).items, [t2])
+
+    def test_transactions_between(self):
+        # Подготовка
+        salt = nomenclature_model.create("Соль", self.nomenclature.nomenclature_group, self.measure)
+        self.add("2025-09-30 10:00:00")
+        t2 = self.add("2025-10-02 10:00:00")
+        t3 = self.add("2025-10-03 10:00:00", self.other_storage)
+        t4 = self.add("2025-10-04 10:00:00")
+        t4.nomenclature = salt
+        self.collection[t4.unique_code] = t4
+        t5 = self.add("2025-10-05 10:00:00")
+        self.add("2025-11-01 10:00:00")
+        start, end = datetime(2025, 10, 1), datetime(2025, 10, 31)
+
+        # Действие
+        all_items = self.collection.transactions_between(start, end)
+        by_storage = self.collection.transactions_between(start, end, self.storage.unique_code)
+        by_nomenclature = self.collection.transactions_between(start, end, nomenclature_code=salt.unique_code)
+        by_both = self.collection.transactions_between(
+            start, end, self.storage.unique_code, self.nomenclature.unique_code)
+        page = self.collection.transactions_between(start, end, offset=1, limit=2)
+
+        # Проверка
+        self.assertEqual(all_items, [t2, t3, t4, t5])
+        self.assertEqual(by_storage, [t2, t4, t5])
+        self.assertEqual(by_nomenclature, [t4])
+        self.assertEqual(by_both, [t2, t5])
+        self.assertEqual(page, [t3, t4])
+        self.assertEqual(self.collection.transactions_between(start, end, offset=10), [])
+
+    def test_unknown_storage(self):
+        # Подготовка
+
+        # Действие
+        index = self.collection.storage_index("unknown")
+
+        # Проверка
+        self.assertEqual(len(index), 0)
+
+    def test_update_batch(self):
+        # Подготовка
+        first = self.add("2025-10-02 10:00:00")
+        batch = [
+            self.create_transaction("2025-10-02 10:00:00"),
+            self.create_transaction("2025-10-01 10:00:00", self.other_storage),
+            self.create_transaction("2025-10-03 10:00:00"),
+            self.create_transaction("2025-10-01 10:00:00")
+        ]
+
+        # Действие
+        self.collection.update({item.unique_code: item for item in batch})
+
+        # Проверка
+        index = self.collection.storage_index(self.storage.unique_code)
+        self.assertEqual(index.items, [batch[3], first, batch[0], batch[2]])
+        self.assertEqual(len(self.collection), 5)
+        start = datetime(2025, 10, 1)
+        end = datetime(2025, 10, 2, 23, 59, 59)
+        self.assertEqual(self.collection.transactions_between(start, end),
+                         [batch[1], batch[3], first, batch[0]])
+        del self.collection[batch[0].unique_code]
+        self.assertEqual(index.items, [batch[3], first, batch[2]])
+
+    def test_aware_date(self):
+        # Подготовка
+        first = self.add("2025-10-02 10:00:00")
+        aware = transaction_model.create_trusted(
+            "aware", "Поступление", self.storage, self.nomenclature, self.measure, 1.0,
+            datetime(2025, 10, 1, tzinfo=timezone.utc))
+        batch = [self.create_transaction("2025-10-03 10:00:00"), aware]
+
+        # Проверка
+        with self.assertRaises(argument_exception):
+            self.collection.update({item.unique_code: item for item in batch})
+        with self.assertRaises(argument_exception):
+            self.collection[aware.unique_code] = aware
+        self.assertEqual(len(self.collection), 1)
+        self.assertEqual(self.collection.storage_index(self.storage.unique_code).items, [first])
+
+if __name__ == '__main__':
+    unittest.main()
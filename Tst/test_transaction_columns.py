@@ -0,0 +1,106 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from Src.Core.osv_builder import osv_builder
+from Src.Core.transaction_collection import transaction_collection
+from Src.Core.transaction_columns import transaction_columns
+from Src.Models.measure_model import measure_model
+from Src.Models.nomenclature_group_model import nomenclature_group_model
+from Src.Models.nomenclature_model import nomenclature_model
+from Src.Models.osv_model import osv_model
+from Src.Models.storage_model import storage_model
+from Src.Models.transaction_model import transaction_model
+
+"""
+    Unit-тесты для класса transaction_columns.
+    Проверяются:
+    - совпадение векторного расчета ОСВ с расчетом по моделям
+    - исключение удаленных транзакций из расчета
+    - уплотнение массивов после удаления доли строк
+"""
+
+@unittest.skipIf(not transaction_columns.available(), "Пакет numpy не установлен")
+class TestTransactionColumns(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        random.seed(42)
+        gramm = measure_model.create_gramm()
+        kilogramm = measure_model.create_kilogramm()
+        group = nomenclature_group_model.create("мука и крупы")
+        self.nomenclatures = {}
+        for i in range(10):
+            item = nomenclature_model.create(f"Номенклатура {i}", group, gramm)
+            self.nomenclatures[item.name] = item
+
+        self.storages = []
+        for i in range(3):
+            storage = storage_model()
+            storage.name = f"Склад {i}"
+            self.storages.append(storage)
+
+        self.collection = transaction_collection()
+        self.collection.enable_columns()
+        for _ in range(500):
+            transaction = transaction_model()
+            transaction.date = datetime(2025, 1, 1) + timedelta(hours=random.randint(0, 24 * 365))
+            transaction.nomenclature = random.choice(list(self.nomenclatures.values()))
+            transaction.storage = random.choice(self.storages)
+            transaction.quantity = float(random.randint(-20, 50))
+            transaction.measure = random.choice([gramm, kilogramm])
+            self.collection[transaction.unique_code] = transaction
+
+    def compare(self, storage: storage_model):
+        osv = osv_model.create(datetime(2025, 4, 1), datetime(2025, 8, 31, 23, 59, 59), storage)
+        expected = osv_builder(osv)
+        expected.generate_rows(self.collection, self.nomenclatures)
+        actual = osv_builder(osv)
+        actual.generate_rows_columnar(self.collection.columns, self.nomenclatures)
+
+        for row in actual.rows:
+            other = expected.find_row(row.nomenclature)
+            self.assertEqual(row.start_balance, other.start_balance)
+            self.assertEqual(row.income, other.income)
+            self.assertEqual(row.outcome, other.outcome)
+            self.assertEqual(row.end_balance, other.end_balance)
+
+    def test_matches_object_builder(self):
+        # Подготовка
+
+        # Действие и проверка
+        for storage in self.storages:
+            self.compare(storage)
+
+    def test_removed_transactions(self):
+        # Подготовка
+        keys = list(self.collection.keys())[:100]
+
+        # Действие
+        for key in keys:
+            del self.collection[key]
+
+        # Проверка
+        self.assertEqual(len(self.collection.columns), 400)
+        for storage in self.storages:
+            self.compare(storage)
+
+    def test_compact_removed(self):
+        # Подготовка
+        keys = list(self.collection.keys())
+        columns = self.collection.columns
+
+        # Действие
+        for key in keys[:300]:
+            del self.collection[key]
+        for key in keys[300:320]:
+            # Повторная запись по тому же ключу тоже оставляет удаленную строку
+            self.collection[key] = self.collection[key]
+
+        # Проверка
+        self.assertEqual(len(columns), 200)
+        self.assertLessEqual(columns.removed, len(columns) * transaction_columns.COMPACT_RATIO)
+        for storage in self.storages:
+            self.compare(storage)
+
+if __name__ == '__main__':
+    unittest.main()
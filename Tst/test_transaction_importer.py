@@ -0,0 +1,154 @@
+import csv
+import gc
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from Src.Core.transaction_importer import transaction_importer
+from Src.Core.validator import argument_exception
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для потокового импорта транзакций (transaction_importer).
+    Проверяются:
+    - импорт CSV частями с ходом импорта и записью отказов в файл
+    - импорт JSON lines с определением формата по расширению
+    - ошибки имени файла, формата и заголовка CSV
+    - строка CSV с ошибкой разбора отклоняется без остановки импорта
+"""
+
+class TestTransactionImporter(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.service = start_service()
+        self.service.start()
+        data = self.service.repo.data
+        self.transactions = data[reposity.transaction_key()]
+        self.storage = next(iter(data[reposity.storage_key()].values()))
+        self.flour = data[reposity.nomenclature_key()]["Пшеничная мука"]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, lines: list) -> str:
+        filename = os.path.join(self.directory.name, name)
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        return filename
+
+    def test_import_csv(self):
+        # Подготовка
+        count = len(self.transactions)
+        lines = ["id,name,storage_id,nomenclature_id,quantity,date"]
+        for position in range(25):
+            lines.append(f"import-{position},Поступление,{self.storage.unique_code},{self.flour.unique_code},"
+                         f"{position},2025-05-01 10:{position:02d}:00")
+        lines[4] = f"import-bad-storage,Поступление,нет такого,{self.flour.unique_code},1,2025-05-01 10:00:00"
+        lines[11] = "import-short,1"
+        lines[20] = f"import-bad-date,Поступление,{self.storage.unique_code},{self.flour.unique_code},1,вчера"
+        filename = self.write("movements.csv", lines)
+        rejects = os.path.join(self.directory.name, "rejected.jsonl")
+        reports = []
+
+        # Действие
+        result = self.service.import_transactions(
+            filename, reject_filename=rejects, batch_size=4, queue_size=1, progress=reports.append)
+
+        # Проверка
+        self.assertEqual(result["total"], 25)
+        self.assertEqual(result["inserted"], 22)
+        self.assertEqual(result["rejected"], 3)
+        self.assertEqual([item["line"] for item in result["errors"]], [5, 12, 21])
+        self.assertEqual(len(self.transactions), count + 22)
+        self.assertEqual(self.transactions["import-24"].quantity, 24.0)
+        self.assertEqual(self.transactions["import-24"].date, datetime(2025, 5, 1, 10, 24))
+        with open(rejects, encoding="utf-8") as file:
+            rejected = [json.loads(line) for line in file]
+        self.assertEqual([item["line"] for item in rejected], [5, 12, 21])
+        self.assertEqual(rejected[1]["row"], ["import-short", "1"])
+        self.assertIn("нет такого", rejected[0]["error"])
+        final = reports[-1]
+        self.assertEqual(final["rows"], 25)
+        self.assertEqual(final["bytes"], final["size"])
+
+    def test_import_jsonl(self):
+        # Подготовка
+        count = len(self.transactions)
+        valid = {
+            "name": "Расход", "storage_id": self.storage.unique_code, "nomenclature_id": self.flour.unique_code,
+            "quantity": -2, "date": "2025-06-01 12:00:00"
+        }
+        filename = self.write("movements.jsonl", [
+            json.dumps(dict(valid, id="import-json-1")),
+            "",
+            "{не JSON",
+            json.dumps(valid),
+            json.dumps(dict(valid, id="import-json-1"))
+        ])
+
+        # Действие
+        result = self.service.import_transactions(filename, batch_size=2)
+
+        # Проверка
+        self.assertEqual(result["total"], 4)
+        self.assertEqual(result["inserted"], 3)
+        self.assertEqual(result["errors"][0]["line"], 3)
+        # Повтор кода в другой части файла заменяет транзакцию
+        self.assertEqual(len(self.transactions), count + 2)
+        self.assertEqual(self.transactions["import-json-1"].quantity, -2.0)
+
+    def test_import_csv_parse_error(self):
+        # Подготовка
+        count = len(self.transactions)
+        row = f"{self.storage.unique_code},{self.flour.unique_code},1,2025-05-01 10:00:00"
+        filename = self.write("movements.csv", [
+            "id,name,storage_id,nomenclature_id,quantity,date",
+            f"parse-1,Поступление,{row}",
+            f"parse-2,\"{'x' * 100}\",{row}",
+            f"parse-3,Поступление,{row}"
+        ])
+        rejects = os.path.join(self.directory.name, "rejected.jsonl")
+        limit = csv.field_size_limit(64)
+
+        # Действие
+        try:
+            result = self.service.import_transactions(filename, reject_filename=rejects)
+        finally:
+            csv.field_size_limit(limit)
+
+        # Проверка
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(result["inserted"], 2)
+        self.assertEqual([item["line"] for item in result["errors"]], [3])
+        self.assertIn("CSV", result["errors"][0]["error"])
+        self.assertEqual(len(self.transactions), count + 2)
+        with open(rejects, encoding="utf-8") as file:
+            self.assertIsNone(json.loads(file.readline())["row"])
+        self.assertTrue(gc.isenabled())
+
+    def test_import_errors(self):
+        # Подготовка
+        header = self.write("header.csv", ["name,storage_id,quantity"])
+        rejects = os.path.join(self.directory.name, "rejected.jsonl")
+
+        # Проверка
+        with self.assertRaises(argument_exception):
+            self.service.import_transactions(os.path.join(self.directory.name, "нет.csv"))
+        with self.assertRaises(argument_exception):
+            self.service.import_transactions(header.replace(".csv", ".xml"))
+        with self.assertRaises(argument_exception):
+            self.service.import_transactions(header, "xml")
+        with self.assertRaises(argument_exception):
+            self.service.import_transactions(header, reject_filename=rejects)
+        with self.assertRaises(argument_exception):
+            self.service.import_transactions(header, batch_size=0)
+        self.assertFalse(os.path.exists(rejects))
+        self.assertEqual(transaction_importer.detect_format("movements.NDJSON"), "jsonl")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import csv
+import json
+import unittest
+from datetime import datetime
+from Src.Core.transaction_ingest import transaction_ingest
+from Src.Core.validator import argument_exception
+from Src.reposity import reposity
+from Src.start_service import start_service
+
+"""
+    Unit-тесты для пакетной загрузки транзакций (transaction_ingest).
+    Проверяются:
+    - загрузка CSV с единицей номенклатуры по умолчанию
+    - отклонение пакета JSON lines со строками с ошибками (в том числе дата с часовым поясом
+      и пустое наименование) и загрузка корректных строк (skip_invalid)
+    - ошибки формата и заголовка CSV
+    - строка CSV с ошибкой разбора отклоняется как строка с ошибкой
+    - номера строк при пустых строках и записи CSV на нескольких строках
+"""
+
+class TestTransactionIngest(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.service = start_service()
+        self.service.start()
+        data = self.service.repo.data
+        self.transactions = data[reposity.transaction_key()]
+        self.storage = next(iter(data[reposity.storage_key()].values()))
+        self.flour = data[reposity.nomenclature_key()]["Пшеничная мука"]
+        self.kilogram = data[reposity.measure_key()]["кг"]
+
+    def test_ingest_csv(self):
+        # Подготовка
+        count = len(self.transactions)
+        source = "\n".join([
+            "id,name,storage_id,nomenclature_id,measure_id,quantity,date",
+            f"bulk-1, Поступление ,{self.storage.unique_code},{self.flour.unique_code},,100,2025-03-01 10:00:00",
+            f"bulk-2,Расход,{self.storage.unique_code},{self.flour.unique_code},{self.kilogram.unique_code},-1.5,2025-03-02 11:30:00"
+        ])
+
+        # Действие
+        result = self.service.ingest_transactions(source, "csv")
+
+        # Проверка
+        self.assertEqual(result, {"total": 2, "inserted": 2, "rejected": 0, "errors": []})
+        self.assertEqual(len(self.transactions), count + 2)
+        first = self.transactions["bulk-1"]
+        self.assertIs(first.storage, self.storage)
+        self.assertIs(first.measure, self.flour.measure)
+        self.assertEqual(first.quantity, 100.0)
+        self.assertEqual(first.date, datetime(2025, 3, 1, 10, 0, 0))
+        self.assertEqual(first.name, "Поступление")
+        self.assertIs(self.transactions["bulk-2"].measure, self.kilogram)
+        self.assertIn("bulk-2", [item.unique_code for item in self.service.repo.transactions_between(
+            datetime(2025, 3, 2), datetime(2025, 3, 3), self.storage)])
+
+    def test_ingest_csv_parse_error(self):
+        # Подготовка
+        row = f"{self.storage.unique_code},{self.flour.unique_code},1,2025-03-01 10:00:00"
+        source = "\n".join([
+            "id,name,storage_id,nomenclature_id,quantity,date",
+            f"parse-1,\"{'x' * 100}\",{row}",
+            f"parse-2,Поступление,{row}"
+        ])
+        limit = csv.field_size_limit(64)
+
+        # Действие
+        try:
+            result = self.service.ingest_transactions(source, "csv", skip_invalid=True)
+        finally:
+            csv.field_size_limit(limit)
+
+        # Проверка
+        self.assertEqual(result["total"], 2)
+        self.assertEqual(result["inserted"], 1)
+        self.assertEqual([item["line"] for item in result["errors"]], [2])
+        self.assertIn("parse-2", self.transactions)
+
+    def test_ingest_jsonl_errors(self):
+        # Подготовка
+        count = len(self.transactions)
+        valid = {
+            "id": "bulk-ok", "name": "Поступление", "storage_id": self.storage.unique_code,
+            "nomenclature_id": self.flour.unique_code, "quantity": 5, "date": "2025-04-01 09:00:00"
+        }
+        lines = [
+            json.dumps(valid),
+            json.dumps(dict(valid, id="bulk-bad-storage", storage_id="нет такого")),
+            "{не JSON",
+            json.dumps(dict(valid, id="bulk-bad-quantity", quantity="много")),
+            json.dumps(dict(valid, id="bulk-bad-date", date="01.04.2025")),
+            json.dumps(valid),
+            json.dumps(dict(valid, id="bulk-bad-zone", date="2025-04-01T09:00:00+03:00")),
+            json.dumps(dict(valid, id="bulk-bad-name", name="   ")),
+            json.dumps(dict(valid, id="bulk-no-name", name=None))
+        ]
+
+        # Действие
+        strict = self.service.ingest_transactions(lines, "jsonl")
+        strict_count = len(self.transactions)
+        relaxed = self.service.ingest_transactions(lines, "jsonl", skip_invalid=True)
+
+        # Проверка
+        self.assertEqual(strict["inserted"], 0)
+        self.assertEqual(strict_count, count)
+        self.assertEqual(relaxed["total"], 9)
+        self.assertEqual(relaxed["inserted"], 1)
+        self.assertEqual([item["line"] for item in relaxed["errors"]], [2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertIn("нет такого", relaxed["errors"][0]["error"])
+        self.assertIn("bulk-ok", relaxed["errors"][4]["error"])
+        self.assertEqual(len(self.transactions), count + 1)
+        self.assertEqual(self.transactions["bulk-ok"].name, "Поступление")
+
+    def test_read_line_numbers(self):
+        # Подготовка
+        csv_source = "name,storage_id,nomenclature_id,quantity,date\nА,s,n,1,d\n\nБ,s,n,2,d\n\"В\nГ\",s,n,3,d\nД,s,n,4,d"
+        jsonl_source = '{"name": "А"}\n\n{"name": "Б"}\n   \n{"name": "В"}'
+
+        # Действие
+        single = transaction_ingest.read(csv_source.split("\n\"В")[0], "csv")
+        multiline = transaction_ingest.read(csv_source, "csv")
+        jsonl = transaction_ingest.read(jsonl_source, "jsonl")
+        compact = transaction_ingest.read(jsonl_source.replace("\n\n", "\n").replace("\n   ", ""), "jsonl")
+
+        # Проверка
+        self.assertEqual(single[1], [2, 4])
+        self.assertEqual(single[0]["name"], ["А", "Б"])
+        self.assertEqual(multiline[1], [2, 4, 6, 7])
+        self.assertEqual(multiline[0]["name"][3], "Д")
+        self.assertEqual(jsonl[1], [1, 3, 5])
+        self.assertEqual(compact[1], [1, 2, 3])
+        self.assertEqual(compact[0]["name"], ["А", "Б", "В"])
+
+    def test_ingest_invalid_format(self):
+        # Проверка
+        with self.assertRaises(argument_exception):
+            self.service.ingest_transactions("", "xml")
+        with self.assertRaises(argument_exception):
+            self.service.ingest_transactions("storage_id,quantity\n", "csv")
+        self.assertEqual(transaction_ingest.formats(), ["csv", "jsonl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
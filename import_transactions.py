@@ -0,0 +1,71 @@
+import argparse
+import sys
+import time
+
+from Src.Core.transaction_importer import transaction_importer
+from Src.Core.validator import argument_exception
+from Src.settings_manager import settings_manager
+from Src.start_service import start_service
+
+"""
+    Потоковый импорт транзакций из файла CSV или JSON lines
+    (например, выгрузки движений по складам из учетной системы).
+
+    Данные приложения загружаются по файлу настроек, транзакции добавляются
+    частями, после чего данные сохраняются (для хранилища SQLite - уже в базе).
+    Строки с ошибками записываются в файл отказов.
+
+    Запуск из корня репозитория:
+        python import_transactions.py movements.csv --reject movements.rejected.jsonl
+"""
+
+
+def parse_arguments(arguments: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Потоковый импорт транзакций из CSV или JSON lines")
+    parser.add_argument("file", help="Файл транзакций (.csv, .jsonl)")
+    parser.add_argument("--format", dest="import_format", choices=["csv", "jsonl"],
+                        help="Формат файла (по умолчанию - по расширению)")
+    parser.add_argument("--reject", dest="reject_filename", help="Файл отказов (JSON lines)")
+    parser.add_argument("--batch-size", type=int, default=transaction_importer.BATCH,
+                        help="Количество строк в части файла")
+    parser.add_argument("--queue-size", type=int, default=transaction_importer.QUEUE,
+                        help="Длина очередей между этапами импорта")
+    parser.add_argument("--settings", default="settings.json", help="Файл настроек")
+    return parser.parse_args(arguments)
+
+
+def print_progress(state: dict):
+    percent = state["bytes"] / state["size"] * 100 if state["size"] > 0 else 100.0
+    print(f"{percent:5.1f}%: строк {state['rows']:,}, добавлено {state['inserted']:,}, "
+          f"отклонено {state['rejected']:,}, {state['rows_per_second']:,.0f} строк/с", flush=True)
+
+
+def main(arguments: list = None) -> int:
+    options = parse_arguments(arguments)
+    manager = settings_manager(options.settings)
+    manager.load_settings()
+    service = start_service()
+    service.initialize_application(manager)
+
+    try:
+        result = service.import_transactions(
+            options.file, options.import_format, options.reject_filename,
+            options.batch_size, options.queue_size, print_progress)
+        started = time.perf_counter()
+        service.save_data()
+        print(f"Данные сохранены за {time.perf_counter() - started:.1f} с")
+    except argument_exception as e:
+        print(f"Ошибка импорта: {e}", file=sys.stderr)
+        return 2
+    finally:
+        service.close_store()
+
+    print(f"Строк: {result['total']:,}, добавлено: {result['inserted']:,}, отклонено: {result['rejected']:,}, "
+          f"время: {result['elapsed']:.1f} с ({result['rows_per_second']:,.0f} строк/с)")
+    for error in result["errors"][:10]:
+        print(f"  строка {error['line']}: {error['error']}")
+    return 1 if result["rejected"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,15 @@ import connexion
 import flask
 from flask import abort, jsonify
 import logging
+import os
 
 from Src.Logics.factory_entities import factory_entities
 from Src.reposity import reposity
 from Src.start_service import start_service
+from Src.settings_manager import settings_manager
 from Src.Convertors.convert_factory import convert_factory
+from Src.Core.production_posting import insufficient_balance_exception
+from Src.Core.validator import argument_exception
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +26,51 @@ data_service = start_service()
 data = None
 responses_factory = factory_entities()
 converter = convert_factory()
+# Каталог, в который пишутся выгрузки по запросу /api/dump
+dump_root = os.path.realpath("dumps")
+
+def cached_json(response_key: str, version, build):
+    """
+    Формирует JSON ответ из заранее закодированных байтов с ETag.
+    
+    Если клиент прислал If-None-Match с актуальным ETag, возвращается 304
+    без преобразования данных. Байты пересобираются только при смене версии.
+    
+    Аргументы:
+        response_key (str): Ключ ответа в кэше
+        version: Версия данных ответа
+        build (callable): Функция без аргументов, возвращающая JSON-совместимые данные
+    """
+    cache = data_service.repo.serialization_cache()
+    etag = cache.etag(response_key, version)
+    if etag is not None and etag in flask.request.if_none_match:
+        response = flask.Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    body, etag = cache.encoded(response_key, version, lambda: app.json.dumps(build()).encode("utf-8"))
+    response = flask.Response(response=body, status=200, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(flask.request)
+
+def warming_response():
+    """
+    Формирует ответ 503 на запросы к транзакциям, пока они загружаются в фоновом режиме.
+    
+    Возвращает:
+        Ответ с состоянием загрузки и заголовком Retry-After или None, если транзакции загружены
+    """
+    if data_service.transactions_ready():
+        return None
+    logger.warning("Запрос к транзакциям до завершения их загрузки")
+    response = jsonify({
+        "status": "error",
+        "message": "Транзакции загружаются, повторите запрос позже",
+        "warming": data_service.warming_state()
+    })
+    response.status_code = 503
+    response.headers["Retry-After"] = "5"
+    return response
 
 @app.route("/", methods=['GET'])
 def index():
@@ -36,12 +85,21 @@ def index():
         "message": "Добро пожаловать в кулинарное REST API",
         "endpoints": {
             "api_accessibility": "GET /api/accessibility",
+            "status": "GET /api/status",
             "recipes_list": "GET /api/recipes", 
             "recipe_by_id": "GET /api/recipes/<recipe_id>",
             "references_list": "GET /api/references",
             "reference_by_name": "GET /api/references/<reference_name>",
+            "cache_stats": "GET /api/cache/stats",
+            "store_stats": "GET /api/store/stats",
             "create_dump": "POST /api/dump",
-            "report": "GET /report/<code>/<start>/<end>"
+            "dump_status": "GET /api/dump/<job_id>",
+            "report": "GET /report/<code>/<start>/<end>",
+            "batch_report": "GET /report/batch/<start>/<end>?storages=<name1,name2>",
+            "live_report": "GET /report/live/<code>/<start>/<end>",
+            "transactions": "GET /api/transactions?start=<start>&end=<end>&storage=<name>&nomenclature=<name>&offset=0&limit=100",
+            "transactions_bulk": "POST /api/transactions/bulk?format=<csv|jsonl>&skip_invalid=<true|false>",
+            "production": "POST /api/production"
         }
     })
 
@@ -56,6 +114,19 @@ def formats():
     logger.info("Проверка доступности API")
     return "SUCCESS"
 
+@app.route("/api/status", methods=['GET'])
+def get_status():
+    """
+    Получить состояние загрузки данных.
+    Пока транзакции загружаются в фоновом режиме ("warming"), справочники
+    и рецепты уже доступны, а запросы к транзакциям и отчетам возвращают 503.
+    
+    Возвращает:
+        JSON с состоянием ("ready", "warming" или "failed") и количеством транзакций
+    """
+    logger.info("Запрос состояния загрузки данных")
+    return jsonify(data_service.warming_state())
+
 @app.route("/response/<string:type>", methods=['GET'])
 def get_response(type):
     """
@@ -100,15 +171,16 @@ def get_recipes():
     try:
         # Получаем данные рецептов из репозитория
         recipes_data = data.get(reposity.recipe_key(), {})
+        version = data_service.repo.version(reposity.recipe_key())
         
-        # Преобразуем все рецепты в JSON-совместимый формат
-        converted_recipes = []
-        for recipe_name, recipe in recipes_data.items():
-            converted_recipe = converter.convert(recipe)
-            converted_recipes.append(converted_recipe)
+        # Преобразуем все рецепты в JSON-совместимый формат (неизмененные - из кэша),
+        # при неизменной версии отдаем готовые байты или 304
+        def build():
+            return data_service.repo.serialization_cache().convert_collection(
+                reposity.recipe_key(), version, recipes_data, converter)
         
-        logger.info(f"Успешно возвращено {len(converted_recipes)} рецептов")
-        return jsonify(converted_recipes)
+        logger.info(f"Успешно возвращено {len(recipes_data)} рецептов")
+        return cached_json(reposity.recipe_key(), version, build)
         
     except Exception as e:
         logger.error(f"Ошибка при получении списка рецептов: {str(e)}")
@@ -165,33 +237,55 @@ def get_references():
     Получить список всех справочников в формате JSON.
     
     Возвращает:
-        JSON объект со всеми справочниками (кроме рецептов)
+        JSON объект со всеми справочниками (кроме рецептов и транзакций)
         
     Ошибки:
         500: В случае внутренней ошибки сервера при получении справочников
     """
     logger.info("Запрос списка всех справочников")
     try:
-        references_data = {}
-        
-        # Собираем все справочники кроме рецептов
-        for key, value in data.items():
-            if key != reposity.recipe_key():  # исключаем рецепты
-                # Преобразуем каждый элемент справочника
-                converted_items = []
-                for item_name, item in value.items():
-                    converted_item = converter.convert(item)
-                    converted_items.append(converted_item)
-                
-                references_data[key] = converted_items
-        
-        logger.info(f"Успешно возвращено {len(references_data)} справочников")
-        return jsonify(references_data)
+        # Все справочники кроме рецептов и транзакций (транзакции - /api/transactions)
+        keys = [key for key in data.keys() if key not in (reposity.recipe_key(), reposity.transaction_key())]
+        version = tuple(data_service.repo.version(key) for key in keys)
+        
+        def build():
+            # Преобразуем каждый элемент справочника (неизмененные - из кэша)
+            return {
+                key: data_service.repo.serialization_cache().convert_collection(
+                    key, data_service.repo.version(key), data[key], converter)
+                for key in keys
+            }
+        
+        logger.info(f"Успешно возвращено {len(keys)} справочников")
+        return cached_json("references", version, build)
         
     except Exception as e:
         logger.error(f"Ошибка при получении справочников: {str(e)}")
         abort(500, description=f"Ошибка при получении справочников: {str(e)}")
 
+@app.route("/api/cache/stats", methods=['GET'])
+def get_cache_stats():
+    """
+    Получить статистику кэша сериализации справочников.
+    
+    Возвращает:
+        JSON объект с размером кэша, попаданиями, промахами и долей попаданий
+    """
+    logger.info("Запрос статистики кэша сериализации")
+    return jsonify(data_service.repo.serialization_cache().stats())
+
+@app.route("/api/store/stats", methods=['GET'])
+def get_store_stats():
+    """
+    Получить показатели пула соединений базы SQLite.
+    
+    Возвращает:
+        JSON объект с размером пула, занятыми и свободными соединениями, ожиданиями
+        и статистикой кэша подготовленных запросов (или хранилищем "memory")
+    """
+    logger.info("Запрос показателей пула соединений")
+    return jsonify(data_service.store_metrics())
+
 @app.route("/api/references/<string:reference_name>", methods=['GET'])
 def get_reference(reference_name):
     """
@@ -213,25 +307,192 @@ def get_reference(reference_name):
         if reference_name not in data:
             logger.warning(f"Справочник '{reference_name}' не найден")
             abort(404, description=f"Справочник '{reference_name}' не найден")
+        if reference_name == reposity.transaction_key():
+            warming = warming_response()
+            if warming is not None:
+                return warming
         
         reference_data = data[reference_name]
+        version = data_service.repo.version(reference_name)
         
-        # Преобразуем все элементы справочника
-        converted_items = []
-        for item_name, item in reference_data.items():
-            converted_item = converter.convert(item)
-            converted_items.append(converted_item)
+        def build():
+            # Преобразуем все элементы справочника (неизмененные - из кэша)
+            return {
+                "reference_name": reference_name,
+                "items": data_service.repo.serialization_cache().convert_collection(
+                    reference_name, version, reference_data, converter)
+            }
         
-        logger.info(f"Справочник '{reference_name}' содержит {len(converted_items)} элементов")
-        return jsonify({
-            "reference_name": reference_name,
-            "items": converted_items
-        })
+        logger.info(f"Справочник '{reference_name}' содержит {len(reference_data)} элементов")
+        return cached_json(f"references/{reference_name}", version, build)
         
     except Exception as e:
         logger.error(f"Ошибка при получении справочника {reference_name}: {str(e)}")
         abort(500, description=f"Ошибка при получении справочника: {str(e)}")
 
+@app.route("/api/transactions", methods=['GET'])
+def get_transactions():
+    """
+    Получить транзакции за период в формате JSON с постраничной выдачей.
+
+    Параметры запроса:
+        start (str): Дата начала периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+        end (str): Дата окончания периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+        storage (str): Название склада (необязательно)
+        nomenclature (str): Название номенклатуры (необязательно)
+        offset (int): Количество пропускаемых транзакций (по умолчанию 0)
+        limit (int): Размер страницы (по умолчанию 100, не больше 1000)
+
+    Возвращает:
+        JSON объект со страницей транзакций и признаком наличия следующей страницы
+
+    Ошибки:
+        400: Неправильный формат параметров
+        404: Склад или номенклатура не найдены
+    """
+    args = flask.request.args
+    logger.info(f"Запрос транзакций за период {args.get('start')} - {args.get('end')}")
+    warming = warming_response()
+    if warming is not None:
+        return warming
+    try:
+        start_date = datetime.strptime(args.get("start", ""), "%Y-%m-%d %H:%M:%S")
+        finish_date = datetime.strptime(args.get("end", ""), "%Y-%m-%d %H:%M:%S")
+        offset = int(args.get("offset", 0))
+        limit = min(int(args.get("limit", 100)), 1000)
+    except ValueError:
+        logger.error("Неправильные параметры запроса транзакций")
+        abort(400, description="Неправильные параметры! Даты: ГГГГ-ММ-ДД ЧЧ:ММ:СС, offset и limit - целые числа")
+    if offset < 0 or limit < 1:
+        abort(400, description="Параметр offset должен быть не меньше 0, limit - не меньше 1")
+
+    storage = None
+    if args.get("storage"):
+        storage = next((item for item in data[reposity.storage_key()].values() if item.name == args["storage"]), None)
+        if storage is None:
+            abort(404, description=f"Склад '{args['storage']}' не найден")
+    nomenclature = None
+    if args.get("nomenclature"):
+        nomenclature = data[reposity.nomenclature_key()].get(args["nomenclature"])
+        if nomenclature is None:
+            abort(404, description=f"Номенклатура '{args['nomenclature']}' не найдена")
+
+    # Запрашиваем на одну транзакцию больше, чтобы узнать о следующей странице
+    transactions = data_service.repo.transactions_between(
+        start_date, finish_date, storage, nomenclature, offset, limit + 1)
+    items = [converter.convert(item) for item in transactions[:limit]]
+
+    logger.info(f"Возвращено {len(items)} транзакций")
+    return jsonify({
+        "offset": offset,
+        "limit": limit,
+        "count": len(items),
+        "has_more": len(transactions) > limit,
+        "items": items
+    })
+
+@app.route("/api/transactions/bulk", methods=['POST'])
+def post_transactions_bulk():
+    """
+    Загрузить пакет транзакций в формате CSV (с заголовком) или JSON lines.
+    Поля строки: id, name, storage_id, nomenclature_id, measure_id, quantity, date
+    (id и measure_id необязательны).
+
+    Параметры запроса:
+        format (str): "csv" или "jsonl" (по умолчанию по Content-Type, иначе "csv")
+        skip_invalid (str): "true" - добавить корректные строки и отклонить ошибочные
+
+    Возвращает:
+        201: JSON с количеством строк, добавленных и отклоненных транзакций
+
+    Ошибки:
+        400: Неподдерживаемый формат, нет обязательного столбца или строки с ошибками
+             (без skip_invalid пакет не добавляется)
+        503: Если транзакции еще загружаются
+    """
+    warming = warming_response()
+    if warming is not None:
+        return warming
+    content_type = flask.request.content_type or ""
+    default_format = "jsonl" if "json" in content_type else "csv"
+    ingest_format = flask.request.args.get("format", default_format)
+    skip_invalid = flask.request.args.get("skip_invalid", "false").lower() == "true"
+    logger.info(f"Пакетная загрузка транзакций в формате {ingest_format}")
+    try:
+        result = data_service.ingest_transactions(
+            flask.request.get_data(as_text=True), ingest_format, skip_invalid)
+    except argument_exception as e:
+        logger.error(f"Ошибка пакетной загрузки транзакций: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    logger.info(f"Добавлено {result['inserted']} транзакций, отклонено {result['rejected']}")
+    if result["rejected"] > 0 and not skip_invalid:
+        return jsonify(dict(result, status="error")), 400
+    return jsonify(dict(result, status="created")), 201
+
+@app.route("/api/production", methods=['POST'])
+def post_production():
+    """
+    Приготовление блюда: списать ингредиенты рецепта со склада.
+
+    Тело запроса (JSON):
+    {
+        "recipe": "Вафли",                 # код или название рецепта
+        "storage": "Склад 1",              # код или название склада
+        "portions": 2,                     # количество порций
+        "mode": "blocking",                # "blocking" - с блокировкой, "overdraft" - под сальдо
+        "date": "2025-01-01 12:00:00"      # по умолчанию - текущая дата
+    }
+
+    Возвращает:
+        201: JSON с транзакциями расхода ингредиентов
+
+    Ошибки:
+        400: Некорректные параметры
+        404: Рецепт или склад не найден
+        409: Не хватает остатков (вариант "blocking"), с перечнем недостающих ингредиентов
+        503: Если транзакции еще загружаются
+    """
+    warming = warming_response()
+    if warming is not None:
+        return warming
+    request_data = flask.request.get_json(silent=True) or {}
+    repo_data = data_service.repo.data
+    recipe_id = str(request_data.get("recipe", ""))
+    storage_id = str(request_data.get("storage", ""))
+    recipes = repo_data[reposity.recipe_key()]
+    # Ключ справочника рецептов - название, поэтому сначала поиск по ключу
+    recipe = recipes.get(recipe_id) or next(
+        (item for item in recipes.values() if recipe_id in (item.unique_code, item.name)), None)
+    storage = next(
+        (item for item in repo_data[reposity.storage_key()].values() if storage_id in (item.unique_code, item.name)),
+        None)
+    if recipe is None or storage is None:
+        return jsonify({"status": "error", "message": "Рецепт или склад не найден"}), 404
+
+    logger.info(f"Приготовление блюда '{recipe.name}' на складе '{storage.name}'")
+    try:
+        date = request_data.get("date")
+        date = None if date is None else datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+        items = data_service.post_production(
+            recipe, storage, request_data.get("portions", 1), request_data.get("mode", "blocking"), date)
+    except insufficient_balance_exception as e:
+        logger.warning(str(e))
+        return jsonify({
+            "status": "blocked",
+            "message": str(e),
+            "shortages": [
+                {"nomenclature_id": nomenclature.unique_code, "nomenclature": nomenclature.name,
+                 "required": required, "available": available}
+                for nomenclature, required, available in e.shortages
+            ]
+        }), 409
+    except (argument_exception, ValueError, TypeError) as e:
+        logger.error(f"Ошибка приготовления блюда: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    return jsonify({"status": "created", "items": [converter.convert(item) for item in items]}), 201
+
 @app.route("/report/<code>/<start>/<end>", methods=['GET'])
 def get_report(code, start, end):
     """
@@ -243,6 +504,9 @@ def get_report(code, start, end):
         end (str): Дата окончания периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
     """
     logger.info(f"Запрос отчета для склада '{code}' за период {start} - {end}")
+    warming = warming_response()
+    if warming is not None:
+        return warming
     
     # Создаем генератор CSV отчетов
     result_format = factory_entities().create("csv")()
@@ -270,53 +534,175 @@ def get_report(code, start, end):
     # Передаем объект storage_model
     osv = data_service.create_osv(start_date, finish_date, storage)
     
-    # Генерируем CSV отчет
-    result = result_format.create(osv.rows)
+    # Отдаем CSV отчет потоком: заголовок сразу, строки по мере форматирования
+    result = result_format.create_stream(osv.rows)
     
     logger.info(f"Отчет для склада '{code}' успешно сгенерирован")
     return flask.Response(response=result, status=200, content_type="text/plain;charset=utf-8")
 
+@app.route("/report/batch/<start>/<end>", methods=['GET'])
+def get_batch_report(start, end):
+    """
+    Сгенерировать отчеты по нескольким складам за указанный период в CSV формате.
+    Ведомость каждого склада строится по его индексу транзакций, упорядоченному
+    по дате: начальный остаток берется из ближайшего снимка остатков, и просматриваются
+    только транзакции склада после снимка (для базы SQLite суммы всех складов
+    считаются одним запросом). Ответ отдается по частям - отдельный блок на каждый склад.
+
+    Аргументы:
+        start (str): Дата начала периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+        end (str): Дата окончания периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+
+    Параметры запроса:
+        storages (str): Названия складов через запятую (по умолчанию - все склады)
+    """
+    logger.info(f"Запрос пакетного отчета за период {start} - {end}")
+    warming = warming_response()
+    if warming is not None:
+        return warming
+
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d %H:%M:%S")
+        finish_date = datetime.strptime(end, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        logger.error("Неправильный формат дат в запросе пакетного отчета")
+        return "Неправильный формат дат! Используйте: ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+
+    # Отбираем склады по названиям из параметра запроса
+    storages = None
+    names = flask.request.args.get("storages")
+    if names:
+        res = data[reposity.storage_key()]
+        storages = [item for item in res.values() if item.name in names.split(",")]
+        if len(storages) == 0:
+            logger.warning(f"Склады '{names}' не найдены")
+            return "Неправильный код склада!"
+
+    osvs = data_service.create_osv_batch(start_date, finish_date, storages)
+
+    def generate():
+        # Каждый склад форматируется и отправляется отдельным блоком
+        result_format = factory_entities().create("csv")()
+        for osv in osvs:
+            yield f"# {osv.storage.name}\n"
+            yield from result_format.create_stream(osv.rows)
+            yield "\n\n"
+
+    logger.info(f"Пакетный отчет сформирован для {len(osvs)} складов")
+    return flask.Response(response=generate(), status=200, content_type="text/plain;charset=utf-8")
+
+@app.route("/report/live/<code>/<start>/<end>", methods=['GET'])
+def get_live_report(code, start, end):
+    """
+    Получить поддерживаемый отчет по складу за период в CSV формате.
+    При первом запросе ведомость строится и подписывается на изменения транзакций,
+    последующие запросы возвращают уже обновленный результат без пересчета.
+
+    Аргументы:
+        code (str): Название склада
+        start (str): Дата начала периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+        end (str): Дата окончания периода в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+    """
+    logger.info(f"Запрос поддерживаемого отчета для склада '{code}' за период {start} - {end}")
+    warming = warming_response()
+    if warming is not None:
+        return warming
+
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d %H:%M:%S")
+        finish_date = datetime.strptime(end, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        logger.error("Неправильный формат дат в запросе отчета")
+        return "Неправильный формат дат! Используйте: ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+
+    storage = next((item for item in data[reposity.storage_key()].values() if item.name == code), None)
+    if storage is None:
+        logger.warning(f"Склад с кодом '{code}' не найден")
+        return "Неправильный код склада!"
+
+    osv = data_service.live_osv(start_date, finish_date, storage)
+    result = factory_entities().create("csv")().create_stream(osv.rows)
+    return flask.Response(response=result, status=200, content_type="text/plain;charset=utf-8")
+
 @app.route("/api/dump", methods=['POST'])
 def get_dump():
     """
-    Сохранить все данные из репозитория в JSON файл.
+    Запустить фоновую выгрузку всех данных репозитория в файл JSON или двоичный снимок.
+    Снимок данных фиксируется при запросе, файл записывается в фоновом потоке
+    во временный файл и атомарно заменяет прежний.
     
     Тело запроса (JSON, опционально):
     {
-        "filename": "имя_файла.json"  # по умолчанию "data_dump.json"
+        "filename": "имя_файла.json",  # имя в каталоге выгрузок dumps, по умолчанию "data_dump.json"
+                                       # ("data_dump.bin" для двоичного снимка)
+        "format": "json",              # "json", "binary" или "sharded" (каталог), по умолчанию из настроек (dump_format)
+        "compression": "gzip"          # "none", "gzip", "bz2" или "lzma", по умолчанию из настроек (dump_compression)
     }
     
     Возвращает:
-        JSON ответ с результатом операции
+        202: JSON с идентификатором задания (job_id) для опроса через GET /api/dump/<job_id>
         
     Ошибки:
-        500: В случае ошибки при выгрузке данных
+        400: Неподдерживаемый формат, имя файла вне каталога выгрузок
+             или непустой каталог без выгрузки (sharded)
+        503: Если транзакции еще загружаются
+        500: В случае ошибки при запуске выгрузки
     """
+    warming = warming_response()
+    if warming is not None:
+        return warming
     try:
         # Получаем данные из тела запроса
-        if flask.request.is_json:
-            request_data = flask.request.get_json()
-            filename = request_data.get('filename', 'data_dump.json')
-        else:
-            # Если JSON не предоставлен, используем значение по умолчанию
-            filename = 'data_dump.json'
+        request_data = flask.request.get_json() if flask.request.is_json else {}
+        dump_format = request_data.get('format', data_service.dump_format)
+        if dump_format not in ("json", "binary", "sharded"):
+            return jsonify({
+                "status": "error",
+                "message": f"Неподдерживаемый формат выгрузки: {dump_format}"
+            }), 400
+        # Каталог данных (sharded) записывается без расширения
+        compression = request_data.get('compression', data_service.dump_compression)
+        if compression not in ("none", "gzip", "bz2", "lzma"):
+            return jsonify({
+                "status": "error",
+                "message": f"Неподдерживаемый алгоритм сжатия: {compression}"
+            }), 400
+        extension = {"json": '.json', "binary": '.bin', "sharded": ''}[dump_format]
+        # Если имя файла не предоставлено, используем значение по умолчанию
+        filename = request_data.get('filename', 'data_dump' + extension)
         
         # Проверяем расширение файла
-        if not filename.endswith('.json'):
-            filename += '.json'
+        if not isinstance(filename, str) or filename == "":
+            filename = 'data_dump' + extension
+        if not filename.endswith(extension):
+            filename += extension
+
+        # Выгрузка пишется только внутрь каталога выгрузок: без абсолютных путей и ".."
+        path = os.path.realpath(os.path.join(dump_root, filename))
+        if os.path.commonpath([dump_root, path]) != dump_root or path == dump_root:
+            return jsonify({
+                "status": "error",
+                "message": f"Имя файла выгрузки должно указывать внутрь каталога выгрузок: {filename}"
+            }), 400
+        os.makedirs(dump_root, exist_ok=True)
         
-        logger.info(f"Запрос на выгрузку данных в файл: {filename}")
+        logger.info(f"Запрос на выгрузку данных в файл: {path}")
         
-        # Используем метод dump из start_service для сохранения данных
-        data_service.dump(filename)
+        # Запускаем фоновую выгрузку, запрос не ждет записи файла
+        try:
+            job = data_service.dump_async(path, dump_format, compression)
+        except argument_exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
         
-        logger.info(f"Данные успешно выгружены в файл: {filename}")
+        logger.info(f"Запущена выгрузка данных в файл: {filename}, задание {job.id}")
         
         return jsonify({
-            "status": "success",
-            "message": f"Данные успешно выгружены в файл: {filename}",
-            "filename": filename
-        }), 200
+            "status": "accepted",
+            "message": f"Выгрузка данных в файл {filename} запущена",
+            "filename": filename,
+            "job_id": job.id,
+            "poll": f"/api/dump/{job.id}"
+        }), 202
         
     except Exception as e:
         logger.error(f"Ошибка при выгрузке данных: {str(e)}")
@@ -325,6 +711,25 @@ def get_dump():
             "message": f"Ошибка при выгрузке данных: {str(e)}"
         }), 500
 
+@app.route("/api/dump/<job_id>", methods=['GET'])
+def get_dump_status(job_id: str):
+    """
+    Получить состояние задания выгрузки.
+    
+    Аргументы:
+        job_id (str): Идентификатор задания из ответа POST /api/dump
+        
+    Возвращает:
+        JSON с состоянием ("pending", "running", "done", "failed"), ходом выполнения и ошибкой
+        
+    Ошибки:
+        404: Если задание не найдено
+    """
+    job = data_service.find_dump_job(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Задание выгрузки {job_id} не найдено"}), 404
+    return jsonify(job.state()), 200
+
 @app.errorhandler(404)
 def page_not_found(error):
     """
@@ -362,10 +767,14 @@ def internal_server_error(error):
 if __name__ == '__main__':
     """
     Точка входа приложения.
-    Запускает сервис данных и Flask сервер.
+    Загружает настройки, инициализирует по ним сервис данных и запускает Flask сервер.
     """
-    # Запускаем сервис данных и получаем данные репозитория
-    data_service.start()
+    # Настройки определяют хранилище, формат файла данных, журнал и параметры ОСВ
+    manager = settings_manager("settings.json")
+    if not manager.load_settings():
+        logger.warning("Настройки не загружены, используются настройки по умолчанию")
+    if not data_service.initialize_application(manager):
+        raise SystemExit("Ошибка инициализации данных")
     data = data_service.repo.data
     
     logger.info("Сервис запущен на 0.0.0.0:8080")